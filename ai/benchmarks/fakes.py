@@ -0,0 +1,635 @@
+# benchmarks/fakes.py
+# 업스트림(OpenAI / Pinecone / 네이버 쇼핑) record/replay 가짜 구현
+# - record : 실제 클라이언트를 호출하고 요청 해시 → 응답/소요시간을 fixtures/<component>.jsonl에 저장
+# - replay : 저장된 응답을 돌려주고, 지연은 프로파일의 분포에서 샘플링 (fixture가 없으면 합성 응답)
+# - 합성 응답은 그래프가 끝까지 돌 수 있는 최소 형태만 맞춤 (라우팅 JSON, 슬롯 JSON, 검색 결과 등)
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from array import array
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+EMBED_DIM = 1536
+NAVER_SHOP_URL = "https://openapi.naver.com/v1/search/shop.json"
+
+# ─────────────────────────────────────────────────────────────
+# 지연 분포
+# ─────────────────────────────────────────────────────────────
+# 단위는 ms. 'recorded'는 fixture에 기록된 실제 소요시간 (없으면 0)
+PROFILES: Dict[str, Dict[str, str]] = {
+    "default": {
+        "llm.first_token": "lognormal:550,0.35",
+        "llm.per_chunk": "lognormal:12,0.3",
+        "embedding": "lognormal:140,0.3",
+        "pinecone": "lognormal:85,0.35",
+        "naver": "lognormal:220,0.4",
+    },
+    "slow": {
+        "llm.first_token": "lognormal:1400,0.5",
+        "llm.per_chunk": "lognormal:25,0.4",
+        "embedding": "lognormal:400,0.5",
+        "pinecone": "lognormal:250,0.5",
+        "naver": "lognormal:700,0.6",
+    },
+    "recorded": {
+        "llm.first_token": "recorded",
+        "llm.per_chunk": "fixed:0",
+        "embedding": "recorded",
+        "pinecone": "recorded",
+        "naver": "recorded",
+    },
+    # 업스트림 지연 없이 파이프라인 자체 오버헤드만 측정
+    "zero": {k: "fixed:0" for k in ("llm.first_token", "llm.per_chunk", "embedding", "pinecone", "naver")},
+}
+
+
+class Latency:
+    """
+    'fixed:120' | 'uniform:lo,hi' | 'normal:mean,std' | 'lognormal:median,sigma' | 'recorded[:scale]'
+    """
+
+    def __init__(self, spec: str, scale: float = 1.0, seed: Optional[int] = None):
+        kind, _, args = spec.partition(":")
+        self.spec = spec
+        self.kind = kind.strip()
+        self.args = [float(x) for x in args.split(",") if x.strip()]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal", "recorded"):
+            raise ValueError(f"unknown latency spec: {spec}")
+        self.scale = scale
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded_ms: Optional[float] = None) -> float:
+        a = self.args
+        with self._lock:
+            if self.kind == "fixed":
+                ms = a[0] if a else 0.0
+            elif self.kind == "uniform":
+                ms = self._rng.uniform(a[0], a[1])
+            elif self.kind == "normal":
+                ms = self._rng.normalvariate(a[0], a[1])
+            elif self.kind == "lognormal":
+                ms = self._rng.lognormvariate(0.0, a[1]) * a[0]
+            else:
+                ms = (recorded_ms or 0.0) * (a[0] if a else 1.0)
+        return max(0.0, ms * self.scale)
+
+    def sleep(self, recorded_ms: Optional[float] = None) -> float:
+        ms = self.sample(recorded_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+        return ms
+
+    async def asleep(self, recorded_ms: Optional[float] = None) -> float:
+        ms = self.sample(recorded_ms)
+        if ms > 0:
+            await asyncio.sleep(ms / 1000)
+        return ms
+
+
+def load_profile(name_or_path: str, scale: float = 1.0, seed: Optional[int] = 7) -> Dict[str, Latency]:
+    """PROFILES 이름 또는 {component: spec} JSON 파일 경로"""
+    if name_or_path in PROFILES:
+        specs = dict(PROFILES[name_or_path])
+    else:
+        with open(name_or_path, encoding="utf-8") as f:
+            specs = {**PROFILES["default"], **json.load(f)}
+    return {k: Latency(v, scale=scale, seed=None if seed is None else seed + i)
+            for i, (k, v) in enumerate(sorted(specs.items()))}
+
+
+# ─────────────────────────────────────────────────────────────
+# fixture 저장소
+# ─────────────────────────────────────────────────────────────
+def request_key(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def encode_vector(vec: List[float]) -> str:
+    return base64.b64encode(array("f", vec).tobytes()).decode("ascii")
+
+
+def decode_vector(s: str) -> List[float]:
+    a = array("f")
+    a.frombytes(base64.b64decode(s))
+    return a.tolist()
+
+
+def vector_key(vec: Optional[List[float]]) -> Optional[str]:
+    """float32로 맞춘 뒤 해시 (record 때 받은 벡터와 replay 때 복원한 벡터가 같은 키)"""
+    if vec is None:
+        return None
+    return hashlib.sha1(array("f", vec).tobytes()).hexdigest()
+
+
+class FixtureStore:
+    """mode: replay | record | synthetic (fixture 무시, 항상 합성 응답)"""
+
+    def __init__(self, root: Optional[str], mode: str = "replay"):
+        if mode not in ("replay", "record", "synthetic"):
+            raise ValueError(f"unknown fixture mode: {mode}")
+        self.root = root
+        self.mode = mode
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _path(self, component: str) -> str:
+        return os.path.join(self.root or ".", f"{component}.jsonl")
+
+    def _load(self, component: str) -> Dict[str, Dict[str, Any]]:
+        if component in self._data:
+            return self._data[component]
+        entries: Dict[str, Dict[str, Any]] = {}
+        path = self._path(component)
+        if self.root and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        e = json.loads(line)
+                        entries[e["key"]] = e
+        self._data[component] = entries
+        return entries
+
+    def _count(self, component: str, what: str) -> None:
+        c = self.stats.setdefault(component, {"hit": 0, "miss": 0, "recorded": 0})
+        c[what] += 1
+
+    def get(self, component: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = None if self.mode == "synthetic" else self._load(component).get(request_key(payload))
+            self._count(component, "hit" if entry is not None else "miss")
+        return entry
+
+    def put(self, component: str, payload: Dict[str, Any], response: Any, latency_ms: float) -> None:
+        key = request_key(payload)
+        entry = {"key": key, "request": payload, "response": response, "latency_ms": round(latency_ms, 1)}
+        with self._lock:
+            entries = self._load(component)
+            self._count(component, "recorded")
+            if key in entries:
+                return
+            entries[key] = entry
+            if self.root:
+                os.makedirs(self.root, exist_ok=True)
+                with open(self._path(component), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+
+# ─────────────────────────────────────────────────────────────
+# 합성 응답 (fixture miss)
+# ─────────────────────────────────────────────────────────────
+_BRANDS = ["샤넬", "디올", "조 말론 런던", "딥티크", "르 라보", "바이레도", "톰 포드", "에르메스", "크리드", "입생로랑"]
+_SEASONS = ["봄", "여름", "가을", "겨울"]
+_GENDERS = ["남성", "여성", "남녀공용"]
+_SLOT_KEYS = ("brand", "concentration", "day_night_score", "gender", "season_score", "sizes", "recommendation_count")
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def synthetic_vector(text: str, dim: int = EMBED_DIM) -> List[float]:
+    rng = random.Random(_seed(text))
+    v = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    n = sum(x * x for x in v) ** 0.5 or 1.0
+    return [x / n for x in v]
+
+
+def synthetic_perfume(pid: int) -> Dict[str, Any]:
+    brand = _BRANDS[pid % len(_BRANDS)]
+    return {
+        "no": pid,
+        "id": str(pid),
+        "brand": brand,
+        "name": f"오 드 퍼퓸 {pid}",
+        "concentration": "오 드 퍼퓸",
+        "gender": _GENDERS[pid % len(_GENDERS)],
+        "season_score": _SEASONS[pid % len(_SEASONS)],
+        "day_night_score": "day" if pid % 2 else "night",
+        "sizes": "50",
+        # 실제 인덱스의 설명 필드 길이(수백 자)에 맞춤 — 체크포인트/직렬화 비용 측정용
+        "text": f"{brand}의 시트러스와 머스크가 어우러진 향수 ({pid}). " + "탑노트의 상큼함이 미들노트의 플로럴로 이어지고 잔향은 우디하게 남습니다. " * 12,
+        "content": f"{brand} 향수 리뷰: 잔향이 은은하고 지속력이 좋아요 ({pid})",
+    }
+
+
+def synthetic_matches(index: str, vec_key: Optional[str], top_k: int) -> Dict[str, Any]:
+    rng = random.Random(_seed(f"{index}:{vec_key}"))
+    ids = rng.sample(range(1, 800), min(int(top_k or 10), 50))
+    return {"matches": [
+        {"id": str(pid), "score": round(0.92 - i * 0.015, 4), "metadata": synthetic_perfume(pid)}
+        for i, pid in enumerate(ids)
+    ], "namespace": ""}
+
+
+def synthetic_naver_items(query: str, display: int) -> Dict[str, Any]:
+    base = 40000 + _seed(query) % 120000
+    return {"items": [
+        {
+            "title": f"<b>{query}</b> 정품 {i + 1}",
+            "link": f"https://shopping.example.com/{_seed(query) % 10000}/{i}",
+            "image": "",
+            "lprice": str(base + i * 3500),
+            "hprice": "",
+            "mallName": f"스토어{i + 1}",
+            "productId": str(_seed(f"{query}{i}")),
+        }
+        for i in range(min(int(display or 10), 10))
+    ]}
+
+
+class SyntheticResponder:
+    """프롬프트 모양을 보고 노드가 파싱할 수 있는 최소 응답을 만듦 (routes: 질의 → 에이전트)"""
+
+    def __init__(self, routes: Optional[Dict[str, str]] = None, answer_chars: int = 400):
+        self.routes = dict(routes or {})
+        self.answer_chars = answer_chars
+
+    def reply(self, messages: List[Tuple[str, str]]) -> str:
+        text = "\n".join(c for _, c in messages)
+        last_user = next((c for r, c in reversed(messages) if r in ("human", "user")), "")
+        if last_user.startswith("USER_QUERY:"):
+            q = last_user.split("\n", 2)[1].strip() if "\n" in last_user else ""
+            return json.dumps({"next": self.routes.get(q, "FAQ_agent"), "reason": "synthetic"}, ensure_ascii=False)
+        if "recommendation_count" in text:
+            return "```json\n" + json.dumps({k: None for k in _SLOT_KEYS}, ensure_ascii=False) + "\n```"
+        if "analyzed_scent" in text:
+            return json.dumps({"analyzed_scent": "은은한 플로럴과 머스크", "confidence": 0.7}, ensure_ascii=False)
+        if "scent_description" in text:
+            return json.dumps({"scent_description": last_user, "price_query": ""}, ensure_ascii=False)
+        if "네이버 쇼핑 검색용 키워드" in text:
+            return re.sub(r"(가격|얼마|최저가|알려줘|\?)", "", last_user).strip()[:20] or "향수"
+        body = "향이 부드럽고 데일리로 쓰기 좋아요. "
+        return (body * (self.answer_chars // len(body) + 1))[: self.answer_chars]
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+def _message_payload(model: str, messages: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    return {"model": model, "messages": [[r, c if isinstance(c, str) else json.dumps(c, ensure_ascii=False, default=str)]
+                                         for r, c in messages]}
+
+
+def _chunks(text: str, size: int = 6) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+# ─────────────────────────────────────────────────────────────
+# ChatOpenAI
+# ─────────────────────────────────────────────────────────────
+class FixtureChatModel(BaseChatModel):
+    """ChatOpenAI 대체 (record 모드에선 inner로 실제 호출)"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    store: Any
+    synth: Any
+    latency: Dict[str, Any]
+    inner: Optional[Any] = None
+    model_name: str = "gpt-4o-mini"
+    streaming: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixture-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        # 트레이스/지표의 모델 라벨이 실제 ChatOpenAI와 같도록
+        return {"model_name": self.model_name}
+
+    def _respond(self, messages: List[BaseMessage]) -> Tuple[str, Dict[str, int], Optional[float], bool]:
+        """Returns (content, usage_metadata, recorded_ms, 실제 호출 여부)"""
+        payload = _message_payload(self.model_name, [(m.type, m.content) for m in messages])
+        if self.store.recording and self.inner is not None:
+            t0 = time.perf_counter()
+            res = self.inner.invoke(messages)
+            ms = (time.perf_counter() - t0) * 1000
+            usage = dict(getattr(res, "usage_metadata", None) or {})
+            self.store.put("llm", payload, {"content": res.content, "usage": usage}, ms)
+            return res.content, usage, ms, True
+        entry = self.store.get("llm", payload)
+        if entry is not None:
+            r = entry["response"]
+            return r["content"], dict(r.get("usage") or {}), entry.get("latency_ms"), False
+        content = self.synth.reply([(r, c) for r, c in payload["messages"]])
+        tin = sum(_approx_tokens(c) for _, c in payload["messages"])
+        usage = {"input_tokens": tin, "output_tokens": _approx_tokens(content),
+                 "total_tokens": tin + _approx_tokens(content)}
+        return content, usage, None, False
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        content, usage, recorded_ms, live = self._respond(messages)
+        if not live:
+            self.latency["llm.first_token"].sleep(recorded_ms)
+            for _ in _chunks(content):
+                self.latency["llm.per_chunk"].sleep()
+        msg = AIMessage(content=content, usage_metadata=usage or None)
+        token_usage = {"prompt_tokens": usage.get("input_tokens", 0), "completion_tokens": usage.get("output_tokens", 0)}
+        return ChatResult(generations=[ChatGeneration(message=msg)],
+                          llm_output={"token_usage": token_usage, "model_name": self.model_name})
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        content, usage, recorded_ms, live = self._respond(messages)
+        if not live:
+            self.latency["llm.first_token"].sleep(recorded_ms)
+        for piece in _chunks(content):
+            if not live:
+                self.latency["llm.per_chunk"].sleep()
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+        # stream_usage=True처럼 마지막 청크에 usage
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage or None))
+
+
+# ─────────────────────────────────────────────────────────────
+# OpenAIEmbeddings
+# ─────────────────────────────────────────────────────────────
+class FixtureEmbeddings(Embeddings):
+    """OpenAIEmbeddings 대체 — 벡터는 float32 base64로 저장"""
+
+    def __init__(self, store: FixtureStore, latency: Dict[str, Latency], inner: Any = None,
+                 model: str = "text-embedding-ada-002"):
+        self.store = store
+        self.latency = latency
+        self.inner = inner
+        self.model = model
+
+    def _one(self, text: str, sleep: bool = True, model: Optional[str] = None) -> List[float]:
+        model = model or self.model
+        payload = {"model": model, "text": text}
+        if self.store.recording and self.inner is not None and model == self.model:
+            t0 = time.perf_counter()
+            vec = self.inner.embed_query(text)
+            self.store.put("embedding", payload, encode_vector(vec), (time.perf_counter() - t0) * 1000)
+            return vec
+        entry = self.store.get("embedding", payload)
+        if sleep:
+            self.latency["embedding"].sleep(entry.get("latency_ms") if entry else None)
+        return decode_vector(entry["response"]) if entry else synthetic_vector(f"{model}:{text}")
+
+    def embed_query(self, text: str) -> List[float]:
+        from scentpick.mas.tools.tracing import span
+        with span("embedding", self.model):
+            return self._one(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        from scentpick.mas.tools.tracing import span
+        with span("embedding", self.model, n=len(texts)):
+            if not (self.store.recording and self.inner is not None):
+                self.latency["embedding"].sleep()
+            return [self._one(t, sleep=False) for t in texts]
+
+
+# ─────────────────────────────────────────────────────────────
+# Pinecone
+# ─────────────────────────────────────────────────────────────
+def _to_plain(obj: Any) -> Any:
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    return json.loads(json.dumps(obj, default=lambda o: getattr(o, "__dict__", str(o))))
+
+
+class FixtureIndex:
+    def __init__(self, name: str, store: FixtureStore, latency: Dict[str, Latency], inner: Any = None):
+        self.name = name
+        self.store = store
+        self.latency = latency
+        self.inner = inner
+
+    def query(self, vector=None, top_k: int = 10, filter=None, include_metadata: bool = True,
+              namespace: str = "", **kwargs) -> Dict[str, Any]:
+        payload = {"index": self.name, "top_k": top_k, "filter": filter, "namespace": namespace,
+                   "vector": vector_key(vector), "include_metadata": include_metadata}
+        if self.store.recording and self.inner is not None:
+            t0 = time.perf_counter()
+            res = _to_plain(self.inner.query(vector=vector, top_k=top_k, filter=filter,
+                                             include_metadata=include_metadata, namespace=namespace, **kwargs))
+            self.store.put("pinecone", payload, res, (time.perf_counter() - t0) * 1000)
+            return res
+        entry = self.store.get("pinecone", payload)
+        self.latency["pinecone"].sleep(entry.get("latency_ms") if entry else None)
+        if entry is not None:
+            return copy.deepcopy(entry["response"])
+        return synthetic_matches(self.name, payload["vector"], top_k)
+
+    def fetch(self, ids=None, namespace: str = "", **kwargs) -> Dict[str, Any]:
+        if self.store.recording and self.inner is not None:
+            return _to_plain(self.inner.fetch(ids=ids, namespace=namespace, **kwargs))
+        self.latency["pinecone"].sleep()
+        return {"vectors": {str(i): {"id": str(i), "metadata": synthetic_perfume(int(i)) if str(i).isdigit() else {}}
+                            for i in (ids or [])}, "namespace": namespace}
+
+    def upsert(self, vectors=None, **kwargs) -> Dict[str, Any]:
+        # 벤치마크 중 실제 인덱스를 건드리지 않음
+        self.latency["pinecone"].sleep()
+        return {"upserted_count": len(vectors or [])}
+
+
+def make_pinecone_class(store: FixtureStore, latency: Dict[str, Latency], real_cls: Any = None):
+    """pinecone.Pinecone 대체 클래스 (Index(name) / Index(host=...) 모두 지원)"""
+
+    class FixturePinecone:
+        def __init__(self, *args, **kwargs):
+            self._real = real_cls(*args, **kwargs) if (store.recording and real_cls is not None) else None
+
+        def Index(self, name: Optional[str] = None, host: Optional[str] = None, **kwargs):
+            label = name or (host or "index").split("//")[-1].split(".")[0]
+            inner = self._real.Index(name=name, host=host, **kwargs) if self._real is not None else None
+            return FixtureIndex(label, store, latency, inner)
+
+    return FixturePinecone
+
+
+# ─────────────────────────────────────────────────────────────
+# openai SDK 직접 호출 (멀티모달 / 리뷰 임베딩 / ML 추천 임베딩)
+# ─────────────────────────────────────────────────────────────
+def _ns_usage(usage: Dict[str, int]) -> SimpleNamespace:
+    tin, tout = int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    return SimpleNamespace(prompt_tokens=tin, completion_tokens=tout, total_tokens=tin + tout)
+
+
+def _ns_completion(content: str, usage: Dict[str, int]) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+                           usage=_ns_usage(usage))
+
+
+def _ns_chunk(piece: Optional[str], usage: Optional[Dict[str, int]] = None) -> SimpleNamespace:
+    if piece is None:
+        return SimpleNamespace(choices=[], usage=_ns_usage(usage or {}))
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+
+
+class _SDKBackend:
+    def __init__(self, chat: FixtureChatModel, embeddings: FixtureEmbeddings, real_client: Any = None):
+        self.chat = chat
+        self.embeddings = embeddings
+        self.real = real_client
+
+    def complete(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Tuple[str, Dict[str, int], Optional[float], bool]:
+        payload = _message_payload(model, [(m.get("role"), m.get("content")) for m in messages])
+        store = self.chat.store
+        if store.recording and self.real is not None:
+            t0 = time.perf_counter()
+            res = self.real.chat.completions.create(model=model, messages=messages,
+                                                    **{k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")})
+            ms = (time.perf_counter() - t0) * 1000
+            u = getattr(res, "usage", None)
+            usage = {"input_tokens": getattr(u, "prompt_tokens", 0), "output_tokens": getattr(u, "completion_tokens", 0)}
+            content = res.choices[0].message.content
+            store.put("openai_chat", payload, {"content": content, "usage": usage}, ms)
+            return content, usage, ms, True
+        entry = store.get("openai_chat", payload)
+        if entry is not None:
+            return entry["response"]["content"], entry["response"].get("usage") or {}, entry.get("latency_ms"), False
+        content = self.chat.synth.reply([(r, c) for r, c in payload["messages"]])
+        if "free_text" in json.dumps(payload, ensure_ascii=False):
+            content = json.dumps({"free_text": "따뜻하고 차분한 무드", "day_night_score": "night",
+                                  "gender": "Unisex", "season_score": "fall"}, ensure_ascii=False)
+        return content, {"input_tokens": 800, "output_tokens": _approx_tokens(content)}, None, False
+
+    def embed(self, model: str, inputs: Any) -> SimpleNamespace:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        if self.embeddings.store.recording and self.real is not None:
+            t0 = time.perf_counter()
+            res = self.real.embeddings.create(model=model, input=inputs)
+            ms = (time.perf_counter() - t0) * 1000
+            for t, d in zip(texts, res.data):
+                self.embeddings.store.put("embedding", {"model": model, "text": t}, encode_vector(d.embedding), ms)
+            return res
+        self.embeddings.latency["embedding"].sleep()
+        vecs = [self.embeddings._one(t, sleep=False, model=model) for t in texts]
+        n = sum(_approx_tokens(t) for t in texts)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=v, index=i) for i, v in enumerate(vecs)],
+                               usage=SimpleNamespace(prompt_tokens=n, completion_tokens=0, total_tokens=n))
+
+
+def make_openai_classes(backend: _SDKBackend):
+    """openai.OpenAI / AsyncOpenAI 대체 클래스와 모듈 수준 openai.embeddings 대체 객체"""
+    lat = backend.chat.latency
+
+    class _Completions:
+        def create(self, model: str, messages, stream: bool = False, **kwargs):
+            content, usage, rec_ms, live = backend.complete(model, messages, **kwargs)
+            if not stream:
+                if not live:
+                    lat["llm.first_token"].sleep(rec_ms)
+                return _ns_completion(content, usage)
+
+            def gen():
+                if not live:
+                    lat["llm.first_token"].sleep(rec_ms)
+                for piece in _chunks(content):
+                    if not live:
+                        lat["llm.per_chunk"].sleep()
+                    yield _ns_chunk(piece)
+                if (kwargs.get("stream_options") or {}).get("include_usage"):
+                    yield _ns_chunk(None, usage)
+            return gen()
+
+    class _AsyncCompletions:
+        async def create(self, model: str, messages, stream: bool = False, **kwargs):
+            content, usage, rec_ms, live = await asyncio.to_thread(backend.complete, model, messages, **kwargs)
+            if not stream:
+                if not live:
+                    await lat["llm.first_token"].asleep(rec_ms)
+                return _ns_completion(content, usage)
+
+            async def agen():
+                if not live:
+                    await lat["llm.first_token"].asleep(rec_ms)
+                for piece in _chunks(content):
+                    if not live:
+                        await lat["llm.per_chunk"].asleep()
+                    yield _ns_chunk(piece)
+                if (kwargs.get("stream_options") or {}).get("include_usage"):
+                    yield _ns_chunk(None, usage)
+            return agen()
+
+    class _Embeddings:
+        def create(self, model: str, input, **kwargs):
+            return backend.embed(model, input)
+
+    class FixtureOpenAI:
+        def __init__(self, *args, **kwargs):
+            self.chat = SimpleNamespace(completions=_Completions())
+            self.embeddings = _Embeddings()
+
+    class FixtureAsyncOpenAI:
+        def __init__(self, *args, **kwargs):
+            self.chat = SimpleNamespace(completions=_AsyncCompletions())
+            self.embeddings = _Embeddings()
+
+    return FixtureOpenAI, FixtureAsyncOpenAI, _Embeddings()
+
+
+# ─────────────────────────────────────────────────────────────
+# 네이버 쇼핑 (requests.get)
+# ─────────────────────────────────────────────────────────────
+class _FakeResponse:
+    def __init__(self, data: Dict[str, Any], status_code: int = 200):
+        self._data = data
+        self.status_code = status_code
+
+    def json(self) -> Dict[str, Any]:
+        return copy.deepcopy(self._data)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+class FixtureRequests:
+    """tools_price 모듈의 requests 대체 — 네이버 쇼핑 URL만 가로채고 나머지는 실제 requests로"""
+
+    def __init__(self, store: FixtureStore, latency: Dict[str, Latency], real: Any):
+        self.store = store
+        self.latency = latency
+        self._real = real
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._real, attr)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        if not url.startswith(NAVER_SHOP_URL):
+            return self._real.get(url, params=params, **kwargs)
+        params = dict(params or {})
+        payload = {"query": params.get("query"), "display": int(params.get("display") or 10), "sort": params.get("sort")}
+        if self.store.recording:
+            t0 = time.perf_counter()
+            r = self._real.get(url, params=params, **kwargs)
+            r.raise_for_status()
+            data = r.json()
+            self.store.put("naver", payload, data, (time.perf_counter() - t0) * 1000)
+            return _FakeResponse(data)
+        entry = self.store.get("naver", payload)
+        self.latency["naver"].sleep(entry.get("latency_ms") if entry else None)
+        if entry is not None:
+            return _FakeResponse(entry["response"])
+        return _FakeResponse(synthetic_naver_items(payload["query"] or "", payload["display"]))
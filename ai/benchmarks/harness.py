@@ -0,0 +1,150 @@
+# benchmarks/harness.py
+# 벤치마크 환경 준비: 가짜 업스트림 설치 → 그래프/FastAPI 앱 로드 → 벤치마크 전용 SQLite DB
+# - install()은 scentpick 모듈이 import되기 전에 불러야 함 (노드들이 import 시점에 llm/클라이언트를 잡아둠)
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .fakes import (
+    FixtureChatModel, FixtureEmbeddings, FixtureRequests, FixtureStore, SyntheticResponder, _SDKBackend,
+    load_profile, make_openai_classes, make_pinecone_class,
+)
+
+# 라우터가 쓰는 테이블만 (MySQL 스키마의 부분집합)
+BENCH_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS conversations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, title TEXT, external_thread_id TEXT,
+        started_at TIMESTAMP, updated_at TIMESTAMP)""",
+    """CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id INTEGER, role TEXT, content TEXT,
+        model TEXT, chat_image TEXT, created_at TIMESTAMP)""",
+    """CREATE TABLE IF NOT EXISTS rec_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, parsed_slots TEXT, agent TEXT, model_version TEXT,
+        created_at TIMESTAMP, conversation_id INTEGER, request_msg_id INTEGER, user_id INTEGER, query_text TEXT)""",
+    """CREATE TABLE IF NOT EXISTS rec_candidates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, `rank` INTEGER, score REAL, reason_summary TEXT,
+        reason_detail TEXT, retrieved_from TEXT, perfume_id INTEGER, run_rec_id INTEGER)""",
+)
+
+
+@dataclass
+class Bench:
+    store: FixtureStore
+    latency: Dict[str, Any]
+    graph_app: Any
+    _fastapi_app: Any = None
+
+    def fastapi_app(self) -> Any:
+        """main.app + get_db를 벤치마크용 SQLite로 교체 (MySQL 불필요)"""
+        if self._fastapi_app is None:
+            from sqlalchemy import create_engine, text
+            from sqlalchemy.orm import sessionmaker
+            from main import app
+            from scentpick.routers import chatbot
+
+            # SQLite는 쓰기 트랜잭션이 DB 전체를 잠그므로(MySQL은 행 단위) 요청이 그래프 실행 내내
+            # 트랜잭션을 잡고 있으면 동시 요청이 직렬화됨 → AUTOCOMMIT으로 문장 단위 커밋
+            path = os.path.join(tempfile.mkdtemp(prefix="scentpick-bench-"), "bench.db")
+            engine = create_engine(f"sqlite:///{path}", isolation_level="AUTOCOMMIT",
+                                   connect_args={"check_same_thread": False, "timeout": 30})
+            with engine.begin() as conn:
+                for ddl in BENCH_SCHEMA:
+                    conn.execute(text(ddl))
+            Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+            def get_db():
+                db = Session()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[chatbot.get_db] = get_db
+            self._fastapi_app = app
+        return self._fastapi_app
+
+    def clear_caches(self) -> None:
+        """패스 사이 in-process 캐시 초기화 (llm_cache 등록분 + 등록 여부와 무관하게 직접 비울 것들)"""
+        from scentpick.mas.nodes.rec_echo_node import POLISH_CACHE
+        from scentpick.mas.tools.image_utils import VISION_ANALYSIS_CACHE
+        from scentpick.mas.tools.llm_cache import invalidate_llm_caches
+        from scentpick.mas.tools.state_compact import CATALOG_CACHE
+        from scentpick.mas.tools.tools_price import NAVER_CACHE
+        from scentpick.mas.tools.turn_cache import TURN_CACHE
+        # 파서/라우팅/FAQ/턴 (llm_cache에 등록된 것)
+        invalidate_llm_caches()
+        for cache in (NAVER_CACHE, TURN_CACHE, POLISH_CACHE, VISION_ANALYSIS_CACHE, CATALOG_CACHE):
+            cache.clear()
+
+
+def install(mode: str = "replay", fixtures_dir: Optional[str] = None, profile: str = "default",
+            latency_scale: float = 1.0, routes: Optional[Dict[str, str]] = None) -> Bench:
+    """
+    mode=record 이면 실제 키(OPENAI_API_KEY / PINECONE_API_KEY / NAVER_*)로 호출하며 fixture 저장,
+    replay/synthetic 이면 네트워크 호출 없음
+    """
+    if "scentpick.mas.config" in sys.modules:
+        raise RuntimeError("benchmarks.harness.install()은 scentpick 모듈 import 전에 호출해야 합니다")
+    recording = mode == "record"
+    if not recording:
+        for k in ("OPENAI_API_KEY", "PINECONE_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET"):
+            os.environ.setdefault(k, "bench")
+
+    store = FixtureStore(fixtures_dir, mode)
+    latency = load_profile(profile, scale=latency_scale)
+
+    import openai
+    import pinecone
+    import requests
+
+    pinecone.Pinecone = make_pinecone_class(store, latency, pinecone.Pinecone)
+    real_openai = openai.OpenAI() if recording else None
+
+    # config는 실제 객체를 만들되(record 모드의 inner) 노드가 import하기 전에 가짜로 바꿔 끼움
+    from scentpick.mas import config
+    from scentpick.mas.tools.tracing import LLMTracingCallback
+    if recording:
+        config.llm.callbacks = None   # 토큰/시간은 바깥 FixtureChatModel 콜백에서만 기록
+    chat = FixtureChatModel(
+        store=store,
+        synth=SyntheticResponder(routes),
+        latency=latency,
+        inner=config.llm if recording else None,
+        model_name=config.MODEL_NAME,
+        callbacks=[LLMTracingCallback()],
+    )
+    emb = FixtureEmbeddings(store, latency, inner=config.embeddings if recording else None,
+                            model="text-embedding-ada-002")
+    config.llm = chat
+    config.embeddings = emb
+
+    sdk_cls, sdk_async_cls, sdk_embeddings = make_openai_classes(_SDKBackend(chat, emb, real_openai))
+    openai.OpenAI = sdk_cls
+    openai.AsyncOpenAI = sdk_async_cls
+    openai.embeddings = sdk_embeddings
+
+    from scentpick.mas.tools import tools_price
+    tools_price.requests = FixtureRequests(store, latency, requests)
+
+    from scentpick.mas.perfume_chatbot import app as graph_app
+    return Bench(store=store, latency=latency, graph_app=graph_app)
+
+
+def serve(app: Any, host: str = "127.0.0.1") -> Tuple[str, Any]:
+    """uvicorn을 백그라운드 스레드로 띄우고 (base_url, server) 반환 — server.should_exit = True로 종료"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning", lifespan="off"))
+    t = threading.Thread(target=server.run, name="bench-uvicorn", daemon=True)
+    t.start()
+    deadline = time.time() + 15
+    while not server.started:
+        if time.time() > deadline or not t.is_alive():
+            raise RuntimeError("uvicorn 서버 시작 실패")
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return f"http://{host}:{port}", server
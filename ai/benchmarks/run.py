@@ -0,0 +1,364 @@
+# benchmarks/run.py
+# 오프라인 벤치마크 드라이버
+#   python -m benchmarks.run run --target graph,chat,stream --concurrency 8 --repeat 3 --out bench.json
+#   python -m benchmarks.run compare base.json bench.json --threshold 0.1
+# - corpus의 각 항목 = 새 대화 1개 (setup 턴은 측정 제외, 마지막 query만 측정)
+# - graph  : graph_app.invoke 직접 (턴 트레이스로 노드별 시간까지 집계)
+# - chat   : POST /chatbot/chat        (TTFB = 응답 본문 첫 바이트)
+# - stream : POST /chatbot/chat/stream (TTFB = 첫 content 이벤트)
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(HERE, "corpus.jsonl")
+DEFAULT_FIXTURES = os.path.join(HERE, "fixtures")
+TARGETS = ("graph", "chat", "stream")
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                out.append(json.loads(line))
+    return out
+
+
+def corpus_routes(corpus: List[Dict[str, Any]]) -> Dict[str, str]:
+    """합성 supervisor 응답용 질의 → 에이전트"""
+    routes = {}
+    for e in corpus:
+        for s in e.get("setup") or []:
+            routes[s["query"]] = s.get("agent", "LLM_parser")
+        routes[e["query"]] = e.get("agent", "FAQ_agent")
+    return routes
+
+
+# ─────────────────────────────────────────────────────────────
+# 통계
+# ─────────────────────────────────────────────────────────────
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 백분위수 (numpy 기본과 동일)"""
+    if not values:
+        return None
+    xs = sorted(values)
+    pos = (len(xs) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(xs) - 1)
+    return round(xs[lo] + (xs[hi] - xs[lo]) * (pos - lo), 1)
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    return {
+        "n": len(values),
+        "mean": round(sum(values) / len(values), 1) if values else None,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": round(max(values), 1) if values else None,
+    }
+
+
+def report(samples: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    ok = [s for s in samples if s["ok"]]
+    by_agent: Dict[str, List[float]] = {}
+    by_node: Dict[str, List[float]] = {}
+    calls: Dict[str, Dict[str, float]] = {}
+    tokens = {"in": 0, "out": 0}
+    for s in ok:
+        by_agent.setdefault(s["agent"] or "unknown", []).append(s["ms"])
+        for n in s.get("nodes") or []:
+            by_node.setdefault(n["name"], []).append(n["ms"])
+        for k, c in (s.get("calls") or {}).items():
+            agg = calls.setdefault(k, {"n": 0, "ms": 0.0})
+            agg["n"] += c["n"]
+            agg["ms"] = round(agg["ms"] + c["ms"], 1)
+        for k in tokens:
+            tokens[k] += (s.get("tokens") or {}).get(k, 0)
+    ttfb = [s["ttfb_ms"] for s in ok if s.get("ttfb_ms") is not None]
+    ckpt = [s["checkpoint"] for s in ok if s.get("checkpoint")]
+    return {
+        "overall": {
+            **summarize([s["ms"] for s in ok]),
+            "errors": len(samples) - len(ok),
+            "throughput_rps": round(len(ok) / wall_s, 2) if wall_s > 0 else None,
+            "wall_s": round(wall_s, 2),
+            **({"ttfb": summarize(ttfb)} if ttfb else {}),
+        },
+        "per_agent": {a: summarize(v) for a, v in sorted(by_agent.items())},
+        **({"per_node": {n: summarize(v) for n, v in sorted(by_node.items())}} if by_node else {}),
+        **({"calls": calls, "tokens": tokens} if calls else {}),
+        **({"checkpoint": {"bytes": summarize([c["bytes"] for c in ckpt]),
+                           "ser_us": summarize([c["ser_us"] for c in ckpt])}} if ckpt else {}),
+        "routing_mismatch": sum(1 for s in ok if s.get("expected") and s["agent"] != s["expected"]),
+        "error_samples": [{"id": s["id"], "error": s["error"]} for s in samples if not s["ok"]][:10],
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 실행기
+# ─────────────────────────────────────────────────────────────
+def _graph_runner(bench) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    from langchain_core.messages import HumanMessage
+    from scentpick.mas.tools.tracing import turn_scope
+
+    def invoke(query: str, thread_id: str, image_url: Optional[str]):
+        state = {"messages": [HumanMessage(content=query)], "next": None, "router_json": None, "image_url": image_url}
+        return bench.graph_app.invoke(state, config={"configurable": {"thread_id": thread_id}})
+
+    def checkpoint_size(thread_id: str) -> Optional[Dict[str, Any]]:
+        # 턴 종료 시점 체크포인트의 직렬화 크기/시간 (checkpointer가 턴마다 하는 일)
+        saver = bench.graph_app.checkpointer
+        tup = saver.get_tuple({"configurable": {"thread_id": thread_id}})
+        if tup is None:
+            return None
+        t0 = time.perf_counter()
+        _, blob = saver.serde.dumps_typed(tup.checkpoint)
+        return {"bytes": len(blob), "ser_us": (time.perf_counter() - t0) * 1e6}
+
+    def run(entry: Dict[str, Any]) -> Dict[str, Any]:
+        thread_id = f"bench-{uuid.uuid4().hex[:12]}"
+        for s in entry.get("setup") or []:
+            invoke(s["query"], thread_id, s.get("image_url"))
+        t0 = time.perf_counter()
+        with turn_scope(thread_id=thread_id) as turn:
+            invoke(entry["query"], thread_id, entry.get("image_url"))
+        ms = (time.perf_counter() - t0) * 1000
+        trace = turn.summary()
+        agents = [n["name"] for n in trace["nodes"] if n["name"] != "supervisor"]
+        return {"ms": ms, "ttfb_ms": None, "agent": agents[-1] if agents else "supervisor",
+                "nodes": trace["nodes"], "calls": trace["calls"], "tokens": trace["tokens"],
+                "checkpoint": checkpoint_size(thread_id)}
+    return run
+
+
+def _http_runner(base_url: str, stream: bool, token: Optional[str]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    import httpx
+
+    headers = {"X-Service-Token": token} if token else {}
+    path = "/chatbot/chat/stream" if stream else "/chatbot/chat"
+    client = httpx.Client(base_url=base_url, headers=headers, timeout=120)
+
+    def post(query: str, conv_id: Optional[int], image_url: Optional[str]) -> Dict[str, Any]:
+        body = {"user_id": 1, "query": query, "conversation_id": conv_id, "image_url": image_url, "stream": stream}
+        t0 = time.perf_counter()
+        ttfb = None
+        out: Dict[str, Any] = {}
+        with client.stream("POST", path, json=body) as r:
+            r.raise_for_status()
+            if not stream:
+                raw = b""
+                for part in r.iter_bytes():
+                    if ttfb is None:
+                        ttfb = (time.perf_counter() - t0) * 1000
+                    raw += part
+                out = json.loads(raw)
+            else:
+                for line in r.iter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    ev = json.loads(line[6:])
+                    if ev.get("error"):
+                        raise RuntimeError(ev["error"])
+                    if ev.get("content") and ttfb is None:
+                        ttfb = (time.perf_counter() - t0) * 1000
+                    if ev.get("done"):
+                        out = ev
+        out["_ms"] = (time.perf_counter() - t0) * 1000
+        out["_ttfb"] = ttfb
+        return out
+
+    def run(entry: Dict[str, Any]) -> Dict[str, Any]:
+        conv_id = None
+        for s in entry.get("setup") or []:
+            conv_id = post(s["query"], conv_id, s.get("image_url")).get("conversation_id", conv_id)
+        out = post(entry["query"], conv_id, entry.get("image_url"))
+        # 엔드포인트 응답엔 라우팅 결과가 없으므로 corpus 라벨로 집계
+        return {"ms": out["_ms"], "ttfb_ms": out["_ttfb"], "agent": entry.get("agent")}
+    return run
+
+
+def run_target(runner: Callable[[Dict[str, Any]], Dict[str, Any]], corpus: List[Dict[str, Any]],
+               concurrency: int, repeat: int, warmup: int, before_pass: Callable[[], None],
+               before_measure: Callable[[], None] = lambda: None) -> Dict[str, Any]:
+    def one(entry):
+        try:
+            r = runner(entry)
+            return {"id": entry["id"], "expected": entry.get("agent"), "ok": True, "error": None, **r}
+        except Exception as e:
+            return {"id": entry["id"], "expected": entry.get("agent"), "ok": False,
+                    "error": f"{type(e).__name__}: {e}"[:300], "ms": None, "agent": None}
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as ex:
+        for _ in range(warmup):
+            before_pass()
+            list(ex.map(one, corpus))
+        before_measure()
+        samples: List[Dict[str, Any]] = []
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            before_pass()
+            samples += list(ex.map(one, corpus))
+        wall = time.perf_counter() - t0
+    return report(samples, wall)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def cmd_run(args) -> Dict[str, Any]:
+    from .harness import install, serve
+
+    corpus = load_corpus(args.corpus)
+    if args.only:
+        corpus = [e for e in corpus if e.get("agent") in set(args.only.split(","))]
+    bench = install(mode=args.mode, fixtures_dir=args.fixtures, profile=args.profile,
+                    latency_scale=args.latency_scale, routes=corpus_routes(corpus))
+    before_pass = (lambda: None) if args.warm_caches else bench.clear_caches
+    from scentpick.mas.tools.speculation import SPECULATIVE_EXECUTION, get_speculation_stats, reset_speculation_stats
+
+    targets = [t.strip() for t in args.target.split(",") if t.strip()]
+    for t in targets:
+        if t not in TARGETS:
+            raise SystemExit(f"unknown target: {t} (choose from {', '.join(TARGETS)})")
+
+    results: Dict[str, Any] = {}
+    server = None
+    base_url = args.base_url
+    try:
+        for t in targets:
+            if t == "graph":
+                runner = _graph_runner(bench)
+            else:
+                if base_url is None:
+                    base_url, server = serve(bench.fastapi_app())
+                runner = _http_runner(base_url, stream=(t == "stream"), token=os.getenv("SERVICE_TOKEN"))
+            print(f"▶ {t}: {len(corpus)} queries × {args.repeat} (concurrency={args.concurrency})", file=sys.stderr)
+            results[t] = run_target(runner, corpus, args.concurrency, args.repeat, args.warmup, before_pass,
+                                    before_measure=reset_speculation_stats)
+            if SPECULATIVE_EXECUTION:
+                results[t]["speculation"] = get_speculation_stats()
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "mode": args.mode,
+            "profile": args.profile,
+            "latency_scale": args.latency_scale,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "corpus": os.path.relpath(args.corpus, HERE),
+            "n_queries": len(corpus),
+            "warm_caches": args.warm_caches,
+            "speculative": SPECULATIVE_EXECUTION,
+        },
+        "fixtures": bench.store.stats,
+        "targets": results,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 결과 비교
+# ─────────────────────────────────────────────────────────────
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """p95가 threshold(비율) 이상 느려진 항목 목록 (표는 stdout)"""
+    regressions = []
+    for k in ("mode", "profile", "latency_scale", "concurrency", "corpus"):
+        b, n = (base.get("meta") or {}).get(k), (new.get("meta") or {}).get(k)
+        if b != n:
+            print(f"⚠️ 실행 조건이 다름: {k} {b} → {n}")
+    print(f"{'target/agent':<32}{'metric':>8}{'base':>10}{'new':>10}{'Δ%':>9}")
+    for target, res in (new.get("targets") or {}).items():
+        b_res = (base.get("targets") or {}).get(target)
+        if not b_res:
+            continue
+        rows = [("overall", b_res["overall"], res["overall"])]
+        rows += [(a, b_res["per_agent"].get(a), s) for a, s in res["per_agent"].items()]
+        if "ttfb" in res["overall"] and "ttfb" in b_res["overall"]:
+            rows.append(("ttfb", b_res["overall"]["ttfb"], res["overall"]["ttfb"]))
+        for name, b, n in rows:
+            if not b:
+                continue
+            for metric in ("p50", "p95", "p99"):
+                bv, nv = b.get(metric), n.get(metric)
+                if not bv or nv is None:
+                    continue
+                delta = (nv - bv) / bv
+                flag = " ⚠️" if metric == "p95" and delta > threshold else ""
+                print(f"{target + '/' + name:<32}{metric:>8}{bv:>10.1f}{nv:>10.1f}{delta * 100:>8.1f}%{flag}")
+                if flag:
+                    regressions.append(f"{target}/{name} p95 {bv:.0f}→{nv:.0f}ms")
+        b_rps, n_rps = b_res["overall"].get("throughput_rps"), res["overall"].get("throughput_rps")
+        if b_rps and n_rps:
+            print(f"{target + '/throughput':<32}{'rps':>8}{b_rps:>10.2f}{n_rps:>10.2f}{(n_rps - b_rps) / b_rps * 100:>8.1f}%")
+    return regressions
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("run")
+    p.add_argument("--target", default="graph", help="graph,chat,stream 중 쉼표로 여러 개")
+    p.add_argument("--mode", default="replay", choices=("replay", "record", "synthetic"))
+    p.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    p.add_argument("--profile", default="default", help="fakes.PROFILES 이름 또는 {component: spec} JSON 경로")
+    p.add_argument("--latency-scale", type=float, default=1.0)
+    p.add_argument("--corpus", default=DEFAULT_CORPUS)
+    p.add_argument("--only", default=None, help="이 에이전트 라벨만 (쉼표 구분)")
+    p.add_argument("--concurrency", type=int, default=4)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--warmup", type=int, default=1)
+    p.add_argument("--warm-caches", action="store_true", help="패스마다 in-process 캐시를 비우지 않음")
+    p.add_argument("--base-url", default=None, help="이미 떠 있는 서버로 보낼 때 (기본: 프로세스 내 uvicorn)")
+    p.add_argument("--out", default=None, help="결과 JSON 경로 (생략 시 stdout)")
+
+    p = sub.add_parser("compare")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.10, help="p95 회귀 허용 비율")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "compare":
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        if regressions:
+            print("\n❌ p95 회귀: " + ", ".join(regressions))
+            sys.exit(1)
+        return
+
+    result = cmd_run(args)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"📄 {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    _main()
@@ -4,9 +4,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from dotenv import load_dotenv
 from database import SessionLocal
+from scentpick.mas.tools.tracing import configure_logging
 
 # .env 파일 로드
 load_dotenv()
+# LOG_LEVEL / LOG_FORMAT(json|text)
+configure_logging()
 
 # app = FastAPI()
 app = FastAPI(title="Perfume Chat bot API") # yyh
@@ -14,6 +17,13 @@ app = FastAPI(title="Perfume Chat bot API") # yyh
 # 라우터 등록
 app.include_router(chatbot.router)
 
+# Prometheus 지표 (prometheus_client 설치 시에만)
+try:
+    from prometheus_client import make_asgi_app
+    app.mount("/metrics", make_asgi_app())
+except ImportError:
+    pass
+
 @app.get("/")
 def read_root():
     return {"msg": "Hi I'm fast api! + FastAPI updated and deployed!!"}
@@ -1,7 +1,8 @@
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from pinecone import Pinecone
+from .tools.tracing import LLMTracingCallback, TracedIndex, TracedOpenAIEmbeddings
 load_dotenv()
 # ---------- 0) Config ----------
 os.environ.setdefault("OPENAI_API_KEY", "PUT_YOUR_KEY_HERE")  # or set in env
@@ -12,9 +13,11 @@ naver_client_id = os.getenv("NAVER_CLIENT_ID")
 naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
 # Pinecone 초기화
 pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-index = pc.Index("perfume-vectordb2")
+index = TracedIndex(pc.Index("perfume-vectordb2"), "perfume-vectordb2")
 
-llm = ChatOpenAI(model=MODEL_NAME, temperature=0, streaming=True)
-embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+# stream_usage=True: 스트리밍 모드에서도 토큰 사용량을 받아 트레이싱에 기록
+llm = ChatOpenAI(model=MODEL_NAME, temperature=0, streaming=True, stream_usage=True,
+                 callbacks=[LLMTracingCallback()])
+embeddings = TracedOpenAIEmbeddings(model="text-embedding-ada-002")
 
 service_token = os.getenv("SERVICE_TOKEN")
@@ -1,7 +1,21 @@
-from ..config import llm
+from ..config import llm, embeddings
 from langchain_core.messages import HumanMessage, AIMessage
 from ..state import AgentState
 from ..prompts.faq_prompt import faq_prompt
+from ..tools.faq_cache import FAQ_CACHE_ENABLED, faq_lookup, faq_store
+from ..tools.speculation import register_prefix, take_speculation
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _embed_question(user_query: str, checkpoint=lambda: None) -> dict:
+    """FAQ 캐시 조회용 질의 임베딩 (추측 실행 앞단)"""
+    return {"vector": embeddings.embed_query(user_query)}
+
+# 캐시를 끄면 임베딩을 쓰지 않으므로 추측 실행도 하지 않음
+if FAQ_CACHE_ENABLED:
+    register_prefix("FAQ_agent", _embed_question)
 
 def FAQ_agent_node(state: AgentState) -> AgentState:
     """FAQ agent - LLM 기본 지식으로 향수 관련 질문 답변"""
@@ -13,10 +27,28 @@ def FAQ_agent_node(state: AgentState) -> AgentState:
             break
 
     try:
-        print(f"🔍 FAQ_agent 실행: {user_query}")
-        chain = faq_prompt | llm
-        ai = chain.invoke({"question": user_query})
-        body = getattr(ai, "content", str(ai))
+        logger.info(f"🔍 FAQ_agent 실행: {user_query}")
+
+        # 의미 기반 캐시 (비슷한 질문의 이전 답변 재사용). 캐시 장애는 답변 생성에 영향 없음
+        hit, body, vector = False, None, None
+        try:
+            pre = take_speculation("FAQ_agent", state)
+            embed = (lambda _q: pre["vector"]) if pre else embeddings.embed_query
+            hit, body, vector = faq_lookup(user_query, embed)
+        except Exception as e:
+            logger.warning(f"⚠️ FAQ 캐시 조회 실패: {e}")
+
+        if hit:
+            logger.info("⚡ FAQ 캐시 hit")
+        else:
+            t0 = time.perf_counter()
+            chain = faq_prompt | llm
+            ai = chain.invoke({"question": user_query})
+            body = getattr(ai, "content", str(ai))
+            try:
+                faq_store(user_query, body, vector, cost_ms=(time.perf_counter() - t0) * 1000)
+            except Exception as e:
+                logger.warning(f"⚠️ FAQ 캐시 저장 실패: {e}")
 
         final_answer = f"💬 답변 결과:\n{body}"
 
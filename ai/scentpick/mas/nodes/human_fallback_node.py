@@ -1,5 +1,8 @@
 from langchain_core.messages import HumanMessage, AIMessage
 from ..state import AgentState
+import logging
+
+logger = logging.getLogger(__name__)
 
 def human_fallback_node(state: AgentState) -> AgentState:
     """향수 관련 복잡한 질문에 대한 기본 응답"""
@@ -11,7 +14,7 @@ def human_fallback_node(state: AgentState) -> AgentState:
     if not user_query:
         user_query = "(empty)"
     
-    print(f"🔍 human_fallback 실행: {user_query}")
+    logger.info(f"🔍 human_fallback 실행: {user_query}")
     fallback_response = (
         f"💬 ScentPick 챗봇은 향수에 관한 질문에 답변하는 전용 챗봇입니다.\n"
         f"❓ '{user_query}' 해당 질문은 향수와 직접 관련이 없어 답변드리기 어려워요.\n"
@@ -1,13 +1,18 @@
 from langchain_core.messages import HumanMessage, AIMessage
 from ..state import AgentState
-from ..tools.tools_parsers import run_llm_parser
+from ..tools.tools_parsers import parse_query_slots
 from ..tools.tools_metafilters import apply_meta_filters
 from ..tools.tools_rag import query_pinecone, generate_response
 import json
 from ..config import llm, embeddings
 from ..tools.tools_price import price_tool
 from ..tools.vector_db_utils import build_item_queries_from_vectordb
+from ..tools.rec_reasons import attach_reasons
+from ..tools.speculation import register_prefix, take_speculation
 from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 def _to_int_ml(v):
     try:
@@ -40,6 +45,30 @@ def _extract_candidates(search_results: dict, preferred_size=None, top_n=5):
     items = [it for it in items if it.get("name")]
     return items[:top_n]
 
+def _retrieve(user_query: str, checkpoint=lambda: None) -> dict:
+    """슬롯 파싱 → 메타필터 → 쿼리 벡터화 → Pinecone 검색 (부작용 없음: 추측 실행 앞단으로도 사용)"""
+    # 1) 슬롯 파싱 (룰 우선, 필요할 때만 LLM)
+    parsed_json = parse_query_slots(user_query)
+    logger.debug(f"🔧 parse_query_slots 결과: {json.dumps(parsed_json, ensure_ascii=False)}")
+
+    # 2) 메타필터
+    filtered_json = apply_meta_filters(parsed_json)
+    logger.debug(f"🔧 apply_meta_filters 결과: {json.dumps(filtered_json, ensure_ascii=False)}")
+    checkpoint()
+
+    # 3) 쿼리 벡터화
+    query_vector = embeddings.embed_query(user_query)
+    checkpoint()
+
+    # 4) Pinecone 검색
+    n_recs = int(parsed_json.get("recommendation_count") or 3)  # 기본값 3
+    search_results = query_pinecone(query_vector, filtered_json, top_k=n_recs)
+    if hasattr(search_results, "to_dict"):
+        search_results = search_results.to_dict()
+    return {"parsed_json": parsed_json, "filtered_json": filtered_json, "search_results": search_results}
+
+register_prefix("LLM_parser", _retrieve)
+
 def LLM_parser_node(state: AgentState) -> AgentState:
     """RAG 파이프라인 + (있다면) 가격 검색, 그리고 rec_history 누적"""
     # 0) 최신 사용자 메시지
@@ -50,36 +79,17 @@ def LLM_parser_node(state: AgentState) -> AgentState:
             break
 
     try:
-        print(f"🔍 LLM_parser 실행: {user_query}")
-
-        # 1) LLM 파싱
-        print(f"🔧 run_llm_parser 호출")
-        parsed_json = run_llm_parser(user_query)
-        print(f"🔧 run_llm_parser 결과")
-        print(f"{json.dumps(parsed_json, ensure_ascii=False)}")
-
-        # 2) 메타필터
-        print(f"🔧 apply_meta_filters 호출")
-        filtered_json = apply_meta_filters(parsed_json)
-        print(f"🔧 apply_meta_filters 결과")
-        print(f"{json.dumps(filtered_json, ensure_ascii=False)}")
-
-        # 3) 쿼리 벡터화
-        print(f"쿼리 벡터화")
-        query_vector = embeddings.embed_query(user_query)
-        
-
-        # 4) Pinecone 검색
-        print(f"pinecone 검색")
+        logger.info(f"🔍 LLM_parser 실행: {user_query}")
+
+        # 1)~4) 슬롯 파싱 + Pinecone 검색 (supervisor와 겹쳐 미리 돌려둔 결과가 있으면 그대로 사용)
+        pre = take_speculation("LLM_parser", state) or _retrieve(user_query)
+        parsed_json = pre["parsed_json"]
+        search_results = pre["search_results"]
         n_recs = int(parsed_json.get("recommendation_count") or 3)  # 기본값 3
-        search_results = query_pinecone(query_vector, filtered_json, top_k=n_recs)
-        if hasattr(search_results, "to_dict"):
-            search_results = search_results.to_dict()
-        print("Pinecone 검색 결과 (메타필터링 컬럼만)")
         matches = (search_results or {}).get("matches", [])
         if not matches:
-            print("결과 없음")
-        else:
+            logger.info("Pinecone 검색 결과 없음")
+        elif logger.isEnabledFor(logging.DEBUG):
             for i, m in enumerate(matches, 1):
                 meta = m.get("metadata", {}) or {}
                 brand = meta.get("brand", "정보없음")
@@ -90,23 +100,22 @@ def LLM_parser_node(state: AgentState) -> AgentState:
                 day_night = meta.get("day_night_score", "정보없음")
                 concentration = meta.get("concentration", "정보없음")
                 
-                print(f"{i}. brand={brand}, name={name}, gender={gender}, size={sizes}ml, "
+                logger.debug(f"{i}. brand={brand}, name={name}, gender={gender}, size={sizes}ml, "
                     f"season={season}, day_night={day_night}, concentration={concentration}")
 
 
         # 4-1) 추천 후보 추출 (rec_echo용 표준 스키마)
         preferred_size = parsed_json.get("sizes")
         candidates = _extract_candidates(search_results, preferred_size=preferred_size, top_n=n_recs)
-        print("추천 후보 (정제된 candidates):")
         if not candidates:
-            print("결과 없음")
-        else:
+            logger.info("추천 후보 없음")
+        elif logger.isEnabledFor(logging.DEBUG):
             for i, it in enumerate(candidates, 1):
                 brand = it.get("brand", "정보없음")
                 name  = it.get("name", "정보없음")
                 size  = it.get("size", "정보없음")
                 url   = it.get("detail_url") or ""
-                print(f"{i}. {brand} - {name} ({size}ml) {url}")
+                logger.debug(f"{i}. {brand} - {name} ({size}ml) {url}")
 
         # 최종 응답용 문자열
         final_response_lines = []
@@ -144,7 +153,7 @@ def LLM_parser_node(state: AgentState) -> AgentState:
                             price_sections.append(f"**{label}**\n{res}")
                             break
                     except Exception as e:
-                        print(f"❌ 가격 검색 오류({q}): {e}")
+                        logger.warning(f"❌ 가격 검색 오류({q}): {e}")
 
             if price_sections:
                 final_response_with_price = f"""{final_response}
@@ -181,7 +190,7 @@ def LLM_parser_node(state: AgentState) -> AgentState:
         entry = {
             "ts": datetime.now(timezone.utc).isoformat(),
             "source": "LLM_parser",
-            "items": candidates,  # ← rec_echo가 그대로 읽음
+            "items": attach_reasons(candidates, final_response),  # ← rec_echo가 그대로 읽음 (+ 한 줄 이유)
         }
 
         return {
@@ -195,7 +204,7 @@ def LLM_parser_node(state: AgentState) -> AgentState:
 
     except Exception as e:
         error_msg = f"[LLM_parser] RAG 파이프라인 실행 중 오류: {e}"
-        print(f"❌ LLM_parser 전체 오류: {e}")
+        logger.error(f"❌ LLM_parser 전체 오류: {e}", exc_info=True)
         return {
             "messages": [AIMessage(content=error_msg)],
             "parsed_slots": {},
@@ -2,9 +2,18 @@
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from ..state import AgentState
 from ..tools.utils import get_prev_user_utterance
+from ..tools.extractive_summary import summarize_turn, is_complex_turn
 from ..config import llm
 from ..prompts.memory_echo_prompt import MEMORY_ECHO_SYSTEM_PROMPT
+import os
+import logging
+import time
 
+logger = logging.getLogger(__name__)
+
+# auto: 로컬 추출 요약, 길거나 복잡한 턴만 LLM / local: 항상 로컬 / llm: 기존처럼 항상 LLM
+MEMORY_ECHO_MODE = os.getenv("MEMORY_ECHO_MODE", "auto")
+MEMORY_ECHO_LOCAL_MAX_CHARS = int(os.getenv("MEMORY_ECHO_LOCAL_MAX_CHARS", "1500"))
 
 
 def _get_last_ai_before_current_turn(state: AgentState):
@@ -23,17 +32,7 @@ def _get_last_ai_before_current_turn(state: AgentState):
     return None
 
 
-def memory_echo_node(state: AgentState) -> AgentState:
-    prev = get_prev_user_utterance(state.get("messages", []))
-    if not prev:
-        ans = (
-            "방금 직전의 질문을 아직 찾지 못했어요.\n"
-            "조금만 더 대화를 이어가시면 최근 질문을 요약해서 바로 알려드릴게요!"
-        )
-        return {"messages": [AIMessage(content=ans)], "final_answer": ans, "last_agent": "memory_echo"}
-
-    last_ai = _get_last_ai_before_current_turn(state)
-
+def _summarize_with_llm(prev: str, last_ai):
     # ✅ 시스템 프롬프트는 분리 파일에서 가져옴
     sys = SystemMessage(content=MEMORY_ECHO_SYSTEM_PROMPT)
 
@@ -45,7 +44,34 @@ def memory_echo_node(state: AgentState) -> AgentState:
     ))
 
     out = llm.invoke([sys, user])
-    summary = (getattr(out, "content", "") or "").strip()
+    return (getattr(out, "content", "") or "").strip()
+
+
+def memory_echo_node(state: AgentState) -> AgentState:
+    prev = get_prev_user_utterance(state.get("messages", []))
+    if not prev:
+        ans = (
+            "방금 직전의 질문을 아직 찾지 못했어요.\n"
+            "조금만 더 대화를 이어가시면 최근 질문을 요약해서 바로 알려드릴게요!"
+        )
+        return {"messages": [AIMessage(content=ans)], "final_answer": ans, "last_agent": "memory_echo"}
+
+    last_ai = _get_last_ai_before_current_turn(state)
+
+    t0 = time.perf_counter()
+    summary = None
+    use_llm = MEMORY_ECHO_MODE == "llm" or (
+        MEMORY_ECHO_MODE == "auto" and is_complex_turn(prev, last_ai, MEMORY_ECHO_LOCAL_MAX_CHARS)
+    )
+    if not use_llm:
+        try:
+            summary = summarize_turn(prev, last_ai)
+        except Exception as e:
+            logger.warning(f"⚠️ memory_echo 로컬 요약 실패, LLM으로 대체: {e}")
+    if not summary:
+        summary = _summarize_with_llm(prev, last_ai)
+        use_llm = True
+    logger.info(f"📝 memory_echo 요약 ({'llm' if use_llm else 'local'}): {(time.perf_counter() - t0) * 1000:.1f}ms")
 
     # 최종 출력(원문 인용은 살짝, 사용자 친화적 이모지 유지)
     final = f"{summary}\n\n🗣️ 원문 질문: {prev}"
@@ -4,10 +4,15 @@ from ..state import AgentState
 import json
 from ..prompts.ML_agent_prompt import ML_agent_system_prompt
 from ..tools.tools_recommend import recommend_perfume_vdb   # Pinecone VDB 기반 추천 도구
-from ..tools.tools_parsers import run_llm_parser
+from ..tools.tools_parsers import parse_query_slots
+from ..tools.rec_reasons import attach_reasons
+from ..tools.speculation import register_prefix, take_speculation
 from ..config import llm
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 def _to_int_ml(v) -> Optional[int]:
     try:
@@ -79,6 +84,30 @@ def _extract_brand_from_query(query: str) -> Optional[str]:
             return b
     return None
 
+def _recommend(user_query: str, checkpoint=lambda: None) -> Dict[str, Any]:
+    """슬롯 파싱 → VDB 기반 추천 (부작용 없음: 추측 실행 앞단으로도 사용)"""
+    parsed_json = parse_query_slots(user_query)
+    brand = parsed_json.get("brand")
+    n_recs = int(parsed_json.get("recommendation_count") or 3)  # 기본값 3
+
+    params = {
+        "user_text": user_query,
+        "topk_labels": 3,
+        "top_n_perfumes": n_recs,
+        "use_thresholds": True,
+        "alpha_labels": 0.8,
+        "index_name": "perfume-vectordb2",
+    }
+
+    if brand:
+        params["metadata_filter"] = {"brand": brand}
+    checkpoint()
+
+    ml_result = recommend_perfume_vdb.invoke(params)
+    return {"n_recs": n_recs, "ml_result": ml_result}
+
+register_prefix("ML_agent", _recommend)
+
 def ML_agent_node(state: AgentState) -> AgentState:
     """ML agent - Pinecone VDB를 통해 상위 N개 추천 후, LLM이 설명문 생성 (멀티턴/rec_history 누적)"""
     # 0) 최신 사용자 메시지
@@ -89,26 +118,12 @@ def ML_agent_node(state: AgentState) -> AgentState:
             break
 
     try:
-        print(f"🔍 ML_parser 실행: {user_query}")
-
-        parsed_json = run_llm_parser(user_query)
-        brand = parsed_json.get("brand")
-        n_recs = int(parsed_json.get("recommendation_count") or 3)  # 기본값 3
-
-        params = {
-            "user_text": user_query,
-            "topk_labels": 3,
-            "top_n_perfumes": n_recs,
-            "use_thresholds": True,
-            "alpha_labels": 0.8,
-            "index_name": "perfume-vectordb2",
-        }
-
-        if brand:
-            params["metadata_filter"] = {"brand": brand}
+        logger.info(f"🔍 ML_parser 실행: {user_query}")
 
-        # 1) VDB 기반 추천
-        ml_result = recommend_perfume_vdb.invoke(params)
+        # 1) VDB 기반 추천 (supervisor와 겹쳐 미리 돌려둔 결과가 있으면 그대로 사용)
+        pre = take_speculation("ML_agent", state) or _recommend(user_query)
+        n_recs = pre["n_recs"]
+        ml_result = pre["ml_result"]
 
         # 2) 후보 표준화 (rec_echo가 바로 읽을 수 있게)
         candidates = _extract_candidates_from_ml_result(ml_result, top_n=n_recs)
@@ -142,7 +157,7 @@ def ML_agent_node(state: AgentState) -> AgentState:
         entry = {
             "ts": datetime.now(timezone.utc).isoformat(),
             "source": "ML_agent",
-            "items": candidates,  # 표준 스키마
+            "items": attach_reasons(candidates, explanation),  # 표준 스키마 (+ 한 줄 이유)
         }
 
         # perfume_list: id, brand, name만 추출
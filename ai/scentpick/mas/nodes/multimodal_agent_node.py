@@ -2,14 +2,172 @@ from langchain_core.messages import AIMessage, HumanMessage
 from ..state import AgentState
 from ..tools.tools_rag import query_pinecone, generate_response
 from ..tools.tools_metafilters import apply_meta_filters
+from ..tools.image_utils import (
+    VISION_DETAIL, analyze_with_cache, prepare_vision_image_from_url, vision_cache_context,
+)
+from ..tools.stream_json import IncrementalJSONFields
+from ..tools.async_utils import run_coro_sync
+from ..tools.rec_reasons import attach_reasons
+from ..tools.tracing import record_openai_usage, span
 from ..config import llm, embeddings
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from datetime import datetime, timezone
+import asyncio
 import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
 
 client = OpenAI()
+aclient = AsyncOpenAI()
+
+# 스트리밍 분석 + 검색 겹치기 (0이면 기존 동기 호출)
+VISION_STREAMING = os.getenv("VISION_STREAMING", "1") not in ("0", "false", "False")
+VISION_TIMEOUT = float(os.getenv("VISION_TIMEOUT", "60"))
+FILTER_KEYS = ("day_night_score", "gender", "season_score")
+
+# free_text를 먼저 받아야 비전 응답이 끝나기 전에 임베딩을 시작할 수 있음
+# → 키 순서 고정 + 모르는 값도 null로 채워서 필터 확정 시점을 알 수 있게 함
+VISION_SYSTEM_PROMPT = """
+            Analyze the uploaded perfume-related image. 
+            Output STRICT JSON with the following keys, in this order:
+            - free_text (short natural language summary: mood, color impression, style, etc.)
+            - day_night_score (day or night)
+            - gender (Male, Female, Unisex)
+            - season_score (spring, summer, fall, winter)
+            Always include every key; use null when a value is not detectable.
+            """
+
+def _vision_messages(image_ref: str, query: str):
+    return [
+        {"role": "system", "content": VISION_SYSTEM_PROMPT},
+        {"role": "user", "content": [
+            {"type": "text", "text": query or "이 이미지에서 향수 추천에 도움이 되는 단서를 추출해줘."},
+            {"type": "image_url", "image_url": {"url": image_ref, "detail": VISION_DETAIL}}
+        ]}
+    ]
+
+def _analyze_image(image_ref: str, query: str):
+    """
+    GPT-4o-mini로 이미지 분석 (JSON 형식 강제)
+    Returns (analysis_json, JSON 파싱 성공 여부)
+    """
+    with span("llm", "gpt-4o-mini.vision"):
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_vision_messages(image_ref, query),
+            max_tokens=400,
+        )
+    record_openai_usage("gpt-4o-mini", getattr(response, "usage", None))
+
+    raw_analysis = response.choices[0].message.content
+
+    try:
+        return json.loads(raw_analysis), True
+    except Exception:
+        # JSON 파싱 실패 시 free_text에 전체 메시지 넣기
+        return {"free_text": raw_analysis}, False
+
+def _search(query_text: str, filtered_json: dict):
+    query_vector = embeddings.embed_query(query_text)
+    search_results = query_pinecone(query_vector, filtered_json, top_k=3)
+    if hasattr(search_results, "to_dict"):
+        search_results = search_results.to_dict()
+    return search_results
+
+async def _analyze_image_streaming(image_ref: str, query: str, timings: dict, t_start: float):
+    """
+    스트리밍 비전 분석 + 검색 겹치기
+    - free_text 완성 → 즉시 임베딩 시작
+    - 필터 키(day_night/gender/season) 모두 완성 → 임베딩 끝나는 대로 Pinecone 검색
+    - 스트림 종료 후 최종 JSON 기준으로 free_text/필터가 다르면 검색 결과는 버림(None)
+    Returns (analysis_json, JSON 파싱 성공 여부, search_results | None)
+    """
+    parser = IncrementalJSONFields()
+    parts = []
+    embed_text = None
+    embed_task = None
+    search_filter = None
+    search_task = None
+
+    def mark(name):
+        timings.setdefault(name, round((time.perf_counter() - t_start) * 1000))
+
+    async def search_after_embed(task, filtered):
+        vector = await task
+        result = await asyncio.to_thread(query_pinecone, vector, filtered, 3)
+        if hasattr(result, "to_dict"):
+            result = result.to_dict()
+        mark("retrieval_done")
+        return result
+
+    with span("llm", "gpt-4o-mini.vision"):
+        stream = await aclient.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_vision_messages(image_ref, query),
+            max_tokens=400,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                # include_usage: 마지막 청크는 choices 없이 usage만
+                record_openai_usage("gpt-4o-mini", getattr(chunk, "usage", None))
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            mark("vision_first_token")
+            parts.append(delta)
+            for key, value in parser.feed(delta):
+                if key == "free_text" and value and embed_task is None:
+                    mark("free_text")
+                    embed_text = str(value)
+                    embed_task = asyncio.create_task(asyncio.to_thread(embeddings.embed_query, embed_text))
+            if embed_task is not None and search_task is None and all(k in parser.fields for k in FILTER_KEYS):
+                mark("filters")
+                search_filter = apply_meta_filters({k: parser.fields.get(k) for k in FILTER_KEYS})
+                search_task = asyncio.create_task(search_after_embed(embed_task, search_filter))
+    mark("vision_done")
+
+    raw_analysis = "".join(parts)
+    try:
+        analysis_json, ok = json.loads(raw_analysis), True
+    except Exception:
+        if parser.state == "done":
+            # ```json 펜스 등으로 json.loads만 실패한 경우
+            analysis_json, ok = dict(parser.fields), True
+        else:
+            analysis_json, ok = {"free_text": raw_analysis}, False
+    if not isinstance(analysis_json, dict):
+        analysis_json, ok = {"free_text": raw_analysis}, False
+
+    search_results = None
+    if (
+        embed_task is not None
+        and (analysis_json.get("free_text") or query) == embed_text
+        and apply_meta_filters(analysis_json) == (search_filter or apply_meta_filters(parser.fields))
+    ):
+        if search_task is None:
+            # 필터 키가 일부 빠진 응답 → 스트림 끝난 시점에 확정
+            search_task = asyncio.create_task(search_after_embed(embed_task, apply_meta_filters(analysis_json)))
+        try:
+            search_results = await search_task
+        except Exception as e:
+            # 분석 결과는 살리고 검색만 호출측에서 다시
+            logger.warning(f"⚠️ 선행 검색 실패, 다시 검색: {e}")
+    elif embed_task is not None:
+        # 추측 검색은 버리고 호출측에서 다시 검색 (백그라운드 작업은 끝나는 대로 폐기)
+        for t in (embed_task, search_task):
+            if t is not None:
+                t.add_done_callback(lambda f: f.exception() if not f.cancelled() else None)
+    return analysis_json, ok, search_results
 
 def multimodal_agent_node(state: AgentState) -> AgentState:
+    t_start = time.perf_counter()
+    timings = {}
     img_url = state.get("image_url")
     if not img_url:
         return {"messages": [AIMessage(content="이미지를 첨부해주세요.")], "next": None}
@@ -25,54 +183,58 @@ def multimodal_agent_node(state: AgentState) -> AgentState:
             query = m.content or ""
             break
 
-    # 2) GPT-4o-mini로 이미지 분석 (JSON 형식 강제)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": """
-            Analyze the uploaded perfume-related image. 
-            Output STRICT JSON with the following keys if detectable:
-            - day_night_score (day or night)
-            - gender (Male, Female, Unisex)
-            - season_score (spring, summer, fall, winter)
-            - free_text (short natural language summary: mood, color impression, style, etc.)
-            """},
-            {"role": "user", "content": [
-                {"type": "text", "text": query or "이 이미지에서 향수 추천에 도움이 되는 단서를 추출해줘."},
-                {"type": "image_url", "image_url": {"url": img_url}}
-            ]}
-        ],
-        max_tokens=400,
-    )
+    # 2) 이미지 전처리 (1회 다운로드 → 축소/재인코딩 + perceptual hash)
+    prepared = None
+    try:
+        prepared = prepare_vision_image_from_url(img_url)
+    except Exception as e:
+        logger.warning(f"⚠️ 이미지 전처리 실패, 원본 URL로 분석: {e}")
 
-    raw_analysis = response.choices[0].message.content
+    # 3) 같은 질의 + 같은/거의 같은 이미지는 캐시된 분석 결과 재사용, 없으면 GPT-4o-mini 분석
+    #    스트리밍 분석 시 free_text/필터가 완성되는 대로 임베딩·검색을 먼저 시작
+    def analyze():
+        image_ref = prepared.data_url if prepared else img_url
+        analysis_json, ok, search_results = None, False, None
+        if VISION_STREAMING:
+            try:
+                analysis_json, ok, search_results = run_coro_sync(
+                    _analyze_image_streaming(image_ref, query, timings, t_start), timeout=VISION_TIMEOUT
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 스트리밍 이미지 분석 실패, 동기 호출로 재시도: {e}")
+                analysis_json, search_results = None, None
+        if analysis_json is None:
+            analysis_json, ok = _analyze_image(image_ref, query)
+        return analysis_json, ok, search_results
 
-    try:
-        analysis_json = json.loads(raw_analysis)
-    except Exception:
-        # JSON 파싱 실패 시 free_text에 전체 메시지 넣기
-        analysis_json = {"free_text": raw_analysis}
+    if prepared is not None:
+        context = vision_cache_context(query, VISION_SYSTEM_PROMPT, "gpt-4o-mini", VISION_DETAIL)
+        analysis_json, search_results, hit = analyze_with_cache(prepared.phash, context, analyze)
+        if hit:
+            timings["vision_cache_hit"] = 1
+    else:
+        analysis_json, _, search_results = analyze()
 
-    # 3) 메타필터 적용
+    # 4) 메타필터 적용
     filtered_json = apply_meta_filters(analysis_json)
 
-    print(f"🔍 multimodal_agent_node 이미지 분석 결과: {json.dumps(analysis_json, ensure_ascii=False)}")
+    logger.info(f"🔍 multimodal_agent_node 이미지 분석 결과: {json.dumps(analysis_json, ensure_ascii=False)}")
 
-    # 4) Pinecone 검색 (free_text는 벡터 검색, 나머지는 메타필터)
-    query_text = analysis_json.get("free_text", query)
-    query_vector = embeddings.embed_query(query_text)
-    search_results = query_pinecone(query_vector, filtered_json, top_k=3)
-    if hasattr(search_results, "to_dict"):
-        search_results = search_results.to_dict()
+    # 5) Pinecone 검색 (free_text는 벡터 검색, 나머지는 메타필터) — 스트리밍 중 이미 끝났으면 생략
+    if search_results is None:
+        # free_text는 null일 수 있음 (프롬프트가 허용) → 질의로 대신 검색
+        search_results = _search(analysis_json.get("free_text") or query, filtered_json)
+        timings.setdefault("retrieval_done", round((time.perf_counter() - t_start) * 1000))
+    logger.info(f"⏱️ multimodal_agent_node timings(ms): {timings}")
 
-    # 5) LLM으로 최종 추천 답변 생성
+    # 6) LLM으로 최종 추천 답변 생성
     final_response = generate_response(
         original_query=f"{query} + 이미지 분석: {json.dumps(analysis_json, ensure_ascii=False)}",
         search_results=search_results,
         limit=3
     )
 
-    # 6) perfume_list 정규화
+    # 7) perfume_list 정규화
     perfume_list = []
     for match in search_results.get("matches", []):
         meta = match.get("metadata", {}) or {}
@@ -91,11 +253,11 @@ def multimodal_agent_node(state: AgentState) -> AgentState:
                 "text": meta.get("text"),
             })
 
-    # 7) history entry (rec_echo 용)
+    # 8) history entry (rec_echo 용)
     entry = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "source": "multimodal_agent",
-        "items": search_results.get("matches", []),
+        "items": attach_reasons(search_results.get("matches", []), final_response),
     }
 
     return {
@@ -3,9 +3,31 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from ..state import AgentState
 from ..config import llm
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 import json
+import logging
+import os
+import threading
+import time
 from ..prompts.rec_echo_prompt import REC_ECHO_SUMMARY_SYSTEM_PROMPT
+from ..tools.cache_utils import TTLCache
+from ..tools.rec_reasons import item_brand_name
+
+logger = logging.getLogger(__name__)
+
+# 기본은 템플릿 렌더링(네트워크 호출 없음). 1이면 LLM 다듬기를 백그라운드로 돌려
+# 같은 추천 묶음(entry ts)을 다시 요청할 때 다듬어진 문장을 사용
+REC_ECHO_LLM_POLISH = os.getenv("REC_ECHO_LLM_POLISH", "0") in ("1", "true", "True")
+
+POLISH_CACHE = TTLCache(
+    "rec_echo_polish",
+    maxsize=int(os.getenv("REC_ECHO_POLISH_MAXSIZE", "1024")),
+    ttl=float(os.getenv("REC_ECHO_POLISH_TTL", str(24 * 3600))),
+)
+_POLISH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rec_echo_polish")
+_polish_inflight = set()
+_polish_lock = threading.Lock()
 
 def _to_int_ml(v):
     try:
@@ -34,15 +56,19 @@ def _get_last_ai_before_current_turn(state: AgentState) -> Optional[str]:
     return None
 
 def _fmt_item_line(it: Dict[str, Any], idx: int, highlight_idx: Optional[int]) -> str:
-    brand = (it.get("brand") or "").strip()
-    name  = (it.get("name")  or "").strip()
-    size  = it.get("size")
-    url   = it.get("detail_url") or it.get("url") or it.get("detailUrl")
+    # multimodal_agent는 Pinecone match(metadata 안에 필드)를 그대로 저장
+    meta = it.get("metadata") or {}
+    brand, name = item_brand_name(it)
+    size  = _to_int_ml(it.get("size") or meta.get("size") or meta.get("size_ml"))
+    url   = it.get("detail_url") or it.get("url") or it.get("detailUrl") or meta.get("detail_url") or meta.get("url")
+    reason = (it.get("reason") or "").strip()
 
     star = "⭐ " if (highlight_idx is not None and idx == highlight_idx) else ""
     base = f"{star}{idx}. {brand} {name}".strip()
     if size:
         base += f" {size}ml"
+    if reason:
+        base += f" — {reason}"
     if url:
         base += f" — {url}"
     return base
@@ -76,6 +102,30 @@ def _summarize_with_llm(items: List[Dict[str, Any]], last_ai: Optional[str], hig
     txt = txt.replace(" — 정보 없음", "").replace(" — N/A", "").replace(" — n/a", "")
     return txt
 
+def _polish_key(entry_ts: Optional[str], highlight_idx: Optional[int]):
+    return (entry_ts, highlight_idx)
+
+def _polish_in_background(key, items: List[Dict[str, Any]], last_ai: Optional[str], highlight_idx: Optional[int]) -> None:
+    """LLM 다듬기를 백그라운드로 예약 (같은 키는 한 번만)"""
+    with _polish_lock:
+        if key in _polish_inflight or key in POLISH_CACHE:
+            return
+        _polish_inflight.add(key)
+
+    def job():
+        t0 = time.perf_counter()
+        try:
+            txt = _summarize_with_llm(items, last_ai, highlight_idx)
+            if txt:
+                POLISH_CACHE.set(key, txt, cost_ms=(time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            logger.warning(f"⚠️ rec_echo LLM 다듬기 실패: {e}")
+        finally:
+            with _polish_lock:
+                _polish_inflight.discard(key)
+
+    _POLISH_EXECUTOR.submit(job)
+
 def rec_echo_node(state: AgentState) -> AgentState:
     # 0) followup 하이라이트 인덱스(선택)
     router = state.get("router_json") or {}
@@ -122,11 +172,19 @@ def rec_echo_node(state: AgentState) -> AgentState:
         )
         return {"messages": [AIMessage(content=ans)], "final_answer": ans, "last_agent": "rec_echo"}
 
-    # 4) (선택) 직전 어시스턴트 답변으로 각 항목 1줄 요약 생성
-    last_ai = _get_last_ai_before_current_turn(state)
-    pretty = _summarize_with_llm(items, last_ai, highlight_idx)
+    # 4) 템플릿 렌더링 (추천 시점에 저장한 reason 사용, 네트워크 호출 없음)
+    #    REC_ECHO_LLM_POLISH=1 이면 다듬어진 요약이 캐시에 있을 때만 사용하고, 없으면 백그라운드로 생성
+    pretty = None
+    if REC_ECHO_LLM_POLISH:
+        entry = fallback_entry or (history[-1] if history else None) or {}
+        entry_ts = entry.get("ts")
+        key = _polish_key(entry_ts, highlight_idx)
+        hit, polished = POLISH_CACHE.get(key)
+        if hit:
+            pretty = polished
+        elif entry_ts:
+            _polish_in_background(key, items, _get_last_ai_before_current_turn(state), highlight_idx)
     if not pretty:
-        # LLM 요약 실패 시 플레인 포맷
         pretty = _format_plain(items, highlight_idx)
 
     # 5) 헤더/추천 포커스
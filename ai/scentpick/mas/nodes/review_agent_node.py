@@ -1,6 +1,10 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from pinecone import Pinecone
@@ -11,7 +15,9 @@ from datetime import datetime, timezone
 from ..state import AgentState
 from ..config import llm
 from ..tools.price_parse import extract_budget_krw
-from ..tools.tools_price import price_tool  # LangChain Tool(.invoke)
+from ..tools.tools_price import price_tool, is_price_cached  # LangChain Tool(.invoke)
+from ..tools.speculation import register_prefix, take_speculation
+from ..tools.tracing import TracedIndex, record_openai_usage, run_in_turn, span
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +30,24 @@ pc = Pinecone(api_key=pinecone_api_key)
 REVIEW_INDEX_NAME = "review-vectordb"
 # 🔁 벡터DB2 사용
 PERFUME_INDEX_NAME = "perfume-vectordb2"
-review_index = pc.Index(REVIEW_INDEX_NAME)
-perfume_index = pc.Index(PERFUME_INDEX_NAME)
+review_index = TracedIndex(pc.Index(REVIEW_INDEX_NAME), REVIEW_INDEX_NAME)
+perfume_index = TracedIndex(pc.Index(PERFUME_INDEX_NAME), PERFUME_INDEX_NAME)
 
 # 🔽 유사도 임계값 (None이면 필터 미적용)
 MIN_SIMILARITY_THRESHOLD = None
 
+# 예산 내 후보가 이 개수만큼 모이면 아직 시작 안 한 가격 조회는 건너뜀
+REVIEW_TARGET_MATCHES = int(os.getenv("REVIEW_TARGET_MATCHES", "3"))
+# 예산 조건이 없을 때는 기존처럼 상위 5개를 보여줌
+REVIEW_NO_BUDGET_MATCHES = int(os.getenv("REVIEW_NO_BUDGET_MATCHES", "5"))
+# 후보 페이징: 한 번에 page_size개씩, 최대 max_candidates개까지 더 깊이 조회
+REVIEW_PAGE_SIZE = int(os.getenv("REVIEW_PAGE_SIZE", "5"))
+REVIEW_MAX_CANDIDATES = int(os.getenv("REVIEW_MAX_CANDIDATES", "25"))
+# 가격 확인 단계 전체 시간 예산(초) — 넘으면 그때까지 찾은 것으로 응답
+REVIEW_PRICE_LATENCY_BUDGET = float(os.getenv("REVIEW_PRICE_LATENCY_BUDGET", "4.0"))
+# 파싱/리뷰검색/가격조회 병렬 실행용 (노드 호출 간 공유)
+_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("REVIEW_MAX_WORKERS", "8")), thread_name_prefix="review")
+
 # ---------------------------
 # 헬퍼
 # ---------------------------
@@ -78,6 +96,16 @@ def _to_int_str(v: Any) -> Optional[str]:
     except Exception:
         return None
 
+def _to_int_ml(v: Any) -> Optional[int]:
+    """50, '50', '50ml', 50.0 -> 50. 실패 시 None."""
+    try:
+        if v is None: return None
+        if isinstance(v, (int, float)): return int(v)
+        s = str(v).lower().replace("ml", "").strip()
+        return int(float(s))
+    except Exception:
+        return None
+
 def _get_no_as_intstr(meta: dict) -> Optional[str]:
     """
     vectordb2 메타에서 내부 링크용 id로 쓸 'no'를 꺼내 정수문자열로 변환.
@@ -100,10 +128,21 @@ def _get_any_id(meta: dict, *keys) -> Optional[str]:
                 return s
     return None
 
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    """단계별 소요시간(ms) 기록"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+
 def get_openai_embedding(text: str) -> List[float]:
     """OpenAI 임베딩 모델로 텍스트 벡터화"""
     try:
-        resp = openai.embeddings.create(model="text-embedding-ada-002", input=text)
+        with span("embedding", "text-embedding-ada-002"):
+            resp = openai.embeddings.create(model="text-embedding-ada-002", input=text)
+        record_openai_usage("text-embedding-ada-002", getattr(resp, "usage", None))
         return resp.data[0].embedding
     except Exception as e:
         logger.error(f"[get_openai_embedding] Error: {e}", exc_info=True)
@@ -218,154 +257,258 @@ def analyze_rag_results(scent_description: str, rag_results: List[Dict]) -> Dict
         logger.error(f"[analyze_rag_results] Error: {e}", exc_info=True)
         return {"analyzed_scent": scent_description, "confidence": 0.0}
 
-def search_perfume_vectordb(analyzed_scent: str, top_k: int = 10) -> List[Dict[str, Any]]:
-    """perfume-vectordb2에서 분석된 향 특성으로 유사도 검색"""
+def _to_perfume_candidate(match: Dict[str, Any]) -> Dict[str, Any]:
+    meta = match.get("metadata", {}) or {}
+    # ✅ vectordb2: p.no → id 로 사용 (없으면 perfume_data.no → no → 기타 키)
+    pid = _get_no_as_intstr(meta) or _get_any_id(meta, "id", "perfume_id", "pid")
+    return {
+        "id": pid,  # 내부 링크용
+        "brand": _get_meta(meta, "brand", "Brand"),
+        "name":  _get_meta(meta, "name", "Name", "title"),
+        "score": float(match.get("score") or 0.0),
+        "size_ml": _to_int_ml(meta.get("size_ml")),
+        "metadata": meta
+    }
+
+def iter_perfume_candidates(
+    analyzed_scent: str,
+    page_size: int = REVIEW_PAGE_SIZE,
+    max_candidates: int = REVIEW_MAX_CANDIDATES,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    perfume-vectordb2 후보를 페이지 단위로 점진 조회 (필요할 때만 더 깊이)
+    - 임베딩은 1회만 계산, Pinecone은 top_k를 늘려가며 재조회 후 새 후보만 yield
+    - 유사도 임계값 아래로 내려가면 더 깊이 볼 필요 없으므로 중단
+    """
     try:
         query_embedding = get_openai_embedding(analyzed_scent)
-        results = perfume_index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True
-        )
-        matches = results.get("matches") or []
+    except Exception:
+        return
+    seen = 0
+    while seen < max_candidates:
+        top_k = min(seen + page_size, max_candidates)
+        try:
+            results = perfume_index.query(vector=query_embedding, top_k=top_k, include_metadata=True)
+        except Exception as e:
+            logger.error(f"[iter_perfume_candidates] Error: {e}", exc_info=True)
+            return
+        matches = (results.get("matches") or [])[seen:top_k]
         if not matches:
-            logger.warning("[search_perfume_vectordb] No matches at all")
-            return []
+            return
+        page = []
+        below = False
+        for m in matches:
+            score = m.get("score")
+            if MIN_SIMILARITY_THRESHOLD is not None and score is not None and score < MIN_SIMILARITY_THRESHOLD:
+                below = True
+                break
+            page.append(_to_perfume_candidate(m))
+        # 첫 페이지가 임계값으로 다 걸러졌다면 top3는 살림
+        if not page and seen == 0:
+            page = [_to_perfume_candidate(m) for m in matches[:3]]
+        seen = top_k
+        if page:
+            yield page
+        if below or len(matches) < page_size:
+            return
+
+def _is_within_budget(price: Any, budget_info: Dict) -> bool:
+    if not budget_info:
+        return True
+    if budget_info.get("budget"):
+        budget = budget_info["budget"]
+        op = budget_info.get("budget_op", "eq")
+        if op == "lte" and price <= budget:
+            return True
+        elif op == "gte" and price >= budget:
+            return True
+        elif op == "eq" and abs(price - budget) <= budget * 0.2:  # ±20% 허용
+            return True
+    elif budget_info.get("budget_min") and budget_info.get("budget_max"):
+        if budget_info["budget_min"] <= price <= budget_info["budget_max"]:
+            return True
+    return False
+
+def _check_one_price(perfume: Dict, budget_info: Dict) -> tuple:
+    """
+    향수 1개 가격 조회 + 예산 체크. perfume dict에 가격 정보를 채움
+    Returns (채택 여부, 네이버 API 실제 호출 여부)
+    """
+    brand = (perfume.get('brand') or "").strip()
+    name  = (perfume.get('name')  or "").strip()
+    size_ml = _to_int_ml(perfume.get('size_ml'))
 
-        # 디버깅 로그
-        for i, m in enumerate(matches[:5], 1):
-            logger.info(f"[perfume_vdb] top{i} score={m.get('score')} meta_keys={list((m.get('metadata') or {}).keys())[:5]}")
-
-        perfumes = []
-        for match in matches[:5]:     # 상위 5개 채택
-            meta = match.get("metadata", {}) or {}
-            score = match.get("score", 0.0)
-
-            if MIN_SIMILARITY_THRESHOLD is not None and score is not None:
-                if score < MIN_SIMILARITY_THRESHOLD:
-                    continue
-
-            # ✅ vectordb2: p.no → id 로 사용 (없으면 perfume_data.no → no → 기타 키)
-            id_from_no = _get_no_as_intstr(meta)
-            pid = id_from_no or _get_any_id(meta, "id", "perfume_id", "pid")
-
-            perfumes.append({
-                "id": pid,  # 내부 링크용
-                "brand": _get_meta(meta, "brand", "Brand"),
-                "name":  _get_meta(meta, "name", "Name", "title"),
-                "score": float(score or 0.0),
-                "size_ml": meta.get("size_ml"),
-                "metadata": meta
-            })
+    if not (brand and name):
+        logger.warning(f"[check_prices_and_filter] Skip: missing brand/name: {perfume}")
+        return False, False
 
-        # 필터로 다 날렸다면 top3는 무조건 살림
-        if not perfumes:
-            for match in matches[:3]:
-                meta = match.get("metadata", {}) or {}
-                pid = _get_no_as_intstr(meta) or _get_any_id(meta, "id", "perfume_id", "pid")
-                perfumes.append({
-                    "id": pid,
-                    "brand": _get_meta(meta, "brand", "Brand"),
-                    "name":  _get_meta(meta, "name", "Name", "title"),
-                    "score": float(match.get("score") or 0.0),
-                    "size_ml": meta.get("size_ml"),
-                    "metadata": meta
-                })
-            logger.info(f"[perfume_vdb] Fallback: kept top{len(perfumes)} without threshold")
-
-        return perfumes
-    except Exception as e:
-        logger.error(f"[search_perfume_vectordb] Error: {e}", exc_info=True)
-        return []
+    try:
+        size_part = f" {size_ml}ml" if size_ml else ""
+        query_str = f"{brand} {name}{size_part}".strip()
+
+        # LangChain Tool 호출
+        tool_res = price_tool.invoke({
+            "user_query": query_str,
+            "brand": brand,
+            "name": name,
+            "size_ml": size_ml,
+            "topk_fetch": 10,
+            "topk_return": 3,
+            "return_json": True
+        })
+
+        logger.info(f"[check_prices_and_filter] Price result: {tool_res}")
+        called = not (isinstance(tool_res, dict) and tool_res.get("cached"))
+
+        if isinstance(tool_res, dict) and tool_res.get("items"):
+            cheapest_item = tool_res["items"][0]
+            price = cheapest_item.get("price")
+
+            # ✅ id 그대로 보존 (price_tool은 id를 주지 않으므로 우리가 받은 걸 유지)
+            perfume["id"] = perfume.get("id")
+            perfume["price"] = price
+            perfume["price_title"] = cheapest_item.get("title")
+            perfume["detail_url"] = cheapest_item.get("link") or cheapest_item.get("url")
+
+            # 예산 체크
+            return _is_within_budget(price, budget_info), called
+
+        logger.warning(f"[check_prices_and_filter] No price items for {brand} {name}")
+        if not budget_info:
+            perfume["id"] = perfume.get("id")
+            perfume["price"] = None
+            perfume["price_title"] = "가격 정보 없음"
+            return True, called
+        return False, called
 
-def check_prices_and_filter(perfume_list: List[Dict], budget_info: Dict) -> List[Dict]:
-    """향수 리스트의 가격을 조회하고 예산 내 필터링 (price_tool.invoke 사용)"""
+    except Exception as e:
+        logger.exception(f"[check_prices_and_filter] price_tool failed for {brand} {name}: {e}")
+        if not budget_info:
+            perfume["id"] = perfume.get("id")
+            perfume["price"] = None
+            perfume["price_title"] = "가격 조회 실패"
+            return True, True
+        return False, True
+
+def check_prices_and_filter(
+    perfume_list: List[Dict],
+    budget_info: Dict,
+    max_matches: Optional[int] = None,
+    deadline: Optional[float] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Dict]:
+    """
+    향수 리스트의 가격을 조회하고 예산 내 필터링 (price_tool.invoke 사용)
+    - 캐시에 가격이 있는 후보는 네트워크 없이 먼저 확인
+    - 나머지는 동시에 발사, max_matches개가 예산 내로 확인되면 조기 종료
+    - deadline(time.monotonic 기준)이 지나면 그때까지 결과로 반환
+    - 종료 후 아직 시작 안 한 조회는 건너뜀. 이미 진행 중인 네이버 요청은 중단할 수 없어
+      끝까지 가고 결과는 가격 캐시에만 남음
+    - stats가 주어지면 price_checks / naver_calls 누적
+    - 반환 순서는 원래 후보 순서 유지
+    """
     if not perfume_list:
         return []
-    
+
     logger.info(f"[check_prices_and_filter] Processing {len(perfume_list)} perfumes")
     logger.info(f"[check_prices_and_filter] Budget info: {budget_info}")
-    
-    budget_matched = []
-    
-    for perfume in perfume_list:
-        brand = (perfume.get('brand') or "").strip()
-        name  = (perfume.get('name')  or "").strip()
-        size_ml = perfume.get('size_ml')
-
-        if not (brand and name):
-            logger.warning(f"[check_prices_and_filter] Skip: missing brand/name: {perfume}")
-            continue
+    stats = stats if stats is not None else {}
+
+    def _record(matched_idx: List[int], i: int, res: tuple) -> None:
+        stats["price_checks"] = stats.get("price_checks", 0) + 1
+        stats["naver_calls"] = stats.get("naver_calls", 0) + int(bool(res[1]))
+        if res[0]:
+            matched_idx.append(i)
+
+    matched_idx: List[int] = []
+    cached, uncached = [], []
+    for i, p in enumerate(perfume_list):
+        is_cached = is_price_cached(
+            (p.get("brand") or "").strip(), (p.get("name") or "").strip(), _to_int_ml(p.get("size_ml"))
+        )
+        (cached if is_cached else uncached).append(i)
 
-        try:
-            size_part = f" {int(size_ml)}ml" if size_ml else ""
-            query_str = f"{brand} {name}{size_part}".strip()
+    # 1) 캐시된 가격 먼저 (네트워크 없음)
+    for i in cached:
+        if max_matches and len(matched_idx) >= max_matches:
+            break
+        _record(matched_idx, i, _check_one_price(perfume_list[i], budget_info))
 
-            # LangChain Tool 호출
-            tool_res = price_tool.invoke({
-                "user_query": query_str,
-                "brand": brand,
-                "name": name,
-                "size_ml": size_ml,
-                "topk_fetch": 10,
-                "topk_return": 3,
-                "return_json": True
-            })
+    # 2) 나머지는 병렬 조회 + 조기 종료/시간 예산
+    if uncached and not (max_matches and len(matched_idx) >= max_matches):
+        stop = threading.Event()
 
-            logger.info(f"[check_prices_and_filter] Price result: {tool_res}")
-
-            if isinstance(tool_res, dict) and tool_res.get("items"):
-                cheapest_item = tool_res["items"][0]
-                price = cheapest_item.get("price")
-                title = cheapest_item.get("title")
-                link  = cheapest_item.get("link") or cheapest_item.get("url")
-
-                # ✅ id 그대로 보존 (price_tool은 id를 주지 않으므로 우리가 받은 걸 유지)
-                perfume["id"] = perfume.get("id")
-                perfume["price"] = price
-                perfume["price_title"] = title
-                perfume["detail_url"] = link
-
-                # 예산 체크
-                is_within_budget = True
-                if budget_info:
-                    is_within_budget = False
-                    if budget_info.get("budget"):
-                        budget = budget_info["budget"]
-                        op = budget_info.get("budget_op", "eq")
-                        if op == "lte" and price <= budget:
-                            is_within_budget = True
-                        elif op == "gte" and price >= budget:
-                            is_within_budget = True
-                        elif op == "eq" and abs(price - budget) <= budget * 0.2:  # ±20% 허용
-                            is_within_budget = True
-                    elif budget_info.get("budget_min") and budget_info.get("budget_max"):
-                        if budget_info["budget_min"] <= price <= budget_info["budget_max"]:
-                            is_within_budget = True
-
-                if is_within_budget:
-                    budget_matched.append(perfume)
-
-            else:
-                logger.warning(f"[check_prices_and_filter] No price items for {brand} {name}")
-                if not budget_info:
-                    perfume["id"] = perfume.get("id")
-                    perfume["price"] = None
-                    perfume["price_title"] = "가격 정보 없음"
-                    budget_matched.append(perfume)
+        def _worker(perfume: Dict):
+            # Future.cancel()은 이미 실행 중인 작업엔 효과가 없으므로 시작 시점에 한 번 더 확인
+            if stop.is_set():
+                return None
+            return _check_one_price(perfume, budget_info)
+
+        def _stop(reason: str) -> None:
+            stop.set()
+            cancelled = sum(f.cancel() for f in pending)
+            logger.info(f"[check_prices_and_filter] {reason}: {len(matched_idx)} matched, "
+                        f"cancelled {cancelled}, in flight {len(pending) - cancelled}")
+
+        futures = {_EXECUTOR.submit(run_in_turn(_worker), perfume_list[i]): i for i in uncached}
+        pending = set(futures)
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            # 한 번에 여러 개가 끝나도 max_matches를 넘겨 채택하지 않음 (후보 순서대로)
+            for f in sorted(done, key=futures.get):
+                if max_matches and len(matched_idx) >= max_matches:
+                    break
+                try:
+                    _record(matched_idx, futures[f], f.result())
+                except Exception as e:
+                    logger.warning(f"[check_prices_and_filter] worker error: {e}")
+            if max_matches and len(matched_idx) >= max_matches:
+                _stop("Early stop")
+                break
+            if not done and pending:
+                _stop("Latency budget exceeded")
+                break
 
-        except Exception as e:
-            logger.exception(f"[check_prices_and_filter] price_tool failed for {brand} {name}: {e}")
-            if not budget_info:
-                perfume["id"] = perfume.get("id")
-                perfume["price"] = None
-                perfume["price_title"] = "가격 조회 실패"
-                budget_matched.append(perfume)
-            continue
-    
+    budget_matched = [perfume_list[i] for i in sorted(matched_idx)]
     logger.info(f"[check_prices_and_filter] Final matched: {len(budget_matched)}/{len(perfume_list)}")
     return budget_matched
 
+def collect_budget_matches(
+    analyzed_scent: str,
+    budget_info: Dict,
+    need: int = REVIEW_TARGET_MATCHES,
+    latency_budget: float = REVIEW_PRICE_LATENCY_BUDGET,
+    stats: Optional[Dict[str, int]] = None,
+) -> tuple:
+    """
+    후보를 페이지 단위로 받아가며 가격을 지연 확인, 예산 내 need개가 모이거나
+    시간 예산이 다하면 종료.
+    Returns (budget_matched, 본 후보 수)
+    """
+    stats = stats if stats is not None else {}
+    deadline = time.monotonic() + latency_budget
+    matched: List[Dict] = []
+    seen = 0
+    for page in iter_perfume_candidates(analyzed_scent):
+        stats["pages"] = stats.get("pages", 0) + 1
+        seen += len(page)
+        # 리스트 정리 (id 포함)
+        page_list = [{
+            "id": p.get("id"),            # p.no → 정수 문자열
+            "brand": p.get("brand", ""),
+            "name": p.get("name", ""),
+            "score": p.get("score", 0.0),
+            "size_ml": p.get("size_ml"),
+        } for p in page]
+        matched += check_prices_and_filter(
+            page_list, budget_info, max_matches=need - len(matched), deadline=deadline, stats=stats
+        )
+        if len(matched) >= need or time.monotonic() >= deadline:
+            break
+    stats["candidates_seen"] = seen
+    return matched, seen
+
 def generate_perfume_response(budget_matched: List[Dict], budget_info: Dict, scent_description: str):
     """
     LLM_parser와 동일 톤으로 본문 생성 + rec_echo 호환 items 반환
@@ -454,6 +597,14 @@ def is_review_agent_query(query: str) -> bool:
     # 라우터에서 scent+price 조합만 review로 보내도록 제어
     return True
 
+def _parse_and_search(user_query: str, checkpoint=lambda: None) -> Dict[str, Any]:
+    """파싱 + 리뷰 RAG 동시 실행 (리뷰 검색은 원문 질의로 충분). 부작용 없음: 추측 실행 앞단으로도 사용"""
+    f_parse = _EXECUTOR.submit(run_in_turn(parse_user_query), user_query)
+    f_rag = _EXECUTOR.submit(run_in_turn(search_review_vectordb), user_query)
+    return {"parsed_query": f_parse.result(), "rag_results": f_rag.result()}
+
+register_prefix("review_agent", _parse_and_search)
+
 def review_agent_node(state: AgentState) -> AgentState:
     try:
         # 최신 사용자 메시지
@@ -474,14 +625,19 @@ def review_agent_node(state: AgentState) -> AgentState:
                 "last_agent": "review_agent"
             }
 
-        # 1) 파싱
-        parsed_query = parse_user_query(user_query)
+        timings: Dict[str, float] = {}
+        t_total = time.perf_counter()
+
+        # 1) 파싱 + 리뷰 RAG (supervisor와 겹쳐 미리 돌려둔 결과가 있으면 그대로 사용)
+        with _stage(timings, "parse+review_search"):
+            pre = take_speculation("review_agent", state) or _parse_and_search(user_query)
+            parsed_query = pre["parsed_query"]
+            rag_results = pre["rag_results"]
         scent_description = parsed_query["scent_description"]
         price_query = parsed_query["price_query"]
         budget_info = extract_budget_krw(price_query) if price_query else {}
 
-        # 2) 리뷰 RAG
-        rag_results = search_review_vectordb(scent_description)
+        # 2) 리뷰 RAG 결과 없음 → LLM 백업
         if not rag_results:
             llm_response = generate_final_llm_response(user_query, scent_description, price_query)
             summary = f"\n💬 추천 결과:\n\n{llm_response}"
@@ -495,12 +651,18 @@ def review_agent_node(state: AgentState) -> AgentState:
             }
 
         # 3) 분석
-        analysis_result = analyze_rag_results(scent_description, rag_results)
+        with _stage(timings, "analyze"):
+            analysis_result = analyze_rag_results(scent_description, rag_results)
         analyzed_scent = analysis_result["analyzed_scent"]
 
-        # 4) 향수 후보 (id는 p.no 기반)
-        perfume_candidates = search_perfume_vectordb(analyzed_scent)
-        if not perfume_candidates:
+        # 4) 향수 후보 페이징 + 가격 지연 확인 (id는 p.no 기반, 예산 내 N개 모이면 종료)
+        price_stats: Dict[str, int] = {}
+        need = REVIEW_TARGET_MATCHES if budget_info else REVIEW_NO_BUDGET_MATCHES
+        with _stage(timings, "perfume_search+price_check"):
+            budget_matched, seen = collect_budget_matches(analyzed_scent, budget_info, need=need, stats=price_stats)
+        timings["total"] = round((time.perf_counter() - t_total) * 1000, 1)
+        logger.info(f"[review_agent] stage timings(ms): {timings} price_stats: {price_stats}")
+        if not seen:
             llm_response = generate_final_llm_response(user_query, scent_description, price_query)
             summary = f"\n💬 추천 결과:\n\n{llm_response}"
             return {
@@ -512,19 +674,7 @@ def review_agent_node(state: AgentState) -> AgentState:
                 "last_agent": "review_agent"
             }
 
-        # 5) 리스트 정리 (id 포함)
-        perfume_list = [{
-            "id": p.get("id"),            # p.no → 정수 문자열
-            "brand": p.get("brand", ""),
-            "name": p.get("name", ""),
-            "score": p.get("score", 0.0),
-            "size_ml": p.get("size_ml"),
-        } for p in perfume_candidates]
-
-        # 6) 가격 조회 + 예산 필터 (id 유지)
-        budget_matched = check_prices_and_filter(perfume_list, budget_info)
-
-        # 7) 응답 생성
+        # 5) 응답 생성
         if budget_matched:
             body, rec_items = generate_perfume_response(budget_matched, budget_info, scent_description)
             summary = f"\n💬 추천 결과:\n\n{body}"
@@ -6,14 +6,18 @@
 from typing import Dict, Any, List, Optional
 import json
 import logging
+import time
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 
 from ..state import AgentState
 from ..prompts.supervisor_prompt import SUPERVISOR_SYSTEM_PROMPT
-from ..config import llm
+from ..config import llm, MODEL_NAME
 from ..tools.state_utils import enforce_message_budget
+from ..tools.llm_cache import LLM_CACHE_ENABLED, SUPERVISOR_CACHE, make_key
+from ..tools.speculation import resolve_speculation, start_speculation
+from ..tools.state_compact import migrate_state
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,10 @@ def _build_rec_context(state: AgentState, max_items: int = 5) -> str:
     return "\n".join(lines) if lines else "(none)"
 
 def supervisor_node(state: AgentState) -> AgentState:
+    # 이전 스키마 체크포인트는 첫 턴에 한 번 압축 (search_results 슬림화, rec_history 최근 N개)
+    return {**_route(state), **migrate_state(state)}
+
+def _route(state: AgentState) -> AgentState:
     # NEW: 메시지 윈도우링 + 요약 선처리 (컨텍스트 경량화)
     try:
         msgs: List[BaseMessage] = state.get("messages") or []
@@ -88,6 +96,20 @@ def supervisor_node(state: AgentState) -> AgentState:
     if image_url:
         return {"next": "multimodal_agent", "router_json": {"forced": True}}
 
+    # 같은 (질의, REC_CONTEXT, LAST_AGENT)면 라우팅 결과 재사용
+    cache_key = (
+        make_key("supervisor_prompt.py", MODEL_NAME, user_query, rec_context, last_agent)
+        if LLM_CACHE_ENABLED else None
+    )
+    if cache_key is not None:
+        hit, cached = SUPERVISOR_CACHE.get(cache_key)
+        if hit:
+            return cached
+
+    # SPECULATIVE_EXECUTION=1: 라우팅 LLM을 기다리는 동안 예측한 에이전트의 앞단(파싱/임베딩/검색)을 미리 실행
+    start_speculation(state, user_query, rec_context)
+
+    t0 = time.perf_counter()
     try:
         ai = chain.invoke({
             "system": SUPERVISOR_SYSTEM_PROMPT,
@@ -100,6 +122,7 @@ def supervisor_node(state: AgentState) -> AgentState:
     except Exception as e:
         msg = f"[supervisor_node] Prompt invoke error: {e}"
         logger.error(msg)
+        resolve_speculation(state, "human_fallback")
         return {
             "next": "human_fallback",
             "router_json": {"error": "prompt_invoke", "detail": str(e)},
@@ -119,5 +142,11 @@ def supervisor_node(state: AgentState) -> AgentState:
         logger.warning(f"[supervisor_node] invalid JSON: {e} raw={raw[:200]}")
         parsed = {"error": "invalid_json", "raw": raw}
 
+    # 예측과 다르면 추측 실행 취소 (같으면 에이전트 노드가 결과를 가져감)
+    resolve_speculation(state, chosen)
+
     # 최종 반환: 다음 노드와 라우터 원본 JSON
-    return {"next": chosen, "router_json": parsed}
+    result = {"next": chosen, "router_json": parsed}
+    if cache_key is not None and "error" not in parsed:
+        SUPERVISOR_CACHE.set(cache_key, result, cost_ms=(time.perf_counter() - t0) * 1000)
+    return result
@@ -13,21 +13,22 @@ from .nodes.rec_echo_node import rec_echo_node   # ← 추가
 from .nodes.review_agent_node import review_agent_node, is_review_agent_query # yyh
 from .state import AgentState
 from .nodes.multimodal_agent_node import multimodal_agent_node
+from .tools.tracing import traced_node
 
 # ---------- Build Graph ----------
 graph = StateGraph(AgentState)
 
-# 노드 추가
-graph.add_node("supervisor", supervisor_node)
-graph.add_node("LLM_parser", LLM_parser_node)
-graph.add_node("FAQ_agent", FAQ_agent_node)
-graph.add_node("human_fallback", human_fallback_node)
-graph.add_node("price_agent", price_agent_node)
-graph.add_node("ML_agent", ML_agent_node)
-graph.add_node("memory_echo", memory_echo_node)
-graph.add_node("rec_echo", rec_echo_node)  # ← 추가
-graph.add_node("review_agent", review_agent_node)
-graph.add_node("multimodal_agent", multimodal_agent_node)
+# 노드 추가 (traced_node: 노드별 실행 시간/에러를 턴 트레이스에 기록)
+graph.add_node("supervisor", traced_node("supervisor", supervisor_node))
+graph.add_node("LLM_parser", traced_node("LLM_parser", LLM_parser_node))
+graph.add_node("FAQ_agent", traced_node("FAQ_agent", FAQ_agent_node))
+graph.add_node("human_fallback", traced_node("human_fallback", human_fallback_node))
+graph.add_node("price_agent", traced_node("price_agent", price_agent_node))
+graph.add_node("ML_agent", traced_node("ML_agent", ML_agent_node))
+graph.add_node("memory_echo", traced_node("memory_echo", memory_echo_node))
+graph.add_node("rec_echo", traced_node("rec_echo", rec_echo_node))  # ← 추가
+graph.add_node("review_agent", traced_node("review_agent", review_agent_node))
+graph.add_node("multimodal_agent", traced_node("multimodal_agent", multimodal_agent_node))
 
 # 시작점
 graph.set_entry_point("supervisor")
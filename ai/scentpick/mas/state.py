@@ -3,6 +3,8 @@ from typing import TypedDict, List, Optional, Dict, Any, Annotated
 from langchain_core.messages import BaseMessage
 from langgraph.graph import add_messages
 
+from .tools.state_compact import compact_rec_history, compact_search_results
+
 def safe_dict_merge(prev: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if not isinstance(prev, dict):
         prev = {}
@@ -19,6 +21,16 @@ def safe_list_concat(prev: Optional[List[Any]], new: Optional[List[Any]]) -> Lis
         return prev
     return prev + new
 
+def replace_search_results(prev: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """이번 턴 검색 결과로 교체 (슬림 레코드만 체크포인트에 저장)"""
+    if new is None:
+        return prev if isinstance(prev, dict) else {"matches": []}
+    return compact_search_results(new)
+
+def bounded_rec_history(prev: Optional[List[Any]], new: Optional[List[Any]]) -> List[Any]:
+    """누적하되 최근 REC_HISTORY_MAX개만 (링 버퍼), items는 슬림 스키마로"""
+    return compact_rec_history(safe_list_concat(prev, new))
+
 class AgentState(TypedDict, total=False):
     messages: Annotated[List[BaseMessage], add_messages]
 
@@ -26,10 +38,10 @@ class AgentState(TypedDict, total=False):
     router_json: Optional[Dict[str, Any]]
 
     parsed_slots: Annotated[Dict[str, Any], safe_dict_merge]
-    search_results: Annotated[Dict[str, Any], safe_dict_merge]
+    search_results: Annotated[Dict[str, Any], replace_search_results]
 
     # ✅ 추천 히스토리 (마지막 추천을 rec_echo가 읽어감)
-    rec_history: Annotated[List[Dict[str, Any]], safe_list_concat]
+    rec_history: Annotated[List[Dict[str, Any]], bounded_rec_history]
 
     # (선택) 지난 턴 마지막 실행 노드명: supervisor 프롬프트에 넣어주기 용도
     last_agent: Optional[str]
@@ -40,3 +52,6 @@ class AgentState(TypedDict, total=False):
     perfume_list: Optional[List[Dict[str, Any]]]
 
     image_url: Optional[str] 
+
+    # 체크포인트 스키마 버전 (tools/state_compact.migrate_state)
+    state_version: Optional[int]
@@ -0,0 +1,32 @@
+# scentpick/mas/tools/async_utils.py
+# 동기 노드에서 코루틴 실행
+# - 그래프 노드는 동기 함수지만 FastAPI 이벤트 루프 안에서 graph_app.invoke로 불릴 수 있음
+#   → asyncio.run() 불가(이미 루프 실행 중). 전용 백그라운드 루프 스레드에 제출하고 결과만 기다림
+# - 루프를 하나로 고정해 AsyncOpenAI 같은 클라이언트의 커넥션 풀도 재사용
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            t = threading.Thread(target=loop.run_forever, name="mas-async-loop", daemon=True)
+            t.start()
+            _loop = loop
+        return _loop
+
+
+def run_coro_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """코루틴을 백그라운드 루프에서 실행하고 결과를 동기적으로 반환 (timeout 시 취소 후 TimeoutError)"""
+    fut = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return fut.result(timeout)
+    except TimeoutError:
+        fut.cancel()
+        raise
@@ -0,0 +1,93 @@
+# scentpick/mas/tools/cache_utils.py
+# 프로세스 내 TTL + LRU 캐시 (스레드 안전) — LLM/가격/FAQ 등 캐시 공용
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .tracing import record_cache
+
+
+class TTLCache:
+    """
+    크기 제한(LRU) + 만료(TTL) 캐시.
+    - get()은 (hit, value) 튜플 반환 (None 값도 캐시 가능하도록)
+    - set(cost_ms=...)로 원래 호출에 걸린 시간을 기록해두면 hit 시 절약 시간 누적
+    - 값은 deepcopy로 보관/반환해서 호출자가 수정해도 캐시가 오염되지 않음
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 3600.0, copy_values: bool = True):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self.copy_values = copy_values
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "saved_ms": 0.0}
+
+    def _copy(self, value: Any) -> Any:
+        return copy.deepcopy(value) if self.copy_values else value
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                hit = False
+            elif entry[0] <= now:
+                del self._data[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                hit = False
+            else:
+                _, value, cost_ms = entry
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["saved_ms"] += cost_ms
+                hit = True
+        record_cache(self.name, hit)
+        return (True, self._copy(value)) if hit else (False, None)
+
+    def set(self, key: Hashable, value: Any, cost_ms: float = 0.0, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else float(ttl))
+        value = self._copy(value)
+        with self._lock:
+            self._data[key] = (expires_at, value, float(cost_ms or 0.0))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        """만료 안 된 항목 존재 여부 (통계/LRU 순서에 영향 없음)"""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            size = len(self._data)
+        lookups = s["hits"] + s["misses"]
+        s.update({
+            "name": self.name,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hit_rate": (s["hits"] / lookups) if lookups else 0.0,
+            "saved_ms": round(s["saved_ms"], 1),
+        })
+        return s
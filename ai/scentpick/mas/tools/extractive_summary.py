@@ -0,0 +1,178 @@
+# scentpick/mas/tools/extractive_summary.py
+# memory_echo용 로컬 추출 요약 (네트워크 호출 없음)
+# - 직전 질문에서 브랜드/계절/성별/시간대/예산/용량을 룰로 뽑아 한줄 요약에 강조
+# - 직전 답변은 문장 단위로 나눠 키워드 겹침 + 위치 + 조건 포함 여부로 점수 → 상위 문장만 그대로 인용
+# - 출력 형식은 MEMORY_ECHO_SYSTEM_PROMPT와 동일 ("📝 한줄 요약" / "✅ 핵심만 콕")
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .slot_extractor import extract_slots
+from .price_parse_ext import extract_budget_krw_ext
+
+SUMMARY_MAX_POINTS = 3
+POINT_MAX_LEN = 60
+
+_MD_RE = re.compile(r"\*\*|__|`|^#+\s*")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s*")
+_NUMBERED_RE = re.compile(r"^\s*(\d+)[.)]\s*(?:\*\*)?(.+?)(?:\*\*|$)")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?。])\s+")
+_TOKEN_RE = re.compile(r"[가-힣]{2,}|[a-zA-Z]{3,}|\d+")
+_LABEL_RE = re.compile(r"^[^:：]{1,12}[:：]\s*")
+# 인사/마무리 같은 군더더기 문장
+_FILLER_RE = re.compile(r"(안녕하세요|도움이 되|궁금한 점|언제든|말씀해 주세요|추천해 ?드릴게요|골라봤어요|찾았어요)")
+_SKIP_PREFIXES = ("💬", "💰 **", "---", "http", "🔍", "🗣️")
+_STOPWORDS = frozenset({
+    "향수", "추천", "추천해줘", "추천해", "해줘", "알려줘", "어떤", "있어", "있나요", "좋은", "괜찮은",
+    "그리고", "정도", "같은", "느낌", "제품", "주세요", "해주세요",
+})
+
+_GENDER_LABEL = {"남성": "남성용", "여성": "여성용", "남녀공용": "남녀공용"}
+_OP_LABEL = {"lte": "이하", "lt": "미만", "gte": "이상", "gt": "초과"}
+_OP_WORD = {v: k for k, v in _OP_LABEL.items()}
+# '10만원 이하'처럼 '원'이 끼면 legacy 파서가 op를 놓치므로 라벨용으로 보정
+_OP_AFTER_AMOUNT_RE = re.compile(r"\d\s*(?:만\s*원?|천\s*원?|원)\s*(이하|이상|미만|초과)")
+
+
+def _won(v: int) -> str:
+    return f"{v // 10000}만원" if v % 10000 == 0 else f"{v:,}원"
+
+
+def _budget_label(b: Dict[str, Any]) -> Optional[str]:
+    if not b:
+        return None
+    if b.get("budget_min") and b.get("budget_max"):
+        return f"{_won(b['budget_min'])}~{_won(b['budget_max'])}"
+    if b.get("budget"):
+        op = b.get("budget_op") or "eq"
+        if op == "approx":
+            return f"약 {_won(b['budget'])}"
+        return f"{_won(b['budget'])} {_OP_LABEL.get(op, '')}".strip()
+    if b.get("budget_max"):
+        return f"{_won(b['budget_max'])} 이하"
+    return None
+
+
+def extract_facets(question: str) -> List[str]:
+    """직전 질문의 조건을 사람이 읽을 라벨로 (브랜드 → 계절 → 성별 → 시간대 → 예산 → 용량 순)"""
+    slots = extract_slots(question or "")["slots"]
+    out: List[str] = []
+    if slots.get("brand"):
+        out.append(slots["brand"])
+    if slots.get("concentration"):
+        out.append(slots["concentration"])
+    if slots.get("season_score"):
+        out.append(slots["season_score"])
+    if slots.get("gender"):
+        out.append(_GENDER_LABEL.get(slots["gender"], slots["gender"]))
+    if slots.get("day_night_score"):
+        out.append(slots["day_night_score"].replace(",", "/"))
+    try:
+        b = dict(extract_budget_krw_ext(question or ""))
+        m = _OP_AFTER_AMOUNT_RE.search(question or "")
+        if b.get("budget") and b.get("budget_op", "eq") == "eq" and m:
+            b["budget_op"] = _OP_WORD[m.group(1)]
+        budget = _budget_label(b)
+    except Exception:
+        budget = None
+    if budget:
+        out.append(budget)
+    if slots.get("sizes"):
+        out.append(f"{slots['sizes']}ml")
+    return out
+
+
+def _clean(line: str) -> str:
+    s = _MD_RE.sub("", line).strip()
+    return _BULLET_RE.sub("", s).strip()
+
+
+def _item_names(answer: str) -> List[str]:
+    names = []
+    for line in answer.splitlines():
+        m = _NUMBERED_RE.match(line)
+        if not m:
+            continue
+        name = _MD_RE.sub("", m.group(2)).split(" - ")[0].split(" — ")[0].strip(" :")
+        name = re.sub(r"\s*\([^)]*\)\s*", " ", name).strip()
+        if 2 <= len(name) <= 40 and name not in names:
+            names.append(name)
+    return names
+
+
+def _sentences(answer: str) -> List[str]:
+    out = []
+    for line in answer.splitlines():
+        raw = line.strip()
+        if not raw or raw.startswith(_SKIP_PREFIXES) or _NUMBERED_RE.match(raw):
+            continue
+        s = _LABEL_RE.sub("", _clean(raw))
+        for sent in _SENT_SPLIT_RE.split(s):
+            sent = sent.strip()
+            if len(sent) >= 8 and not _FILLER_RE.search(sent):
+                out.append(sent)
+    return out
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(text or "") if t.lower() not in _STOPWORDS]
+
+
+def _shorten(s: str, n: int = POINT_MAX_LEN) -> str:
+    return s if len(s) <= n else s[: n - 1].rstrip() + "…"
+
+
+def rank_sentences(question: str, answer: str, facets: List[str], limit: int = SUMMARY_MAX_POINTS) -> List[str]:
+    """키워드 겹침 + 조건 포함 + 앞쪽 위치 가중치로 상위 문장 선택 (원문 순서 유지)"""
+    sents = _sentences(answer)
+    if not sents:
+        return []
+    q_tokens = set(_tokens(question))
+    f_tokens = set(t for f in facets for t in _tokens(f))
+    scored: List[Tuple[float, int, str]] = []
+    for i, s in enumerate(sents):
+        toks = set(_tokens(s))
+        score = 1.0 * len(toks & q_tokens) + 1.5 * len(toks & f_tokens)
+        score += 1.0 / (1 + i)                 # 앞 문장 선호
+        if len(s) > 120:
+            score -= 0.5                       # 너무 긴 문장은 핵심 인용에 부적합
+        scored.append((score, i, s))
+    top = sorted(scored, key=lambda x: (-x[0], x[1]))[:limit]
+    return [s for _, _, s in sorted(top, key=lambda x: x[1])]
+
+
+def summarize_turn(question: str, answer: Optional[str]) -> str:
+    """직전 질문/답변 → '📝 한줄 요약' (+ '✅ 핵심만 콕') 텍스트"""
+    facets = extract_facets(question)
+    facet_txt = " · ".join(facets)
+    names = _item_names(answer or "")
+
+    if names:
+        shown = ", ".join(names[:3]) + (" 등" if len(names) > 3 else "")
+        cond = f"{facet_txt} 조건으로 " if facets else ""
+        headline = f"{cond}향수를 물어보셔서 {shown} {len(names)}개를 추천드렸어요."
+    elif facets:
+        headline = f"{facet_txt} 관련해서 물어보셨어요."
+    else:
+        headline = f"직전에 \"{_shorten((question or '').strip(), 40)}\" 하고 물어보셨어요."
+
+    lines = [f"📝 한줄 요약: {headline}"]
+    if not answer:
+        return "\n".join(lines)
+
+    points = []
+    if facets:
+        points.append(f"조건: {facet_txt}")
+    points += [_shorten(s) for s in rank_sentences(question, answer, facets, SUMMARY_MAX_POINTS - len(points))]
+    if points:
+        lines.append("✅ 핵심만 콕:")
+        lines += [f"- {p}" for p in points]
+    return "\n".join(lines)
+
+
+def is_complex_turn(question: str, answer: Optional[str], max_chars: int) -> bool:
+    """로컬 요약이 부적절한 턴 (너무 긴 답변, 인용할 문장이 없는 답변)"""
+    if not answer:
+        return False
+    if len(answer) > max_chars:
+        return True
+    return not _sentences(answer) and not _item_names(answer)
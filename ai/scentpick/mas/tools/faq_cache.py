@@ -0,0 +1,576 @@
+# scentpick/mas/tools/faq_cache.py
+# FAQ_agent 의미 기반 답변 캐시 (로컬 벡터 인덱스)
+# - 질문 임베딩 → 코사인 유사도 최근접 이웃이 FAQ_CACHE_THRESHOLD 이상이면 캐시 답변 반환
+# - 정규화한 질문이 완전히 같으면 임베딩 호출도 생략
+# - TTL + 크기 제한(가장 오래 안 쓰인 항목부터 제거), faq_prompt.py가 바뀌면 전체 무효화
+# - 기본 꺼짐(FAQ_CACHE_ENABLED=1로 켬): 임계값은 calibrate로 실제 임베딩 모델에서 확인한 뒤 사용
+# - FAQ_CACHE_PATH가 있으면 디스크에 저장/복원 (.npz + .json)
+#   워커별 저장은 파일 잠금(.lock) 안에서 저장본과 병합 후 프로세스별 임시 파일 → 원자적 교체
+#   관리 작업(무효화/시드)은 병합 없이 덮어쓰고 세대 번호(.gen)를 올림, 각 워커는 주기적으로 확인해서 다시 읽음
+#
+# 관리 CLI (ai/ 디렉터리에서):
+#   python -m scentpick.mas.tools.faq_cache stats
+#   python -m scentpick.mas.tools.faq_cache invalidate [--pattern 정규식]
+#   python -m scentpick.mas.tools.faq_cache seed-jsonl logs.jsonl     # {"question","answer"} 한 줄씩
+#   python -m scentpick.mas.tools.faq_cache seed-db [--limit 5000]    # rec_runs(agent=FAQ_agent) + messages
+#   python -m scentpick.mas.tools.faq_cache calibrate tests/data/faq_calibration_pairs.jsonl
+#                                                   # {"a","b","same"} 쌍 → 임계값별 정밀도/재현율
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .llm_cache import normalize_query, prompt_version, register_cache
+from .tracing import record_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경 — 잠금 없이 원자적 교체만
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FAQ_CACHE_ENABLED = os.getenv("FAQ_CACHE_ENABLED", "0") not in ("0", "false", "False")
+# ada-002는 무관한 문장끼리도 코사인 0.8 안팎이 나와서 0.9대 초반은 오탐이 많음 → 보수적으로
+FAQ_CACHE_THRESHOLD = float(os.getenv("FAQ_CACHE_THRESHOLD", "0.97"))
+FAQ_CACHE_TTL = float(os.getenv("FAQ_CACHE_TTL", str(7 * 24 * 3600)))
+FAQ_CACHE_MAXSIZE = int(os.getenv("FAQ_CACHE_MAXSIZE", "5000"))
+FAQ_CACHE_PATH = os.getenv("FAQ_CACHE_PATH", "")
+# 디스크 저장 최소 간격(초) — 매 저장마다 쓰지 않도록
+FAQ_CACHE_SAVE_INTERVAL = float(os.getenv("FAQ_CACHE_SAVE_INTERVAL", "60"))
+# 다른 프로세스의 무효화/시드 반영 확인 주기(초)
+FAQ_CACHE_SYNC_INTERVAL = float(os.getenv("FAQ_CACHE_SYNC_INTERVAL", "5"))
+
+FAQ_PROMPT_FILE = "faq_prompt.py"
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """저장본 읽기-병합-쓰기를 프로세스 간 직렬화 (path + '.lock')"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SemanticFAQCache:
+    """
+    질문 벡터(L2 정규화) 행렬 + 답변 리스트. 조회는 행렬곱 한 번.
+    TTLCache와 같은 인터페이스(name/clear/stats)라 llm_cache.register_cache로 함께 관리됨
+    """
+
+    def __init__(self, name: str = "faq_semantic", threshold: float = FAQ_CACHE_THRESHOLD,
+                 ttl: float = FAQ_CACHE_TTL, maxsize: int = FAQ_CACHE_MAXSIZE):
+        self.name = name
+        self.threshold = float(threshold)
+        self.ttl = float(ttl)
+        self.maxsize = max(1, int(maxsize))
+        self._lock = threading.Lock()
+        self._vecs: Optional[np.ndarray] = None     # (n, d) float32
+        self._questions: List[str] = []
+        self._answers: List[str] = []
+        self._expires: List[float] = []              # time.time() 기준 (디스크 저장 후에도 유효)
+        self._last_used: List[float] = []
+        self._costs: List[float] = []                # 답변 생성에 걸린 시간(ms) — hit 시 절약 시간 누적
+        self._exact: Dict[str, int] = {}
+        self._stats = {"hits": 0, "exact_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "saved_ms": 0.0}
+        self._last_save = 0.0
+        self._last_sync = 0.0
+        self._generation = 0
+
+    # ── 내부 ─────────────────────────────────────────────
+    @staticmethod
+    def _unit(vec: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vec, dtype=np.float32).ravel()
+        n = float(np.linalg.norm(v))
+        return v / n if n > 0 else v
+
+    def _rebuild_exact(self) -> None:
+        self._exact = {normalize_query(q): i for i, q in enumerate(self._questions)}
+
+    def _drop(self, keep: np.ndarray) -> None:
+        """keep(bool 마스크)만 남기고 재구성 (lock 안에서 호출)"""
+        idx = np.flatnonzero(keep)
+        self._vecs = self._vecs[idx] if self._vecs is not None and len(idx) else None
+        self._questions = [self._questions[i] for i in idx]
+        self._answers = [self._answers[i] for i in idx]
+        self._expires = [self._expires[i] for i in idx]
+        self._last_used = [self._last_used[i] for i in idx]
+        self._costs = [self._costs[i] for i in idx]
+        self._rebuild_exact()
+
+    def _purge_expired(self, now: float) -> None:
+        if not self._expires:
+            return
+        keep = np.asarray(self._expires) > now
+        n_expired = int((~keep).sum())
+        if n_expired:
+            self._stats["expired"] += n_expired
+            self._drop(keep)
+
+    # ── 조회/저장 ─────────────────────────────────────────
+    def lookup_exact(self, question: str) -> Tuple[bool, Optional[str]]:
+        now = time.time()
+        with self._lock:
+            i = self._exact.get(normalize_query(question))
+            if i is None or self._expires[i] <= now:
+                return False, None
+            self._last_used[i] = now
+            self._stats["hits"] += 1
+            self._stats["exact_hits"] += 1
+            self._stats["saved_ms"] += self._costs[i]
+            return True, self._answers[i]
+
+    def lookup(self, vector: Sequence[float]) -> Tuple[bool, Optional[str], float]:
+        """최근접 이웃 (hit, answer, score)"""
+        q = self._unit(vector)
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            if self._vecs is None or not len(self._questions) or self._vecs.shape[1] != q.shape[0]:
+                self._stats["misses"] += 1
+                return False, None, 0.0
+            sims = self._vecs @ q
+            i = int(np.argmax(sims))
+            score = float(sims[i])
+            if score < self.threshold:
+                self._stats["misses"] += 1
+                return False, None, score
+            self._last_used[i] = now
+            self._stats["hits"] += 1
+            self._stats["saved_ms"] += self._costs[i]
+            return True, self._answers[i], score
+
+    def add(self, question: str, answer: str, vector: Sequence[float], cost_ms: float = 0.0,
+            ttl: Optional[float] = None) -> None:
+        v = self._unit(vector)[None, :]
+        now = time.time()
+        with self._lock:
+            key = normalize_query(question)
+            if key in self._exact:
+                # 같은 질문은 답변/만료만 갱신
+                i = self._exact[key]
+                self._answers[i] = answer
+                self._expires[i] = now + (self.ttl if ttl is None else float(ttl))
+                self._last_used[i] = now
+                self._costs[i] = float(cost_ms or 0.0)
+                return
+            if self._vecs is not None and self._vecs.shape[1] != v.shape[1]:
+                # 임베딩 모델이 바뀐 경우 — 이전 벡터는 비교 불가
+                self._clear_locked()
+            self._vecs = v if self._vecs is None else np.vstack([self._vecs, v])
+            self._questions.append(question)
+            self._answers.append(answer)
+            self._expires.append(now + (self.ttl if ttl is None else float(ttl)))
+            self._last_used.append(now)
+            self._costs.append(float(cost_ms or 0.0))
+            self._exact[key] = len(self._questions) - 1
+            self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> None:
+        """maxsize 초과분을 만료 → 가장 오래 안 쓰인 순으로 제거"""
+        over = len(self._questions) - self.maxsize
+        if over > 0:
+            self._purge_expired(now)
+            over = len(self._questions) - self.maxsize
+        if over > 0:
+            keep = np.ones(len(self._questions), dtype=bool)
+            keep[np.argsort(np.asarray(self._last_used), kind="stable")[:over]] = False
+            self._stats["evictions"] += over
+            self._drop(keep)
+
+    # ── 관리 ─────────────────────────────────────────────
+    def _clear_locked(self) -> None:
+        self._vecs = None
+        self._questions, self._answers, self._expires, self._last_used, self._costs = [], [], [], [], []
+        self._exact = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def invalidate(self, pattern: Optional[str] = None) -> int:
+        """pattern(정규식)이 질문/답변에 걸리는 항목만, 없으면 전체 삭제. 삭제 개수 반환"""
+        with self._lock:
+            n = len(self._questions)
+            if not pattern:
+                self._clear_locked()
+                return n
+            rx = re.compile(pattern, re.IGNORECASE)
+            keep = np.array([not (rx.search(q) or rx.search(a)) for q, a in zip(self._questions, self._answers)], dtype=bool)
+            removed = int((~keep).sum())
+            if removed:
+                self._drop(keep)
+            return removed
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            size = len(self._questions)
+        lookups = s["hits"] + s["misses"]
+        s.update({
+            "name": self.name,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "threshold": self.threshold,
+            "hit_rate": (s["hits"] / lookups) if lookups else 0.0,
+            "saved_ms": round(s["saved_ms"], 1),
+        })
+        return s
+
+    # ── 디스크 ───────────────────────────────────────────
+    @staticmethod
+    def _read_file(path: str, version: str = "") -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """저장본 (vecs, meta). 없거나 프롬프트 버전이 다르면 None"""
+        if not (os.path.exists(path + ".npz") and os.path.exists(path + ".json")):
+            return None
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if version and meta.get("version") != version:
+            return None
+        with open(path + ".npz", "rb") as f:
+            vecs = np.load(f)
+        return vecs, meta
+
+    def _merge_locked(self, vecs: np.ndarray, meta: Dict[str, Any], now: float) -> int:
+        """저장본 중 메모리에 없는 질문만 추가 (같은 질문은 메모리 쪽 우선). 추가 개수 반환"""
+        questions = meta.get("questions") or []
+        if not questions or not vecs.size:
+            return 0
+        if self._vecs is not None and self._vecs.shape[1] != vecs.shape[1]:
+            return 0
+        costs = meta.get("costs") or [0.0] * len(questions)
+        idx = []
+        for i, q in enumerate(questions):
+            key = normalize_query(q)
+            if key in self._exact or float(meta["expires"][i]) <= now:
+                continue
+            self._exact[key] = len(self._questions)
+            self._questions.append(q)
+            self._answers.append(meta["answers"][i])
+            self._expires.append(float(meta["expires"][i]))
+            # 이 워커에서 아직 안 쓰인 항목 → 크기 초과 시 먼저 제거
+            self._last_used.append(0.0)
+            self._costs.append(float(costs[i]))
+            idx.append(i)
+        if idx:
+            rows = vecs[idx].astype(np.float32)
+            self._vecs = rows if self._vecs is None else np.vstack([self._vecs, rows])
+            self._evict_locked(now)
+        return len(idx)
+
+    def _write_file(self, path: str, version: str) -> None:
+        with self._lock:
+            vecs = self._vecs if self._vecs is not None else np.zeros((0, 0), dtype=np.float32)
+            meta = {
+                "version": version,
+                "questions": list(self._questions),
+                "answers": list(self._answers),
+                "expires": list(self._expires),
+                "costs": list(self._costs),
+            }
+            self._last_save = time.monotonic()
+        # 임시 파일은 프로세스별 (같은 이름을 쓰면 동시에 쓰는 워커끼리 섞임)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp + ".npz", "wb") as f:
+            np.save(f, vecs)
+        with open(tmp + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp + ".npz", path + ".npz")
+        os.replace(tmp + ".json", path + ".json")
+
+    def save(self, path: str, version: str = "", merge: bool = True) -> None:
+        """
+        저장. merge=True(워커 저장)면 잠금 안에서 저장본과 병합 후 씀 → 다른 워커 항목을 덮어쓰지 않음
+        - 그 사이 무효화/시드로 세대가 바뀌었으면 로컬 항목은 버리고 저장본을 따름 (무효화된 항목 부활 방지)
+        """
+        with _file_lock(path):
+            if merge:
+                if self._read_generation(path) != self._generation:
+                    self._load_file(path, version)
+                    self._last_save = time.monotonic()
+                    return
+                disk = self._read_file(path, version)
+                if disk is not None:
+                    with self._lock:
+                        self._merge_locked(*disk, now=time.time())
+            self._write_file(path, version)
+
+    def maybe_save(self, path: str, version: str = "") -> None:
+        if path and time.monotonic() - self._last_save >= FAQ_CACHE_SAVE_INTERVAL:
+            try:
+                self.save(path, version)
+            except Exception as e:
+                logger.warning("[faq_cache] save failed: %s", e)
+
+    @staticmethod
+    def _read_generation(path: str) -> int:
+        try:
+            with open(path + ".gen", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def publish(self, path: str, version: str = "") -> int:
+        """병합 없이 저장 + 세대 번호 증가 → 다른 워커가 다음 sync()에서 다시 읽음"""
+        with _file_lock(path):
+            self._write_file(path, version)
+            gen = self._read_generation(path) + 1
+            with open(path + ".gen", "w", encoding="utf-8") as f:
+                f.write(str(gen))
+            self._generation = gen
+        return gen
+
+    def sync(self, path: str, version: str = "") -> bool:
+        """세대 번호가 바뀌었으면 저장본 다시 읽기 (FAQ_CACHE_SYNC_INTERVAL 마다 한 번만 확인)"""
+        now = time.monotonic()
+        if not path or now - self._last_sync < FAQ_CACHE_SYNC_INTERVAL:
+            return False
+        self._last_sync = now
+        if self._read_generation(path) == self._generation:
+            return False
+        self.load(path, version)
+        return True
+
+    def _load_file(self, path: str, version: str) -> int:
+        self._generation = self._read_generation(path)
+        disk = self._read_file(path, version)
+        if disk is None and os.path.exists(path + ".json"):
+            logger.info("[faq_cache] prompt version changed → saved cache discarded")
+        with self._lock:
+            self._clear_locked()
+            if disk is not None:
+                self._merge_locked(*disk, now=time.time())
+            # 복원한 항목은 모두 방금 쓴 것으로 (LRU 기준 초기화)
+            self._last_used = [time.time()] * len(self._questions)
+            return len(self._questions)
+
+    def load(self, path: str, version: str = "") -> int:
+        """저장본 복원 (프롬프트 버전이 다르거나 만료된 항목은 버림). 복원 개수 반환"""
+        with _file_lock(path):
+            return self._load_file(path, version)
+
+
+FAQ_CACHE = SemanticFAQCache()
+register_cache(FAQ_CACHE)
+
+
+def faq_version() -> str:
+    return prompt_version(FAQ_PROMPT_FILE)
+
+
+if FAQ_CACHE_ENABLED and FAQ_CACHE_PATH:
+    try:
+        FAQ_CACHE.load(FAQ_CACHE_PATH, faq_version())
+    except Exception as e:
+        logger.warning("[faq_cache] load failed: %s", e)
+
+
+def faq_lookup(question: str, embed_query: Callable[[str], List[float]]) -> Tuple[bool, Optional[str], Optional[List[float]]]:
+    """
+    (hit, answer, vector). 정확 일치 → 임베딩 최근접 순서.
+    miss일 때 vector를 돌려주므로 답변 생성 후 faq_store에 그대로 넘기면 임베딩을 다시 하지 않음
+    """
+    if not FAQ_CACHE_ENABLED:
+        return False, None, None
+    try:
+        FAQ_CACHE.sync(FAQ_CACHE_PATH, faq_version())
+    except Exception as e:
+        logger.warning("[faq_cache] sync failed: %s", e)
+    hit, answer = FAQ_CACHE.lookup_exact(question)
+    if hit:
+        record_cache(FAQ_CACHE.name, True)
+        return True, answer, None
+    vector = embed_query(question)
+    hit, answer, score = FAQ_CACHE.lookup(vector)
+    record_cache(FAQ_CACHE.name, hit)
+    if hit:
+        logger.info("[faq_cache] semantic hit (%.3f): %s", score, question)
+    return hit, answer, vector
+
+
+def faq_store(question: str, answer: str, vector: Optional[List[float]], cost_ms: float = 0.0) -> None:
+    if not FAQ_CACHE_ENABLED or vector is None or not answer:
+        return
+    FAQ_CACHE.add(question, answer, vector, cost_ms=cost_ms)
+    FAQ_CACHE.maybe_save(FAQ_CACHE_PATH, faq_version())
+
+
+def invalidate_faq_cache(pattern: Optional[str] = None) -> int:
+    """관리용 무효화 (디스크 저장본이 있으면 다른 워커에도 전파)"""
+    n = FAQ_CACHE.invalidate(pattern)
+    if FAQ_CACHE_PATH:
+        FAQ_CACHE.publish(FAQ_CACHE_PATH, faq_version())
+    return n
+
+
+# ─────────────────────────────────────────────────────────────
+# 시드 (로그 → 캐시)
+# ─────────────────────────────────────────────────────────────
+_ANSWER_PREFIX_RE = re.compile(r"^💬 답변 결과:\s*")
+
+
+def seed(pairs: Iterable[Tuple[str, str]], embed_documents: Callable[[List[str]], List[List[float]]],
+         batch_size: int = 128, cache: SemanticFAQCache = FAQ_CACHE) -> int:
+    """(질문, 답변) 목록을 임베딩해서 캐시에 적재. 같은 질문은 마지막 답변 유지"""
+    uniq: Dict[str, Tuple[str, str]] = {}
+    for q, a in pairs:
+        if not q or not a or a.startswith("❌"):
+            continue
+        uniq[normalize_query(q)] = (q, _ANSWER_PREFIX_RE.sub("", a).strip())
+    items = list(uniq.values())
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        vecs = embed_documents([q for q, _ in batch])
+        for (q, a), v in zip(batch, vecs):
+            cache.add(q, a, v)
+    return len(items)
+
+
+def load_jsonl_pairs(path: str) -> List[Tuple[str, str]]:
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            q = row.get("question") or row.get("query") or row.get("query_text")
+            a = row.get("answer") or row.get("content")
+            if q and a:
+                pairs.append((q, a))
+    return pairs
+
+
+def load_db_pairs(db, limit: int = 5000) -> List[Tuple[str, str]]:
+    """rec_runs(agent='FAQ_agent')의 질문 + 같은 대화에서 바로 다음 assistant 메시지"""
+    from sqlalchemy import text
+    rows = db.execute(text("""
+        SELECT r.query_text,
+               (SELECT m.content FROM messages m
+                 WHERE m.conversation_id = r.conversation_id
+                   AND m.role = 'assistant'
+                   AND m.id > r.request_msg_id
+                 ORDER BY m.id LIMIT 1) AS answer
+          FROM rec_runs r
+         WHERE r.agent = 'FAQ_agent'
+         ORDER BY r.created_at DESC
+         LIMIT :n
+    """), {"n": int(limit)}).fetchall()
+    # 최신 답변이 마지막에 적재되도록 오래된 순으로
+    return [(q, a) for q, a in reversed(rows) if q and a]
+
+
+# ─────────────────────────────────────────────────────────────
+# 임계값 보정 (라벨링된 질문 쌍 → 임계값별 정밀도/재현율)
+# ─────────────────────────────────────────────────────────────
+def load_calibration_pairs(path: str) -> List[Tuple[str, str, bool]]:
+    """{"a": 질문, "b": 질문, "same": 같은 답변을 써도 되는지} 한 줄씩"""
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                pairs.append((row["a"], row["b"], bool(row["same"])))
+    return pairs
+
+
+def calibrate(pairs: Sequence[Tuple[str, str, bool]], embed_documents: Callable[[List[str]], List[List[float]]],
+              thresholds: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+    """
+    쌍별 코사인 유사도로 임계값마다 precision/recall/오탐 수 계산
+    recommended: 오탐 0인 가장 낮은 임계값 (없으면 None)
+    """
+    thresholds = thresholds or [round(0.90 + 0.01 * i, 2) for i in range(10)]
+    texts = list(dict.fromkeys(t for a, b, _ in pairs for t in (a, b)))
+    vecs = {t: SemanticFAQCache._unit(v) for t, v in zip(texts, embed_documents(texts))}
+    scored = [(float(vecs[a] @ vecs[b]), same) for a, b, same in pairs]
+    rows = []
+    for th in thresholds:
+        tp = sum(1 for s, same in scored if s >= th and same)
+        fp = sum(1 for s, same in scored if s >= th and not same)
+        positives = sum(1 for _, same in scored if same)
+        rows.append({
+            "threshold": th,
+            "precision": tp / (tp + fp) if tp + fp else 1.0,
+            "recall": tp / positives if positives else 0.0,
+            "false_positives": fp,
+        })
+    safe = [r["threshold"] for r in rows if r["false_positives"] == 0]
+    return {
+        "pairs": len(scored),
+        "max_different": max((s for s, same in scored if not same), default=None),
+        "min_same": min((s for s, same in scored if same), default=None),
+        "thresholds": rows,
+        "recommended": min(safe) if safe else None,
+    }
+
+
+def _main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m scentpick.mas.tools.faq_cache")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats")
+    p = sub.add_parser("invalidate")
+    p.add_argument("--pattern", default=None, help="질문/답변에 걸리는 정규식 (생략 시 전체)")
+    p = sub.add_parser("seed-jsonl")
+    p.add_argument("path")
+    p = sub.add_parser("seed-db")
+    p.add_argument("--limit", type=int, default=5000)
+    p = sub.add_parser("calibrate")
+    p.add_argument("path")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "calibrate":
+        from ..config import embeddings
+        report = calibrate(load_calibration_pairs(args.path), embeddings.embed_documents)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    if not FAQ_CACHE_PATH:
+        ap.error("FAQ_CACHE_PATH 환경변수가 필요합니다 (프로세스 간 공유되는 저장 위치)")
+
+    if args.cmd == "stats":
+        print(json.dumps(FAQ_CACHE.stats(), ensure_ascii=False, indent=2))
+        return
+    if args.cmd == "invalidate":
+        print(f"🗑️ {invalidate_faq_cache(args.pattern)}개 항목 삭제")
+        return
+
+    from ..config import embeddings
+    if args.cmd == "seed-jsonl":
+        pairs = load_jsonl_pairs(args.path)
+    else:
+        import database
+        db = database.SessionLocal()
+        try:
+            pairs = load_db_pairs(db, args.limit)
+        finally:
+            db.close()
+    n = seed(pairs, embeddings.embed_documents)
+    print(f"🌱 {n}개 질문 적재 (현재 {len(FAQ_CACHE)}개)")
+    FAQ_CACHE.publish(FAQ_CACHE_PATH, faq_version())
+
+
+if __name__ == "__main__":
+    _main()
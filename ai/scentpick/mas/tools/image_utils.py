@@ -0,0 +1,195 @@
+# scentpick/mas/tools/image_utils.py
+# 멀티모달 입력 이미지 전처리 + perceptual hash 캐시
+# - S3 이미지를 한 번만 내려받아 비전 모델 권장 해상도로 축소/재인코딩 (data URL로 전달)
+# - dHash(64bit)로 동일/유사 이미지 판별 → 분석 결과(analysis_json) 재사용
+#   (키에 프롬프트/모델 설정 해시 + 정규화된 질의를 포함: 같은 이미지라도 질문이 다르면 따로 분석)
+# - Pillow 헬퍼(_ensure_pillow/_open_image/_to_rgb)는 web/uauth/utils.py와 동일한 방식
+import base64
+import hashlib
+import io
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import requests
+
+from .cache_utils import TTLCache
+from .tracing import record_cache
+from .llm_cache import normalize_query
+
+# gpt-4o-mini 'low' detail은 512px 한 장으로 처리 → 그 이상은 토큰만 늘어남
+VISION_MAX_SIDE = int(os.getenv("VISION_MAX_SIDE", "512"))
+VISION_DETAIL = os.getenv("VISION_DETAIL", "low")
+VISION_JPEG_QUALITY = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+VISION_MAX_DOWNLOAD_BYTES = int(os.getenv("VISION_MAX_DOWNLOAD_BYTES", str(10 * 1024 * 1024)))
+# 해밍 거리 이 값 이하면 같은 이미지로 간주 (64bit 중)
+# - 합성 이미지 60장 측정: JPEG q40 재압축/절반 축소는 93~100%가 2 이하
+# - 화면 9% 크기 물체를 더한 '다른' 이미지도 18%는 2 이하, 38%는 3 이하 → 오탐을 줄이려 2
+VISION_HASH_MAX_DISTANCE = int(os.getenv("VISION_HASH_MAX_DISTANCE", "2"))
+
+
+def _ensure_pillow():
+    try:
+        from PIL import Image, ImageOps, ImageSequence  # noqa: F401
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("Pillow (PIL) is required for image processing.") from e
+
+
+def _open_image(file_obj):
+    from PIL import Image, ImageOps, ImageSequence
+    file_obj.seek(0)
+    img = Image.open(file_obj)
+    if getattr(img, "is_animated", False):
+        frame0 = ImageSequence.Iterator(img).__next__()
+        img = frame0.convert("RGBA")
+    # 휴대폰 사진 회전 정보 반영
+    return ImageOps.exif_transpose(img)
+
+
+def _to_rgb(img):
+    from PIL import Image
+    if img.mode in ("RGB",):
+        return img
+    if img.mode in ("RGBA", "LA"):
+        bg = Image.new("RGB", img.size, (255, 255, 255))
+        bg.paste(img, mask=img.split()[-1])
+        return bg
+    return img.convert("RGB")
+
+
+def download_image(url: str, timeout: float = 10.0, max_bytes: int = VISION_MAX_DOWNLOAD_BYTES) -> bytes:
+    """이미지 다운로드 (크기 제한)"""
+    with requests.get(url, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        buf = io.BytesIO()
+        for chunk in r.iter_content(64 * 1024):
+            buf.write(chunk)
+            if buf.tell() > max_bytes:
+                raise ValueError(f"image too large (> {max_bytes} bytes)")
+    return buf.getvalue()
+
+
+def dhash(img, hash_size: int = 8) -> int:
+    """difference hash: 회색조 (hash_size+1)x hash_size 축소 후 인접 픽셀 밝기 비교"""
+    from PIL import Image
+    g = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    px = list(g.getdata())
+    bits = 0
+    for row in range(hash_size):
+        base = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (1 if px[base + col] > px[base + col + 1] else 0)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class PreparedImage:
+    data_url: str
+    phash: int
+    size: Tuple[int, int]
+    original_bytes: int
+    encoded_bytes: int
+
+
+def prepare_vision_image(raw: bytes, max_side: int = VISION_MAX_SIDE, quality: int = VISION_JPEG_QUALITY) -> PreparedImage:
+    """원본 바이트 → (축소/재인코딩된 JPEG data URL, perceptual hash)"""
+    _ensure_pillow()
+    from PIL import Image
+
+    img = _to_rgb(_open_image(io.BytesIO(raw)))
+    phash = dhash(img)
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=True)
+    data = buf.getvalue()
+    return PreparedImage(
+        data_url="data:image/jpeg;base64," + base64.b64encode(data).decode("ascii"),
+        phash=phash,
+        size=img.size,
+        original_bytes=len(raw),
+        encoded_bytes=len(data),
+    )
+
+
+def prepare_vision_image_from_url(url: str) -> PreparedImage:
+    return prepare_vision_image(download_image(url))
+
+
+def vision_cache_context(query: str, *prompt_parts: str) -> Tuple[str, str]:
+    """분석 결과를 좌우하는 입력 → 캐시 키 앞부분 (프롬프트/모델 설정 해시, 정규화된 질의)"""
+    digest = hashlib.sha1("\x00".join(prompt_parts).encode("utf-8")).hexdigest()[:12]
+    return digest, normalize_query(query)
+
+
+class PerceptualHashCache(TTLCache):
+    """
+    (context, phash) 키 캐시: 같은 context 안에서 정확히 같은 해시가 없으면
+    해밍 거리 max_distance 이내 항목 재사용
+    - 정확/근사 조회를 한 번의 락 안에서 끝내고 hit/miss는 조회당 한 번만 기록
+    """
+
+    def get_near(self, context: Hashable, phash: int,
+                 max_distance: int = VISION_HASH_MAX_DISTANCE) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            best_key: Optional[Tuple[Hashable, int]] = (context, phash)
+            entry = self._data.get(best_key)
+            if entry is not None and entry[0] <= now:
+                del self._data[best_key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                best_key = None
+                if max_distance > 0:
+                    best_dist = max_distance + 1
+                    for key, (expires_at, _, _) in self._data.items():
+                        if expires_at <= now or key[0] != context:
+                            continue
+                        d = hamming(key[1], phash)
+                        if d < best_dist:
+                            best_key, best_dist = key, d
+            if best_key is None:
+                self._stats["misses"] += 1
+                hit = False
+            else:
+                _, value, cost_ms = self._data[best_key]
+                self._data.move_to_end(best_key)
+                self._stats["hits"] += 1
+                self._stats["saved_ms"] += cost_ms
+                hit = True
+        record_cache(self.name, hit)
+        return (True, self._copy(value)) if hit else (False, None)
+
+
+VISION_ANALYSIS_CACHE = PerceptualHashCache(
+    "vision_analysis",
+    maxsize=int(os.getenv("VISION_CACHE_MAXSIZE", "512")),
+    ttl=float(os.getenv("VISION_CACHE_TTL", str(7 * 24 * 3600))),
+)
+
+
+def analyze_with_cache(
+    phash: int,
+    context: Hashable,
+    analyze: Callable[[], Tuple[Any, bool, Any]],
+    cache: PerceptualHashCache = VISION_ANALYSIS_CACHE,
+) -> Tuple[Any, Any, bool]:
+    """
+    캐시 우선 이미지 분석
+    - analyze() → (analysis_json, JSON 파싱 성공 여부, 부가 결과); 성공한 분석만 저장
+    Returns (analysis_json, 부가 결과(캐시 hit이면 None), cache hit 여부)
+    """
+    hit, cached = cache.get_near(context, phash)
+    if hit:
+        return cached, None, True
+    t0 = time.perf_counter()
+    analysis_json, ok, extra = analyze()
+    if ok:
+        cache.set((context, phash), analysis_json, cost_ms=(time.perf_counter() - t0) * 1000)
+    return analysis_json, extra, False
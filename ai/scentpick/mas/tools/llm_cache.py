@@ -0,0 +1,136 @@
+# scentpick/mas/tools/llm_cache.py
+# 구조화 출력 LLM 호출(run_llm_parser, supervisor 라우팅) 메모이즈
+# - temperature=0 이라 (프롬프트, 입력)이 같으면 결과도 같다고 보고 캐시
+# - 키: (프롬프트 파일 버전 해시, 모델명, 정규화된 질의, 추가 컨텍스트)
+# - mas/prompts/ 파일이 바뀌면 버전 해시가 바뀌고 캐시도 비움
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAXSIZE = int(os.getenv("LLM_CACHE_MAXSIZE", "2048"))
+# 프롬프트 파일 변경 감지 주기(초) — 매 호출마다 stat 하지 않도록
+PROMPT_CHECK_INTERVAL = float(os.getenv("PROMPT_CHECK_INTERVAL", "5"))
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+PARSER_CACHE = TTLCache("run_llm_parser", maxsize=LLM_CACHE_MAXSIZE, ttl=LLM_CACHE_TTL)
+SUPERVISOR_CACHE = TTLCache("supervisor", maxsize=LLM_CACHE_MAXSIZE, ttl=LLM_CACHE_TTL)
+_CACHES: List[TTLCache] = [PARSER_CACHE, SUPERVISOR_CACHE]
+
+# ─────────────────────────────────────────────────────────────
+# 프롬프트 버전 / 변경 훅
+# ─────────────────────────────────────────────────────────────
+_version_lock = threading.Lock()
+_fingerprint: Tuple = ()
+_versions: Dict[str, str] = {}
+_last_check = 0.0
+_hooks: List[Callable[[List[str]], None]] = []
+
+
+def _scan_prompts() -> Tuple:
+    out = []
+    for p in sorted(PROMPTS_DIR.glob("*.py")):
+        try:
+            st = p.stat()
+            out.append((p.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            continue
+    return tuple(out)
+
+
+def _hash_prompts() -> Dict[str, str]:
+    versions = {}
+    for p in sorted(PROMPTS_DIR.glob("*.py")):
+        try:
+            versions[p.name] = hashlib.sha1(p.read_bytes()).hexdigest()[:12]
+        except OSError:
+            continue
+    return versions
+
+
+def check_prompt_changes(force: bool = False) -> List[str]:
+    """
+    prompts/ 변경 감지. 바뀐 파일이 있으면 LLM 캐시를 비우고 등록된 훅 호출.
+    Returns 바뀐 파일명 목록
+    """
+    global _fingerprint, _versions, _last_check
+    now = time.monotonic()
+    if not force and _versions and now - _last_check < PROMPT_CHECK_INTERVAL:
+        return []
+    with _version_lock:
+        _last_check = now
+        fp = _scan_prompts()
+        if fp == _fingerprint and _versions:
+            return []
+        new_versions = _hash_prompts()
+        changed = sorted(k for k in set(new_versions) | set(_versions) if new_versions.get(k) != _versions.get(k))
+        first_load = not _versions
+        _fingerprint, _versions = fp, new_versions
+    if changed and not first_load:
+        logger.info("[llm_cache] prompts changed: %s → cache invalidated", changed)
+        invalidate_llm_caches()
+        for hook in list(_hooks):
+            try:
+                hook(changed)
+            except Exception as e:
+                logger.warning("[llm_cache] invalidation hook failed: %s", e)
+    return [] if first_load else changed
+
+
+def on_prompts_changed(hook: Callable[[List[str]], None]) -> Callable[[List[str]], None]:
+    """프롬프트 변경 시 호출될 훅 등록 (데코레이터로도 사용 가능)"""
+    _hooks.append(hook)
+    return hook
+
+
+def prompt_version(filename: str) -> str:
+    check_prompt_changes()
+    return _versions.get(filename, "missing")
+
+
+def invalidate_llm_caches() -> None:
+    for c in _CACHES:
+        c.clear()
+
+
+def register_cache(cache: TTLCache) -> TTLCache:
+    """프롬프트 변경 시 함께 비울 캐시 등록"""
+    if cache not in _CACHES:
+        _CACHES.append(cache)
+    return cache
+
+
+# ─────────────────────────────────────────────────────────────
+# 키
+# ─────────────────────────────────────────────────────────────
+_WS_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s.?!~…]+$")
+
+
+def normalize_query(query: Any) -> str:
+    """의미가 바뀌지 않는 범위의 정규화: NFKC, 소문자, 공백 축약, 끝 문장부호 제거"""
+    s = unicodedata.normalize("NFKC", str(query or ""))
+    s = _WS_RE.sub(" ", s).strip().lower()
+    return _TRAILING_PUNCT_RE.sub("", s)
+
+
+def make_key(prompt_file: str, model: str, query: Any, *context: Any) -> Tuple:
+    return (prompt_version(prompt_file), model, normalize_query(query)) + tuple(
+        "" if c is None else str(c) for c in context
+    )
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    return {c.name: c.stats() for c in _CACHES}
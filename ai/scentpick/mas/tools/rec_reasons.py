@@ -0,0 +1,116 @@
+# scentpick/mas/tools/rec_reasons.py
+# 추천 시점에 최종 답변에서 항목별 "한 줄 이유"를 뽑아 rec_history items에 저장
+# - rec_echo가 LLM 재요약 없이 템플릿만으로 다시 보여줄 수 있도록
+# - 답변에 실제로 있는 문장만 사용 (없으면 reason 생략)
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+REASON_MAX_LEN = 80
+# 항목 제목 아래에서 이유를 찾을 최대 줄 수
+_LOOKAHEAD_LINES = 8
+
+_MD_RE = re.compile(r"\*\*|__|`|^#+\s*")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s*")
+_LABEL_RE = re.compile(r"^(?:향수\s*)?(?:선택\s*)?(?:추천\s*)?(?:이유|특징|포인트)\s*[:：]\s*")
+_SEP_RE = re.compile(r"^[\s:：\-–—()\[\]]+")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_SENT_END_RE = re.compile(r"(?<=[.!?。])\s+")
+# 가격/유사도 줄은 이유가 아님 (review_agent 본문)
+_SKIP_PREFIXES = ("💰", "🛒", "🎯", "🔗", "http")
+
+
+def _norm(s: str) -> str:
+    return re.sub(r"\s+", "", s or "").lower()
+
+
+def item_brand_name(it: Dict[str, Any]) -> Tuple[str, str]:
+    """candidates 스키마 / Pinecone match 스키마 모두에서 (brand, name)"""
+    meta = it.get("metadata") or {}
+    brand = it.get("brand") or meta.get("brand") or meta.get("Brand") or ""
+    name = it.get("name") or meta.get("name") or meta.get("Name") or ""
+    return str(brand).strip(), str(name).strip()
+
+
+def _clean(line: str) -> str:
+    s = _MD_RE.sub("", line).strip()
+    s = _BULLET_RE.sub("", s)
+    s = _LABEL_RE.sub("", s)
+    return s.strip()
+
+
+def _first_sentence(s: str, max_len: int) -> str:
+    parts = _SENT_END_RE.split(s, maxsplit=1)
+    s = (parts[0] if parts else s).strip()
+    if len(s) > max_len:
+        s = s[: max_len - 1].rstrip() + "…"
+    return s
+
+
+def _usable(s: str) -> bool:
+    return len(s) >= 6 and not s.startswith(_SKIP_PREFIXES)
+
+
+def extract_item_reasons(items: List[Dict[str, Any]], answer: Optional[str], max_len: int = REASON_MAX_LEN) -> List[Optional[str]]:
+    """
+    items 순서대로 답변(answer)에서 해당 항목을 설명하는 첫 문장 추출
+    1) 이름이 나온 줄의 나머지 텍스트 ("1. **A B** - 상큼한 시트러스…")
+    2) 없으면 그 아래 줄들 중 '이유'가 들어간 줄 → 그 외 첫 설명 줄 (다음 항목 이름이 나오기 전까지)
+    """
+    if not answer or not items:
+        return [None] * len(items)
+    lines = answer.splitlines()
+    norm_lines = [_norm(_MD_RE.sub("", ln)) for ln in lines]
+    names = [_norm(item_brand_name(it)[1]) for it in items]
+
+    def line_of(name: str) -> int:
+        if not name:
+            return -1
+        for i in range(len(norm_lines)):
+            if name in norm_lines[i]:
+                return i
+        return -1
+
+    reasons: List[Optional[str]] = []
+    for idx, it in enumerate(items):
+        name = names[idx]
+        at = line_of(name)
+        if at < 0:
+            reasons.append(None)
+            continue
+
+        # 1) 같은 줄에서 이름 뒤쪽
+        raw_name = item_brand_name(it)[1]
+        line = _MD_RE.sub("", lines[at])
+        pos = line.lower().find(raw_name.lower())
+        tail = _PAREN_RE.sub("", line[pos + len(raw_name):]) if pos >= 0 else ""
+        tail = _clean(_SEP_RE.sub("", tail))
+        if _usable(tail):
+            reasons.append(_first_sentence(tail, max_len))
+            continue
+
+        # 2) 아래 줄들 (다른 항목 이름이 나오면 중단)
+        others = [n for j, n in enumerate(names) if j != idx and n and n != name]
+        block: List[Tuple[str, str]] = []
+        for ln, nl in zip(lines[at + 1: at + 1 + _LOOKAHEAD_LINES], norm_lines[at + 1: at + 1 + _LOOKAHEAD_LINES]):
+            if any(o in nl for o in others):
+                break
+            c = _clean(ln)
+            if _usable(c):
+                block.append((ln, c))
+        if not block:
+            reasons.append(None)
+            continue
+        pick = next((c for ln, c in block if "이유" in ln), block[0][1])
+        reasons.append(_first_sentence(pick, max_len))
+    return reasons
+
+
+def attach_reasons(items: List[Dict[str, Any]], answer: Optional[str]) -> List[Dict[str, Any]]:
+    """items 복사본에 reason 필드 추가 (찾은 항목만)"""
+    out = []
+    for it, reason in zip(items, extract_item_reasons(items, answer)):
+        it = dict(it)
+        if reason:
+            it["reason"] = reason
+        out.append(it)
+    return out
@@ -0,0 +1,271 @@
+# scentpick/mas/tools/slot_extractor.py
+# 룰 기반 슬롯 추출기 (run_llm_parser 앞단)
+# - 닫힌 어휘(브랜드/부향률/성별/계절/시간대/용량/개수)는 사전·정규식으로 먼저 뽑고
+# - 슬롯마다 confidence를 붙여서, 확신이 낮은 슬롯이 있을 때만 LLM 파서를 부른다
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from .brand_utils import BRAND_ALIASES, CONC_SYNONYMS
+from .tools_metafilters import BRAND_LOOKUP, CONC_LOOKUP, _normalize_key, apply_meta_filters
+
+SLOT_KEYS = (
+    "brand", "concentration", "day_night_score", "gender",
+    "season_score", "sizes", "recommendation_count",
+)
+
+# 이 값 이상이면 룰 결과를 그대로 사용 (모든 슬롯이 넘으면 LLM 호출 생략)
+SLOT_MIN_CONFIDENCE = float(os.getenv("SLOT_MIN_CONFIDENCE", "0.75"))
+
+# ─────────────────────────────────────────────────────────────
+# 브랜드/부향률 별칭 오토마톤
+#  - 별칭 전체를 하나의 정규식 alternation으로 컴파일 (긴 별칭 우선)
+#  - 단어 사이 공백은 있어도/없어도 매칭, 라틴 별칭은 단어 경계 필요
+#  - 매칭된 문자열은 _normalize_key → BRAND_LOOKUP/CONC_LOOKUP으로 표준 라벨화
+# ─────────────────────────────────────────────────────────────
+# 일반 명사와 겹치는 별칭 (단독 매칭 시 확신 낮춤)
+_AMBIGUOUS_ALIASES = frozenset({"메모", "퍼퓸", "코롱", "solid", "balm", "parfum"})
+
+def _match_text(alias: str) -> str:
+    """악센트 제거 + 소문자 (공백은 유지) — 매칭용 원문"""
+    return " ".join(_normalize_key(w) for w in str(alias).split())
+
+def _alias_pattern(alias: str) -> Optional[str]:
+    key = _normalize_key(alias)
+    if not key:
+        return None
+    words = [re.escape(w) for w in re.split(r"\s+", _match_text(alias)) if w]
+    body = r"\s*".join(words)
+    if re.match(r"[a-z0-9]", key):
+        body = r"(?<![a-z0-9])" + body
+    if re.search(r"[a-z0-9.]$", key):
+        body = body + r"(?![a-z0-9])"
+    return body
+
+def _build_alias_regex() -> re.Pattern:
+    aliases = set()
+    for table in (BRAND_ALIASES, CONC_SYNONYMS):
+        for std, al in table.items():
+            aliases.update(list(al) + [std])
+    patterns = [(len(_normalize_key(a)), _alias_pattern(a)) for a in aliases]
+    patterns = sorted({p for p in patterns if p[1]}, key=lambda x: -x[0])
+    return re.compile("|".join(p for _, p in patterns))
+
+_ALIAS_RE = _build_alias_regex()
+
+# ─────────────────────────────────────────────────────────────
+# 성별/계절/시간대 어휘 (LLM 파서가 내놓는 원문 라벨 기준으로 출력)
+# ─────────────────────────────────────────────────────────────
+_GENDER_WORDS = [
+    ("남녀공용", "남녀공용", 1.0), ("유니섹스", "남녀공용", 1.0), ("unisex", "남녀공용", 1.0),
+    ("공용", "남녀공용", 1.0),
+    ("남성", "남성", 1.0), ("남자", "남성", 1.0), ("female", "여성", 1.0), ("women", "여성", 1.0),
+    ("male", "남성", 1.0), ("men", "남성", 1.0),
+    ("여성", "여성", 1.0), ("여자", "여성", 1.0),
+    # 선물 대상에서 유추 (LLM도 보통 같은 결론)
+    ("남친", "남성", 0.8), ("남편", "남성", 0.8), ("아빠", "남성", 0.8), ("아버지", "남성", 0.8),
+    ("여친", "여성", 0.8), ("아내", "여성", 0.8), ("와이프", "여성", 0.8), ("엄마", "여성", 0.8),
+    ("어머니", "여성", 0.8),
+]
+_GENDER_RE = re.compile("|".join(
+    (r"(?<![a-z])" + re.escape(w) + r"(?![a-z])") if w.isascii() else re.escape(w)
+    for w, _, _ in _GENDER_WORDS
+))
+_GENDER_MAP = {w: (label, conf) for w, label, conf in _GENDER_WORDS}
+
+_SEASON_WORDS = {
+    "봄": "봄", "여름": "여름", "가을": "가을", "겨울": "겨울",
+    "spring": "봄", "summer": "여름", "fall": "가을", "autumn": "가을", "winter": "겨울",
+}
+_SEASON_RE = re.compile(r"봄|여름|가을|겨울|(?<![a-z])(?:spring|summer|fall|autumn|winter)(?![a-z])")
+# 계절을 유추해야 하는 표현 → LLM에 맡김
+_SEASON_CUES = ("더운", "더위", "추운", "추위", "휴가", "바캉스", "크리스마스", "연말", "환절기", "간절기", "장마")
+
+_DAY_NIGHT_RE = re.compile(r"낮(?![은게춰아])|밤|주간|야간|데일리|(?<![a-z])(?:day|night|daily)(?![a-z])")
+_DAY_NIGHT_CUES = ("저녁", "아침", "데이트", "출근", "오피스", "파티", "클럽")
+
+_CONC_CUES = ("부향률", "농도", "지속", "오래가")
+
+# ─────────────────────────────────────────────────────────────
+# 숫자 슬롯
+# ─────────────────────────────────────────────────────────────
+_SIZE_RE = re.compile(r"(\d+)\s*(?:ml|㎖|미리|밀리)", re.IGNORECASE)
+_COUNT_RE = re.compile(r"(\d+)\s*(?:개|가지|종류|종)")
+_KO_NUM = {"한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10}
+_KO_COUNT_RE = re.compile(r"(다섯|여섯|일곱|여덟|아홉|한|두|세|네|열)\s*(?:개|가지|종류)")
+# 가격/서수/퍼센트 등 슬롯과 무관한 숫자
+_OTHER_NUM_RE = re.compile(r"\d[\d,.]*\s*(?:만\s*원|만원|만|천\s*원|원|번째|번|%|퍼센트|살|세|대)")
+_DIGIT_RE = re.compile(r"\d")
+_LATIN_WORD_RE = re.compile(r"[a-z][a-z'’&.]{2,}")
+_KNOWN_LATIN = frozenset({
+    "ml", "edp", "edt", "edc", "day", "night", "daily", "spring", "summer", "fall", "autumn", "winter",
+    "male", "female", "men", "women", "unisex", "perfume", "fragrance", "scent", "top", "best",
+})
+
+
+def _match_aliases(text: str) -> List[Dict[str, Any]]:
+    out = []
+    for m in _ALIAS_RE.finditer(text):
+        key = _normalize_key(m.group(0))
+        if key in BRAND_LOOKUP:
+            out.append({"kind": "brand", "value": BRAND_LOOKUP[key], "alias": key, "span": m.span()})
+        elif key in CONC_LOOKUP:
+            out.append({"kind": "concentration", "value": CONC_LOOKUP[key], "alias": key, "span": m.span()})
+    return out
+
+
+def _mask(text: str, spans: Iterable) -> str:
+    chars = list(text)
+    for a, b in spans:
+        for i in range(a, b):
+            chars[i] = " "
+    return "".join(chars)
+
+
+def extract_slots(query: str) -> Dict[str, Dict[str, Any]]:
+    """
+    룰 기반 슬롯 추출.
+    Returns {"slots": {slot: value|None}, "confidence": {slot: 0.0~1.0}}
+    - slots의 값 형식은 run_llm_parser 출력과 동일 (브랜드/부향률 표준 라벨, '여름', '50' 등)
+    """
+    text = _match_text(query or "")
+    slots: Dict[str, Any] = {k: None for k in SLOT_KEYS}
+    conf: Dict[str, float] = {k: 0.95 for k in SLOT_KEYS}
+
+    # 1) 브랜드/부향률 (한 오토마톤에서 최장 일치 → '퍼퓸 드 말리'가 '퍼퓸'보다 우선)
+    hits = _match_aliases(text)
+    for kind in ("brand", "concentration"):
+        found = [h for h in hits if h["kind"] == kind]
+        values = list(dict.fromkeys(h["value"] for h in found))
+        if values:
+            slots[kind] = values[0]
+            if len(values) > 1:
+                conf[kind] = 0.5
+            elif all(h["alias"] in _AMBIGUOUS_ALIASES for h in found):
+                conf[kind] = 0.6
+            else:
+                conf[kind] = 1.0
+    rest = _mask(text, [h["span"] for h in hits])
+
+    if not slots["brand"]:
+        unknown = [w for w in _LATIN_WORD_RE.findall(rest) if w.strip(".'’&") not in _KNOWN_LATIN]
+        if unknown or "브랜드" in rest:
+            conf["brand"] = 0.5
+    if not slots["concentration"] and any(c in rest for c in _CONC_CUES):
+        conf["concentration"] = 0.5
+
+    # 2) 성별
+    genders = [_GENDER_MAP[m.group(0)] for m in _GENDER_RE.finditer(rest)]
+    labels = list(dict.fromkeys(g[0] for g in genders))
+    if len(labels) == 1:
+        slots["gender"] = labels[0]
+        conf["gender"] = max(g[1] for g in genders)
+    elif len(labels) > 1:
+        # '남녀공용'은 '남'/'여' 단서보다 우선
+        slots["gender"] = "남녀공용" if "남녀공용" in labels else labels[0]
+        conf["gender"] = 0.9 if "남녀공용" in labels else 0.5
+
+    # 3) 계절
+    seasons = list(dict.fromkeys(_SEASON_WORDS[m.group(0)] for m in _SEASON_RE.finditer(rest)))
+    if seasons:
+        slots["season_score"] = seasons[0]
+        conf["season_score"] = 1.0 if len(seasons) == 1 else 0.5
+    elif any(c in rest for c in _SEASON_CUES):
+        conf["season_score"] = 0.5
+
+    # 4) 시간대 (LLM과 마찬가지로 원문 표현을 그대로 — 정규화는 apply_meta_filters에서)
+    day_night = list(dict.fromkeys(m.group(0) for m in _DAY_NIGHT_RE.finditer(rest)))
+    if day_night:
+        slots["day_night_score"] = ",".join(day_night)
+        conf["day_night_score"] = 1.0 if len(day_night) == 1 else 0.8
+    elif any(c in rest for c in _DAY_NIGHT_CUES):
+        conf["day_night_score"] = 0.6
+
+    # 5) 용량/개수
+    m = _SIZE_RE.search(rest)
+    if m:
+        slots["sizes"] = m.group(1)
+        conf["sizes"] = 1.0
+    m = _COUNT_RE.search(rest)
+    if m:
+        slots["recommendation_count"] = int(m.group(1))
+        conf["recommendation_count"] = 1.0
+    else:
+        m = _KO_COUNT_RE.search(rest)
+        if m:
+            slots["recommendation_count"] = _KO_NUM[m.group(1)]
+            conf["recommendation_count"] = 1.0
+
+    # 해석 못 한 숫자가 남아 있으면 용량/개수 확신 낮춤
+    leftover = _OTHER_NUM_RE.sub(" ", _COUNT_RE.sub(" ", _SIZE_RE.sub(" ", rest)))
+    if _DIGIT_RE.search(leftover):
+        for k in ("sizes", "recommendation_count"):
+            if slots[k] is None:
+                conf[k] = 0.5
+
+    return {"slots": slots, "confidence": conf}
+
+
+def low_confidence_slots(result: Dict[str, Dict[str, Any]], threshold: float = SLOT_MIN_CONFIDENCE) -> List[str]:
+    return [k for k, c in result["confidence"].items() if c < threshold]
+
+
+# ─────────────────────────────────────────────────────────────
+# 통계 (LLM 생략률 / 슬롯별 LLM 위임 횟수)
+# ─────────────────────────────────────────────────────────────
+_stats_lock = threading.Lock()
+_STATS: Dict[str, Any] = {"calls": 0, "llm_skipped": 0, "llm_slots": {k: 0 for k in SLOT_KEYS}}
+
+def record_slot_run(low_slots: List[str]) -> None:
+    with _stats_lock:
+        _STATS["calls"] += 1
+        if not low_slots:
+            _STATS["llm_skipped"] += 1
+        for k in low_slots:
+            _STATS["llm_slots"][k] += 1
+
+def get_slot_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        calls = _STATS["calls"]
+        return {
+            "calls": calls,
+            "llm_skipped": _STATS["llm_skipped"],
+            "skip_rate": (_STATS["llm_skipped"] / calls) if calls else 0.0,
+            "llm_slots": dict(_STATS["llm_slots"]),
+        }
+
+
+def evaluate_slot_agreement(cases: Iterable[Dict[str, Any]], threshold: float = SLOT_MIN_CONFIDENCE) -> Dict[str, Any]:
+    """
+    오프라인 평가: cases = [{"query": ..., "expected": run_llm_parser 출력(또는 정답 라벨)}]
+    - 비교는 apply_meta_filters 이후 값(실제 검색에 쓰이는 값) + recommendation_count
+    - skip_rate: 모든 슬롯이 threshold 이상이라 LLM 호출이 생략되는 비율
+    """
+    total = skipped = 0
+    agree = {k: 0 for k in SLOT_KEYS}
+    agree_skipped = {k: 0 for k in SLOT_KEYS}
+    mismatches = []
+    for case in cases:
+        total += 1
+        res = extract_slots(case["query"])
+        is_skip = not low_confidence_slots(res, threshold)
+        skipped += is_skip
+        got = apply_meta_filters(dict(res["slots"]))
+        exp = apply_meta_filters(dict(case.get("expected") or {})) or {}
+        got["recommendation_count"] = res["slots"]["recommendation_count"]
+        exp["recommendation_count"] = (case.get("expected") or {}).get("recommendation_count")
+        for k in SLOT_KEYS:
+            ok = str(got.get(k)) == str(exp.get(k))
+            agree[k] += ok
+            if is_skip:
+                agree_skipped[k] += ok
+            if not ok:
+                mismatches.append({"query": case["query"], "slot": k, "rule": got.get(k), "expected": exp.get(k)})
+    return {
+        "cases": total,
+        "skip_rate": skipped / total if total else 0.0,
+        "agreement": {k: agree[k] / total if total else 0.0 for k in SLOT_KEYS},
+        "agreement_when_skipped": {k: agree_skipped[k] / skipped if skipped else 0.0 for k in SLOT_KEYS},
+        "mismatches": mismatches,
+    }
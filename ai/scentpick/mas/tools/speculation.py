@@ -0,0 +1,245 @@
+# scentpick/mas/tools/speculation.py
+# 그래프 단위 추측 실행 (SPECULATIVE_EXECUTION=1 일 때만)
+# - supervisor가 LLM 라우팅을 기다리는 동안, 키워드 예측기로 고른 에이전트의
+#   부작용 없는 앞단(슬롯 파싱/질의 임베딩/벡터 검색)을 미리 돌려둔다
+# - 라우팅 결과가 예측과 같으면 에이전트 노드가 결과를 가져다 쓰고(commit),
+#   다르면 취소(discard) — 이미 돌고 있던 작업은 다음 체크포인트에서 멈춤
+# - 앞단 함수는 각 노드 모듈이 register_prefix()로 등록 (tools → nodes import 없음)
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.messages import HumanMessage
+
+from .slot_extractor import SLOT_MIN_CONFIDENCE, extract_slots
+from .tracing import run_in_turn, span
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_EXECUTION = os.getenv("SPECULATIVE_EXECUTION", "0") in ("1", "true", "True")
+SPECULATION_MAX_WORKERS = int(os.getenv("SPECULATION_MAX_WORKERS", "4"))
+# 에이전트 노드가 끝내 가져가지 않은 추측 결과 보관 시간(초)
+SPECULATION_TTL = float(os.getenv("SPECULATION_TTL", "60"))
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=SPECULATION_MAX_WORKERS, thread_name_prefix="speculate")
+
+
+class SpeculationCancelled(Exception):
+    """라우팅이 예측과 달라 앞단 실행을 중단"""
+
+
+# ─────────────────────────────────────────────────────────────
+# 예측기: supervisor 프롬프트의 라우팅 규칙을 키워드로 근사
+#  - 앞단이 등록된 에이전트(LLM_parser/ML_agent/FAQ_agent/review_agent)만 예측
+#  - 직전 추천/대화를 가리키는 질의, 가격 전용 질의, 비-향수 질의는 예측하지 않음(None)
+# ─────────────────────────────────────────────────────────────
+_FACET_SLOTS = ("brand", "season_score", "gender", "sizes", "day_night_score", "concentration")
+
+_DEICTIC_RE = re.compile(r"방금|아까|그거|그 향수|그 ?중|\d+ ?번|(?:첫|두|세|네|다섯) ?번째|목록|다시|요약|뭐라고|뭐였")
+_NON_PERFUME = (
+    "데오드란트", "데오드런트", "틴트", "섬유유연제", "방향제", "탈취제", "디퓨저", "캔들", "룸스프레이",
+    "샴푸", "바디미스트", "바디워시", "바디로션", "핸드크림", "deodorant", "diffuser", "candle", "shampoo",
+)
+_PRICE = (
+    "가격", "얼마", "구매", "판매", "할인", "어디서 사", "어디서사", "배송비", "최저가", "쿠폰", "세일", "특가",
+    "만원", "원대", "price", "cost", "cheapest", "buy", "discount",
+)
+_REVIEW = ("리뷰", "후기", "평점", "review")
+_FAQ = ("차이", "뜻", "정의", "어원", "방법", "어떻게", "뭐야", "무엇", "왜", "difference", "how to", "what is")
+_RECOMMEND = ("추천", "골라", "찾아", "알려줘", "있어", "recommend")
+_SCENT = (
+    "포근", "따뜻", "부드러", "잔잔", "은은", "시원", "상쾌", "상큼", "청량", "달달", "바닐라", "머스크", "비누",
+    "아쿠아", "시트러스", "프루티", "플로럴", "우디", "스모키", "가죽", "앰버", "스파이시", "허벌", "파우더리",
+    "히노키", "편백", "숲", "향 추천", "무드", "분위기", "느낌",
+    "cozy", "fresh", "citrus", "fruity", "floral", "woody", "smoky", "musk", "powdery",
+)
+
+
+def _has(text: str, words) -> bool:
+    return any(w in text for w in words)
+
+
+def predict_agent(query: str, rec_context: str = "(none)") -> Optional[str]:
+    """싼 라우팅 예측 (LLM 없음). 확신이 없으면 None → 추측 실행 안 함"""
+    text = (query or "").strip().lower()
+    if not text:
+        return None
+    if _DEICTIC_RE.search(text) and (rec_context != "(none)" or "방금" in text or "뭐라고" in text):
+        return None
+    if _has(text, _NON_PERFUME):
+        return None
+
+    price = _has(text, _PRICE)
+    recommend = _has(text, _RECOMMEND)
+    if _has(text, _FAQ) and not price and "추천" not in text:
+        return "FAQ_agent"
+
+    rule = extract_slots(text)
+    facets = [k for k in _FACET_SLOTS
+              if rule["slots"].get(k) is not None and rule["confidence"].get(k, 0.0) >= SLOT_MIN_CONFIDENCE]
+    if facets:
+        # 특정 브랜드/제품의 가격만 묻는 경우는 price_agent
+        return "LLM_parser" if ("추천" in text or not price) else None
+    if _has(text, _REVIEW) or (price and _has(text, _SCENT)):
+        return "review_agent"
+    if price:
+        return None
+    if _has(text, _SCENT) or recommend:
+        return "ML_agent"
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# 앞단 등록 / 실행
+# ─────────────────────────────────────────────────────────────
+_PREFIXES: Dict[str, Callable[..., Dict[str, Any]]] = {}
+
+
+def register_prefix(agent: str, fn: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """fn(user_query, checkpoint) -> dict. checkpoint()는 취소됐으면 SpeculationCancelled를 던짐"""
+    _PREFIXES[agent] = fn
+    return fn
+
+
+class Speculation:
+    def __init__(self, agent: str, query: str):
+        self.agent = agent
+        self.query = query
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.cancelled = threading.Event()
+        self.future: Optional[Future] = None
+
+    def checkpoint(self) -> None:
+        if self.cancelled.is_set():
+            raise SpeculationCancelled(self.agent)
+
+    def run(self, fn: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            with span("speculation", self.agent):
+                self.checkpoint()
+                return fn(self.query, self.checkpoint)
+        finally:
+            self.finished = time.perf_counter()
+
+
+_lock = threading.RLock()   # _account_waste 콜백이 잠금 안에서 바로 불릴 수 있음
+_PENDING: Dict[Any, Speculation] = {}
+_STATS: Dict[str, Any] = {
+    "started": 0, "committed": 0, "discarded": 0, "failed": 0, "abstained": 0,
+    "saved_ms": 0.0, "wasted_ms": 0.0,
+}
+
+
+def _turn_key(state: Dict[str, Any]) -> Optional[Any]:
+    """이번 턴의 최신 사용자 메시지 (add_messages가 붙인 id 우선)"""
+    for m in reversed(state.get("messages") or []):
+        if isinstance(m, HumanMessage):
+            return m.id or m.content
+    return None
+
+
+def _account_waste(spec: Speculation) -> None:
+    # 이미 돌고 있던 앞단은 멈출 때까지의 시간이 낭비
+    def done(_fut):
+        end = spec.finished or time.perf_counter()
+        with _lock:
+            _STATS["wasted_ms"] += (end - spec.started) * 1000
+    if spec.future is None or spec.future.cancel():
+        return
+    spec.future.add_done_callback(done)
+
+
+def _purge_expired(now: float) -> None:
+    expired = [k for k, s in _PENDING.items() if now - s.started > SPECULATION_TTL]
+    for k in expired:
+        spec = _PENDING.pop(k)
+        spec.cancelled.set()
+        _STATS["discarded"] += 1
+        _account_waste(spec)
+
+
+def start_speculation(state: Dict[str, Any], user_query: str, rec_context: str) -> Optional[Speculation]:
+    """supervisor LLM 호출 직전에 호출. 예측한 에이전트의 앞단을 백그라운드로 시작"""
+    if not SPECULATIVE_EXECUTION:
+        return None
+    key = _turn_key(state)
+    agent = predict_agent(user_query, rec_context)
+    fn = _PREFIXES.get(agent) if agent else None
+    if key is None or fn is None:
+        with _lock:
+            _STATS["abstained"] += 1
+        return None
+
+    spec = Speculation(agent, user_query)
+    with _lock:
+        _purge_expired(time.perf_counter())
+        _PENDING[key] = spec
+        _STATS["started"] += 1
+    spec.future = _EXECUTOR.submit(run_in_turn(spec.run), fn)
+    logger.debug(f"🔮 speculation start: {agent}")
+    return spec
+
+
+def resolve_speculation(state: Dict[str, Any], chosen: Optional[str]) -> None:
+    """supervisor 라우팅 확정 후 호출. 예측이 빗나갔으면 취소"""
+    if not SPECULATIVE_EXECUTION:
+        return
+    key = _turn_key(state)
+    with _lock:
+        spec = _PENDING.get(key)
+        if spec is None or spec.agent == chosen:
+            return
+        del _PENDING[key]
+        spec.cancelled.set()
+        _STATS["discarded"] += 1
+    logger.debug(f"🔮 speculation discard: {spec.agent} (routed to {chosen})")
+    _account_waste(spec)
+
+
+def take_speculation(agent: str, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """에이전트 노드에서 호출. 같은 턴/같은 에이전트의 앞단 결과가 있으면 반환 (없거나 실패면 None)"""
+    if not SPECULATIVE_EXECUTION:
+        return None
+    key = _turn_key(state)
+    with _lock:
+        spec = _PENDING.get(key)
+        if spec is None or spec.agent != agent:
+            return None
+        del _PENDING[key]
+    claimed = time.perf_counter()
+    try:
+        result = spec.future.result()
+    except Exception as e:
+        logger.warning(f"⚠️ speculation failed ({agent}): {e}")
+        with _lock:
+            _STATS["failed"] += 1
+        return None
+    # supervisor와 겹쳐서 돈 구간 = 절약된 시간
+    overlap = min(spec.finished or claimed, claimed) - spec.started
+    with _lock:
+        _STATS["committed"] += 1
+        _STATS["saved_ms"] += max(0.0, overlap) * 1000
+    return result
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    with _lock:
+        started = _STATS["started"]
+        return {
+            "enabled": SPECULATIVE_EXECUTION,
+            **_STATS,
+            "saved_ms": round(_STATS["saved_ms"], 1),
+            "wasted_ms": round(_STATS["wasted_ms"], 1),
+            "hit_rate": (_STATS["committed"] / started) if started else 0.0,
+        }
+
+
+def reset_speculation_stats() -> None:
+    with _lock:
+        for k in _STATS:
+            _STATS[k] = 0.0 if k.endswith("_ms") else 0
@@ -0,0 +1,165 @@
+# scentpick/mas/tools/state_compact.py
+# 체크포인트에 저장되는 AgentState 경량화
+# - search_results: Pinecone match 전체(metadata의 긴 text 포함) 대신 id 참조 슬림 레코드만 저장
+# - rec_history: 최근 REC_HISTORY_MAX개만 유지(링 버퍼), items도 표준 슬림 스키마로
+# - 잘라낸 metadata는 프로세스 내 카탈로그 캐시에 보관 → 필요할 때(hydrate_search_results) 다시 채움
+#   캐시에 없으면 perfume 인덱스 fetch로 복원
+# - STATE_VERSION 이전 스키마로 저장된 체크포인트는 migrate_state()로 첫 턴에 한 번 압축
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from .cache_utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 2
+REC_HISTORY_MAX = int(os.getenv("REC_HISTORY_MAX", "10"))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", str(24 * 3600)))
+CATALOG_CACHE_MAXSIZE = int(os.getenv("CATALOG_CACHE_MAXSIZE", "5000"))
+
+# 체크포인트에 남기는 metadata 키 (rec_echo 폴백/라우터 perfume_list 구성에 필요한 것만)
+SLIM_META_KEYS = ("no", "brand", "name", "perfume_name", "sizes", "size", "concentration", "detail_url")
+# rec_history items 표준 키 (rec_echo/price_agent/supervisor REC_CONTEXT가 읽는 것)
+ITEM_KEYS = ("id", "brand", "name", "size", "detail_url", "rank", "score", "reason")
+
+# match id → 전체 metadata (값은 읽기 전용으로만 쓰므로 복사 생략)
+CATALOG_CACHE = TTLCache("catalog", maxsize=CATALOG_CACHE_MAXSIZE, ttl=CATALOG_CACHE_TTL, copy_values=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# search_results
+# ─────────────────────────────────────────────────────────────
+def _is_full(meta: Dict[str, Any]) -> bool:
+    return any(k not in SLIM_META_KEYS for k in meta)
+
+
+def slim_match(m: Any) -> Dict[str, Any]:
+    if hasattr(m, "to_dict"):
+        m = m.to_dict()
+    m = m or {}
+    meta = m.get("metadata") or {}
+    mid = m.get("id")
+    if mid is not None and _is_full(meta):
+        CATALOG_CACHE.set(str(mid), dict(meta))
+    return {
+        "id": mid,
+        "score": m.get("score"),
+        "metadata": {k: meta[k] for k in SLIM_META_KEYS if meta.get(k) is not None},
+    }
+
+
+def compact_search_results(sr: Any) -> Dict[str, Any]:
+    """{"matches": [...]} → 슬림 match 목록 (namespace/usage 등 부가 키는 버림)"""
+    if hasattr(sr, "to_dict"):
+        sr = sr.to_dict()
+    if not isinstance(sr, dict):
+        return {"matches": []}
+    out = {k: v for k, v in sr.items() if k in ("recs", "candidates")}
+    out["matches"] = [slim_match(m) for m in sr.get("matches") or []]
+    return out
+
+
+def _fetch_metadata(ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    from ..config import index
+    res = index.fetch(ids=ids)
+    vectors = getattr(res, "vectors", None)
+    if vectors is None and isinstance(res, dict):
+        vectors = res.get("vectors")
+    found: Dict[str, Dict[str, Any]] = {}
+    for vid, v in (vectors or {}).items():
+        meta = getattr(v, "metadata", None)
+        if meta is None and isinstance(v, dict):
+            meta = v.get("metadata")
+        if meta:
+            found[str(vid)] = dict(meta)
+            CATALOG_CACHE.set(str(vid), dict(meta))
+    return found
+
+
+def hydrate_search_results(sr: Any, fetch: bool = True) -> Dict[str, Any]:
+    """슬림 match에 전체 metadata를 다시 채움 (카탈로그 캐시 → 없으면 인덱스 fetch, 실패 시 슬림 그대로)"""
+    if not isinstance(sr, dict):
+        return {"matches": []}
+    matches = sr.get("matches") or []
+    full: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for m in matches:
+        mid = m.get("id")
+        if mid is None or _is_full(m.get("metadata") or {}):
+            continue
+        hit, meta = CATALOG_CACHE.get(str(mid))
+        if hit:
+            full[str(mid)] = meta
+        else:
+            missing.append(str(mid))
+    if missing and fetch:
+        try:
+            full.update(_fetch_metadata(missing))
+        except Exception as e:
+            logger.warning(f"⚠️ catalog fetch 실패 ({len(missing)}건): {e}")
+    if not full:
+        return sr
+    out = dict(sr)
+    out["matches"] = [
+        {**m, "metadata": {**full[str(m.get("id"))], **(m.get("metadata") or {})}} if str(m.get("id")) in full else m
+        for m in matches
+    ]
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# rec_history
+# ─────────────────────────────────────────────────────────────
+def _to_int(v: Any) -> Optional[int]:
+    try:
+        return int(float(v)) if v is not None else None
+    except Exception:
+        return None
+
+
+def slim_item(it: Dict[str, Any]) -> Dict[str, Any]:
+    """candidates 스키마 / Pinecone match 스키마 → 표준 슬림 item"""
+    if not isinstance(it, dict):
+        return {}
+    meta = it.get("metadata") or {}
+    if meta:
+        # match 스키마: DB id는 metadata.no
+        it = {
+            "id": _to_int(meta.get("no")),
+            "brand": meta.get("brand") or meta.get("Brand"),
+            "name": meta.get("name") or meta.get("Name"),
+            "size": it.get("size") or meta.get("size") or meta.get("sizes"),
+            "detail_url": meta.get("detail_url") or meta.get("url"),
+            "score": it.get("score"),
+            "reason": it.get("reason"),
+        }
+    return {k: it[k] for k in ITEM_KEYS if it.get(k) is not None}
+
+
+def compact_rec_entry(e: Any) -> Any:
+    if not isinstance(e, dict):
+        return e
+    return {**e, "items": [slim_item(it) for it in e.get("items") or []]}
+
+
+def compact_rec_history(history: List[Any], max_len: int = REC_HISTORY_MAX) -> List[Any]:
+    return [compact_rec_entry(e) for e in history[-max_len:]]
+
+
+# ─────────────────────────────────────────────────────────────
+# 마이그레이션
+# ─────────────────────────────────────────────────────────────
+def migrate_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    이전 스키마 체크포인트 → 현재 스키마로 바꾸는 노드 출력 (이미 최신이면 {})
+    - search_results는 교체 리듀서라 압축본을 그대로 넘기고
+    - rec_history는 누적 리듀서가 쓸 때마다 링 버퍼 + 슬림화를 하므로 빈 리스트만 넘기면 됨
+    """
+    if state.get("state_version") == STATE_VERSION:
+        return {}
+    return {
+        "search_results": compact_search_results(state.get("search_results")),
+        "rec_history": [],
+        "state_version": STATE_VERSION,
+    }
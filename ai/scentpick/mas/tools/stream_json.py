@@ -0,0 +1,136 @@
+# scentpick/mas/tools/stream_json.py
+# 스트리밍 LLM 출력에서 JSON 최상위 필드를 "완성되는 즉시" 꺼내는 증분 파서
+# - ```json 펜스 / 앞쪽 잡문은 첫 '{' 전까지 무시
+# - 최상위 값이 문자열/숫자/true/false/null이면 바로 반환, 중첩 객체/배열은 통째로 json.loads
+# - 파싱 불가능한 입력이어도 예외를 던지지 않음 (최종 결과는 호출측에서 json.loads로 확정)
+import json
+from typing import Any, List, Tuple
+
+_WS = " \t\r\n"
+_PRIMITIVE_END = ",}" + _WS
+
+
+class IncrementalJSONFields:
+    """
+    parser = IncrementalJSONFields()
+    for chunk in stream:
+        for key, value in parser.feed(chunk):
+            ...   # key 필드가 막 완성됨
+    parser.fields  # 지금까지 완성된 필드 전체
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.state = "start"   # start → key → colon → value → after → done
+        self.key = None
+        self.fields = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        if chunk:
+            self.buf += chunk
+        done: List[Tuple[str, Any]] = []
+        while self.state != "done":
+            if not self._step(done):
+                break
+        return done
+
+    # 현재 상태에서 한 토큰 진행. 더 읽을 데이터가 없으면 False
+    def _step(self, done: List[Tuple[str, Any]]) -> bool:
+        buf, n = self.buf, len(self.buf)
+        i = self.pos
+        while i < n and buf[i] in _WS:
+            i += 1
+        self.pos = i
+        if i >= n:
+            return False
+
+        if self.state == "start":
+            j = buf.find("{", i)
+            if j < 0:
+                self.pos = n
+                return False
+            self.pos, self.state = j + 1, "key"
+            return True
+
+        if self.state == "key":
+            if buf[i] == "}":
+                self.pos, self.state = i + 1, "done"
+                return True
+            end = _scan_string(buf, i)
+            if end < 0:
+                return False
+            self.key = _loads(buf[i:end])
+            self.pos, self.state = end, "colon"
+            return True
+
+        if self.state == "colon":
+            self.pos, self.state = i + 1, "value"
+            return True
+
+        if self.state == "value":
+            end = _scan_value(buf, i)
+            if end < 0:
+                return False
+            value = _loads(buf[i:end])
+            if isinstance(self.key, str):
+                self.fields[self.key] = value
+                done.append((self.key, value))
+            self.pos, self.state = end, "after"
+            return True
+
+        # after: ',' 다음 키 / '}' 끝
+        self.pos = i + 1
+        self.state = "key" if buf[i] == "," else "done"
+        return True
+
+
+def _loads(s: str) -> Any:
+    try:
+        return json.loads(s)
+    except ValueError:
+        return s.strip().strip('"')
+
+
+def _scan_string(buf: str, i: int) -> int:
+    """buf[i] == '"' 인 문자열의 끝 다음 인덱스. 미완성이면 -1"""
+    j = i + 1
+    n = len(buf)
+    while j < n:
+        c = buf[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == '"':
+            return j + 1
+        j += 1
+    return -1
+
+
+def _scan_value(buf: str, i: int) -> int:
+    """최상위 값 하나의 끝 다음 인덱스. 미완성이면 -1"""
+    c = buf[i]
+    if c == '"':
+        return _scan_string(buf, i)
+    if c in "{[":
+        depth, j, n = 0, i, len(buf)
+        while j < n:
+            ch = buf[j]
+            if ch == '"':
+                j = _scan_string(buf, j)
+                if j < 0:
+                    return -1
+                continue
+            if ch in "{[":
+                depth += 1
+            elif ch in "}]":
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+            j += 1
+        return -1
+    # 숫자/true/false/null: 구분자가 나와야 완성으로 판단
+    j, n = i, len(buf)
+    while j < n and buf[j] not in _PRIMITIVE_END:
+        j += 1
+    return j if j < n else -1
@@ -1,5 +1,8 @@
 from ..config import llm
 from ..prompts.price_prompt import keyword_extraction_prompt
+import logging
+
+logger = logging.getLogger(__name__)
 
 def extract_search_keyword_with_llm(user_query: str) -> str:
     """LLM을 사용해서 검색 키워드 추출"""
@@ -14,5 +17,5 @@ def extract_search_keyword_with_llm(user_query: str) -> str:
         
         return keyword
     except Exception as e:
-        print(f"키워드 추출 오류: {e}")
+        logger.warning(f"키워드 추출 오류: {e}")
         return "향수"  # 오류 시 기본값
@@ -1,5 +1,9 @@
 # 메타필터 함수들
 import re
+import json
+import unicodedata
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 from ..tools.brand_utils import BRAND_ALIASES, CONC_SYNONYMS
 
 # def filter_brand(brand_value):
@@ -55,92 +59,80 @@ from ..tools.brand_utils import BRAND_ALIASES, CONC_SYNONYMS
 #                 return num
 #     return str(sizes_value) if str(sizes_value) in valid_sizes else None
 
+# ─────────────────────────────────────────────────────────────
+# 정규화 룩업 테이블 (import 시 1회 생성, 읽기 전용)
+#  - 키: 소문자 + 공백 제거 + 악센트 제거 ("Chloé" → "chloe", "오 드 퍼퓸" → "오드퍼퓸")
+#  - 같은 키가 여러 표준 라벨에 걸리면 dict 순서상 먼저 나온 라벨 유지 (기존 순차 스캔과 동일)
+# ─────────────────────────────────────────────────────────────
+_WS_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+
+def _normalize_key(value: Any) -> str:
+    s = unicodedata.normalize("NFKD", str(value))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = unicodedata.normalize("NFC", s)
+    return _WS_RE.sub("", s).lower()
+
+def _build_lookup(synonyms: Mapping[str, List[str]]) -> Mapping[str, str]:
+    table: Dict[str, str] = {}
+    for std, aliases in synonyms.items():
+        for a in list(aliases) + [std]:
+            table.setdefault(_normalize_key(a), std)
+    return MappingProxyType(table)
+
+BRAND_LOOKUP = _build_lookup(BRAND_ALIASES)
+CONC_LOOKUP = _build_lookup(CONC_SYNONYMS)
+
+DAY_NIGHT_LOOKUP = MappingProxyType({"낮": "day", "밤": "night", "day": "day", "night": "night"})
+GENDER_LOOKUP = MappingProxyType({
+    "남성": "Male", "여성": "Female", "남녀공용": "Unisex", "공용": "Unisex",
+    "male": "Male", "female": "Female", "unisex": "Unisex",
+})
+SEASON_LOOKUP = MappingProxyType({
+    "봄": "spring", "여름": "summer", "가을": "fall", "겨울": "winter",
+    "spring": "spring", "summer": "summer", "fall": "fall", "winter": "winter",
+})
+VALID_SIZES = frozenset({"30", "50", "75", "100", "150"})
+
+
 def filter_brand(brand_value):
     if brand_value is None:
         return None
-    v = str(brand_value).replace(" ", "")
-    for std, aliases in BRAND_ALIASES.items():
-        # 별칭 매칭
-        if v in [a.replace(" ", "") for a in aliases + [std]]:
-            return std
-    return None
-
-
+    return BRAND_LOOKUP.get(_normalize_key(brand_value))
 
 def filter_concentration(concentration_value):
     if concentration_value is None:
         return None
-    v = str(concentration_value).replace(" ", "")
-    for std, aliases in CONC_SYNONYMS.items():
-        # std(표준 라벨)도 포함해서 매칭
-        if v in [a.replace(" ", "") for a in aliases + [std]]:
-            return std
-    return None
-
-
+    return CONC_LOOKUP.get(_normalize_key(concentration_value))
 
 def filter_day_night_score(day_night_value):
-    valid_day_night = ["day","night"]
     if not day_night_value:
         return None
-    # 정규화
-    mapping = {"낮":"day","밤":"night"}
-    if day_night_value in mapping:
-        v = mapping[day_night_value]
-    else:
-        v = str(day_night_value).strip()
-    # 필터
-    if "," in v:
-        values = [x.strip() for x in v.split(",")]
-        filtered = [x for x in values if x in valid_day_night]
-        return ",".join(filtered) if filtered else None
-    return v if v in valid_day_night else None
+    # "day, night" 처럼 복수 값이면 유효한 것만 남김
+    values = [DAY_NIGHT_LOOKUP.get(_normalize_key(x)) for x in str(day_night_value).split(",")]
+    filtered = [x for x in values if x]
+    return ",".join(filtered) if filtered else None
 
 def filter_gender(gender_value):
-    valid_genders = ['Female','Male','Unisex']
     if not gender_value:
         return None
-    mapping = {"남성":"Male","여성":"Female","남녀공용":"Unisex","공용":"Unisex"}
-    v = mapping.get(str(gender_value).strip(), str(gender_value).strip())
-    return v if v in valid_genders else None
+    return GENDER_LOOKUP.get(_normalize_key(gender_value))
 
 def filter_season_score(season_value):
-    valid_seasons = ['winter','spring','summer','fall']
     if not season_value:
         return None
-    mapping = {"봄":"spring","여름":"summer","가을":"fall","겨울":"winter"}
-    v = mapping.get(str(season_value).strip(), str(season_value).strip())
-    return v if v in valid_seasons else None
+    return SEASON_LOOKUP.get(_normalize_key(season_value))
 
 def filter_sizes(sizes_value):
-    valid_sizes = ['30','50','75','100','150']
     if not sizes_value:
         return None
     # 정규화
-    s = str(sizes_value).lower().replace("ml","").strip()
-    # 숫자만 추출
-    import re
-    numbers = re.findall(r'\d+', s)
-    if numbers:
-        for num in numbers:
-            if num in valid_sizes:
-                return num
-    return s if s in valid_sizes else None
-
-def filter_sizes(sizes_value):
-    valid_sizes = ['30','50','75','100','150']
-    if not sizes_value:
-        return None
-    # 정규화
-    s = str(sizes_value).lower().replace("ml","").strip()
-    # 숫자만 추출
-    import re
-    numbers = re.findall(r'\d+', s)
-    if numbers:
-        for num in numbers:
-            if num in valid_sizes:
-                return num
-    return s if s in valid_sizes else None
+    s = str(sizes_value).lower().replace("ml", "").strip()
+    # 숫자 중 유효한 용량 첫 번째
+    for num in _DIGITS_RE.findall(s):
+        if num in VALID_SIZES:
+            return num
+    return s if s in VALID_SIZES else None
 
 
 def apply_meta_filters(parsed_json: dict) -> dict:
@@ -157,18 +149,23 @@ def apply_meta_filters(parsed_json: dict) -> dict:
         'season_score': filter_season_score(parsed_json.get('season_score')),
         'sizes': filter_sizes(parsed_json.get('sizes'))
     }
-    # result = {
-    #     'brand': filter_brand(parsed_json.get('brand')),
-    #     'concentration': filter_concentration(parsed_json.get('concentration')),
-    #     'day_night_score': filter_day_night_score(parsed_json.get('day_night_score')),
-    #     'gender': filter_gender(parsed_json.get('gender')),
-    #     'season_score': filter_season_score(parsed_json.get('season_score')),
-    #     'sizes': filter_sizes(parsed_json.get('sizes'))
-    # }
-
-    # return result
-
-    # yyh
+
+def apply_meta_filters_batch(parsed_list: Iterable[Any]) -> List[Optional[dict]]:
+    """
+    여러 parsed_slots를 한 번에 정규화 (rec_runs.parsed_slots 오프라인 재처리용)
+    - dict 또는 JSON 문자열 모두 허용
+    - JSON 파싱 실패 항목, dict가 아닌 항목은 None
+    """
+    out: List[Optional[dict]] = []
+    for item in parsed_list:
+        if isinstance(item, (str, bytes)):
+            try:
+                item = json.loads(item)
+            except (TypeError, ValueError):
+                out.append(None)
+                continue
+        out.append(apply_meta_filters(item) if isinstance(item, dict) else None)
+    return out
 
 def build_pinecone_filter(filtered_json: dict) -> dict:
     """메타필터링 결과를 Pinecone filter dict로 변환"""
@@ -1,9 +1,18 @@
 import json
-from ..config import llm
+import time
+from ..config import llm, MODEL_NAME
 from ..prompts.parser_prompt import parse_prompt
+from .llm_cache import LLM_CACHE_ENABLED, PARSER_CACHE, make_key
+from .slot_extractor import extract_slots, low_confidence_slots, record_slot_run
 
 def run_llm_parser(query: str):
-    """사용자 쿼리를 JSON으로 파싱"""
+    """사용자 쿼리를 JSON으로 파싱 (정규화된 질의 기준 캐시)"""
+    key = make_key("parser_prompt.py", MODEL_NAME, query) if LLM_CACHE_ENABLED else None
+    if key is not None:
+        hit, cached = PARSER_CACHE.get(key)
+        if hit:
+            return cached
+    t0 = time.perf_counter()
     try:
         chain = parse_prompt | llm
         ai_response = chain.invoke({"query": query})
@@ -16,6 +25,30 @@ def run_llm_parser(query: str):
             response_text = response_text.split("```")[1].strip()
 
         parsed = json.loads(response_text)
+        if key is not None and isinstance(parsed, dict):
+            PARSER_CACHE.set(key, parsed, cost_ms=(time.perf_counter() - t0) * 1000)
         return parsed
     except Exception as e:
         return {"error": f"파싱 오류: {str(e)}"}
+
+def parse_query_slots(query: str):
+    """
+    룰 기반 슬롯 추출을 먼저 하고, 확신이 낮은 슬롯이 있을 때만 LLM 파서 호출
+    - 룰이 확신 있게 찾은 슬롯은 유지, 나머지(residual)는 LLM 결과로 채움
+    - LLM 파싱이 실패하면 룰 결과로 진행
+    """
+    rule = extract_slots(query)
+    slots = dict(rule["slots"])
+    low = low_confidence_slots(rule)
+    record_slot_run(low)
+    if not low:
+        return slots
+
+    parsed = run_llm_parser(query)
+    if not isinstance(parsed, dict) or "error" in parsed:
+        return slots
+    merged = dict(parsed)
+    for k, v in slots.items():
+        if k not in low and v is not None:
+            merged[k] = v
+    return merged
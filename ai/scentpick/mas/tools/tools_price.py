@@ -1,11 +1,85 @@
 # scentpick/mas/tools/tools_price.py
 from langchain_core.tools import tool
+import os
 import requests, re
-from typing import Optional, List, Dict, Union
+import threading
+from typing import Optional, List, Dict, Union, Tuple
 
 from ..tools.tools_keywords import extract_search_keyword_with_llm
+from ..tools.cache_utils import TTLCache
+from ..tools.tracing import span
 from ..config import naver_client_id, naver_client_secret
 
+NAVER_SHOP_URL = "https://openapi.naver.com/v1/search/shop.json"
+
+# 네이버 쇼핑 응답 캐시 (같은 검색어는 TTL 동안 재사용)
+# - 프롬프트와 무관하므로 llm_cache 레지스트리에 넣지 않음 (프롬프트 수정으로 가격 데이터가 지워지지 않게)
+# - /chatbot/cache/invalidate에서 직접 비움
+NAVER_CACHE = TTLCache(
+    "naver_shop",
+    maxsize=int(os.getenv("NAVER_CACHE_MAXSIZE", "2048")),
+    ttl=float(os.getenv("NAVER_CACHE_TTL", "1800")),
+)
+_naver_lock = threading.Lock()
+_NAVER_STATS = {"calls": 0, "errors": 0}
+
+def get_naver_stats() -> Dict:
+    with _naver_lock:
+        s = dict(_NAVER_STATS)
+    c = NAVER_CACHE.stats()
+    s.update({"cache_hits": c["hits"], "cache_hit_rate": c["hit_rate"]})
+    return s
+
+def _naver_cache_key(search_keyword: str, display: int) -> Tuple[str, int]:
+    return (_norm(search_keyword), int(display))
+
+def _naver_shop_items(search_keyword: str, display: int) -> Tuple[List[Dict], bool]:
+    """
+    네이버 쇼핑 검색 (캐시 우선).
+    Returns (items, cached) — 요청 실패 시 예외 전파
+    """
+    key = _naver_cache_key(search_keyword, display)
+    hit, items = NAVER_CACHE.get(key)
+    if hit:
+        return items, True
+
+    headers = {
+        "X-Naver-Client-Id": naver_client_id,
+        "X-Naver-Client-Secret": naver_client_secret,
+    }
+    params = {"query": search_keyword, "display": display, "sort": "sim"}
+    with _naver_lock:
+        _NAVER_STATS["calls"] += 1
+    try:
+        with span("http", "naver_shop"):
+            r = requests.get(NAVER_SHOP_URL, headers=headers, params=params, timeout=10)
+            r.raise_for_status()
+    except Exception:
+        with _naver_lock:
+            _NAVER_STATS["errors"] += 1
+        raise
+    items = (r.json() or {}).get("items") or []
+    NAVER_CACHE.set(key, items)
+    return items, False
+
+def _build_search_keyword(brand: Optional[str], name: Optional[str], size_ml: Optional[int]) -> Optional[str]:
+    if not (brand and name):
+        return None
+    q = f"{brand} {name}".strip()
+    if size_ml and size_ml > 0:
+        q = f"{q} {int(size_ml)}ml"
+    return q
+
+def _display(topk_fetch: int) -> int:
+    return min(max(int(topk_fetch), 1), 30)
+
+def is_price_cached(brand: str, name: str, size_ml: Optional[int] = None, topk_fetch: int = 10) -> bool:
+    """네트워크 호출 없이 캐시만 확인 (캐시된 후보부터 가격 확인할 때 사용)"""
+    kw = _build_search_keyword(brand, name, size_ml)
+    if not kw:
+        return False
+    return _naver_cache_key(kw, _display(topk_fetch)) in NAVER_CACHE
+
 def _remove_html_tags(text: str) -> str:
     return re.sub(r"<[^>]+>", "", text or "")
 
@@ -50,38 +124,20 @@ def price_tool(
     """
 
     # 1) 질의어 구성
-    if brand and name:
-        q = f"{brand} {name}".strip()
-        if size_ml and size_ml > 0:
-            q = f"{q} {int(size_ml)}ml"
-        search_keyword = q
-    else:
+    search_keyword = _build_search_keyword(brand, name, size_ml)
+    if not search_keyword:
         # LLM이 만든 짧고 잘 먹히는 키워드 사용
         search_keyword = extract_search_keyword_with_llm(user_query)
 
-    # 2) API 호출
-    url = "https://openapi.naver.com/v1/search/shop.json"
-    headers = {
-        "X-Naver-Client-Id": naver_client_id,
-        "X-Naver-Client-Secret": naver_client_secret,
-    }
-    params = {
-        "query": search_keyword,
-        "display": min(max(int(topk_fetch), 1), 30),
-        "sort": "sim",
-    }
-
+    # 2) API 호출 (캐시 우선)
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
+        raw_items, cached = _naver_shop_items(search_keyword, _display(topk_fetch))
     except Exception as e:
         return {"error": f"request_error: {e}"} if return_json else f"❌ 요청 오류: {e}"
 
-    data = r.json() or {}
-    raw_items: List[Dict] = data.get("items") or []
     if not raw_items:
         if return_json:
-            return {"query": search_keyword, "items": [], "under_budget": []}
+            return {"query": search_keyword, "items": [], "under_budget": [], "cached": cached}
         return f"😔 '{search_keyword}'에 대한 검색 결과가 없습니다.\n💡 다른 브랜드명이나 향수명으로 다시 검색해보세요."
 
     # 3) 가공: 제목/가격 + (옵션) 제목 정규식 + (옵션) 브랜드/제품 느슨매칭
@@ -101,7 +157,7 @@ def price_tool(
 
     if not view:
         if return_json:
-            return {"query": search_keyword, "items": [], "under_budget": []}
+            return {"query": search_keyword, "items": [], "under_budget": [], "cached": cached}
         out = f"🔍 '{search_keyword}' 검색 결과:\n\n조건(제목 매칭/필터)에 부합하는 항목이 없습니다."
         return out
 
@@ -111,7 +167,7 @@ def price_tool(
 
     if return_json:
         under = [x for x in top if (budget_krw is None or x["price"] <= int(budget_krw))]
-        return {"query": search_keyword, "items": top, "under_budget": under}
+        return {"query": search_keyword, "items": top, "under_budget": under, "cached": cached}
 
     # 5) 텍스트 모드(호환)
     output = f"🔍 '{search_keyword}' 검색 결과:\n\n"
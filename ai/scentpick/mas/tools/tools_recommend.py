@@ -1,4 +1,5 @@
 # --- stdlib ---
+import logging
 import os
 import re
 from pathlib import Path
@@ -16,6 +17,10 @@ from pinecone import Pinecone
 # --- langchain ---
 from langchain_core.tools import tool
 
+from .tracing import TracedIndex, record_openai_usage, span
+
+logger = logging.getLogger(__name__)
+
 
 # ======================
 # 경로 & 기본 설정
@@ -75,7 +80,8 @@ def get_openai_client(timeout_sec: int = 20):
 @lru_cache()
 def get_pinecone_index(host: str):
     pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-    return pc.Index(host=host)
+    # 트레이스 이름은 호스트의 인덱스 부분만 (perfume-vectordb2-xxxx)
+    return TracedIndex(pc.Index(host=host), host.split("//")[-1].split(".")[0])
 
 
 # ======================
@@ -116,7 +122,9 @@ def _embed_openai_1536(texts: List[str], model: str = "text-embedding-3-small")
     if not texts:
         return np.zeros((0, 1536), dtype=np.float32)
     client = get_openai_client(timeout_sec=20)
-    res = client.embeddings.create(model=model, input=texts)
+    with span("embedding", model, n=len(texts)):
+        res = client.embeddings.create(model=model, input=texts)
+    record_openai_usage(model, getattr(res, "usage", None))
     embs = np.array([d.embedding for d in res.data], dtype=np.float32)
     norms = np.linalg.norm(embs, axis=1, keepdims=True) + 1e-8
     return embs / norms
@@ -405,4 +413,4 @@ def warmup_recommender():
     try:
         _ = get_openai_client().embeddings.create(model="text-embedding-3-small", input=["warmup"])
     except Exception as e:
-        print("[warmup] OpenAI warmup failed:", e)
+        logger.warning(f"[warmup] OpenAI warmup failed: {e}")
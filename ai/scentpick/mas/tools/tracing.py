@@ -0,0 +1,365 @@
+# scentpick/mas/tools/tracing.py
+# 턴 단위 트레이싱: 그래프 노드 + 외부 호출(LLM, 임베딩, Pinecone, Naver)의 시간/토큰/캐시/에러 기록
+# - 현재 턴은 contextvar로 전달 → 노드 코드에 인자를 추가하지 않아도 됨
+#   (다른 스레드/이벤트 루프로 넘기는 작업은 bind_turn / run_in_turn으로 이어줌)
+# - OpenTelemetry span, Prometheus 히스토그램은 패키지가 설치돼 있을 때만 (없으면 턴 요약만)
+# - 턴 요약은 TRACE_IN_PARSED_SLOTS=1 이면 rec_runs.parsed_slots["_timings"]로 저장
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") not in ("0", "false", "False")
+TRACE_IN_PARSED_SLOTS = os.getenv("TRACE_IN_PARSED_SLOTS", "0") in ("1", "true", "True")
+
+try:  # pragma: no cover - optional dependency
+    from opentelemetry import trace as _otel_trace
+    from opentelemetry.trace import Status, StatusCode
+    _tracer = _otel_trace.get_tracer("scentpick.mas")
+except Exception:  # pragma: no cover
+    _otel_trace = None
+    _tracer = None
+
+try:  # pragma: no cover - optional dependency
+    from prometheus_client import Counter, Histogram
+    _BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+    NODE_SECONDS = Histogram("scentpick_node_seconds", "LangGraph node wall time", ["node"], buckets=_BUCKETS)
+    CALL_SECONDS = Histogram("scentpick_call_seconds", "Outbound call wall time", ["kind", "name"], buckets=_BUCKETS)
+    TURN_SECONDS = Histogram("scentpick_turn_seconds", "Whole chat turn wall time", buckets=_BUCKETS)
+    TOKENS = Counter("scentpick_llm_tokens_total", "LLM tokens", ["model", "direction"])
+    ERRORS = Counter("scentpick_errors_total", "Node/outbound call errors", ["kind", "name"])
+    CACHE_LOOKUPS = Counter("scentpick_cache_lookups_total", "In-process cache lookups", ["cache", "result"])
+except Exception:  # pragma: no cover
+    NODE_SECONDS = CALL_SECONDS = TURN_SECONDS = TOKENS = ERRORS = CACHE_LOOKUPS = None
+
+
+# ─────────────────────────────────────────────────────────────
+# 로깅 설정 (print 대신 레벨별 로그)
+# ─────────────────────────────────────────────────────────────
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        turn = current_turn()
+        if turn is not None:
+            out["turn_id"] = turn.turn_id
+            if turn.thread_id:
+                out["thread_id"] = turn.thread_id
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, ensure_ascii=False)
+
+
+def configure_logging() -> None:
+    """LOG_LEVEL(기본 INFO), LOG_FORMAT=json|text — 앱 시작 시 한 번 호출"""
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "text") == "json":
+        handler.setFormatter(_JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+
+
+# ─────────────────────────────────────────────────────────────
+# 턴 트레이스
+# ─────────────────────────────────────────────────────────────
+class TurnTrace:
+    def __init__(self, turn_id: Optional[str] = None, thread_id: Optional[str] = None):
+        # turn_id는 요청(턴)마다 새로, 같은 대화의 턴들은 thread_id로 묶음
+        self.turn_id = turn_id or uuid.uuid4().hex[:12]
+        self.thread_id = thread_id
+        self.started = time.perf_counter()
+        self.nodes: List[Dict[str, Any]] = []
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.tokens: Dict[str, int] = {"in": 0, "out": 0}
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.errors: List[str] = []
+        self._lock = threading.Lock()
+
+    def add_node(self, name: str, ms: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.nodes.append({"name": name, "ms": round(ms, 1), **({"error": error} if error else {})})
+
+    def add_call(self, kind: str, name: str, ms: float, error: Optional[str] = None) -> None:
+        key = f"{kind}:{name}"
+        with self._lock:
+            c = self.calls.setdefault(key, {"n": 0, "ms": 0.0, "errors": 0})
+            c["n"] += 1
+            c["ms"] = round(c["ms"] + ms, 1)
+            if error:
+                c["errors"] += 1
+                self.errors.append(f"{key}: {error}")
+
+    def add_tokens(self, tokens_in: int, tokens_out: int) -> None:
+        with self._lock:
+            self.tokens["in"] += int(tokens_in or 0)
+            self.tokens["out"] += int(tokens_out or 0)
+
+    def add_cache(self, name: str, hit: bool) -> None:
+        with self._lock:
+            c = self.cache.setdefault(name, {"hit": 0, "miss": 0})
+            c["hit" if hit else "miss"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "turn_id": self.turn_id,
+                **({"thread_id": self.thread_id} if self.thread_id else {}),
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+                "nodes": list(self.nodes),
+                "calls": {k: dict(v) for k, v in self.calls.items()},
+                "tokens": dict(self.tokens),
+                "cache": {k: dict(v) for k, v in self.cache.items()},
+                **({"errors": list(self.errors[:10])} if self.errors else {}),
+            }
+
+
+_TURN: contextvars.ContextVar[Optional[TurnTrace]] = contextvars.ContextVar("scentpick_turn", default=None)
+
+
+def current_turn() -> Optional[TurnTrace]:
+    return _TURN.get()
+
+
+def bind_turn(turn: Optional[TurnTrace]) -> None:
+    """다른 스레드/태스크에서 같은 턴에 기록하도록 연결 (그 컨텍스트 안에서 호출)"""
+    _TURN.set(turn)
+
+
+def run_in_turn(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """executor.submit(run_in_turn(fn), ...) — 제출 시점의 턴을 워커 스레드에 이어줌"""
+    turn = current_turn()
+
+    def wrapper(*args, **kwargs):
+        token = _TURN.set(turn)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _TURN.reset(token)
+    return wrapper
+
+
+@contextmanager
+def turn_scope(turn_id: Optional[str] = None, thread_id: Optional[str] = None) -> Iterator[TurnTrace]:
+    turn = TurnTrace(turn_id, thread_id)
+    token = _TURN.set(turn)
+    try:
+        yield turn
+    finally:
+        _TURN.reset(token)
+        s = turn.summary()
+        if TURN_SECONDS is not None:
+            TURN_SECONDS.observe(s["total_ms"] / 1000)
+        logger.info("turn %s (thread %s) done in %.0fms nodes=%s tokens=%s", turn.turn_id, turn.thread_id,
+                    s["total_ms"], [(n["name"], n["ms"]) for n in s["nodes"]], s["tokens"])
+        logger.debug("turn trace %s", json.dumps(s, ensure_ascii=False))
+
+
+def attach_timings(parsed_slots: Optional[Dict[str, Any]], trace: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """TRACE_IN_PARSED_SLOTS=1 이면 rec_runs.parsed_slots에 턴 요약(_timings)을 덧붙임"""
+    slots = dict(parsed_slots or {})
+    if TRACE_IN_PARSED_SLOTS and trace:
+        slots["_timings"] = trace
+    return slots
+
+
+# ─────────────────────────────────────────────────────────────
+# span / 기록
+# ─────────────────────────────────────────────────────────────
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    with span("pinecone", "query", top_k=3): ...
+    kind == "node" 이면 노드 목록에, 그 외는 외부 호출 집계에 기록
+    """
+    if not TRACING_ENABLED:
+        yield attrs
+        return
+    otel_span = None
+    if _tracer is not None:
+        otel_span = _tracer.start_span(f"{kind}.{name}", attributes={k: str(v) for k, v in attrs.items()})
+    t0 = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        turn = current_turn()
+        if kind == "node":
+            if turn is not None:
+                turn.add_node(name, ms, error)
+            if NODE_SECONDS is not None:
+                NODE_SECONDS.labels(node=name).observe(ms / 1000)
+        else:
+            if turn is not None:
+                turn.add_call(kind, name, ms, error)
+            if CALL_SECONDS is not None:
+                CALL_SECONDS.labels(kind=kind, name=name).observe(ms / 1000)
+        if error and ERRORS is not None:
+            ERRORS.labels(kind=kind, name=name).inc()
+        if otel_span is not None:
+            if error:
+                otel_span.set_status(Status(StatusCode.ERROR, error))
+            otel_span.end()
+        logger.debug("%s.%s %.1fms%s", kind, name, ms, f" error={error}" if error else "")
+
+
+def traced_node(name: str, fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """graph.add_node(name, traced_node(name, fn))"""
+    def wrapper(state):
+        with span("node", name):
+            return fn(state)
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def record_tokens(model: str, tokens_in: int, tokens_out: int) -> None:
+    if not TRACING_ENABLED:
+        return
+    turn = current_turn()
+    if turn is not None:
+        turn.add_tokens(tokens_in, tokens_out)
+    if TOKENS is not None:
+        TOKENS.labels(model=model, direction="in").inc(int(tokens_in or 0))
+        TOKENS.labels(model=model, direction="out").inc(int(tokens_out or 0))
+
+
+def record_cache(name: str, hit: bool) -> None:
+    if not TRACING_ENABLED:
+        return
+    turn = current_turn()
+    if turn is not None:
+        turn.add_cache(name, hit)
+    if CACHE_LOOKUPS is not None:
+        CACHE_LOOKUPS.labels(cache=name, result="hit" if hit else "miss").inc()
+
+
+def record_openai_usage(model: str, usage: Any) -> None:
+    """openai SDK 응답의 usage(prompt_tokens/completion_tokens) 기록"""
+    if usage is None:
+        return
+    record_tokens(model, getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+
+
+# ─────────────────────────────────────────────────────────────
+# 외부 호출 래퍼
+# ─────────────────────────────────────────────────────────────
+class LLMTracingCallback(BaseCallbackHandler):
+    """ChatOpenAI callbacks=[...]: 호출 시간 + 토큰 사용량 (스트리밍은 stream_usage=True 필요)"""
+
+    def __init__(self):
+        self._starts: Dict[Any, tuple] = {}
+
+    def _start(self, serialized, run_id, kwargs):
+        name = ((kwargs.get("invocation_params") or {}).get("model_name")
+                or (kwargs.get("invocation_params") or {}).get("model")
+                or (serialized or {}).get("name") or "llm")
+        otel_span = _tracer.start_span(f"llm.{name}") if (_tracer is not None and TRACING_ENABLED) else None
+        self._starts[run_id] = (time.perf_counter(), name, current_turn(), otel_span)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(serialized, run_id, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(serialized, run_id, kwargs)
+
+    def _finish(self, run_id, error: Optional[str] = None, response=None):
+        started = self._starts.pop(run_id, None)
+        if not started or not TRACING_ENABLED:
+            return
+        t0, name, turn, otel_span = started
+        ms = (time.perf_counter() - t0) * 1000
+        if turn is not None:
+            turn.add_call("llm", name, ms, error)
+        if CALL_SECONDS is not None:
+            CALL_SECONDS.labels(kind="llm", name=name).observe(ms / 1000)
+        if error and ERRORS is not None:
+            ERRORS.labels(kind="llm", name=name).inc()
+        tin, tout = _usage_from_result(response)
+        if tin or tout:
+            if turn is not None:
+                turn.add_tokens(tin, tout)
+            if TOKENS is not None:
+                TOKENS.labels(model=name, direction="in").inc(tin)
+                TOKENS.labels(model=name, direction="out").inc(tout)
+        if otel_span is not None:
+            otel_span.set_attribute("llm.tokens_in", tin)
+            otel_span.set_attribute("llm.tokens_out", tout)
+            if error:
+                otel_span.set_status(Status(StatusCode.ERROR, error))
+            otel_span.end()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, response=response)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=f"{type(error).__name__}: {error}"[:200])
+
+
+def _usage_from_result(response) -> tuple:
+    if response is None:
+        return 0, 0
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return int(usage.get("prompt_tokens", 0)), int(usage.get("completion_tokens", 0))
+    # 스트리밍: 마지막 청크의 usage_metadata가 메시지에 합쳐짐
+    tin = tout = 0
+    for gens in getattr(response, "generations", None) or []:
+        for g in gens:
+            meta = getattr(getattr(g, "message", None), "usage_metadata", None) or {}
+            tin += int(meta.get("input_tokens", 0))
+            tout += int(meta.get("output_tokens", 0))
+    return tin, tout
+
+
+class TracedOpenAIEmbeddings(OpenAIEmbeddings):
+    """임베딩 호출 시간 기록 (OpenAIEmbeddings와 동일하게 사용)"""
+
+    def embed_query(self, text: str) -> List[float]:
+        with span("embedding", self.model):
+            return super().embed_query(text)
+
+    def embed_documents(self, texts: List[str], chunk_size: Optional[int] = None, **kwargs) -> List[List[float]]:
+        with span("embedding", self.model, n=len(texts)):
+            return super().embed_documents(texts, chunk_size=chunk_size, **kwargs)
+
+
+class TracedIndex:
+    """Pinecone Index 프록시: query/fetch/upsert 시간 기록, 나머지 속성은 그대로 위임"""
+
+    _TRACED = ("query", "fetch", "upsert")
+
+    def __init__(self, index: Any, name: str = "index"):
+        self._index = index
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        target = getattr(self._index, attr)
+        if attr not in self._TRACED or not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            with span("pinecone", f"{self._name}.{attr}"):
+                return target(*args, **kwargs)
+        return call
@@ -0,0 +1,170 @@
+# scentpick/mas/tools/turn_cache.py
+# 추천 턴 응답 캐시 (TURN_CACHE_ENABLED=1 일 때만)
+# - 추천 맥락이 없는 대화 첫 추천 턴("여름에 쓸 시원한 향수 추천해줘")은 같은 질의면 같은
+#   search_results/perfume_list와 거의 같은 답변이 나오므로, 그래프 실행 전체를 재생으로 대체
+# - 키: (supervisor 프롬프트 버전, 모델, 정규화 질의, LAST_AGENT, 패싯 슬롯, 카탈로그 버전)
+#   라우팅된 에이전트는 항목에 저장 — supervisor 입력은 (질의, REC_CONTEXT, LAST_AGENT)뿐이고
+#   REC_CONTEXT가 없는 턴만 키를 받으므로 라우팅은 키와 1:1 (SUPERVISOR_CACHE 키와 같은 구성)
+# - hit이면 그래프를 돌리지 않고 체크포인트에 이번 턴(질의/답변/rec_history 등)을 그대로 기록
+# - 카탈로그(벡터DB/상품 DB)가 바뀌면 set_catalog_version()으로 전체 무효화
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ..config import MODEL_NAME
+from .cache_utils import TTLCache
+from .llm_cache import make_key, register_cache
+from .slot_extractor import extract_slots
+from .state_compact import CATALOG_CACHE
+
+logger = logging.getLogger(__name__)
+
+TURN_CACHE_ENABLED = os.getenv("TURN_CACHE_ENABLED", "0") in ("1", "true", "True")
+TURN_CACHE_TTL = float(os.getenv("TURN_CACHE_TTL", "1800"))
+TURN_CACHE_MAXSIZE = int(os.getenv("TURN_CACHE_MAXSIZE", "1024"))
+# 결과가 질의만으로 정해지는 추천 에이전트만
+TURN_CACHE_AGENTS = frozenset(
+    a.strip() for a in os.getenv("TURN_CACHE_AGENTS", "LLM_parser,ML_agent").split(",") if a.strip()
+)
+
+_FACET_SLOTS = ("brand", "concentration", "day_night_score", "gender", "season_score", "sizes", "recommendation_count")
+
+# 프롬프트가 바뀌면 llm_cache와 함께 비워짐
+TURN_CACHE = register_cache(TTLCache("turn", maxsize=TURN_CACHE_MAXSIZE, ttl=TURN_CACHE_TTL))
+
+_lock = threading.Lock()
+_catalog = {"version": os.getenv("CATALOG_VERSION", "0"), "bumps": 0}
+_STATS = {"bypassed": 0, "stored": 0, "replay_errors": 0}
+
+
+def catalog_version() -> str:
+    with _lock:
+        return _catalog["version"]
+
+
+def set_catalog_version(version: Optional[str] = None) -> str:
+    """카탈로그 버전 변경 + 턴/카탈로그 metadata 캐시 비우기 (version 없으면 현재 버전에 +N 붙여 올림)"""
+    with _lock:
+        if version is None:
+            _catalog["bumps"] += 1
+            base = os.getenv("CATALOG_VERSION", "0")
+            version = f"{base}+{_catalog['bumps']}"
+        _catalog["version"] = str(version)
+    TURN_CACHE.clear()
+    CATALOG_CACHE.clear()
+    logger.info(f"🗂️ catalog version → {version} (turn/catalog cache cleared)")
+    return str(version)
+
+
+def _has_rec_context(values: Dict[str, Any]) -> bool:
+    return bool(values.get("rec_history") or values.get("perfume_list"))
+
+
+def turn_cache_key(graph_app: Any, config: Dict[str, Any], query: str,
+                   image_url: Optional[str] = None) -> Optional[Tuple]:
+    """캐시 대상 턴이면 키, 아니면 None (이미지 / 이미 추천 맥락이 있는 대화)"""
+    if not TURN_CACHE_ENABLED or image_url:
+        return None
+    try:
+        values = graph_app.get_state(config).values or {}
+    except Exception as e:
+        logger.warning(f"⚠️ turn cache: state 조회 실패: {e}")
+        return None
+    if _has_rec_context(values):
+        with _lock:
+            _STATS["bypassed"] += 1
+        return None
+    slots = extract_slots(query)["slots"]
+    facets = tuple((k, slots.get(k)) for k in _FACET_SLOTS if slots.get(k) is not None)
+    return make_key("supervisor_prompt.py", MODEL_NAME, query, values.get("last_agent"), facets, catalog_version())
+
+
+def turn_cache_replay(graph_app: Any, config: Dict[str, Any], key: Hashable, query: str) -> Optional[Dict[str, Any]]:
+    """hit이면 이번 턴을 체크포인트에 기록하고 그래프 출력과 같은 모양의 state 반환, miss면 None"""
+    hit, entry = TURN_CACHE.get(key)
+    if not hit:
+        return None
+    agent = entry["chosen_agent"]
+    rec_entry = dict(entry["rec_entry"], ts=datetime.now(timezone.utc).isoformat(), cached=True)
+    update = {
+        "messages": [HumanMessage(content=query), AIMessage(content=entry["message"])],
+        "next": agent,
+        "router_json": entry["router_json"],
+        "parsed_slots": entry["parsed_slots"],
+        "search_results": entry["search_results"],
+        "perfume_list": entry["perfume_list"],
+        "final_answer": entry["final_answer"],
+        "rec_history": [rec_entry],
+        "last_agent": agent,
+        "image_url": None,
+    }
+    try:
+        # 에이전트 노드가 실행된 것처럼 기록 → 다음 턴의 rec_echo/price_agent/supervisor가 그대로 읽음
+        graph_app.update_state(config, update, as_node=agent)
+        return graph_app.get_state(config).values
+    except Exception as e:
+        logger.warning(f"⚠️ turn cache replay 실패 ({agent}): {e}")
+        with _lock:
+            _STATS["replay_errors"] += 1
+        return None
+
+
+def turn_cache_store(key: Hashable, out: Dict[str, Any], cost_ms: float = 0.0) -> bool:
+    """그래프 출력이 캐시할 만한 추천 턴이면 저장 (에러 응답/추천 없음은 저장 안 함)"""
+    agent = out.get("last_agent")
+    rj = out.get("router_json") or {}
+    if agent not in TURN_CACHE_AGENTS or not isinstance(rj, dict) or rj.get("next") != agent:
+        return False
+    rec = out.get("rec_history") or []
+    # 맥락 없는 턴만 키를 받으므로 rec_history는 이번 턴 항목 하나뿐이어야 함
+    if len(rec) != 1 or rec[-1].get("source") != agent or not rec[-1].get("items"):
+        return False
+    ai_msgs = [m for m in out.get("messages", []) if isinstance(m, AIMessage)]
+    if not ai_msgs:
+        return False
+    TURN_CACHE.set(key, {
+        "chosen_agent": agent,
+        "router_json": rj,
+        "message": ai_msgs[-1].content,
+        "final_answer": out.get("final_answer"),
+        "parsed_slots": out.get("parsed_slots") or {},
+        "search_results": out.get("search_results") or {"matches": []},
+        "perfume_list": out.get("perfume_list") or [],
+        "rec_entry": rec[-1],
+    }, cost_ms=cost_ms)
+    with _lock:
+        _STATS["stored"] += 1
+    return True
+
+
+def run_with_turn_cache(graph_app: Any, init_state: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """graph_app.invoke 대체: 캐시 대상 턴이면 재생/저장, 아니면 그대로 실행"""
+    query = init_state["messages"][-1].content
+    key = turn_cache_key(graph_app, config, query, init_state.get("image_url"))
+    if key is not None:
+        out = turn_cache_replay(graph_app, config, key, query)
+        if out is not None:
+            logger.info(f"⚡ turn cache hit: {out.get('last_agent')}")
+            return out
+    t0 = time.perf_counter()
+    out = graph_app.invoke(init_state, config=config)
+    if key is not None:
+        turn_cache_store(key, out, cost_ms=(time.perf_counter() - t0) * 1000)
+    return out
+
+
+def get_turn_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        extra = dict(_STATS)
+    return {
+        **TURN_CACHE.stats(),
+        **extra,
+        "enabled": TURN_CACHE_ENABLED,
+        "catalog_version": catalog_version(),
+        "agents": sorted(TURN_CACHE_AGENTS),
+    }
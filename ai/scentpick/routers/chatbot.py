@@ -7,6 +7,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, Any, Dict, List
 import json
+import re
 
 from fastapi import APIRouter, HTTPException, Header, Depends, Request
 from fastapi.responses import StreamingResponse
@@ -14,11 +15,20 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import asyncio
+import logging
 
 from langchain_core.messages import HumanMessage, AIMessage
 from scentpick.mas.perfume_chatbot import app as graph_app
+from scentpick.mas.tools.llm_cache import check_prompt_changes, get_llm_cache_stats, invalidate_llm_caches
+from scentpick.mas.tools.faq_cache import invalidate_faq_cache
+from scentpick.mas.tools.tools_price import NAVER_CACHE, get_naver_stats
+from scentpick.mas.tools.tracing import attach_timings, turn_scope
+from scentpick.mas.tools.state_compact import hydrate_search_results
+from scentpick.mas.tools.turn_cache import get_turn_cache_stats, run_with_turn_cache, set_catalog_version
 from database import SessionLocal
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
 # -----------------------------
@@ -55,7 +65,10 @@ def generate_ai_response(query: str, thread_id: str, image_url: Optional[str] =
     config = {"configurable": {"thread_id": thread_id}}
 
     try:
-        out = graph_app.invoke(init_state, config=config)
+        # 턴 단위 트레이스: 노드/외부 호출 시간, 토큰, 캐시 hit/miss
+        # TURN_CACHE_ENABLED=1: 추천 맥락 없는 첫 추천 턴은 캐시된 턴을 재생
+        with turn_scope(thread_id=thread_id) as turn:
+            out = run_with_turn_cache(graph_app, init_state, config)
 
         # 라우팅된 노드명 추출
         chosen = None
@@ -71,9 +84,11 @@ def generate_ai_response(query: str, thread_id: str, image_url: Optional[str] =
         return {
             "answer": answer,
             "parsed_slots": out.get("parsed_slots", {}) or {},
-            "search_results": out.get("search_results", {"matches": []}) or {"matches": []},
+            # state에는 슬림 레코드만 있으므로 전체 metadata(text 등)를 카탈로그 캐시에서 복원
+            "search_results": hydrate_search_results(out.get("search_results") or {"matches": []}),
             "perfume_list": out.get("perfume_list", []) or [],
             "chosen_agent": chosen,
+            "trace": turn.summary(),
         }
     except Exception as e:
         return {
@@ -103,7 +118,8 @@ async def generate_ai_response_streaming(query: str, thread_id: str, image_url:
     try:
         # 현재는 기존 방식으로 응답을 생성하고 청크로 나누어 전송
         # 향후 LangGraph에서 스트리밍을 지원하면 해당 방식으로 변경 가능
-        out = graph_app.invoke(init_state, config=config)
+        with turn_scope(thread_id=thread_id) as turn:
+            out = run_with_turn_cache(graph_app, init_state, config)
 
         # 라우팅된 노드명 추출
         chosen = None
@@ -154,9 +170,10 @@ async def generate_ai_response_streaming(query: str, thread_id: str, image_url:
         yield {
             "done": True,
             "parsed_slots": out.get("parsed_slots", {}) or {},
-            "search_results": out.get("search_results", {"matches": []}) or {"matches": []},
+            "search_results": hydrate_search_results(out.get("search_results") or {"matches": []}),
             "perfume_list": perfume_list,
             "chosen_agent": chosen,
+            "trace": turn.summary(),
         }
 
     except Exception as e:
@@ -235,7 +252,7 @@ def django_chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         ai_output = generate_ai_response(request.query, thread_id, request.image_url)
 
         ai_answer      = ai_output["answer"]
-        parsed_slots   = ai_output.get("parsed_slots", {})
+        parsed_slots   = attach_timings(ai_output.get("parsed_slots", {}), ai_output.get("trace"))
         search_results = ai_output.get("search_results", {"matches": []})
         chosen_agent   = ai_output.get("chosen_agent")
 
@@ -340,7 +357,7 @@ def django_chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
                     )
                     inserted = True
                 except Exception as e:
-                    print(f"❌ rec_candidates insert error (perfume_list idx={idx}): {e}")
+                    logger.error(f"❌ rec_candidates insert error (perfume_list idx={idx}): {e}")
 
         # 7) 대화 updated_at 갱신
         db.execute(
@@ -494,7 +511,7 @@ async def chat_stream(
             ai_msg_id = res.lastrowid
 
             # 5) rec_runs 저장
-            parsed_slots = ai_output.get("parsed_slots", {})
+            parsed_slots = attach_timings(ai_output.get("parsed_slots", {}), ai_output.get("trace"))
             chosen_agent = ai_output.get("chosen_agent")
 
             res = db.execute(
@@ -560,7 +577,7 @@ async def chat_stream(
                             },
                         )
                     except Exception as e:
-                        print(f"❌ rec_candidates insert error (streaming idx={idx}): {e}")
+                        logger.error(f"❌ rec_candidates insert error (streaming idx={idx}): {e}")
 
             # 7) 대화 updated_at 갱신
             db.execute(
@@ -592,3 +609,40 @@ async def chat_stream(
         "Transfer-Encoding": "chunked",
         }
     )
+
+# -----------------------------
+# 캐시 상태/무효화 (운영용)
+# -----------------------------
+@router.get("/cache/stats", dependencies=[Depends(verify_service_token)])
+def cache_stats():
+    check_prompt_changes(force=True)
+    return {"llm": get_llm_cache_stats(), "turn": get_turn_cache_stats(), "naver": get_naver_stats()}
+
+@router.post("/cache/invalidate", dependencies=[Depends(verify_service_token)])
+def cache_invalidate():
+    invalidate_llm_caches()
+    invalidate_faq_cache()
+    NAVER_CACHE.clear()
+    return {"ok": True}
+
+class CatalogInvalidateRequest(BaseModel):
+    version: Optional[str] = None
+
+@router.post("/cache/catalog/invalidate", dependencies=[Depends(verify_service_token)])
+def catalog_cache_invalidate(body: Optional[CatalogInvalidateRequest] = None):
+    """벡터DB/상품 카탈로그 갱신 후 호출. 카탈로그 버전을 올리고 턴 캐시를 비움"""
+    version = set_catalog_version(body.version if body else None)
+    return {"ok": True, "catalog_version": version}
+
+class FAQInvalidateRequest(BaseModel):
+    pattern: Optional[str] = None
+
+@router.post("/cache/faq/invalidate", dependencies=[Depends(verify_service_token)])
+def faq_cache_invalidate(body: Optional[FAQInvalidateRequest] = None):
+    """FAQ 캐시 무효화. pattern(정규식)이 있으면 질문/답변에 걸리는 항목만"""
+    pattern = body.pattern if body else None
+    try:
+        removed = invalidate_faq_cache(pattern)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"invalid pattern: {e}")
+    return {"ok": True, "removed": removed}
@@ -0,0 +1,15 @@
+# tests/conftest.py
+# 노드/툴 모듈은 import 시점에 config(OpenAI/Pinecone 클라이언트)를 잡으므로
+# 테스트 모듈을 모으기 전에 benchmarks의 가짜 업스트림을 설치 (네트워크/키 없음, 지연 0)
+import pytest
+
+from benchmarks.harness import install
+
+BENCH = install("replay", profile="zero")
+
+
+@pytest.fixture
+def bench():
+    BENCH.clear_caches()
+    yield BENCH
+    BENCH.clear_caches()
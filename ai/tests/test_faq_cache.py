@@ -0,0 +1,120 @@
+# tests/test_faq_cache.py
+# FAQ 의미 캐시: 여러 워커가 같은 FAQ_CACHE_PATH에 저장할 때 병합/무효화 전파, 임계값 보정
+import os
+
+import numpy as np
+import pytest
+
+from scentpick.mas.tools import faq_cache
+from scentpick.mas.tools.faq_cache import SemanticFAQCache, calibrate, load_calibration_pairs
+
+PAIRS_PATH = os.path.join(os.path.dirname(__file__), "data", "faq_calibration_pairs.jsonl")
+
+
+def _vec(seed, dim=16):
+    return np.random.default_rng(seed).normal(size=dim).tolist()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "faq" / "cache")
+
+
+def test_defaults_are_conservative(monkeypatch):
+    if "FAQ_CACHE_ENABLED" not in os.environ:
+        assert faq_cache.FAQ_CACHE_ENABLED is False
+    if "FAQ_CACHE_THRESHOLD" not in os.environ:
+        assert faq_cache.FAQ_CACHE_THRESHOLD >= 0.97
+
+
+def test_workers_merge_instead_of_overwrite(path):
+    w1, w2 = SemanticFAQCache(), SemanticFAQCache()
+    w1.add("탑노트가 뭐야?", "answer-1", _vec(1))
+    w1.save(path, "v1")
+    w2.add("레이어링이 뭐야?", "answer-2", _vec(2))
+    w2.save(path, "v1")
+
+    fresh = SemanticFAQCache()
+    assert fresh.load(path, "v1") == 2
+    assert fresh.lookup_exact("탑노트가 뭐야?") == (True, "answer-1")
+    assert fresh.lookup_exact("레이어링이 뭐야?") == (True, "answer-2")
+    # 병합된 항목은 저장한 워커 메모리에도 들어옴
+    assert w2.lookup_exact("탑노트가 뭐야?") == (True, "answer-1")
+    assert not [n for n in os.listdir(os.path.dirname(path)) if ".tmp" in n]
+
+
+def test_same_question_keeps_local_answer(path):
+    w1, w2 = SemanticFAQCache(), SemanticFAQCache()
+    w1.add("탑노트가 뭐야?", "old", _vec(1))
+    w1.save(path, "v1")
+    w2.add("탑노트가 뭐야?", "new", _vec(1))
+    w2.save(path, "v1")
+
+    fresh = SemanticFAQCache()
+    assert fresh.load(path, "v1") == 1
+    assert fresh.lookup_exact("탑노트가 뭐야?") == (True, "new")
+
+
+def test_published_invalidation_is_not_resurrected(path):
+    w1, w2 = SemanticFAQCache(), SemanticFAQCache()
+    w1.add("탑노트가 뭐야?", "answer-1", _vec(1))
+    w1.save(path, "v1")
+    w2.load(path, "v1")
+    w2.add("레이어링이 뭐야?", "answer-2", _vec(2))
+
+    # 관리 작업: w1에서 전체 무효화 후 전파
+    w1.invalidate()
+    w1.publish(path, "v1")
+
+    # 아직 sync 안 한 w2가 저장 → 자기 항목을 덮어쓰지 않고 저장본(빈 캐시)을 따름
+    w2.save(path, "v1")
+    assert len(w2) == 0
+    fresh = SemanticFAQCache()
+    assert fresh.load(path, "v1") == 0
+
+
+def test_other_prompt_version_is_not_merged(path):
+    w1, w2 = SemanticFAQCache(), SemanticFAQCache()
+    w1.add("탑노트가 뭐야?", "answer-1", _vec(1))
+    w1.save(path, "v1")
+    w2.add("레이어링이 뭐야?", "answer-2", _vec(2))
+    w2.save(path, "v2")
+
+    fresh = SemanticFAQCache()
+    assert fresh.load(path, "v2") == 1
+    assert fresh.lookup_exact("탑노트가 뭐야?") == (False, None)
+
+
+def test_merge_respects_maxsize(path):
+    w1 = SemanticFAQCache()
+    for i in range(3):
+        w1.add(f"q{i}", f"a{i}", _vec(i))
+    w1.save(path, "v1")
+    w2 = SemanticFAQCache(maxsize=2)
+    w2.add("mine", "a", _vec(10))
+    w2.save(path, "v1")
+    assert len(w2) == 2
+    # 이 워커에서 쓴 항목은 남음
+    assert w2.lookup_exact("mine") == (True, "a")
+
+
+def test_calibration_pairs_file():
+    pairs = load_calibration_pairs(PAIRS_PATH)
+    assert len(pairs) >= 40
+    assert any(same for *_, same in pairs) and any(not same for *_, same in pairs)
+
+
+def test_calibrate_recommends_lowest_safe_threshold():
+    # 같은 쌍은 코사인 0.99, 다른 쌍은 0.945가 되도록 만든 가짜 임베딩
+    base = np.array([1.0, 0.0, 0.0])
+
+    def rotate(cos):
+        return [cos, float(np.sqrt(1 - cos * cos)), 0.0]
+
+    table = {"a": base.tolist(), "a'": rotate(0.99), "b": base.tolist(), "b'": rotate(0.945)}
+    report = calibrate([("a", "a'", True), ("b", "b'", False)],
+                       lambda texts: [table[t] for t in texts])
+    assert report["recommended"] == 0.95
+    by_th = {r["threshold"]: r for r in report["thresholds"]}
+    assert by_th[0.94]["false_positives"] == 1
+    assert by_th[0.99]["recall"] == 1.0
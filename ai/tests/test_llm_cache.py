@@ -0,0 +1,85 @@
+# tests/test_llm_cache.py
+# 프롬프트 파일 버전이 캐시 키에 들어가고, 파일이 바뀌면 등록된 캐시가 비워지는지 (prompts/ 대신 임시 폴더)
+import pytest
+
+from scentpick.mas.tools import llm_cache as lc
+from scentpick.mas.tools.cache_utils import TTLCache
+
+
+@pytest.fixture
+def prompts(tmp_path, monkeypatch):
+    monkeypatch.setattr(lc, "PROMPTS_DIR", tmp_path)
+    monkeypatch.setattr(lc, "_fingerprint", ())
+    monkeypatch.setattr(lc, "_versions", {})
+    monkeypatch.setattr(lc, "_last_check", 0.0)
+    monkeypatch.setattr(lc, "_hooks", [])
+    monkeypatch.setattr(lc, "_CACHES", list(lc._CACHES))
+    (tmp_path / "parser_prompt.py").write_text('PROMPT = "v1"\n', encoding="utf-8")
+    (tmp_path / "other_prompt.py").write_text('PROMPT = "other"\n', encoding="utf-8")
+    assert lc.check_prompt_changes(force=True) == []   # 첫 로드는 변경 아님
+    return tmp_path
+
+
+def _edit(path, text):
+    path.write_text(text, encoding="utf-8")
+
+
+def test_normalize_query():
+    assert lc.normalize_query("  여름   향수 추천해줘?! ") == "여름 향수 추천해줘"
+    assert lc.normalize_query("ＥＤＰ Chanel") == "edp chanel"
+    assert lc.normalize_query(None) == ""
+
+
+def test_key_follows_prompt_version(prompts):
+    key = lc.make_key("parser_prompt.py", "gpt-4o-mini", "여름 향수", None, 3)
+    assert key == lc.make_key("parser_prompt.py", "gpt-4o-mini", " 여름 향수?", "", "3")
+    assert key[0] != "missing"
+    assert lc.make_key("nope.py", "gpt-4o-mini", "여름 향수")[0] == "missing"
+
+    _edit(prompts / "parser_prompt.py", 'PROMPT = "v2 with more rules"\n')
+    assert lc.check_prompt_changes(force=True) == ["parser_prompt.py"]
+    assert lc.make_key("parser_prompt.py", "gpt-4o-mini", "여름 향수", None, 3) != key
+
+
+def test_prompt_edit_clears_registered_caches(prompts):
+    extra = lc.register_cache(TTLCache("test_extra", maxsize=8, ttl=60))
+    assert lc.register_cache(extra) is extra and lc._CACHES.count(extra) == 1
+    unregistered = TTLCache("test_unregistered", maxsize=8, ttl=60)
+    for c in (lc.PARSER_CACHE, extra, unregistered):
+        c.set("k", 1)
+    seen = []
+    lc.on_prompts_changed(seen.append)
+
+    # 내용이 같으면(다시 저장만 함) 변경 아님
+    _edit(prompts / "other_prompt.py", 'PROMPT = "other"\n')
+    assert lc.check_prompt_changes(force=True) == []
+    assert "k" in extra
+
+    _edit(prompts / "other_prompt.py", 'PROMPT = "other, edited"\n')
+    assert lc.check_prompt_changes(force=True) == ["other_prompt.py"]
+    assert seen == [["other_prompt.py"]]
+    assert "k" not in lc.PARSER_CACHE and "k" not in extra
+    assert "k" in unregistered
+    assert "test_extra" in lc.get_llm_cache_stats()
+
+
+def test_change_check_is_throttled(prompts, monkeypatch):
+    monkeypatch.setattr(lc, "PROMPT_CHECK_INTERVAL", 3600.0)
+    version = lc.prompt_version("parser_prompt.py")
+    _edit(prompts / "parser_prompt.py", 'PROMPT = "v3, edited again"\n')
+    # 주기 안에서는 stat도 하지 않음 → 강제 확인(/chatbot/cache/stats) 시 반영
+    assert lc.prompt_version("parser_prompt.py") == version
+    assert lc.check_prompt_changes(force=True) == ["parser_prompt.py"]
+    assert lc.prompt_version("parser_prompt.py") != version
+
+
+def test_cache_endpoints(prompts):
+    from scentpick.routers.chatbot import cache_invalidate, cache_stats
+
+    lc.SUPERVISOR_CACHE.set("k", 1)
+    stats = cache_stats()
+    assert {"run_llm_parser", "supervisor"} <= set(stats["llm"])
+    assert stats["llm"]["supervisor"]["size"] >= 1
+    assert {"turn", "naver"} <= set(stats)
+    assert cache_invalidate() == {"ok": True}
+    assert "k" not in lc.SUPERVISOR_CACHE
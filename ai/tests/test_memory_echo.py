@@ -0,0 +1,95 @@
+# tests/test_memory_echo.py
+# memory_echo: 기본(auto)은 로컬 추출 요약, 답변이 MEMORY_ECHO_LOCAL_MAX_CHARS보다 길거나 인용할 문장이 없으면 LLM
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from scentpick.mas.nodes import memory_echo_node as me
+from scentpick.mas.tools.extractive_summary import is_complex_turn, summarize_turn
+
+QUESTION = "여름에 쓸 샤넬 여성 향수 10만원 이하로 추천해줘"
+ANSWER = """안녕하세요! 조건에 맞는 향수를 골라봤어요.
+1. **Chanel Chance Eau Tendre** - 상큼한 자몽과 재스민이 어우러져 여름에 가볍게 쓰기 좋아요.
+2. **Chanel Paris Deauville** (EDT) - 바질과 시트러스가 시원하게 퍼져요.
+3. **Chanel Coco Mademoiselle**
+여름 낮에는 시트러스 계열이 덥지 않게 느껴져서 부담이 적어요.
+💰 **가격: 98,000원**
+궁금한 점 있으면 언제든 말씀해 주세요!"""
+
+
+def test_summary_keeps_recommended_items():
+    text = summarize_turn(QUESTION, ANSWER)
+    headline = text.splitlines()[0]
+    assert headline.startswith("📝 한줄 요약: ")
+    for name in ("Chanel Chance Eau Tendre", "Chanel Paris Deauville", "Chanel Coco Mademoiselle"):
+        assert name in headline
+    assert "3개를 추천드렸어요" in headline
+    assert "10만원 이하" in headline
+    assert "✅ 핵심만 콕:" in text
+    assert "- 여름 낮에는 시트러스 계열이 덥지 않게 느껴져서 부담이 적어요." in text
+    # 인사/마무리/가격 줄은 인용하지 않음
+    assert "안녕하세요" not in text and "언제든" not in text and "98,000" not in text
+
+
+def test_summary_without_items_or_answer():
+    assert summarize_turn("탑노트가 뭐야?", None) == '📝 한줄 요약: 직전에 "탑노트가 뭐야?" 하고 물어보셨어요.'
+    text = summarize_turn("남자 겨울 향수", "겨울에는 앰버와 바닐라 계열이 포근하게 잘 어울려요.")
+    assert "관련해서 물어보셨어요" in text.splitlines()[0]
+
+
+def test_complex_turn_threshold():
+    assert not is_complex_turn(QUESTION, ANSWER, max_chars=len(ANSWER))
+    assert is_complex_turn(QUESTION, ANSWER, max_chars=len(ANSWER) - 1)
+    # 인용할 문장도 항목도 없는 답변
+    assert is_complex_turn(QUESTION, "음...", max_chars=1500)
+    assert not is_complex_turn(QUESTION, None, max_chars=1500)
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake(prev, last_ai):
+        calls.append(prev)
+        return "LLM 요약"
+    monkeypatch.setattr(me, "_summarize_with_llm", fake)
+    return calls
+
+
+def _state(answer=ANSWER):
+    return {"messages": [HumanMessage(content=QUESTION), AIMessage(content=answer),
+                         HumanMessage(content="내가 방금 뭐라고 했지?")]}
+
+
+def test_auto_uses_local_summary_for_short_answer(monkeypatch, llm_calls):
+    monkeypatch.setattr(me, "MEMORY_ECHO_MODE", "auto")
+    out = me.memory_echo_node(_state())
+    assert llm_calls == []
+    assert out["final_answer"].startswith("📝 한줄 요약: ")
+    assert out["final_answer"].endswith(f"🗣️ 원문 질문: {QUESTION}")
+    assert out["last_agent"] == "memory_echo"
+
+
+def test_auto_switches_to_llm_above_max_chars(monkeypatch, llm_calls):
+    monkeypatch.setattr(me, "MEMORY_ECHO_MODE", "auto")
+    monkeypatch.setattr(me, "MEMORY_ECHO_LOCAL_MAX_CHARS", len(ANSWER) - 1)
+    out = me.memory_echo_node(_state())
+    assert llm_calls == [QUESTION]
+    assert out["final_answer"].startswith("LLM 요약")
+
+
+@pytest.mark.parametrize("mode, expected_llm", [("llm", True), ("local", False)])
+def test_fixed_modes(monkeypatch, llm_calls, mode, expected_llm):
+    monkeypatch.setattr(me, "MEMORY_ECHO_MODE", mode)
+    monkeypatch.setattr(me, "MEMORY_ECHO_LOCAL_MAX_CHARS", 10)
+    me.memory_echo_node(_state())
+    assert bool(llm_calls) is expected_llm
+
+
+def test_local_failure_falls_back_to_llm(monkeypatch, llm_calls):
+    def broken(question, answer):
+        raise ValueError("bad answer")
+    monkeypatch.setattr(me, "MEMORY_ECHO_MODE", "local")
+    monkeypatch.setattr(me, "summarize_turn", broken)
+    out = me.memory_echo_node(_state())
+    assert llm_calls == [QUESTION]
+    assert out["final_answer"].startswith("LLM 요약")
@@ -0,0 +1,150 @@
+# tests/test_metafilters.py
+# 룩업 테이블 기반 메타필터가 예전 필드별 정규화 함수와 같은 결과를 내는지 확인
+# - 예전 함수가 값을 돌려준 입력에서는 새 함수도 같은 값이어야 함 (새 쪽은 대소문자/악센트 변형까지 받는 상위집합)
+# - apply_meta_filters_batch == 항목별 apply_meta_filters
+import json
+
+import pytest
+
+from scentpick.mas.tools import tools_metafilters as mf
+from scentpick.mas.tools.brand_utils import BRAND_ALIASES, CONC_SYNONYMS
+
+
+# -----------------------------
+# 예전 구현 (기준값)
+# -----------------------------
+def old_filter_brand(v):
+    v = str(v).replace(" ", "")
+    for std, aliases in BRAND_ALIASES.items():
+        if v in [a.replace(" ", "") for a in aliases + [std]]:
+            return std
+    return None
+
+
+def old_filter_concentration(v):
+    v = str(v).replace(" ", "")
+    for std, aliases in CONC_SYNONYMS.items():
+        if v in [a.replace(" ", "") for a in aliases + [std]]:
+            return std
+    return None
+
+
+def old_filter_day_night_score(v):
+    if not v:
+        return None
+    mapping = {"낮": "day", "밤": "night"}
+    v = mapping[v] if v in mapping else str(v).strip()
+    if "," in v:
+        filtered = [x.strip() for x in v.split(",") if x.strip() in ["day", "night"]]
+        return ",".join(filtered) or None
+    return v if v in ["day", "night"] else None
+
+
+def old_filter_gender(v):
+    if not v:
+        return None
+    mapping = {"남성": "Male", "여성": "Female", "남녀공용": "Unisex", "공용": "Unisex"}
+    v = mapping.get(str(v).strip(), str(v).strip())
+    return v if v in ["Female", "Male", "Unisex"] else None
+
+
+def old_filter_season_score(v):
+    if not v:
+        return None
+    mapping = {"봄": "spring", "여름": "summer", "가을": "fall", "겨울": "winter"}
+    v = mapping.get(str(v).strip(), str(v).strip())
+    return v if v in ["winter", "spring", "summer", "fall"] else None
+
+
+# -----------------------------
+# 입력
+# -----------------------------
+def _variants(s):
+    """원문 + 공백/대소문자 변형"""
+    return {s, f" {s} ", s.replace(" ", ""), s.upper(), s.lower(), s.title()}
+
+
+def _alias_inputs(table):
+    out = set()
+    for std, aliases in table.items():
+        for a in aliases + [std]:
+            out |= _variants(a)
+    return sorted(out) + ["", "없는브랜드", "unknown"]
+
+
+BRAND_INPUTS = _alias_inputs(BRAND_ALIASES)
+CONC_INPUTS = _alias_inputs(CONC_SYNONYMS)
+GENDER_INPUTS = sorted(
+    set().union(*[_variants(s) for s in ["남성", "여성", "남녀공용", "공용", "Male", "Female", "Unisex"]])
+) + ["", None, "중성", "men"]
+SEASON_INPUTS = sorted(
+    set().union(*[_variants(s) for s in ["봄", "여름", "가을", "겨울", "spring", "summer", "fall", "winter"]])
+) + ["", None, "autumn", "장마"]
+DAY_NIGHT_INPUTS = sorted(
+    set().union(*[_variants(s) for s in ["낮", "밤", "day", "night", "day,night", "day, night", "night , day"]])
+) + ["", None, "day,evening", "evening", ","]
+
+
+def _assert_compatible(new, old, inputs):
+    for v in inputs:
+        expected = old(v)
+        if expected is not None:
+            assert new(v) == expected, v
+
+
+@pytest.mark.parametrize("new, old, inputs", [
+    (mf.filter_brand, old_filter_brand, BRAND_INPUTS),
+    (mf.filter_concentration, old_filter_concentration, CONC_INPUTS),
+    (mf.filter_gender, old_filter_gender, GENDER_INPUTS),
+    (mf.filter_season_score, old_filter_season_score, SEASON_INPUTS),
+    (mf.filter_day_night_score, old_filter_day_night_score, DAY_NIGHT_INPUTS),
+], ids=["brand", "concentration", "gender", "season", "day_night"])
+def test_lookup_matches_old_normalizer(new, old, inputs):
+    _assert_compatible(new, old, inputs)
+
+
+def test_every_alias_resolves():
+    for std, aliases in BRAND_ALIASES.items():
+        for a in aliases + [std]:
+            assert mf.filter_brand(a) is not None, a
+    for std, aliases in CONC_SYNONYMS.items():
+        for a in aliases + [std]:
+            assert mf.filter_concentration(a) is not None, a
+
+
+def test_case_and_whitespace_variants():
+    assert mf.filter_gender(" 여성 ") == "Female"
+    assert mf.filter_gender("MALE") == "Male"
+    assert mf.filter_season_score(" 겨울") == "winter"
+    assert mf.filter_season_score("Summer") == "summer"
+    assert mf.filter_day_night_score("Day, NIGHT") == "day,night"
+    assert mf.filter_concentration("E D P") == mf.filter_concentration("edp")
+
+
+def test_batch_matches_single():
+    parsed = [
+        {"brand": "샤넬", "concentration": "edp", "day_night_score": "밤",
+         "gender": "여성", "season_score": "겨울", "sizes": "50"},
+        {"brand": " Jo Malone ", "concentration": "오드 뚜왈렛", "day_night_score": "day, night",
+         "gender": "Unisex", "season_score": "spring", "sizes": None},
+        {"brand": None, "concentration": None, "day_night_score": None,
+         "gender": None, "season_score": None, "sizes": None},
+        {"brand": "없는브랜드", "gender": "중성"},
+    ]
+    as_json = [json.dumps(p, ensure_ascii=False) for p in parsed]
+
+    expected = [mf.apply_meta_filters(dict(p)) for p in parsed]
+    assert mf.apply_meta_filters_batch([dict(p) for p in parsed]) == expected
+    assert mf.apply_meta_filters_batch(as_json) == expected
+
+
+def test_batch_bad_json_is_none():
+    out = mf.apply_meta_filters_batch(['{"brand": "샤넬"}', "{not json", '{"gender": "남성"}'])
+    assert out[1] is None
+    assert out[0] == mf.apply_meta_filters({"brand": "샤넬"})
+    assert out[2] == mf.apply_meta_filters({"gender": "남성"})
+
+
+@pytest.mark.parametrize("item", [[], "", 0, None, "[1, 2]", 3.5])
+def test_batch_non_dict_is_none(item):
+    assert mf.apply_meta_filters_batch([item, {"brand": "샤넬"}]) == [None, mf.apply_meta_filters({"brand": "샤넬"})]
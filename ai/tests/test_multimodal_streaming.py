@@ -0,0 +1,131 @@
+# tests/test_multimodal_streaming.py
+# 스트리밍 비전 분석 + 검색 겹치기: free_text/필터가 완성되면 미리 검색하고,
+# 최종 JSON과 어긋나면 그 결과를 버림 (비전 스트림/임베딩/Pinecone은 가짜)
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from scentpick.mas.nodes import multimodal_agent_node as mm
+
+IMAGE = "data:image/jpeg;base64,AAAA"
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeVisionStream:
+    """chat.completions.create(stream=True) 대체: 미리 정한 텍스트를 size 글자씩 흘려보냄"""
+
+    def __init__(self, text, size=5):
+        self.text = text
+        self.size = size
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        async def gen():
+            for i in range(0, len(self.text), self.size):
+                yield _chunk(self.text[i:i + self.size])
+                await asyncio.sleep(0)
+            yield SimpleNamespace(choices=[], usage=None)
+        return gen()
+
+
+class FakeRetrieval:
+    def __init__(self):
+        self.embedded = []
+        self.filters = []
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [0.1, 0.2]
+
+    def query(self, vector, filtered, top_k=3):
+        self.filters.append(filtered)
+        return {"matches": [{"id": "1", "score": 0.9, "metadata": {"no": 1, "brand": "B", "name": "N"}}]}
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    retrieval = FakeRetrieval()
+    monkeypatch.setattr(mm, "embeddings", retrieval)
+    monkeypatch.setattr(mm, "query_pinecone", retrieval.query)
+
+    def use_stream(text, size=5):
+        monkeypatch.setattr(mm, "aclient", FakeVisionStream(text, size))
+    return retrieval, use_stream
+
+
+def _run(query="여름 향수"):
+    return asyncio.run(mm._analyze_image_streaming(IMAGE, query, {}, time.perf_counter()))
+
+
+FULL = {"free_text": "시원한 바다 무드", "day_night_score": "day", "gender": None, "season_score": "summer"}
+
+
+def test_overlapped_search_is_used(fakes):
+    retrieval, use_stream = fakes
+    use_stream(json.dumps(FULL, ensure_ascii=False))
+    analysis, ok, results = _run()
+    assert ok and analysis == FULL
+    assert results["matches"][0]["metadata"]["no"] == 1
+    assert retrieval.embedded == ["시원한 바다 무드"]
+    assert retrieval.filters == [mm.apply_meta_filters(FULL)]
+
+
+def test_missing_filter_keys_search_after_stream(fakes):
+    retrieval, use_stream = fakes
+    partial = {"free_text": "시원한 바다 무드", "gender": "Male"}
+    use_stream(json.dumps(partial, ensure_ascii=False), size=3)
+    analysis, ok, results = _run()
+    assert ok and analysis == partial
+    assert results is not None
+    assert retrieval.filters == [mm.apply_meta_filters(partial)]
+
+
+def test_null_free_text_skips_overlap(fakes):
+    retrieval, use_stream = fakes
+    use_stream(json.dumps({**FULL, "free_text": None}))
+    analysis, ok, results = _run()
+    assert ok and analysis["free_text"] is None
+    assert results is None
+    assert retrieval.embedded == []
+
+
+def test_truncated_json_discards_speculative_search(fakes):
+    # max_tokens로 잘린 응답: 필드는 다 나왔지만 최종 JSON 파싱 실패 → 선행 검색 폐기
+    retrieval, use_stream = fakes
+    use_stream(json.dumps(FULL, ensure_ascii=False)[:-1])
+    analysis, ok, results = _run()
+    assert not ok
+    assert results is None
+    assert retrieval.embedded == ["시원한 바다 무드"]
+
+
+def test_changed_final_value_discards_search(fakes):
+    # 중복 키: 스트리밍 중 본 free_text와 최종 json.loads 값이 다름
+    retrieval, use_stream = fakes
+    text = json.dumps(FULL, ensure_ascii=False)[:-1] + ', "free_text": "포근한 겨울 무드"}'
+    use_stream(text)
+    analysis, ok, results = _run()
+    assert ok and analysis["free_text"] == "포근한 겨울 무드"
+    assert results is None
+
+
+def test_node_searches_with_query_when_free_text_is_null(fakes, monkeypatch, bench):
+    retrieval, use_stream = fakes
+    use_stream(json.dumps({**FULL, "free_text": None}))
+
+    def no_download(url):
+        raise OSError("offline")
+    monkeypatch.setattr(mm, "prepare_vision_image_from_url", no_download)
+    monkeypatch.setattr(mm, "VISION_STREAMING", True)
+
+    out = mm.multimodal_agent_node({"image_url": "https://example.com/a.jpg",
+                                    "messages": [HumanMessage(content="바다 느낌 향수")]})
+    assert retrieval.embedded == ["바다 느낌 향수"]
+    assert out["perfume_list"][0]["id"] == 1
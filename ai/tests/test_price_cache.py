@@ -0,0 +1,80 @@
+# tests/test_price_cache.py
+# 네이버 쇼핑 응답 캐시: 같은 검색어는 재호출하지 않고, 프롬프트 변경 무효화와는 분리
+import pytest
+
+from scentpick.mas.tools import tools_price
+from scentpick.mas.tools.llm_cache import invalidate_llm_caches
+from scentpick.mas.tools.tools_price import NAVER_CACHE, is_price_cached, price_tool
+
+
+class CountingRequests:
+    """requests.get 호출 수만 세는 가짜 (네이버 응답 모양)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        self.calls.append(dict(params or {}))
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"items": [{"title": "샤넬 <b>N°5</b> 오 드 빠르펭 50ml", "lprice": "180000"}]}
+
+
+@pytest.fixture
+def fake_requests(monkeypatch):
+    fake = CountingRequests()
+    monkeypatch.setattr(tools_price, "requests", fake)
+    NAVER_CACHE.clear()
+    yield fake
+    NAVER_CACHE.clear()
+
+
+def _lookup(**kw):
+    args = {"user_query": "샤넬 넘버5 가격", "brand": "샤넬", "name": "N°5", "size_ml": 50, "return_json": True}
+    args.update(kw)
+    return price_tool.invoke(args)
+
+
+def test_uncached_lookup_calls_api_once(fake_requests):
+    assert not is_price_cached("샤넬", "N°5", 50)
+    out = _lookup()
+    assert out["cached"] is False and out["items"]
+    assert len(fake_requests.calls) == 1
+    assert is_price_cached("샤넬", "N°5", 50)
+
+
+def test_cached_lookup_skips_api(fake_requests):
+    first = _lookup()
+    second = _lookup()
+    assert second["cached"] is True
+    assert second["items"] == first["items"]
+    assert len(fake_requests.calls) == 1
+
+
+def test_other_size_is_separate_entry(fake_requests):
+    _lookup()
+    assert not is_price_cached("샤넬", "N°5", 100)
+    _lookup(size_ml=100)
+    assert len(fake_requests.calls) == 2
+
+
+def test_prompt_invalidation_keeps_price_cache(fake_requests):
+    _lookup()
+    invalidate_llm_caches()
+    assert is_price_cached("샤넬", "N°5", 50)
+    _lookup()
+    assert len(fake_requests.calls) == 1
+
+
+def test_invalidate_endpoint_clears_price_cache(fake_requests):
+    from scentpick.routers.chatbot import cache_invalidate
+
+    _lookup()
+    assert cache_invalidate() == {"ok": True}
+    assert not is_price_cached("샤넬", "N°5", 50)
+    _lookup()
+    assert len(fake_requests.calls) == 2
@@ -0,0 +1,131 @@
+# tests/test_rec_echo.py
+# rec_echo: 추천 시점에 저장한 한 줄 이유로 템플릿 렌더링(하이라이트 포함),
+# REC_ECHO_LLM_POLISH=1이면 (추천 묶음 ts, 하이라이트) 키로 다듬은 요약을 캐시에서만 사용
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from scentpick.mas.nodes import rec_echo_node as re_node
+from scentpick.mas.nodes.rec_echo_node import POLISH_CACHE, rec_echo_node
+from scentpick.mas.tools.rec_reasons import attach_reasons, extract_item_reasons
+
+ANSWER = """추천 향수입니다.
+1. **Chanel Chance** - 상큼한 시트러스와 핑크 페퍼가 밝게 시작해요. 오래 남아요.
+2. **Diptyque Do Son**
+   - 💰 가격: 150,000원
+   - 추천 이유: 튜베로즈가 바닷바람처럼 가볍게 퍼져요.
+3. **Le Labo Santal 33**
+"""
+
+ITEMS = [
+    {"id": 1, "brand": "Chanel", "name": "Chance", "size": 50, "detail_url": "https://example.com/1"},
+    {"id": 2, "brand": "Diptyque", "name": "Do Son"},
+    {"id": 3, "brand": "Le Labo", "name": "Santal 33", "size": "100ml"},
+]
+
+
+def test_reasons_from_answer():
+    assert extract_item_reasons(ITEMS, ANSWER) == [
+        "상큼한 시트러스와 핑크 페퍼가 밝게 시작해요.",
+        "튜베로즈가 바닷바람처럼 가볍게 퍼져요.",
+        None,
+    ]
+    assert extract_item_reasons(ITEMS, None) == [None, None, None]
+    long = "1. Chance - " + "가" * 200
+    assert len(extract_item_reasons(ITEMS[:1], long, max_len=20)[0]) == 20
+    # 이유를 못 찾은 항목엔 reason 키를 넣지 않음
+    assert ["reason" in it for it in attach_reasons(ITEMS, ANSWER)] == [True, True, False]
+
+
+def _state(highlight=None, ts="2026-01-01T00:00:00+00:00", items=None):
+    router = {"next": "rec_echo"}
+    if highlight is not None:
+        router["followup_reference"] = {"index": highlight}
+    return {
+        "messages": [HumanMessage(content="여름 향수 추천"), AIMessage(content=ANSWER), HumanMessage(content="다시 보여줘")],
+        "router_json": router,
+        "rec_history": [{"ts": ts, "source": "LLM_parser", "items": items or attach_reasons(ITEMS, ANSWER)}],
+    }
+
+
+def test_template_without_highlight():
+    out = rec_echo_node(_state())
+    assert out["last_agent"] == "rec_echo"
+    assert out["final_answer"] == (
+        "🔁 방금 추천드린 향수 요약 (총 3개)\n\n"
+        "1. Chanel Chance 50ml — 상큼한 시트러스와 핑크 페퍼가 밝게 시작해요. — https://example.com/1\n"
+        "2. Diptyque Do Son — 튜베로즈가 바닷바람처럼 가볍게 퍼져요.\n"
+        "3. Le Labo Santal 33 100ml"
+    )
+    assert "rec_history" not in out
+
+
+@pytest.mark.parametrize("highlight", [2, "2"])
+def test_template_with_highlight(highlight):
+    text = rec_echo_node(_state(highlight))["final_answer"]
+    lines = text.splitlines()
+    assert lines[3] == "⭐ 2. Diptyque Do Son — 튜베로즈가 바닷바람처럼 가볍게 퍼져요."
+    assert not lines[2].startswith("⭐") and not lines[4].startswith("⭐")
+    assert text.endswith("\n⭐ 추천 포커스: 2번 Diptyque Do Son\n")
+
+
+def test_out_of_range_highlight_has_no_focus():
+    text = rec_echo_node(_state(9))["final_answer"]
+    assert "⭐" not in text
+
+
+def test_fallback_from_search_results():
+    state = {"messages": [HumanMessage(content="다시 보여줘")], "search_results": {"matches": [
+        {"id": "7", "metadata": {"brand": "Byredo", "name": "Gypsy Water", "size": "50"}}]}}
+    out = rec_echo_node(state)
+    assert "1. Byredo Gypsy Water 50ml" in out["final_answer"]
+    assert out["rec_history"][0]["source"] == "fallback"
+
+
+@pytest.fixture
+def polish(monkeypatch):
+    calls = []
+
+    def fake_summarize(items, last_ai, highlight_idx):
+        calls.append((len(items), last_ai, highlight_idx))
+        return f"다듬은 요약 (highlight={highlight_idx})"
+
+    monkeypatch.setattr(re_node, "REC_ECHO_LLM_POLISH", True)
+    monkeypatch.setattr(re_node, "_summarize_with_llm", fake_summarize)
+    POLISH_CACHE.clear()
+    yield calls
+    POLISH_CACHE.clear()
+
+
+def _wait_cached(key, timeout=2.0):
+    end = time.monotonic() + timeout
+    while key not in POLISH_CACHE and time.monotonic() < end:
+        time.sleep(0.01)
+    assert key in POLISH_CACHE
+
+
+def test_polish_cache_miss_then_hit(polish):
+    ts = "2026-01-01T00:00:00+00:00"
+    first = rec_echo_node(_state(2, ts))["final_answer"]
+    # miss: 템플릿으로 바로 답하고 다듬기는 백그라운드
+    assert "다듬은 요약" not in first and "⭐ 2." in first
+    _wait_cached((ts, 2))
+    assert polish == [(3, ANSWER, 2)]
+
+    second = rec_echo_node(_state(2, ts))["final_answer"]
+    assert "다듬은 요약 (highlight=2)" in second
+    assert polish == [(3, ANSWER, 2)]
+
+
+@pytest.mark.parametrize("other", [{"highlight": 1}, {"ts": "2026-01-02T00:00:00+00:00"}])
+def test_polish_cache_keyed_by_ts_and_highlight(polish, other):
+    ts = "2026-01-01T00:00:00+00:00"
+    rec_echo_node(_state(2, ts))
+    _wait_cached((ts, 2))
+
+    args = {"highlight": 2, "ts": ts, **other}
+    text = rec_echo_node(_state(**args))["final_answer"]
+    assert "다듬은 요약" not in text
+    _wait_cached((args["ts"], args["highlight"]))
+    assert len(polish) == 2
@@ -0,0 +1,141 @@
+# tests/test_review_price_check.py
+# review_agent 가격 확인: 목표 개수 도달 시 조기 종료, 시간 예산, 캐시 후보 우선, 후보 페이지 재조회
+# - 가격 조회는 호출만 기록하는 가짜 함수, 워커는 1개로 고정해 실행 순서를 결정적으로
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scentpick.mas.nodes import review_agent_node as ra
+
+
+class FakePrice:
+    """_check_one_price 대체: accept(perfume) 결과로 채택, slow 후보는 release될 때까지 대기"""
+
+    def __init__(self, accept=lambda p: True, slow=(), delay=0.0):
+        self.calls = []
+        self.accept = accept
+        self.slow = set(slow)
+        self.delay = delay
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, perfume, budget_info):
+        with self._lock:
+            self.calls.append(perfume["name"])
+        if perfume["name"] in self.slow:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        return self.accept(perfume), True
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    ex = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(ra, "_EXECUTOR", ex)
+    yield ex
+    ex.shutdown(wait=True)
+
+
+@pytest.fixture
+def fake_price(monkeypatch):
+    def install(*args, cached=(), **kwargs):
+        fake = FakePrice(*args, **kwargs)
+        monkeypatch.setattr(ra, "_check_one_price", fake)
+        monkeypatch.setattr(ra, "is_price_cached", lambda brand, name, size_ml=None: name in cached)
+        return fake
+    return install
+
+
+def _perfumes(n):
+    return [{"id": str(i), "brand": "B", "name": f"p{i}", "size_ml": 50} for i in range(n)]
+
+
+def test_stops_at_target_matches(executor, fake_price):
+    fake = fake_price(delay=0.02)
+    stats = {}
+    out = ra.check_prices_and_filter(_perfumes(6), {"budget": 100000}, max_matches=2, stats=stats)
+    executor.shutdown(wait=True)
+    assert [p["name"] for p in out] == ["p0", "p1"]
+    assert stats == {"price_checks": 2, "naver_calls": 2}
+    # 워커 1개: 종료 시점에 이미 진행 중이던 1건 외에는 호출되지 않음
+    assert fake.calls[:2] == ["p0", "p1"] and len(fake.calls) <= 3
+
+
+def test_batch_of_finished_results_does_not_overshoot(executor, fake_price):
+    # 캐시 미스 후보가 모두 한꺼번에 끝나도 max_matches개만 채택
+    fake_price()
+    out = ra.check_prices_and_filter(_perfumes(6), {"budget": 100000}, max_matches=2)
+    assert [p["name"] for p in out] == ["p0", "p1"]
+
+
+def test_deadline_returns_partial_results(executor, fake_price):
+    fake = fake_price(slow={"p1"})
+    t0 = time.monotonic()
+    out = ra.check_prices_and_filter(_perfumes(4), {"budget": 100000}, max_matches=3, deadline=t0 + 0.2)
+    assert time.monotonic() - t0 < 1.0
+    assert [p["name"] for p in out] == ["p0"]
+    fake.release.set()
+    executor.shutdown(wait=True)
+    # p1은 진행 중이라 끝까지 가지만, 큐에 있던 p2/p3는 호출되지 않음
+    assert fake.calls == ["p0", "p1"]
+
+
+def test_cached_candidates_checked_first(executor, fake_price):
+    fake = fake_price(cached={"p3", "p4"})
+    out = ra.check_prices_and_filter(_perfumes(5), {"budget": 100000}, max_matches=2)
+    assert fake.calls == ["p3", "p4"]
+    assert [p["name"] for p in out] == ["p3", "p4"]
+
+
+def test_results_keep_candidate_order(executor, fake_price):
+    fake_price(accept=lambda p: p["name"] != "p1", cached={"p2"})
+    out = ra.check_prices_and_filter(_perfumes(4), {"budget": 100000})
+    assert [p["name"] for p in out] == ["p0", "p2", "p3"]
+
+
+class FakePerfumeIndex:
+    def __init__(self, n):
+        self.top_ks = []
+        self.matches = [{"id": str(i), "score": 1.0 - i / 100, "metadata": {"no": i, "brand": "B", "name": f"p{i}"}}
+                        for i in range(n)]
+
+    def query(self, vector, top_k, include_metadata=True):
+        self.top_ks.append(top_k)
+        return {"matches": self.matches[:top_k]}
+
+
+@pytest.fixture
+def fake_index(monkeypatch):
+    embeds = []
+    monkeypatch.setattr(ra, "get_openai_embedding", lambda text: embeds.append(text) or [0.0])
+    index = FakePerfumeIndex(30)
+    monkeypatch.setattr(ra, "perfume_index", index)
+    index.embeds = embeds
+    return index
+
+
+def test_candidates_requery_with_growing_top_k(fake_index):
+    pages = list(ra.iter_perfume_candidates("우디", page_size=5, max_candidates=12))
+    assert fake_index.top_ks == [5, 10, 12]
+    assert [[p["name"] for p in page] for page in pages] == [
+        [f"p{i}" for i in range(0, 5)], [f"p{i}" for i in range(5, 10)], ["p10", "p11"]]
+    assert fake_index.embeds == ["우디"]
+
+
+def test_collect_goes_deeper_only_when_needed(executor, fake_index, fake_price):
+    # 짝수 번호만 예산 내 → 첫 페이지(p0~p4)에서 3개 확보, 더 조회하지 않음
+    fake_price(accept=lambda p: int(p["name"][1:]) % 2 == 0)
+    stats = {}
+    matched, seen = ra.collect_budget_matches("우디", {"budget": 100000}, need=3, stats=stats)
+    assert [p["name"] for p in matched] == ["p0", "p2", "p4"]
+    assert (seen, stats["pages"]) == (5, 1)
+    assert fake_index.top_ks == [5]
+
+    # p7 이후만 예산 내 → 두 번째 페이지 재조회
+    fake_index.top_ks.clear()
+    fake_price(accept=lambda p: int(p["name"][1:]) >= 7)
+    matched, seen = ra.collect_budget_matches("우디", {"budget": 100000}, need=3)
+    assert [p["name"] for p in matched] == ["p7", "p8", "p9"]
+    assert fake_index.top_ks == [5, 10]
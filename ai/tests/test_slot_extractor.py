@@ -0,0 +1,55 @@
+# tests/test_slot_extractor.py
+# 규칙 기반 슬롯 추출 회귀 테스트 (tests/data/slot_cases.jsonl: 손으로 라벨링한 40개 질의)
+# - 라벨은 파서 프롬프트가 요구하는 값 기준, 비교는 apply_meta_filters 이후 값
+# - LLM을 생략한 질의는 전부 일치해야 하고, 전체 일치율/생략률은 하한 이상
+import json
+from pathlib import Path
+
+import pytest
+
+from scentpick.mas.tools.slot_extractor import (
+    SLOT_KEYS,
+    evaluate_slot_agreement,
+    extract_slots,
+    low_confidence_slots,
+)
+
+CASES_PATH = Path(__file__).parent / "data" / "slot_cases.jsonl"
+
+MIN_AGREEMENT = 0.95
+MIN_SKIP_RATE = 0.75
+
+
+def _load_cases():
+    with CASES_PATH.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture(scope="module")
+def report():
+    return evaluate_slot_agreement(_load_cases())
+
+
+def test_labelled_set_size(report):
+    assert report["cases"] == 40
+
+
+def test_agreement_floor(report):
+    for k in SLOT_KEYS:
+        assert report["agreement"][k] >= MIN_AGREEMENT, (k, report["mismatches"])
+
+
+def test_skipped_queries_agree(report):
+    # LLM 없이 끝난 질의에서 틀리면 그대로 검색에 쓰이므로 하한이 아니라 전부 일치
+    for k in SLOT_KEYS:
+        assert report["agreement_when_skipped"][k] == 1.0, (k, report["mismatches"])
+
+
+def test_skip_rate_floor(report):
+    assert report["skip_rate"] >= MIN_SKIP_RATE
+
+
+@pytest.mark.parametrize("query", ["크리스마스에 어울리는 향수", "지속력 좋은 향수 추천", "데이트할 때 뿌릴 향수"])
+def test_inference_cues_go_to_llm(query):
+    res = extract_slots(query)
+    assert low_confidence_slots(res), res
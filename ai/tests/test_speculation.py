@@ -0,0 +1,135 @@
+# tests/test_speculation.py
+# 추측 실행: 키워드 라우팅 예측, 예측이 맞으면 commit / 빗나가면 취소, 실패·만료 집계
+# - 앞단 함수는 테스트용 가짜, 예측기는 실제 predict_agent (파라미터 케이스) 또는 고정값
+import threading
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from scentpick.mas.tools import speculation as sp
+from scentpick.mas.tools.speculation import (
+    SpeculationCancelled,
+    get_speculation_stats,
+    predict_agent,
+    resolve_speculation,
+    start_speculation,
+    take_speculation,
+)
+
+
+@pytest.mark.parametrize("query, rec_context, expected", [
+    ("방금 추천한 거 다시 보여줘", "(none)", None),
+    ("2번 향수 더 알려줘", "[1] Chanel No.5", None),
+    ("샤넬 넘버5 가격 얼마야?", "(none)", None),
+    ("가격 얼마야", "(none)", None),
+    ("섬유유연제 추천해줘", "(none)", None),
+    ("안녕", "(none)", None),
+    ("", "(none)", None),
+    ("오드퍼퓸이랑 오드뚜왈렛 차이가 뭐야?", "(none)", "FAQ_agent"),
+    ("여름에 쓸 여성 향수 추천해줘", "(none)", "LLM_parser"),
+    ("샤넬 여름 향수 추천하고 가격도", "(none)", "LLM_parser"),
+    ("포근한 느낌 향수 추천해줘", "(none)", "ML_agent"),
+    ("시원한 향수 후기 알려줘", "(none)", "review_agent"),
+    ("5만원대 시원한 향수", "(none)", "review_agent"),
+])
+def test_predict_agent(query, rec_context, expected):
+    assert predict_agent(query, rec_context) == expected
+
+
+@pytest.fixture
+def spec_env(monkeypatch):
+    """추측 실행 켜고, 예측은 항상 ML_agent, 앞단은 prefix(fn)로 지정"""
+    monkeypatch.setattr(sp, "SPECULATIVE_EXECUTION", True)
+    monkeypatch.setattr(sp, "_PENDING", {})
+    monkeypatch.setattr(sp, "predict_agent", lambda query, rec_context="(none)": "ML_agent")
+    sp.reset_speculation_stats()
+
+    def prefix(fn):
+        monkeypatch.setitem(sp._PREFIXES, "ML_agent", fn)
+    yield prefix
+    sp.reset_speculation_stats()
+
+
+def _state(msg_id="m1", query="포근한 향수 추천해줘"):
+    return {"messages": [HumanMessage(content=query, id=msg_id)]}
+
+
+def _until_cancelled(started):
+    def prefix(query, checkpoint):
+        started.set()
+        while True:
+            checkpoint()
+            time.sleep(0.005)
+    return prefix
+
+
+def test_commit_on_matching_route(spec_env):
+    spec_env(lambda query, checkpoint: {"parsed": query})
+    state = _state()
+    spec = start_speculation(state, "포근한 향수 추천해줘", "(none)")
+    assert spec is not None and spec.agent == "ML_agent"
+    resolve_speculation(state, "ML_agent")
+    # 다른 에이전트는 가져갈 수 없음
+    assert take_speculation("LLM_parser", state) is None
+    assert take_speculation("ML_agent", state) == {"parsed": "포근한 향수 추천해줘"}
+    # 한 번 가져가면 끝
+    assert take_speculation("ML_agent", state) is None
+    stats = get_speculation_stats()
+    assert (stats["started"], stats["committed"], stats["discarded"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 1.0
+
+
+def test_mismatch_cancels_running_prefix(spec_env):
+    started = threading.Event()
+    spec_env(_until_cancelled(started))
+    state = _state()
+    spec = start_speculation(state, "q", "(none)")
+    assert started.wait(2)
+    resolve_speculation(state, "FAQ_agent")
+    assert spec.cancelled.is_set()
+    with pytest.raises(SpeculationCancelled):
+        spec.future.result(timeout=2)
+    assert take_speculation("ML_agent", state) is None
+    stats = get_speculation_stats()
+    assert (stats["discarded"], stats["committed"]) == (1, 0)
+    assert stats["wasted_ms"] > 0
+
+
+def test_failing_prefix_counted_as_failed(spec_env):
+    def broken(query, checkpoint):
+        raise RuntimeError("pinecone down")
+    spec_env(broken)
+    state = _state()
+    start_speculation(state, "q", "(none)")
+    resolve_speculation(state, "ML_agent")
+    assert take_speculation("ML_agent", state) is None
+    stats = get_speculation_stats()
+    assert (stats["failed"], stats["committed"]) == (1, 0)
+
+
+def test_unclaimed_speculation_expires(spec_env, monkeypatch):
+    started = threading.Event()
+    spec_env(_until_cancelled(started))
+    monkeypatch.setattr(sp, "SPECULATION_TTL", 0.0)
+    old = start_speculation(_state("m1"), "q", "(none)")
+    assert started.wait(2)
+    # 다음 턴의 추측 시작 시 만료된 항목 정리
+    spec_env(lambda query, checkpoint: {})
+    start_speculation(_state("m2"), "q2", "(none)")
+    assert old.cancelled.is_set()
+    assert take_speculation("ML_agent", _state("m1")) is None
+    assert list(sp._PENDING) == ["m2"]
+    assert get_speculation_stats()["discarded"] == 1
+
+
+def test_abstain_and_disabled(spec_env, monkeypatch):
+    monkeypatch.setattr(sp, "predict_agent", lambda query, rec_context="(none)": None)
+    assert start_speculation(_state(), "안녕", "(none)") is None
+    assert get_speculation_stats()["abstained"] == 1
+
+    monkeypatch.setattr(sp, "SPECULATIVE_EXECUTION", False)
+    monkeypatch.setattr(sp, "predict_agent", lambda query, rec_context="(none)": "ML_agent")
+    spec_env(lambda query, checkpoint: {})
+    assert start_speculation(_state(), "q", "(none)") is None
+    assert take_speculation("ML_agent", _state()) is None
@@ -0,0 +1,118 @@
+# tests/test_state_compact.py
+# 체크포인트 경량화: 예전(전체 metadata/무제한 rec_history) 체크포인트가 슬림 스키마로 옮겨지고,
+# 응답을 만들 때 라우터가 읽는 metadata(no/text 등)는 카탈로그 캐시/인덱스 fetch로 복원되는지
+import pytest
+
+from benchmarks.fakes import synthetic_perfume
+from scentpick.mas.state import bounded_rec_history, replace_search_results
+from scentpick.mas.tools import state_compact as sc
+from scentpick.mas.tools.state_compact import (
+    CATALOG_CACHE,
+    ITEM_KEYS,
+    REC_HISTORY_MAX,
+    SLIM_META_KEYS,
+    STATE_VERSION,
+    hydrate_search_results,
+    migrate_state,
+)
+
+
+def _full_match(pid, score=0.9):
+    return {"id": str(pid), "score": score, "metadata": synthetic_perfume(pid)}
+
+
+def _old_rec_entry(n):
+    return {"ts": f"t{n}", "source": "LLM_parser", "items": [_full_match(n), _full_match(n + 100)]}
+
+
+@pytest.fixture
+def old_state():
+    """STATE_VERSION 이전 체크포인트: 전체 match + 자르지 않은 rec_history"""
+    return {
+        "search_results": {"matches": [_full_match(i) for i in (1, 2, 3)], "namespace": "", "usage": {"read_units": 5}},
+        "rec_history": [_old_rec_entry(n) for n in range(REC_HISTORY_MAX + 5)],
+        "last_agent": "LLM_parser",
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clean_catalog():
+    CATALOG_CACHE.clear()
+    yield
+    CATALOG_CACHE.clear()
+
+
+def _apply(state, update):
+    """supervisor 노드 출력(update)을 state 리듀서로 반영"""
+    out = dict(state)
+    for k, v in update.items():
+        if k == "search_results":
+            out[k] = replace_search_results(state.get(k), v)
+        elif k == "rec_history":
+            out[k] = bounded_rec_history(state.get(k), v)
+        else:
+            out[k] = v
+    return out
+
+
+def test_old_checkpoint_migrates_to_slim_shape(old_state):
+    update = migrate_state(old_state)
+    assert update["state_version"] == STATE_VERSION
+    state = _apply(old_state, update)
+
+    sr = state["search_results"]
+    assert set(sr) == {"matches"}
+    assert [m["id"] for m in sr["matches"]] == ["1", "2", "3"]
+    for m in sr["matches"]:
+        assert set(m["metadata"]) <= set(SLIM_META_KEYS)
+        assert "text" not in m["metadata"] and m["metadata"]["no"] == int(m["id"])
+
+    rec = state["rec_history"]
+    assert len(rec) == REC_HISTORY_MAX
+    assert rec[-1]["ts"] == f"t{REC_HISTORY_MAX + 4}"
+    for e in rec:
+        for it in e["items"]:
+            assert set(it) <= set(ITEM_KEYS)
+    assert rec[-1]["items"][0]["id"] == REC_HISTORY_MAX + 4
+
+    # 한 번 옮긴 체크포인트는 다시 건드리지 않음
+    assert migrate_state(state) == {}
+
+
+def test_reducers_keep_state_slim():
+    sr = replace_search_results(None, {"matches": [_full_match(7)]})
+    assert "text" not in sr["matches"][0]["metadata"]
+    # None은 이전 값 유지
+    assert replace_search_results(sr, None) is sr
+
+    history = []
+    for n in range(REC_HISTORY_MAX + 3):
+        history = bounded_rec_history(history, [_old_rec_entry(n)])
+    assert len(history) == REC_HISTORY_MAX
+    assert history[0]["ts"] == "t3"
+
+
+def test_hydrate_restores_router_fields_from_catalog_cache(old_state):
+    state = _apply(old_state, migrate_state(old_state))
+    hydrated = hydrate_search_results(state["search_results"], fetch=False)
+    for m, original in zip(hydrated["matches"], old_state["search_results"]["matches"]):
+        assert m["metadata"] == original["metadata"]
+        assert m["score"] == original["score"]
+        # chatbot 라우터가 rec_candidates 저장에 쓰는 값
+        assert m["metadata"]["text"] and int(m["metadata"]["no"]) == int(m["id"])
+
+
+def test_hydrate_falls_back_to_index_fetch(old_state, monkeypatch):
+    state = _apply(old_state, migrate_state(old_state))
+    CATALOG_CACHE.clear()   # 다른 워커/재시작 뒤
+    hydrated = hydrate_search_results(state["search_results"])
+    assert [m["metadata"]["text"] for m in hydrated["matches"]] == \
+        [synthetic_perfume(i)["text"] for i in (1, 2, 3)]
+    # fetch한 metadata는 캐시에 들어감
+    assert "1" in CATALOG_CACHE
+
+    def down(ids):
+        raise RuntimeError("pinecone down")
+    CATALOG_CACHE.clear()
+    monkeypatch.setattr(sc, "_fetch_metadata", down)
+    assert hydrate_search_results(state["search_results"]) == state["search_results"]
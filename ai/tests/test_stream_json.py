@@ -0,0 +1,60 @@
+# tests/test_stream_json.py
+# 증분 JSON 필드 파서: 청크가 어디서 잘려도 완성된 최상위 필드만, json.loads와 같은 값으로
+import json
+
+import pytest
+
+from scentpick.mas.tools.stream_json import IncrementalJSONFields
+
+SAMPLE = ('```json\n{"free_text": "따뜻한 \\"우디\\" 무드", "day_night_score": null, '
+          '"gender": "Unisex", "score": 0.8, "tags": ["a", {"b": "}"}], "ok": true}\n```')
+EXPECTED = json.loads(SAMPLE[len("```json\n"):-len("\n```")])
+
+
+def _feed_all(chunks):
+    parser = IncrementalJSONFields()
+    events = []
+    for c in chunks:
+        events.extend(parser.feed(c))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(SAMPLE)])
+def test_any_chunking_matches_json_loads(size):
+    parser, events = _feed_all(SAMPLE[i:i + size] for i in range(0, len(SAMPLE), size))
+    assert parser.state == "done"
+    assert parser.fields == EXPECTED
+    assert [k for k, _ in events] == list(EXPECTED)
+
+
+def test_partial_key_and_value_wait_for_completion():
+    parser = IncrementalJSONFields()
+    assert parser.feed('{"free_te') == []
+    assert parser.feed('xt": "플로') == []
+    assert parser.feed('럴"') == [("free_text", "플로럴")]
+    assert parser.feed(', "gen') == []
+    assert parser.fields == {"free_text": "플로럴"}
+    assert parser.state != "done"
+
+
+def test_null_and_number_need_delimiter():
+    parser = IncrementalJSONFields()
+    assert parser.feed('{"gender": nul') == []
+    # null 뒤에 구분자가 와야 완성 (nullx 같은 잘린 토큰과 구분)
+    assert parser.feed("l") == []
+    assert parser.feed(", ") == [("gender", None)]
+    assert parser.feed('"score": 12') == []
+    assert parser.feed("}") == [("score", 12)]
+    assert parser.state == "done"
+    assert parser.fields == {"gender": None, "score": 12}
+
+
+def test_leading_text_is_skipped():
+    parser, events = _feed_all(["분석 결과입니다:\n", '{"a": 1}'])
+    assert events == [("a", 1)]
+
+
+def test_garbage_does_not_raise():
+    parser, events = _feed_all(["not json at all", "{\"a\" 1, ", "\"b\": [1, 2"])
+    assert parser.state != "done"
+    assert "b" not in parser.fields
@@ -0,0 +1,22 @@
+# tests/test_tracing.py
+# 턴 트레이스: 같은 대화(thread)의 턴마다 turn_id가 새로 발급되는지
+from scentpick.mas.tools.tracing import current_turn, turn_scope
+
+
+def test_turn_id_is_per_turn():
+    ids = []
+    for _ in range(2):
+        with turn_scope(thread_id="thread-1") as turn:
+            assert current_turn() is turn
+            ids.append(turn.turn_id)
+            summary = turn.summary()
+        assert summary["thread_id"] == "thread-1"
+        assert summary["turn_id"] != "thread-1"
+    assert ids[0] != ids[1]
+    assert current_turn() is None
+
+
+def test_explicit_turn_id_without_thread():
+    with turn_scope("t-1") as turn:
+        assert turn.summary()["turn_id"] == "t-1"
+        assert "thread_id" not in turn.summary()
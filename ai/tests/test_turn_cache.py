@@ -0,0 +1,155 @@
+# tests/test_turn_cache.py
+# 추천 턴 캐시: 키 구성, 맥락 있는 대화 우회, 카탈로그 버전 무효화, 재생한 턴이 실제 실행과 같은 state를 남기는지
+# - 그래프는 benchmarks 가짜 업스트림 위의 실제 graph_app (라우팅은 SyntheticResponder.routes로 지정)
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from scentpick.mas import config as mas_config
+from scentpick.mas.tools import turn_cache as tc
+
+QUERY = "여름에 쓸 시원한 향수 추천해줘"
+
+
+class FakeGraph:
+    """get_state만 필요한 키 계산용"""
+
+    def __init__(self, values=None):
+        self.values = values or {}
+
+    def get_state(self, config):
+        return type("Snapshot", (), {"values": self.values})()
+
+
+@pytest.fixture
+def enabled(monkeypatch, bench):
+    monkeypatch.setattr(tc, "TURN_CACHE_ENABLED", True)
+    monkeypatch.setitem(tc._catalog, "version", tc._catalog["version"])
+    monkeypatch.setitem(tc._catalog, "bumps", tc._catalog["bumps"])
+    return bench
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    def route(query, agent):
+        monkeypatch.setitem(mas_config.llm.synth.routes, query, agent)
+    return route
+
+
+def _thread():
+    return {"configurable": {"thread_id": f"test-{uuid.uuid4().hex}"}}
+
+
+def _turn(bench, cfg, query):
+    return tc.run_with_turn_cache(bench.graph_app, {"messages": [HumanMessage(content=query)], "image_url": None}, cfg)
+
+
+def _rec_out(agent="LLM_parser", **kw):
+    out = {
+        "messages": [HumanMessage(content=QUERY), AIMessage(content="추천 답변")],
+        "router_json": {"next": agent},
+        "last_agent": agent,
+        "rec_history": [{"ts": "t", "source": agent, "items": [{"id": 1}]}],
+        "search_results": {"matches": [{"id": "1"}]},
+        "perfume_list": [{"id": 1}],
+    }
+    out.update(kw)
+    return out
+
+
+def test_disabled_or_image_turn_has_no_key(monkeypatch):
+    monkeypatch.setattr(tc, "TURN_CACHE_ENABLED", False)
+    assert tc.turn_cache_key(FakeGraph(), {}, QUERY) is None
+    monkeypatch.setattr(tc, "TURN_CACHE_ENABLED", True)
+    assert tc.turn_cache_key(FakeGraph(), {}, QUERY, image_url="https://example.com/a.jpg") is None
+
+
+def test_key_parts(enabled):
+    key = tc.turn_cache_key(FakeGraph(), {}, QUERY)
+    assert key is not None
+    # 공백/대소문자 차이는 같은 키
+    assert tc.turn_cache_key(FakeGraph(), {}, f"  {QUERY} ") == key
+    # 패싯(계절)이 다르면 다른 키
+    assert tc.turn_cache_key(FakeGraph(), {}, "겨울에 쓸 따뜻한 향수 추천해줘") != key
+    # supervisor 입력인 LAST_AGENT가 다르면 라우팅이 달라질 수 있으므로 다른 키
+    assert tc.turn_cache_key(FakeGraph({"last_agent": "FAQ_agent"}), {}, QUERY) != key
+    assert tc.turn_cache_key(FakeGraph({"last_agent": "FAQ_agent"}), {}, QUERY) == \
+        tc.turn_cache_key(FakeGraph({"last_agent": "FAQ_agent", "messages": []}), {}, QUERY)
+
+
+@pytest.mark.parametrize("values", [
+    {"rec_history": [{"source": "LLM_parser", "items": [{"id": 1}]}]},
+    {"perfume_list": [{"id": 1}]},
+])
+def test_conversation_with_rec_context_bypasses(enabled, values):
+    before = tc.get_turn_cache_stats()["bypassed"]
+    assert tc.turn_cache_key(FakeGraph(values), {}, QUERY) is None
+    assert tc.get_turn_cache_stats()["bypassed"] == before + 1
+
+
+@pytest.mark.parametrize("out", [
+    _rec_out(agent="FAQ_agent"),
+    _rec_out(router_json={"next": "ML_agent"}),
+    _rec_out(rec_history=[]),
+    _rec_out(rec_history=[{"ts": "t", "source": "LLM_parser", "items": []}]),
+    _rec_out(messages=[HumanMessage(content=QUERY)]),
+], ids=["agent", "route-mismatch", "no-history", "no-items", "no-answer"])
+def test_store_skips_non_cacheable_turns(enabled, out):
+    assert not tc.turn_cache_store(("k",), out)
+    assert ("k",) not in tc.TURN_CACHE
+
+
+def test_store_and_replay_miss(enabled):
+    assert tc.turn_cache_store(("k",), _rec_out())
+    assert ("k",) in tc.TURN_CACHE
+    assert tc.turn_cache_replay(enabled.graph_app, _thread(), ("other",), QUERY) is None
+
+
+def test_catalog_version_invalidates(enabled):
+    key = tc.turn_cache_key(FakeGraph(), {}, QUERY)
+    tc.turn_cache_store(key, _rec_out())
+    assert tc.set_catalog_version("catalog-v2") == "catalog-v2"
+    assert len(tc.TURN_CACHE) == 0
+    assert tc.turn_cache_key(FakeGraph(), {}, QUERY) != key
+    # 버전 없이 호출하면 기본 버전에 +N을 붙여 올림
+    assert tc.set_catalog_version() != "catalog-v2"
+
+
+# 다음 턴에 읽는 state 필드
+_STATE_KEYS = ("next", "last_agent", "router_json", "parsed_slots", "search_results", "final_answer")
+
+
+def _comparable(values):
+    out = {k: values.get(k) for k in _STATE_KEYS}
+    out["perfume_list"] = values.get("perfume_list") or []
+    out["messages"] = [(type(m).__name__, m.content) for m in values.get("messages", [])]
+    out["rec_history"] = [(e.get("source"), e.get("items")) for e in values.get("rec_history") or []]
+    return out
+
+
+def test_replayed_turn_matches_real_run(enabled, routes):
+    routes(QUERY, "LLM_parser")
+    real_cfg, cached_cfg = _thread(), _thread()
+
+    real = _turn(enabled, real_cfg, QUERY)
+    assert tc.get_turn_cache_stats()["stored"] >= 1
+    hits = tc.TURN_CACHE.stats()["hits"]
+    cached = _turn(enabled, cached_cfg, QUERY)
+    assert tc.TURN_CACHE.stats()["hits"] == hits + 1
+    assert cached["rec_history"][-1]["cached"] is True
+
+    graph = enabled.graph_app
+    assert _comparable(cached) == _comparable(real)
+    assert _comparable(graph.get_state(cached_cfg).values) == _comparable(graph.get_state(real_cfg).values)
+    # 다음 단계가 남아 있지 않음 (에이전트 노드가 끝난 것과 같은 위치)
+    assert graph.get_state(cached_cfg).next == graph.get_state(real_cfg).next == ()
+
+    # 다음 턴: 추천 맥락이 있으므로 캐시를 우회하고, 두 대화가 같은 답을 냄
+    for follow_up, agent in (("방금 추천한 것 중 첫 번째 다시 설명해줘", "rec_echo"),
+                             ("첫 번째 향수 가격 알려줘", "price_agent")):
+        routes(follow_up, agent)
+        a = _turn(enabled, real_cfg, follow_up)
+        b = _turn(enabled, cached_cfg, follow_up)
+        assert a.get("last_agent") == b.get("last_agent") == agent
+        assert _comparable(a)["messages"][-1] == _comparable(b)["messages"][-1]
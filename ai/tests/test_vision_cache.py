@@ -0,0 +1,165 @@
+# tests/test_vision_cache.py
+# 비전 분석 캐시: (프롬프트 해시, 질의, phash) 키 hit/miss + 근사 중복 이미지 판별
+# - 비전 클라이언트는 호출 횟수만 세는 가짜, 이미지는 Pillow로 만든 합성 장면
+import io
+import random
+
+import pytest
+from PIL import Image, ImageDraw
+
+from scentpick.mas.tools.image_utils import (
+    VISION_HASH_MAX_DISTANCE,
+    PerceptualHashCache,
+    analyze_with_cache,
+    hamming,
+    prepare_vision_image,
+    vision_cache_context,
+)
+from scentpick.mas.tools.tracing import turn_scope
+
+PROMPT = "Analyze the uploaded perfume-related image."
+
+
+class StubVisionClient:
+    """질의별 고정 분석 결과를 돌려주고 호출 횟수를 기록"""
+
+    def __init__(self, ok=True):
+        self.calls = []
+        self.ok = ok
+
+    def analyzer(self, query):
+        def analyze():
+            self.calls.append(query)
+            return {"free_text": f"analysis for {query}", "season_score": "summer"}, self.ok, {"matches": []}
+        return analyze
+
+
+def _scene(seed, size=(800, 600), extra=None):
+    rnd = random.Random(seed)
+    img = Image.new("RGB", size)
+    d = ImageDraw.Draw(img)
+    c0 = [rnd.randint(0, 255) for _ in range(3)]
+    c1 = [rnd.randint(0, 255) for _ in range(3)]
+    for y in range(size[1]):
+        t = y / size[1]
+        d.line([(0, y), (size[0], y)], fill=tuple(int(a + (b - a) * t) for a, b in zip(c0, c1)))
+    for _ in range(12):
+        x, y, r = rnd.randint(0, size[0]), rnd.randint(0, size[1]), rnd.randint(30, 200)
+        d.ellipse([x - r, y - r, x + r, y + r], fill=tuple(rnd.randint(0, 255) for _ in range(3)))
+    if extra is not None:
+        # 같은 배경에 물체 하나를 더한 '다른' 사진
+        r2 = random.Random(extra)
+        x, y = r2.randint(100, 700), r2.randint(100, 500)
+        d.rectangle([x - 120, y - 90, x + 120, y + 90], fill=tuple(r2.randint(0, 255) for _ in range(3)))
+    return img
+
+
+def _jpeg(img, quality=95):
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def cache():
+    return PerceptualHashCache("vision_test", maxsize=32, ttl=60)
+
+
+@pytest.fixture
+def images():
+    # 시드는 측정값 기준: 재압축본 거리 2(경계), 물체를 더한 사진 거리 4, 다른 장면 20 이상
+    base = _scene(4)
+    return {
+        "original": prepare_vision_image(_jpeg(base)),
+        "recompressed": prepare_vision_image(_jpeg(base.resize((400, 300)), quality=40)),
+        "other": prepare_vision_image(_jpeg(_scene(2))),
+        "edited": prepare_vision_image(_jpeg(_scene(4, extra=9))),
+    }
+
+
+def _ctx(query, prompt=PROMPT):
+    return vision_cache_context(query, prompt, "gpt-4o-mini", "low")
+
+
+def test_same_image_same_query_hits(cache, images):
+    client = StubVisionClient()
+    img = images["original"]
+    first, extra, hit = analyze_with_cache(img.phash, _ctx("여름 향수"), client.analyzer("여름 향수"), cache)
+    assert not hit and extra == {"matches": []}
+    second, extra, hit = analyze_with_cache(img.phash, _ctx("여름 향수 "), client.analyzer("여름 향수"), cache)
+    assert hit and extra is None
+    assert second == first
+    assert len(client.calls) == 1
+
+
+def test_different_query_misses(cache, images):
+    client = StubVisionClient()
+    img = images["original"]
+    analyze_with_cache(img.phash, _ctx("여름 향수"), client.analyzer("여름 향수"), cache)
+    out, _, hit = analyze_with_cache(img.phash, _ctx("남자 향수"), client.analyzer("남자 향수"), cache)
+    assert not hit
+    assert out["free_text"] == "analysis for 남자 향수"
+    assert client.calls == ["여름 향수", "남자 향수"]
+
+
+def test_prompt_change_misses(cache, images):
+    client = StubVisionClient()
+    img = images["original"]
+    analyze_with_cache(img.phash, _ctx("q"), client.analyzer("q"), cache)
+    _, _, hit = analyze_with_cache(img.phash, _ctx("q", PROMPT + " v2"), client.analyzer("q"), cache)
+    assert not hit
+    assert len(client.calls) == 2
+
+
+def test_failed_parse_not_cached(cache, images):
+    client = StubVisionClient(ok=False)
+    img = images["original"]
+    analyze_with_cache(img.phash, _ctx("q"), client.analyzer("q"), cache)
+    _, _, hit = analyze_with_cache(img.phash, _ctx("q"), client.analyzer("q"), cache)
+    assert not hit
+    assert len(client.calls) == 2
+
+
+def test_near_duplicate_hits(cache, images):
+    orig, dup = images["original"], images["recompressed"]
+    assert hamming(orig.phash, dup.phash) <= VISION_HASH_MAX_DISTANCE
+
+    client = StubVisionClient()
+    with turn_scope("t-near") as turn:
+        analyze_with_cache(orig.phash, _ctx("q"), client.analyzer("q"), cache)
+        _, _, hit = analyze_with_cache(dup.phash, _ctx("q"), client.analyzer("q"), cache)
+    assert hit
+    assert len(client.calls) == 1
+    # 근사 hit는 조회 한 번 = hit 한 번 (정확 키 미스를 따로 세지 않음)
+    assert turn.cache["vision_test"] == {"hit": 1, "miss": 1}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_exact_and_miss_recorded_once(cache, images):
+    img, other = images["original"], images["other"]
+    cache.set((_ctx("q"), img.phash), {"free_text": "q"})
+    with turn_scope("t-exact") as turn:
+        assert cache.get_near(_ctx("q"), img.phash) == (True, {"free_text": "q"})
+        assert cache.get_near(_ctx("q"), other.phash) == (False, None)
+        assert cache.get_near(_ctx("q"), img.phash, max_distance=0)[0]
+    assert turn.cache["vision_test"] == {"hit": 2, "miss": 1}
+
+
+@pytest.mark.parametrize("name", ["other", "edited"])
+def test_distinct_image_misses(cache, images, name):
+    orig, other = images["original"], images[name]
+    assert hamming(orig.phash, other.phash) > VISION_HASH_MAX_DISTANCE
+
+    client = StubVisionClient()
+    analyze_with_cache(orig.phash, _ctx("q"), client.analyzer("q"), cache)
+    _, _, hit = analyze_with_cache(other.phash, _ctx("q"), client.analyzer("q"), cache)
+    assert not hit
+    assert len(client.calls) == 2
+
+
+def test_near_lookup_stays_within_context(cache, images):
+    orig, dup = images["original"], images["recompressed"]
+    cache.set((_ctx("a"), orig.phash), {"free_text": "a"})
+    assert cache.get_near(_ctx("b"), dup.phash) == (False, None)
+    assert cache.get_near(_ctx("a"), dup.phash) == (True, {"free_text": "a"})
@@ -155,6 +155,33 @@ DATABASES = {
     }
 }
 
+# Cache
+# REDIS_URL이 있으면 Redis(운영), 없으면 프로세스 메모리(개발/테스트)
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ["REDIS_URL"],
+            'KEY_PREFIX': 'scentpick',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 향수 목록 페이지 패싯(브랜드/농도/성별/어코드/용량) 캐시 시간(초)
+CATALOG_FACETS_TIMEOUT = int(os.environ.get("CATALOG_FACETS_TIMEOUT", "3600"))
+# 향수 목록 필터 조합별 전체 개수(COUNT) 캐시 시간(초)
+CATALOG_COUNT_TIMEOUT = int(os.environ.get("CATALOG_COUNT_TIMEOUT", "600"))
+# 향수 상세 페이지 뷰 모델(노트/이미지/이전·다음 id) 캐시 시간(초)
+PERFUME_DETAIL_TIMEOUT = int(os.environ.get("PERFUME_DETAIL_TIMEOUT", "3600"))
+# 추천 페이지 날씨: 이 시간(초)이 지나면 백그라운드 갱신, 캐시가 없을 때 기다리는 최대 시간(초)
+WEATHER_FORECAST_TTL = int(os.environ.get("WEATHER_FORECAST_TTL", "600"))
+WEATHER_COLD_WAIT = float(os.environ.get("WEATHER_COLD_WAIT", "1.5"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
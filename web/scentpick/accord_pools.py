@@ -0,0 +1,113 @@
+# scentpick/accord_pools.py
+# 날씨/계절 추천용 어코드 풀: (어코드, 성별) → 정렬된 perfume id 배열 (프로세스 내 색인)
+# - 풀 = 어코드 중 하나라도 가진 향수의 앞쪽(id 순) pool개 — 기존 EXISTS + LIMIT 조회와 같은 집합
+# - 제외 / k개 랜덤 추출은 id 배열에서, 뽑힌 id만 id__in 조회 1번
+# - 무효화: Perfume 저장/삭제 시 signals.py → invalidate_accord_pools()
+#   캐시(운영은 Redis)에 버전 토큰을 두고, 각 프로세스는 토큰이 바뀌면 다음 조회 때 재구성
+import heapq
+import random
+import threading
+import uuid
+from array import array
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .models import Perfume, PerfumeAccord
+
+ACCORD_POOLS_VERSION_KEY = "scentpick:accord_pools:version"
+
+
+def genders_for(gender):
+    """요청 성별 → 포함할 성별들 (None이면 전체). Male/Female은 Unisex 포함"""
+    if gender in ("Male", "Female"):
+        return (gender, "Unisex")
+    if gender == "Unisex":
+        return ("Unisex",)
+    return None
+
+
+class AccordPoolIndex:
+    def __init__(self, ids):
+        # ids: accord → gender → array("q") (id 오름차순)
+        self.ids = ids
+
+    @classmethod
+    def build(cls):
+        acc = defaultdict(lambda: defaultdict(list))
+        rows = PerfumeAccord.objects.order_by("perfume_id").values_list("accord", "perfume_id", "perfume__gender")
+        for accord, pid, gender in rows.iterator(chunk_size=5000):
+            acc[accord][gender].append(pid)
+        return cls({
+            accord: {gender: array("q", pids) for gender, pids in by_gender.items()}
+            for accord, by_gender in acc.items()
+        })
+
+    def pool_ids(self, accords, gender=None, limit=None):
+        """어코드 중 하나라도 가진 (성별 조건) 향수 id, 오름차순 최대 limit개"""
+        genders = genders_for(gender)
+        arrays = [
+            arr
+            for accord in dict.fromkeys(accords)
+            for g, arr in self.ids.get(accord, {}).items()
+            if genders is None or g in genders
+        ]
+        out = []
+        last = None
+        for pid in heapq.merge(*arrays):
+            if pid != last:
+                out.append(pid)
+                last = pid
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+
+_lock = threading.Lock()
+_current = {"index": None, "version": None}
+
+
+def _index_version():
+    version = cache.get(ACCORD_POOLS_VERSION_KEY)
+    if version is None:
+        cache.add(ACCORD_POOLS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(ACCORD_POOLS_VERSION_KEY)
+    return version
+
+
+def get_accord_pool_index():
+    version = _index_version()
+    index = _current["index"]
+    if index is not None and _current["version"] == version:
+        return index
+    with _lock:
+        if _current["index"] is None or _current["version"] != version:
+            _current["index"] = AccordPoolIndex.build()
+            _current["version"] = version
+        return _current["index"]
+
+
+def invalidate_accord_pools():
+    cache.set(ACCORD_POOLS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def accord_pool_ids(accords, gender=None, limit=None):
+    return get_accord_pool_index().pool_ids(accords, gender, limit)
+
+
+def fetch_in_order(ids):
+    """id 리스트 → 같은 순서의 Perfume 리스트 (id__in 조회 1번, 없어진 id는 건너뜀)"""
+    if not ids:
+        return []
+    by_id = Perfume.objects.in_bulk(ids)
+    return [by_id[pid] for pid in ids if pid in by_id]
+
+
+def sample_accord_pool(accords, k, pool=60, exclude_ids=None, gender=None):
+    """풀(앞쪽 pool개)에서 exclude_ids를 빼고 k개 랜덤 → Perfume 리스트"""
+    ids = accord_pool_ids(accords, gender, limit=pool)
+    if exclude_ids:
+        ids = [pid for pid in ids if pid not in exclude_ids]
+    if len(ids) > k:
+        ids = random.sample(ids, k)
+    return fetch_in_order(ids)
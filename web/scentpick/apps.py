@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ScentpickConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scentpick'
+
+    def ready(self):
+        from . import signals
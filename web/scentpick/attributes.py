@@ -0,0 +1,124 @@
+# scentpick/attributes.py
+# perfumes의 JSON 컬럼(main_accords / top·middle·base_notes / sizes) → 정규화 테이블 행
+# - perfume_accords / perfume_notes / perfume_sizes 는 이 모듈로만 채움
+# - Perfume 저장 시: signals.py → sync_perfume_attributes()
+# - 마이그레이션 / 일괄 적재(raw SQL, bulk_create) 뒤: rebuild_perfume_attributes()
+#   (manage.py sync_perfume_attributes)
+import unicodedata
+
+from django.db import transaction
+
+from .models import Perfume, PerfumeAccord, PerfumeNote, PerfumeSize
+
+# (layer, Perfume 필드)
+NOTE_LAYERS = (("top", "top_notes"), ("middle", "middle_notes"), ("base", "base_notes"))
+SOURCE_FIELDS = ("main_accords", "sizes") + tuple(f for _, f in NOTE_LAYERS)
+
+# 어코드 목록에서 제외할 구분자 토큰
+_ACCORD_SKIP = {"/", "-", "_"}
+_ACCORD_MAX = PerfumeAccord._meta.get_field("accord").max_length
+_NOTE_MAX = PerfumeNote._meta.get_field("note").max_length
+
+
+def _tokens(raw):
+    """JSON 리스트 또는 "['a', 'b']" / "a, b" 문자열 → 토큰 리스트"""
+    if not raw:
+        return []
+    if isinstance(raw, (list, tuple)):
+        parts = [str(p).strip() for p in raw if p]
+    else:
+        cleaned = str(raw).strip("[]").replace("'", "").replace('"', "")
+        parts = [p.strip() for p in cleaned.split(",")]
+    return [p for p in parts if p]
+
+
+def _unique(items, key=None):
+    """순서 유지 중복 제거 (key가 같으면 처음 것만)"""
+    seen = {}
+    for item in items:
+        seen.setdefault(item if key is None else key(item), item)
+    return list(seen.values())
+
+
+def _collation_key(text):
+    """
+    MySQL *_ci 콜레이션에서 같은 값으로 보는 문자열끼리 같은 키 (대소문자/악센트 무시)
+    → uq_perfume_accord / uq_perfume_note_layer 에 걸리는 "Woody"/"woody", "Neroli"/"Néroli" 중복 제거
+    """
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    return unicodedata.normalize("NFC", "".join(ch for ch in decomposed if not unicodedata.combining(ch)))
+
+
+def parse_accords(raw):
+    return _unique((t[:_ACCORD_MAX] for t in _tokens(raw) if t not in _ACCORD_SKIP), key=_collation_key)
+
+
+def parse_notes(raw):
+    return _unique((t[:_NOTE_MAX] for t in _tokens(raw)), key=_collation_key)
+
+
+def parse_sizes(raw):
+    """[30, 50] / ["30ml", "50"] / "30, 50" → [30, 50]"""
+    sizes = []
+    for t in _tokens(raw):
+        digits = "".join(ch for ch in t.split(".")[0] if ch.isdigit())
+        if digits and int(digits) > 0:
+            sizes.append(int(digits))
+    return _unique(sizes)
+
+
+def attribute_rows(perfume, accord_model=PerfumeAccord, note_model=PerfumeNote, size_model=PerfumeSize):
+    """향수 하나의 (어코드 행, 노트 행, 용량 행). 마이그레이션에서는 historical 모델을 넘김"""
+    pid = perfume.pk
+    accords = [
+        accord_model(perfume_id=pid, accord=a, position=i)
+        for i, a in enumerate(parse_accords(perfume.main_accords))
+    ]
+    notes = [
+        note_model(perfume_id=pid, layer=layer, note=n)
+        for layer, field in NOTE_LAYERS
+        for n in parse_notes(getattr(perfume, field))
+    ]
+    sizes = [size_model(perfume_id=pid, size_ml=s) for s in parse_sizes(perfume.sizes)]
+    return accords, notes, sizes
+
+
+def sync_perfume_attributes(perfume):
+    """향수 하나의 정규화 행을 JSON 컬럼 기준으로 다시 씀"""
+    accords, notes, sizes = attribute_rows(perfume)
+    with transaction.atomic():
+        PerfumeAccord.objects.filter(perfume_id=perfume.pk).delete()
+        PerfumeNote.objects.filter(perfume_id=perfume.pk).delete()
+        PerfumeSize.objects.filter(perfume_id=perfume.pk).delete()
+        PerfumeAccord.objects.bulk_create(accords)
+        PerfumeNote.objects.bulk_create(notes)
+        PerfumeSize.objects.bulk_create(sizes)
+
+
+def rebuild_perfume_attributes(perfumes=None, accord_model=PerfumeAccord, note_model=PerfumeNote,
+                               size_model=PerfumeSize, batch_size=1000):
+    """perfumes(쿼리셋, 기본 전체)의 정규화 행을 batch_size개씩 다시 씀 → (어코드, 노트, 용량) 행 수"""
+    if perfumes is None:
+        perfumes = Perfume.objects.all()
+    perfumes = perfumes.only("pk", *SOURCE_FIELDS).order_by("pk")
+    totals = [0, 0, 0]
+    batch = []
+
+    def flush():
+        ids = [p.pk for p in batch]
+        rows = [attribute_rows(p, accord_model, note_model, size_model) for p in batch]
+        with transaction.atomic():
+            for i, model in enumerate((accord_model, note_model, size_model)):
+                model.objects.filter(perfume_id__in=ids).delete()
+                objs = [obj for r in rows for obj in r[i]]
+                model.objects.bulk_create(objs, batch_size=batch_size)
+                totals[i] += len(objs)
+        batch.clear()
+
+    for p in perfumes.iterator(chunk_size=batch_size):
+        batch.append(p)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return tuple(totals)
@@ -0,0 +1,166 @@
+# scentpick/chat_history.py
+# 대화 기록 + 각 assistant 메시지에 붙는 추천 후보를 고정 쿼리 수로 불러오기
+# - 메시지 1번, rec_runs(요청 메시지 시각 포함) 1번, 골라진 run들의 후보(+향수) 1번
+# - 기존 규칙 그대로: assistant 메시지마다 "요청 메시지가 그 메시지 이전인 run 중 가장 최근 run"의 후보
+# - 메시지는 최신순 커서 페이지(before=<message_id>), (conversation, created_at) 인덱스 범위 조회
+# - 대화 목록은 (updated_at, id) 커서 페이지, 제목 없는 대화의 첫 user 메시지 제목도 같은 쿼리에서
+# - *_state(): ETag용 변경 요약값 (쿼리 1번, 본문을 만들지 않고 304 판단)
+import hashlib
+import json
+
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Substr
+from django.utils.dateparse import parse_datetime
+
+from .models import Conversation, Message, RecCandidate, RecRun
+from .pagination import decode_cursor, encode_cursor
+
+MESSAGE_PAGE_SIZE = 50
+CONVERSATION_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+
+
+def page_size(raw, default):
+    """?limit= 값 → 1..MAX_PAGE_SIZE (잘못된 값은 default)"""
+    try:
+        return min(max(int(raw), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return default
+
+
+def _latest_runs_by_message(messages, runs):
+    """assistant 메시지 id → 그 시점까지의 최신 run id (runs: (run_id, run_created_at, request_created_at))"""
+    runs = sorted(runs, key=lambda r: r[2])
+    chosen = {}
+    best = None
+    i = 0
+    for m in messages:
+        while i < len(runs) and runs[i][2] <= m.created_at:
+            if best is None or (runs[i][1], runs[i][0]) > (best[1], best[0]):
+                best = runs[i]
+            i += 1
+        if m.role == "assistant" and best is not None:
+            chosen[m.id] = best[0]
+    return chosen
+
+
+def _with_perfume_lists(conversation, messages):
+    """시간순 메시지 → [(Message, perfume_list)]"""
+    if not any(m.role == "assistant" for m in messages):
+        return [(m, []) for m in messages]
+
+    # 페이지 마지막 메시지보다 나중에 요청된 run은 이 페이지와 무관
+    runs = RecRun.objects.filter(
+        conversation=conversation,
+        request_msg__isnull=False,
+        request_msg__created_at__lte=messages[-1].created_at,
+    ).values_list("id", "created_at", "request_msg__created_at")
+    chosen = _latest_runs_by_message(messages, list(runs))
+
+    lists = {run_id: [] for run_id in set(chosen.values())}
+    if lists:
+        candidates = (
+            RecCandidate.objects.filter(run_rec_id__in=lists)
+            .select_related("perfume")
+            .only("run_rec_id", "rank", "score", "perfume__id", "perfume__brand", "perfume__name")
+            .order_by("run_rec_id", "rank")
+        )
+        for c in candidates:
+            lists[c.run_rec_id].append({
+                "id": c.perfume.id,
+                "brand": c.perfume.brand,
+                "name": c.perfume.name,
+                "rank": c.rank,
+                "score": c.score,
+            })
+    return [(m, lists.get(chosen.get(m.id), [])) for m in messages]
+
+
+def load_conversation_history(conversation, before=None, limit=None):
+    """
+    before(메시지 id)보다 오래된 메시지 중 최신 limit개 (limit=None이면 전부)
+    → ([(Message, perfume_list)] 시간순, next_before)
+    perfume_list: [{"id", "brand", "name", "rank", "score"}] (없으면 [])
+    next_before: 더 오래된 메시지가 있으면 이번 페이지 첫 메시지 id, 없으면 None
+    """
+    qs = conversation.messages.only("id", "conversation_id", "role", "content", "created_at", "chat_image")
+    if before:
+        # 기준 메시지 시각은 서브쿼리로 (다른 대화의 id면 빈 결과)
+        anchor = Subquery(conversation.messages.filter(pk=before).values("created_at")[:1])
+        qs = qs.filter(Q(created_at__lt=anchor) | Q(created_at=anchor, id__lt=before))
+    qs = qs.order_by("-created_at", "-id")
+    if limit is None:
+        messages, more = list(qs), False
+    else:
+        messages = list(qs[:limit + 1])
+        more = len(messages) > limit
+        messages = messages[:limit]
+    if not messages:
+        return [], None
+    messages.reverse()
+    return _with_perfume_lists(conversation, messages), (messages[0].id if more else None)
+
+
+def load_conversation_list(user, cursor=None, limit=CONVERSATION_PAGE_SIZE):
+    """
+    (updated_at, id) 최신순 → ([{"id", "title", "updated_at"}], next_cursor)
+    제목이 없으면 첫 user 메시지 앞 15자, 그것도 없으면 "대화 {id}"
+    """
+    first_user_text = (
+        Message.objects.filter(conversation=OuterRef("pk"), role="user")
+        .order_by("created_at", "id")
+        .values("content")[:1]
+    )
+    qs = (
+        Conversation.objects.filter(user=user)
+        .annotate(first_text=Substr(Subquery(first_user_text), 1, 15))
+        .only("id", "title", "updated_at")
+        .order_by("-updated_at", "-id")
+    )
+    key = (decode_cursor(cursor) or {}).get("u")
+    if isinstance(key, list) and len(key) == 2:
+        updated_at = parse_datetime(str(key[0]))
+        if updated_at is not None:
+            qs = qs.filter(Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=key[1]))
+    rows = list(qs[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"u": [rows[-1].updated_at.isoformat(), rows[-1].id]})
+    items = [
+        {"id": c.id, "title": c.title or c.first_text or f"대화 {c.id}", "updated_at": c.updated_at}
+        for c in rows
+    ]
+    return items, next_cursor
+
+
+# -----------------------------
+# ETag
+# -----------------------------
+def make_etag(*parts):
+    raw = json.dumps(parts, default=str, separators=(",", ":")).encode()
+    return hashlib.sha1(raw).hexdigest()[:32]
+
+
+def conversation_state(user, conv_id):
+    """
+    대화 하나의 변경 요약 (updated_at, title, 마지막 메시지 id, 메시지 수, 마지막 run id), 없으면 None
+    FastAPI 쪽이 updated_at 갱신을 빠뜨려도 메시지/run 추가·삭제는 잡힘
+    """
+    messages = Message.objects.filter(conversation=OuterRef("pk"))
+    return (
+        Conversation.objects.filter(id=conv_id, user=user)
+        .annotate(
+            last_message=Subquery(messages.order_by("-id").values("id")[:1]),
+            message_count=Subquery(messages.values("conversation").annotate(n=Count("id")).values("n")),
+            last_run=Subquery(RecRun.objects.filter(conversation=OuterRef("pk")).order_by("-id").values("id")[:1]),
+        )
+        .values_list("updated_at", "title", "last_message", "message_count", "last_run")
+        .first()
+    )
+
+
+def conversation_list_state(user):
+    """사용자 대화 목록의 변경 요약 (가장 최근 updated_at, 대화 수)"""
+    state = Conversation.objects.filter(user=user).aggregate(latest=Max("updated_at"), n=Count("id"))
+    return state["latest"], state["n"]
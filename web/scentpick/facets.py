@@ -0,0 +1,45 @@
+# scentpick/facets.py
+# 향수 목록(perfumes) 페이지 좌측 필터용 패싯 목록
+# - 브랜드/농도/성별/메인어코드/용량별 값과 개수를 한 번에 계산해 Django 캐시에 보관
+# - 페이지 넘김(ajax=1)마다 DISTINCT 쿼리 3개 + main_accords 전체 파싱을 반복하지 않도록
+# - 어코드/용량 개수는 정규화 테이블(perfume_accords / perfume_sizes) GROUP BY
+# - Perfume 저장/삭제 시 signals.py에서 invalidate_catalog_facets() 호출
+#   (bulk_create/update/loaddata --raw 등 시그널이 없는 일괄 작업 뒤에는 직접 호출, 아니면 만료 시간까지 유지)
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Perfume, PerfumeAccord, PerfumeSize
+
+FACETS_CACHE_KEY = "scentpick:catalog_facets:v1"
+FACETS_CACHE_TIMEOUT = getattr(settings, "CATALOG_FACETS_TIMEOUT", 60 * 60)
+
+
+def _value_counts(qs, field):
+    # 정규화 테이블은 (perfume, 값) 유니크라 행 수 = 향수 수
+    rows = qs.values(field).annotate(count=Count("pk")).order_by(field)
+    return [{"value": r[field], "count": r["count"]} for r in rows]
+
+
+def compute_catalog_facets():
+    """DB에서 패싯 목록 계산 (캐시 없이)"""
+    return {
+        "brands": _value_counts(Perfume.objects.exclude(brand=""), "brand"),
+        "concentrations": _value_counts(Perfume.objects.exclude(concentration=""), "concentration"),
+        "genders": _value_counts(Perfume.objects.exclude(gender=""), "gender"),
+        "accords": _value_counts(PerfumeAccord.objects.all(), "accord"),
+        "sizes": _value_counts(PerfumeSize.objects.all(), "size_ml"),
+    }
+
+
+def get_catalog_facets():
+    """캐시된 패싯 목록 (없으면 계산 후 저장)"""
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        facets = compute_catalog_facets()
+        cache.set(FACETS_CACHE_KEY, facets, FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_catalog_facets():
+    cache.delete(FACETS_CACHE_KEY)
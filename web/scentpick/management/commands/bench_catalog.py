@@ -0,0 +1,200 @@
+# scentpick/management/commands/bench_catalog.py
+# 향수 목록(perfumes) 페이지 지연시간 벤치마크
+# - 트랜잭션 안에서 가짜 향수 N개를 넣고 측정 후 롤백 (기존 데이터는 그대로)
+# - 패싯 캐시 miss(cold) / hit(warm) / 페이지 넘김(ajax=1) / 깊은 페이지(번호 vs 커서) / 어코드·용량 필터 /
+#   q 검색 / 자동완성 / 계절·월드컵 후보 조회 / 추천 페이지(날씨는 캐시에 미리 채움)
+#   각각 p50/p95와 쿼리 수 출력, --explain 이면 필터 쿼리의 EXPLAIN도 출력
+#   python manage.py bench_catalog --settings=django_app.settings_dev --perfumes 5000 --explain
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from scentpick.attributes import rebuild_perfume_attributes
+from scentpick.accord_pools import get_accord_pool_index, invalidate_accord_pools
+from scentpick.facets import compute_catalog_facets, invalidate_catalog_facets
+from scentpick.models import Perfume, PerfumeAccord, PerfumeSize
+from scentpick.pagination import PER_PAGE, encode_cursor, invalidate_catalog_counts
+from scentpick.search import get_search_index, invalidate_search_index
+from scentpick.views import (
+    fetch_random_by_accords, filter_worldcup_candidates, perfume_has, perfume_ids_with, query_perfumes_by_accords,
+)
+from scentpick.weather import _forecast_key, grid_cell
+
+ACCORDS = [
+    "플로랄", "우디", "시트러스", "머스크", "파우더리", "앰버", "스파이시", "프루티", "그린", "아쿠아틱",
+    "바닐라", "레더", "로즈", "스모키", "허벌", "발삼", "오리엔탈", "화이트 플로랄", "오존", "토바코",
+]
+CONCENTRATIONS = ["EDP", "EDT", "EDC", "Parfum", "Extrait"]
+GENDERS = ["Male", "Female", "Unisex"]
+SIZES = [5, 10, 30, 50, 75, 100, 125, 150, 200]
+NOTES = [
+    "bergamot", "lemon", "mandarin", "pink pepper", "rose", "jasmine", "iris", "lavender", "neroli",
+    "cedar", "sandalwood", "vetiver", "patchouli", "musk", "amber", "vanilla", "tonka bean", "oud",
+    "leather", "incense", "tea", "fig", "blackcurrant", "pear", "ginger", "cardamom", "benzoin",
+]
+WORDS = ["은은한", "따뜻한", "상쾌한", "깊은", "부드러운", "향", "잔향", "느낌", "분위기", "fresh", "warm", "soft"]
+TYPEAHEAD_QUERIES = ["b", "be", "bench b", "bench brand 01", "ber", "베르", "우디", "로랄", "vanil", "rose 우디", "perfume 004"]
+
+
+def _pct(samples, p):
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "향수 목록 페이지 지연시간 벤치마크 (가짜 데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--perfumes", type=int, default=5000, help="넣을 가짜 향수 수")
+        parser.add_argument("--brands", type=int, default=400)
+        parser.add_argument("--repeat", type=int, default=20, help="시나리오별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--explain", action="store_true", help="필터 쿼리 EXPLAIN 출력")
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            self._seed(opts["perfumes"], opts["brands"], opts["seed"])
+            try:
+                if opts["explain"]:
+                    self._explain()
+                self._run(opts["repeat"])
+            finally:
+                transaction.set_rollback(True)
+                invalidate_catalog_facets()
+                invalidate_catalog_counts()
+                invalidate_search_index()
+                invalidate_accord_pools()
+
+    def _seed(self, n, n_brands, seed):
+        rnd = random.Random(seed)
+        Perfume.objects.bulk_create(
+            [
+                Perfume(
+                    brand=f"Bench Brand {i % n_brands:03d}",
+                    name=f"Bench Perfume {i:05d}",
+                    sizes=sorted(rnd.sample(SIZES, rnd.randint(1, 3))),
+                    description=" ".join(rnd.choices(WORDS + NOTES + ACCORDS, k=40)),
+                    concentration=rnd.choice(CONCENTRATIONS),
+                    gender=rnd.choice(GENDERS),
+                    main_accords=rnd.sample(ACCORDS, rnd.randint(3, 8)),
+                    top_notes=rnd.sample(NOTES, 3),
+                    middle_notes=rnd.sample(NOTES, 3),
+                    base_notes=rnd.sample(NOTES, 3),
+                )
+                for i in range(n)
+            ],
+            batch_size=1000,
+        )
+        # bulk_create는 post_save가 없으므로 정규화 테이블 직접 채움
+        rebuild_perfume_attributes(Perfume.objects.filter(name__startswith="Bench Perfume "))
+        self.stdout.write(f"perfumes: {Perfume.objects.count()} (seeded {n})")
+
+    def _explain(self):
+        queries = {
+            "accord filter": Perfume.objects.filter(
+                pk__in=perfume_ids_with(PerfumeAccord, accord__in=["우디", "앰버"])
+            ).order_by("brand", "name")[:24],
+            "size filter": Perfume.objects.filter(
+                pk__in=perfume_ids_with(PerfumeSize, size_ml__in=[100])
+            ).order_by("brand", "name")[:24],
+            "seasonal pool": Perfume.objects.filter(
+                perfume_has(PerfumeAccord, accord__in=["우디", "스파이시", "앰버", "머스크"])
+            )[:60],
+            "worldcup": Perfume.objects.filter(
+                perfume_has(PerfumeAccord, accord="플로랄"), gender__in=["Female", "Unisex"]
+            )[:200],
+        }
+        for label, qs in queries.items():
+            self.stdout.write(f"-- EXPLAIN {label}")
+            self.stdout.write(qs.explain())
+
+    def _run(self, repeat):
+        user = User.objects.create_user(username="bench_catalog_user", password="bench-pass-1234")
+        client = Client(HTTP_HOST="localhost")
+        client.force_login(user)
+
+        def measure(label, path, before=None):
+            timings, queries = [], 0
+            for _ in range(repeat):
+                if before:
+                    before()
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    res = client.get(path)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                if res.status_code != 200:
+                    raise RuntimeError(f"{path} → {res.status_code}")
+                queries = len(ctx.captured_queries)
+            self.stdout.write(
+                f"{label:<28} p50={statistics.median(timings):8.1f}ms  "
+                f"p95={_pct(timings, 95):8.1f}ms  queries={queries}"
+            )
+
+        t0 = time.perf_counter()
+        compute_catalog_facets()
+        self.stdout.write(f"{'facet compute (uncached)':<28} {(time.perf_counter() - t0) * 1000:8.1f}ms")
+
+        invalidate_search_index()
+        t0 = time.perf_counter()
+        index = get_search_index()
+        self.stdout.write(
+            f"{'search index build':<28} {(time.perf_counter() - t0) * 1000:8.1f}ms  "
+            f"docs={len(index.docs)} terms={len(index.terms)}"
+        )
+
+        invalidate_accord_pools()
+        t0 = time.perf_counter()
+        get_accord_pool_index()
+        self.stdout.write(f"{'accord pool index build':<28} {(time.perf_counter() - t0) * 1000:8.1f}ms")
+
+        url = reverse("scentpick:perfumes")
+        measure("page, facets cold", url, before=invalidate_catalog_facets)
+        measure("page, facets cached", url)
+        measure("page 10 ajax", f"{url}?page=10&ajax=1")
+
+        # 깊은 페이지: 번호(OFFSET, COUNT 캐시 전/후) vs 같은 위치의 커서
+        deep = max(1, Perfume.objects.count() // PER_PAGE - 1)
+        measure(f"page {deep} ajax, count cold", f"{url}?page={deep}&ajax=1", before=invalidate_catalog_counts)
+        measure(f"page {deep} ajax", f"{url}?page={deep}&ajax=1")
+        measure("cursor first ajax", f"{url}?ajax=1&cursor=")
+        last = Perfume.objects.order_by("brand", "name", "pk")[(deep - 1) * PER_PAGE - 1]
+        cursor = encode_cursor({"k": [last.brand, last.name, last.pk]})
+        measure(f"cursor @page {deep} ajax", f"{url}?ajax=1&cursor={cursor}")
+        measure("filtered ajax", f"{url}?gender=Female&conc=EDP&ajax=1")
+        measure("accord filter ajax", f"{url}?accord=우디&accord=앰버&ajax=1")
+        measure("size filter ajax", f"{url}?size=100&ajax=1")
+        measure("q search ajax", f"{url}?q=우디 bergamot&ajax=1")
+
+        typeahead_url = reverse("scentpick:perfume_typeahead")
+        for tq in TYPEAHEAD_QUERIES:
+            measure(f"typeahead '{tq}'", f"{typeahead_url}?q={tq}")
+
+        def measure_fn(label, fn):
+            timings = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - t0) * 1000)
+            self.stdout.write(f"{label:<28} p50={statistics.median(timings):8.1f}ms  p95={_pct(timings, 95):8.1f}ms")
+
+        measure_fn("seasonal pool (60)", lambda: query_perfumes_by_accords(["우디", "스파이시", "앰버", "머스크"], limit=60))
+        measure_fn("worldcup candidates", lambda: filter_worldcup_candidates("여성", "플로랄", "day"))
+        measure_fn("weather pick (3 of 60)", lambda: fetch_random_by_accords(["시트러스", "아쿠아틱", "그린"], gender="Female"))
+
+        # 추천 페이지: Open-Meteo 호출 없이 측정하도록 날씨 캐시를 미리 채움
+        lat, lon = 37.5665, 126.9780
+        cache.set(_forecast_key(grid_cell(lat, lon)), {
+            "current": {"temperature_2m": 21.0, "relative_humidity_2m": 55, "weather_code": 1, "wind_speed_10m": 2.0},
+            "fetched_at": time.time(),
+        }, 60 * 60)
+        recommend_url = reverse("scentpick:recommend")
+        measure("recommend page", f"{recommend_url}?lat={lat}&lon={lon}")
+        measure("recommend + worldcup", f"{recommend_url}?lat={lat}&lon={lon}&g=여성&a=플로랄&t=day")
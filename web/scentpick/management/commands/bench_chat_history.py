@@ -0,0 +1,105 @@
+# scentpick/management/commands/bench_chat_history.py
+# 대화 기록 로딩(채팅 화면 / 메시지 API) 지연시간 벤치마크
+# - 트랜잭션 안에서 --messages 개 메시지(user/assistant 번갈아)와 user 메시지마다 추천 run + 후보,
+#   그리고 같은 사용자의 다른 대화 --conversations 개를 넣고 측정 후 롤백 (기존 데이터는 그대로)
+# - p50/p95(테스트 클라이언트라 응답 전체 = TTFB), 쿼리 수, 응답 크기 출력
+#   ETag 재검증(If-None-Match → 304)도 측정
+#   python manage.py bench_chat_history --settings=django_app.settings_dev --messages 200 --conversations 300
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from scentpick.models import Conversation, Message, Perfume, RecCandidate, RecRun
+
+
+def _pct(samples, p):
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "대화 기록 로딩 지연시간 벤치마크 (가짜 데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200, help="대화 하나의 메시지 수")
+        parser.add_argument("--candidates", type=int, default=5, help="run 하나의 추천 후보 수")
+        parser.add_argument("--conversations", type=int, default=300, help="같은 사용자의 다른 대화 수")
+        parser.add_argument("--repeat", type=int, default=20, help="시나리오별 반복 횟수")
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            try:
+                user, conv = self._seed(opts["messages"], opts["candidates"], opts["conversations"])
+                self._run(user, conv, opts["repeat"])
+            finally:
+                transaction.set_rollback(True)
+
+    def _seed(self, n_messages, n_candidates, n_conversations):
+        user = User.objects.create_user(username="bench_chat_user", password="bench-pass-1234")
+        for i in range(n_conversations):
+            other = Conversation.objects.create(user=user, title=None if i % 3 else f"지난 대화 {i}")
+            Message.objects.create(conversation=other, role="user", content=f"지난 질문 {i} " * 5)
+        conv = Conversation.objects.create(user=user, title="bench")
+        perfumes = Perfume.objects.bulk_create(
+            [
+                Perfume(
+                    brand="Bench Brand", name=f"Bench Chat Perfume {i:03d}", sizes=[50], description="",
+                    concentration="EDP", gender="Unisex", main_accords=["우디"],
+                )
+                for i in range(n_candidates * 4)
+            ]
+        )
+        answer = "추천 향수와 이유를 정리했어요. " * 40  # 실제 답변 길이(약 1KB) 흉내
+        for i in range(n_messages):
+            if i % 2:
+                Message.objects.create(conversation=conv, role="assistant", content=f"{answer}{i}")
+                continue
+            req = Message.objects.create(conversation=conv, role="user", content=f"향수 추천해줘 {i}")
+            run = RecRun.objects.create(user=user, conversation=conv, request_msg=req, query_text=req.content)
+            offset = (i // 2) % 4 * n_candidates
+            RecCandidate.objects.bulk_create([
+                RecCandidate(run_rec=run, perfume=perfumes[offset + r], rank=r + 1, score=1.0 / (r + 1))
+                for r in range(n_candidates)
+            ])
+        conv.save()  # 가장 최근 대화로
+        self.stdout.write(
+            f"messages: {n_messages}, runs: {RecRun.objects.filter(conversation=conv).count()}, "
+            f"conversations: {Conversation.objects.filter(user=user).count()}"
+        )
+        return user, conv
+
+    def _run(self, user, conv, repeat):
+        client = Client(HTTP_HOST="localhost")
+        client.force_login(user)
+
+        def measure(label, path, params=None, status=200, **headers):
+            timings, queries = [], 0
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    res = client.get(path, params or {}, **headers)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                if res.status_code != status:
+                    raise RuntimeError(f"{path} → {res.status_code}")
+                queries = len(ctx.captured_queries)
+            self.stdout.write(
+                f"{label:<28} p50={statistics.median(timings):8.1f}ms  "
+                f"p95={_pct(timings, 95):8.1f}ms  queries={queries}  bytes={len(res.content)}"
+            )
+            return res
+
+        messages_url = reverse("scentpick:conversation_messages_api", args=[conv.id])
+        res = measure("messages api", messages_url)
+        if res.has_header("ETag"):
+            measure("messages api, 304", messages_url, status=304, HTTP_IF_NONE_MATCH=res["ETag"])
+        conversations_url = reverse("scentpick:conversations_api")
+        res = measure("conversations api", conversations_url)
+        if res.has_header("ETag"):
+            measure("conversations api, 304", conversations_url, status=304, HTTP_IF_NONE_MATCH=res["ETag"])
+        measure("chat page", reverse("scentpick:chat"), {"conversation_id": conv.id})
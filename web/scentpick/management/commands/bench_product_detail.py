@@ -0,0 +1,114 @@
+# scentpick/management/commands/bench_product_detail.py
+# 향수 상세 페이지(product_detail) 처리량 벤치마크
+# - 트랜잭션 안에서 가짜 향수 N개(노트 15개씩)와 노트 이미지 M개를 넣고 측정 후 롤백 (기존 데이터는 그대로)
+# - 비로그인 / 로그인(즐겨찾기·피드백 있음) 각각, 뷰 모델 캐시 miss(cold)와 hit(warm)
+#   req/s(단일 스레드, 테스트 클라이언트), p50, 쿼리 수 출력
+#   python manage.py bench_product_detail --settings=django_app.settings_dev --perfumes 2000 --requests 500
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from scentpick.models import Favorite, FeedbackEvent, NoteImage, Perfume
+from scentpick.note_images import invalidate_note_images
+from scentpick.utils.note_translations import KOREAN_TO_ENGLISH
+
+try:
+    from scentpick.perfume_detail import invalidate_perfume_details
+except ImportError:  # 캐시 도입 전 코드와 비교할 때
+    def invalidate_perfume_details():
+        pass
+
+
+class Command(BaseCommand):
+    help = "향수 상세 페이지 처리량 벤치마크 (가짜 데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--perfumes", type=int, default=2000, help="넣을 가짜 향수 수")
+        parser.add_argument("--note-images", type=int, default=300, help="넣을 가짜 노트 이미지 수")
+        parser.add_argument("--requests", type=int, default=500, help="시나리오별 요청 수")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            try:
+                ids = self._seed(opts["perfumes"], opts["note_images"], opts["seed"])
+                self._run(ids, opts["requests"], opts["seed"])
+            finally:
+                transaction.set_rollback(True)
+                invalidate_note_images()
+                invalidate_perfume_details()
+
+    def _seed(self, n, n_images, seed):
+        rnd = random.Random(seed)
+        korean = list(KOREAN_TO_ENGLISH)
+        english = list(KOREAN_TO_ENGLISH.values())
+        NoteImage.objects.bulk_create(
+            [NoteImage(category="bench", note_name=name, image_url=f"https://img/{i}.jpg")
+             for i, name in enumerate(rnd.sample(english, min(n_images, len(english))))]
+        )
+        perfumes = Perfume.objects.bulk_create(
+            [
+                Perfume(
+                    brand=f"Bench Brand {i % 200:03d}",
+                    name=f"Bench Perfume {i:05d}",
+                    sizes=[30, 50, 100],
+                    description="벤치마크용 향수",
+                    concentration="EDP",
+                    gender="Unisex",
+                    main_accords=["우디", "앰버", "머스크"],
+                    top_notes=rnd.sample(korean, 5),
+                    middle_notes=rnd.sample(korean, 5),
+                    base_notes=rnd.sample(korean, 5),
+                )
+                for i in range(n)
+            ],
+            batch_size=1000,
+        )
+        ids = [p.id for p in perfumes] or list(
+            Perfume.objects.filter(name__startswith="Bench Perfume ").values_list("id", flat=True)
+        )
+        self.stdout.write(f"perfumes: {len(ids)}, note_images: {NoteImage.objects.count()}")
+        return ids
+
+    def _run(self, ids, n_requests, seed):
+        user = User.objects.create_user(username="bench_detail_user", password="bench-pass-1234")
+        for pid in ids[::10]:
+            Favorite.objects.create(user=user, perfume_id=pid)
+            FeedbackEvent.objects.create(user=user, perfume_id=pid, source="detail", action="like")
+        anon = Client(HTTP_HOST="localhost")
+        member = Client(HTTP_HOST="localhost")
+        member.force_login(user)
+
+        def measure(label, client, targets, before=None):
+            timings, queries = [], 0
+            started = time.perf_counter()
+            for pid in targets:
+                if before:
+                    before()
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    res = client.get(reverse("scentpick:product_detail", args=[pid]))
+                    timings.append((time.perf_counter() - t0) * 1000)
+                if res.status_code != 200:
+                    raise RuntimeError(f"{pid} → {res.status_code}")
+                queries = len(ctx.captured_queries)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:<24} {len(targets) / elapsed:7.1f} req/s  "
+                f"p50={statistics.median(timings):6.2f}ms  queries={queries}"
+            )
+
+        rnd = random.Random(seed)
+        hot = rnd.sample(ids, min(50, len(ids)))  # 인기 향수 50개를 반복 조회
+        targets = [rnd.choice(hot) for _ in range(n_requests)]
+        measure("anonymous, cold", anon, targets, before=invalidate_perfume_details)
+        measure("anonymous, warm", anon, targets)
+        measure("logged in, cold", member, targets, before=invalidate_perfume_details)
+        measure("logged in, warm", member, targets)
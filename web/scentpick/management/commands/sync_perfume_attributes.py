@@ -0,0 +1,33 @@
+# scentpick/management/commands/sync_perfume_attributes.py
+# perfume_accords / perfume_notes / perfume_sizes 재구성
+# - 시그널이 없는 적재(raw SQL, bulk_create, loaddata) 뒤에 실행
+#   python manage.py sync_perfume_attributes [--ids 1 2 3]
+from django.core.management.base import BaseCommand
+
+from scentpick.accord_pools import invalidate_accord_pools
+from scentpick.attributes import rebuild_perfume_attributes
+from scentpick.facets import invalidate_catalog_facets
+from scentpick.models import Perfume
+from scentpick.pagination import invalidate_catalog_counts
+from scentpick.perfume_detail import invalidate_perfume_details
+from scentpick.search import invalidate_search_index
+
+
+class Command(BaseCommand):
+    help = "perfumes JSON 컬럼 기준으로 어코드/노트/용량 정규화 테이블 재구성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", type=int, nargs="*", help="일부 향수만 (기본 전체)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        perfumes = Perfume.objects.all()
+        if opts["ids"]:
+            perfumes = perfumes.filter(pk__in=opts["ids"])
+        accords, notes, sizes = rebuild_perfume_attributes(perfumes, batch_size=opts["batch_size"])
+        invalidate_catalog_facets()
+        invalidate_catalog_counts()
+        invalidate_search_index()
+        invalidate_perfume_details()
+        invalidate_accord_pools()
+        self.stdout.write(f"accords={accords} notes={notes} sizes={sizes}")
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_attribute_tables(apps, schema_editor):
+    from scentpick.attributes import rebuild_perfume_attributes
+
+    rebuild_perfume_attributes(
+        apps.get_model('scentpick', 'Perfume').objects.all(),
+        accord_model=apps.get_model('scentpick', 'PerfumeAccord'),
+        note_model=apps.get_model('scentpick', 'PerfumeNote'),
+        size_model=apps.get_model('scentpick', 'PerfumeSize'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scentpick', '0003_message_chat_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfumeAccord',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('accord', models.CharField(max_length=50)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('perfume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='accord_rows', to='scentpick.perfume')),
+            ],
+            options={
+                'db_table': 'perfume_accords',
+                'indexes': [models.Index(fields=['accord', 'perfume'], name='perfume_acc_accord_33ccb5_idx')],
+                'constraints': [models.UniqueConstraint(fields=('perfume', 'accord'), name='uq_perfume_accord')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PerfumeNote',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('layer', models.CharField(choices=[('top', 'top'), ('middle', 'middle'), ('base', 'base')], max_length=10)),
+                ('note', models.CharField(max_length=100)),
+                ('perfume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='note_rows', to='scentpick.perfume')),
+            ],
+            options={
+                'db_table': 'perfume_notes',
+                'indexes': [models.Index(fields=['note', 'layer', 'perfume'], name='perfume_not_note_da2219_idx')],
+                'constraints': [models.UniqueConstraint(fields=('perfume', 'layer', 'note'), name='uq_perfume_note_layer')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PerfumeSize',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('size_ml', models.PositiveIntegerField()),
+                ('perfume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='size_rows', to='scentpick.perfume')),
+            ],
+            options={
+                'db_table': 'perfume_sizes',
+                'indexes': [models.Index(fields=['size_ml', 'perfume'], name='perfume_siz_size_ml_caf152_idx')],
+                'constraints': [models.UniqueConstraint(fields=('perfume', 'size_ml'), name='uq_perfume_size')],
+            },
+        ),
+        migrations.RunPython(populate_attribute_tables, migrations.RunPython.noop),
+    ]
@@ -64,6 +64,78 @@ class Perfume(models.Model):
         return f"{self.brand} {self.name}"
 
 
+# 카탈로그 필터용 정규화 테이블 (perfumes의 JSON 컬럼에서 파생, Perfume 저장 시 signals.py가 동기화)
+# - JSON/TEXT LIKE 검색 대신 (값, perfume_id) 인덱스로 조회
+class PerfumeAccord(models.Model):
+    """
+    향수별 메인어코드 (perfume_accords)
+    """
+    id = models.BigAutoField(primary_key=True)
+    perfume = models.ForeignKey(Perfume, on_delete=models.CASCADE, related_name="accord_rows")
+    accord = models.CharField(max_length=50)
+    position = models.PositiveSmallIntegerField(default=0)  # main_accords 안의 순서(0=대표 어코드)
+
+    class Meta:
+        db_table = "perfume_accords"
+        indexes = [
+            models.Index(fields=["accord", "perfume"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["perfume", "accord"], name="uq_perfume_accord"),
+        ]
+
+    def __str__(self):
+        return f"P#{self.perfume_id} {self.accord}"
+
+
+class PerfumeNote(models.Model):
+    """
+    향수별 탑/미들/베이스 노트 (perfume_notes)
+    """
+    class Layer(models.TextChoices):
+        TOP = "top", "top"
+        MIDDLE = "middle", "middle"
+        BASE = "base", "base"
+
+    id = models.BigAutoField(primary_key=True)
+    perfume = models.ForeignKey(Perfume, on_delete=models.CASCADE, related_name="note_rows")
+    layer = models.CharField(max_length=10, choices=Layer.choices)
+    note = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = "perfume_notes"
+        indexes = [
+            models.Index(fields=["note", "layer", "perfume"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["perfume", "layer", "note"], name="uq_perfume_note_layer"),
+        ]
+
+    def __str__(self):
+        return f"P#{self.perfume_id} {self.layer}:{self.note}"
+
+
+class PerfumeSize(models.Model):
+    """
+    향수별 판매 용량 ml (perfume_sizes)
+    """
+    id = models.BigAutoField(primary_key=True)
+    perfume = models.ForeignKey(Perfume, on_delete=models.CASCADE, related_name="size_rows")
+    size_ml = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "perfume_sizes"
+        indexes = [
+            models.Index(fields=["size_ml", "perfume"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["perfume", "size_ml"], name="uq_perfume_size"),
+        ]
+
+    def __str__(self):
+        return f"P#{self.perfume_id} {self.size_ml}ml"
+
+
 class NoteImage(models.Model):
     """
     노트별 이미지 (note_images)
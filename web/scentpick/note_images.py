@@ -0,0 +1,95 @@
+# scentpick/note_images.py
+# 노트 이름 → 노트 이미지 URL (상품 상세 페이지)
+# - note_images 테이블은 작고 거의 안 바뀜 → 프로세스 안에 한 번 올려 두고 노트 목록을 한 번에 해석
+# - 매칭 규칙(기존 get_note_image_url과 동일, 각 단계에서 id가 가장 작은 행):
+#   1) 영어명(get_english_note_name) 대소문자 무시 일치
+#   2) 영어명을 포함하는 노트
+#   3) 영어명이 여러 단어면 3글자 이상 단어 각각을 포함하는 노트
+#   4) 원래 이름(한국어)을 포함하는 노트
+# - 부분 일치는 행 전체를 훑되 같은 검색어 결과는 기억 (노트 종류가 적어 금방 다 채워짐)
+# - 무효화: NoteImage 저장/삭제 시 signals.py → invalidate_note_images()
+#   캐시(운영은 Redis)에 버전 토큰을 두고, 각 프로세스는 토큰이 바뀌면 다음 조회 때 다시 읽음
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from .models import NoteImage
+from .utils.note_translations import get_english_note_name
+
+NOTE_IMAGES_VERSION_KEY = "scentpick:note_images:version"
+
+
+class NoteImageIndex:
+    def __init__(self, rows):
+        # rows: (note_name, image_url) — id 순
+        self.rows = [(name.lower(), url) for name, url in rows if name is not None]
+        self.exact = {}
+        for name, url in self.rows:
+            self.exact.setdefault(name, url)
+        self._contains = {}
+
+    @classmethod
+    def build(cls):
+        return cls(NoteImage.objects.order_by("id").values_list("note_name", "image_url"))
+
+    def containing(self, needle):
+        """needle을 포함하는 첫 노트 → (찾음 여부, image_url)"""
+        needle = needle.lower()
+        if needle not in self._contains:
+            self._contains[needle] = next(
+                ((True, url) for name, url in self.rows if needle in name), (False, None)
+            )
+        return self._contains[needle]
+
+    def resolve(self, note_name):
+        if not isinstance(note_name, str):
+            return None
+        english = get_english_note_name(note_name)
+        key = english.lower()
+        if key in self.exact:
+            return self.exact[key]
+        found, url = self.containing(english)
+        if found:
+            return url
+        if " " in english:
+            for word in english.split():
+                if len(word) > 2:
+                    found, url = self.containing(word)
+                    if found:
+                        return url
+        return self.containing(note_name)[1]
+
+
+_lock = threading.Lock()
+_current = {"index": None, "version": None}
+
+
+def _index_version():
+    version = cache.get(NOTE_IMAGES_VERSION_KEY)
+    if version is None:
+        cache.add(NOTE_IMAGES_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(NOTE_IMAGES_VERSION_KEY)
+    return version
+
+
+def get_note_image_index():
+    version = _index_version()
+    index = _current["index"]
+    if index is not None and _current["version"] == version:
+        return index
+    with _lock:
+        if _current["index"] is None or _current["version"] != version:
+            _current["index"] = NoteImageIndex.build()
+            _current["version"] = version
+        return _current["index"]
+
+
+def invalidate_note_images():
+    cache.set(NOTE_IMAGES_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def resolve_note_images(note_names):
+    """노트 이름 리스트 → 같은 순서의 image_url 리스트 (없으면 None)"""
+    index = get_note_image_index()
+    return [index.resolve(name) for name in note_names]
@@ -0,0 +1,111 @@
+# scentpick/pagination.py
+# 향수 목록(perfumes) 페이지 나누기
+# - 커서(keyset) 모드: 무한 스크롤 AJAX 그리드용. (brand, name, id) 기준 "이 다음부터 24개"
+#   → OFFSET/COUNT 없이 (brand, name) 인덱스 범위 조회, 깊은 페이지도 첫 페이지와 같은 비용
+# - 번호 페이지(비 AJAX)는 Paginator 유지, 대신 필터 조합별 COUNT(*)를 캐시
+#   Perfume 저장/삭제 시 signals.py → invalidate_catalog_counts()
+import base64
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+PER_PAGE = 24
+COUNT_VERSION_KEY = "scentpick:catalog_count:version"
+COUNT_CACHE_TIMEOUT = getattr(settings, "CATALOG_COUNT_TIMEOUT", 10 * 60)
+
+
+# -----------------------------
+# 커서
+# -----------------------------
+def encode_cursor(payload):
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """잘못된 커서는 None (첫 페이지로 취급)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def keyset_page(qs, cursor=None, per_page=PER_PAGE):
+    """
+    (brand, name, id) 순으로 cursor 다음 per_page개 → (향수 리스트, 다음 커서 또는 None)
+    """
+    key = (decode_cursor(cursor) or {}).get("k")
+    if isinstance(key, list) and len(key) == 3:
+        brand, name, pk = key
+        # brand >= 조건은 인덱스 범위 시작점, 나머지 OR가 같은 brand 안에서 이어서 자름
+        qs = qs.filter(
+            Q(brand__gte=brand)
+            & (Q(brand__gt=brand) | Q(name__gt=name) | Q(name=name, pk__gt=pk))
+        )
+    rows = list(qs.order_by("brand", "name", "pk")[:per_page + 1])
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor({"k": [last.brand, last.name, last.pk]})
+
+
+def offset_page(ids, cursor=None, per_page=PER_PAGE):
+    """
+    이미 순서가 정해진 id 리스트(q 검색 관련도 순)용 커서 → (이번 id들, 다음 커서 또는 None)
+    """
+    try:
+        start = max(int((decode_cursor(cursor) or {}).get("o", 0)), 0)
+    except (TypeError, ValueError):
+        start = 0
+    end = start + per_page
+    return ids[start:end], (encode_cursor({"o": end}) if end < len(ids) else None)
+
+
+# -----------------------------
+# COUNT 캐시 (번호 페이지)
+# -----------------------------
+def _count_version():
+    version = cache.get(COUNT_VERSION_KEY)
+    if version is None:
+        cache.add(COUNT_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(COUNT_VERSION_KEY)
+    return version
+
+
+def filter_signature(params):
+    """필터 값 dict → 값 순서와 무관한 짧은 해시"""
+    norm = {k: sorted(v) if isinstance(v, (list, tuple)) else v for k, v in sorted(params.items()) if v}
+    raw = json.dumps(norm, ensure_ascii=False, sort_keys=True).encode()
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def invalidate_catalog_counts():
+    cache.set(COUNT_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+class CachedCountPaginator(Paginator):
+    """같은 필터 조합의 COUNT(*)를 COUNT_CACHE_TIMEOUT 동안 재사용하는 Paginator"""
+
+    def __init__(self, object_list, per_page, signature, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.signature = signature
+
+    @cached_property
+    def count(self):
+        key = f"scentpick:catalog_count:{_count_version()}:{self.signature}"
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
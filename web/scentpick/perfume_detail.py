@@ -0,0 +1,116 @@
+# scentpick/perfume_detail.py
+# 향수 상세 페이지(product_detail)의 사용자와 무관한 부분 캐시
+# - 향수 행 + 파싱된 어코드/노트(이미지 URL 포함) + 이전/다음 향수 id 를 향수별 키로 저장
+# - 향수 데이터는 카탈로그 적재 때만 바뀜 → 키에 버전 토큰을 넣고
+#   Perfume / NoteImage 저장·삭제 시 signals.py → invalidate_perfume_details() 로 전체 무효화
+# - 사용자별 상태(즐겨찾기 / 좋아요·싫어요)는 user_perfume_state() 한 번의 쿼리로 따로
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Subquery
+
+from .models import Favorite, FeedbackEvent, Perfume
+from .note_images import resolve_note_images
+
+DETAIL_VERSION_KEY = "scentpick:perfume_detail:version"
+DETAIL_CACHE_TIMEOUT = getattr(settings, "PERFUME_DETAIL_TIMEOUT", 60 * 60)
+
+
+def _json_list(field_data):
+    """JSON 리스트 / JSON 문자열 / 공백 구분 문자열 → 리스트"""
+    if not field_data:
+        return []
+    try:
+        # Case 1: 이미 Python 리스트인 경우
+        if isinstance(field_data, list):
+            return field_data
+        # Case 2: JSON 문자열인 경우 (예: '["레몬", "자몽"]')
+        if isinstance(field_data, str):
+            try:
+                parsed = json.loads(field_data)
+                if isinstance(parsed, list):
+                    return parsed
+            except ValueError:
+                # Case 3: JSON 파싱 실패시 공백으로 분리 (예: '레몬 자몽')
+                return field_data.split()
+        return []
+    except Exception as e:
+        print(f"Error processing field: {field_data}, Error: {e}")
+        return []
+
+
+def _detail_version():
+    version = cache.get(DETAIL_VERSION_KEY)
+    if version is None:
+        cache.add(DETAIL_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(DETAIL_VERSION_KEY)
+    return version
+
+
+def invalidate_perfume_details():
+    cache.set(DETAIL_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def build_perfume_detail(perfume):
+    """캐시 없이 상세 뷰 모델 계산"""
+    main_accords = _json_list(perfume.main_accords)
+    layers = [_json_list(perfume.top_notes), _json_list(perfume.middle_notes), _json_list(perfume.base_notes)]
+
+    # 노트 이미지: 탑/미들/베이스 전체를 한 번에 (메모리 색인, DB 조회 없음)
+    image_urls = iter(resolve_note_images([note for notes in layers for note in notes]))
+    top_notes, middle_notes, base_notes = [
+        [
+            {
+                "name": note,
+                "korean_name": note,  # 이미 한국어이므로 그대로 사용
+                "image_url": next(image_urls),  # 한국어→영어 변환 후 이미지 검색
+            }
+            for note in notes
+        ]
+        for notes in layers
+    ]
+
+    return {
+        "perfume": perfume,
+        "main_accords": main_accords,
+        "top_notes": top_notes,
+        "middle_notes": middle_notes,
+        "base_notes": base_notes,
+        "prev_id": Perfume.objects.filter(id__lt=perfume.id).order_by("-id").values_list("id", flat=True).first(),
+        "next_id": Perfume.objects.filter(id__gt=perfume.id).order_by("id").values_list("id", flat=True).first(),
+    }
+
+
+def get_perfume_detail(perfume_id):
+    """캐시된 상세 뷰 모델 (향수가 없으면 None)"""
+    key = f"scentpick:perfume_detail:{_detail_version()}:{perfume_id}"
+    detail = cache.get(key)
+    if detail is None:
+        perfume = Perfume.objects.filter(id=perfume_id).first()
+        if perfume is None:
+            return None
+        detail = build_perfume_detail(perfume)
+        cache.set(key, detail, DETAIL_CACHE_TIMEOUT)
+    return detail
+
+
+def user_perfume_state(user, perfume_id):
+    """(즐겨찾기 여부, 'like' / 'dislike' / None) — 쿼리 1번"""
+    if not user.is_authenticated:
+        return False, None
+    row = (
+        Perfume.objects.filter(id=perfume_id)
+        .annotate(
+            is_favorite=Exists(Favorite.objects.filter(user=user, perfume=OuterRef("pk"))),
+            feedback_status=Subquery(
+                FeedbackEvent.objects.filter(user=user, perfume=OuterRef("pk"), action__in=["like", "dislike"])
+                .order_by("id")
+                .values("action")[:1]
+            ),
+        )
+        .values_list("is_favorite", "feedback_status")
+        .first()
+    )
+    return (bool(row[0]), row[1]) if row else (False, None)
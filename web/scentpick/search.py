@@ -0,0 +1,205 @@
+# scentpick/search.py
+# 향수 목록 자유 검색(q) / 검색창 자동완성 백엔드
+# - 프로세스 내 역색인: 이름/브랜드/메인어코드/노트/설명을 필드 가중치와 함께 색인, idf로 순위
+# - 모든 검색어 토큰이 어딘가에 있어야 매칭(AND), 토큰은 정확히 일치 > 접두어 일치 순으로 점수
+# - 한글은 짧은 필드(이름/브랜드/어코드/노트)의 접미사도 색인 → "로랄"로 "플로랄" 검색
+# - 노트/어코드는 NOTE_TRANSLATIONS / KOREAN_TO_ENGLISH로 한↔영 번역어도 같이 색인
+#   ("바닐라"로 Vanilla 노트, "vanilla"로 바닐라 어코드)
+# - DB 종류(MySQL/SQLite)와 무관하게 같은 코드 경로
+# - 무효화: Perfume 저장/삭제 시 signals.py → invalidate_search_index()
+#   캐시(운영은 Redis)에 색인 버전 토큰을 두고, 각 프로세스는 토큰이 바뀌면 다음 검색 때 재구성
+import heapq
+import math
+import re
+import threading
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .models import Perfume, PerfumeAccord, PerfumeNote
+from .utils.note_translations import KOREAN_TO_ENGLISH, NOTE_TRANSLATIONS
+
+SEARCH_VERSION_KEY = "scentpick:search_index:version"
+
+FIELD_WEIGHTS = {"name": 8.0, "brand": 6.0, "accord": 4.0, "note": 3.0, "description": 1.0}
+SUFFIX_FIELDS = ("name", "brand", "accord", "note")
+PREFIX_FACTOR = 0.7     # 접두어 일치 점수 비율
+SUFFIX_FACTOR = 0.5     # 한글 접미사(부분) 일치 색인 가중치 비율
+MAX_PREFIX_TERMS = 64   # 토큰 하나가 펼쳐지는 접두어 용어 수 상한 (자동완성 지연 상한)
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+# 두 사전은 서로 빠진 항목이 있어 양방향으로 합침
+_EN2KO = {
+    **{en.lower(): ko for ko, en in KOREAN_TO_ENGLISH.items()},
+    **{en.lower(): ko for en, ko in NOTE_TRANSLATIONS.items()},
+}
+_KO2EN = {
+    **{ko.replace(" ", ""): en for en, ko in NOTE_TRANSLATIONS.items()},
+    **{ko.replace(" ", ""): en for ko, en in KOREAN_TO_ENGLISH.items()},
+}
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def translation(value):
+    """노트/어코드 이름의 한↔영 번역 (없으면 빈 문자열)"""
+    v = str(value or "").strip()
+    return _EN2KO.get(v.lower()) or _KO2EN.get(v.replace(" ", "")) or ""
+
+
+def _is_hangul(token):
+    return "가" <= token[0] <= "힣"
+
+
+def _rank_key(item):
+    # 점수 내림차순, 동점은 색인 순서((brand, name) 순)
+    doc, score = item
+    return score, -doc
+
+
+class CatalogSearchIndex:
+    def __init__(self, docs, postings):
+        # docs: (perfume_id, brand, name) — (brand, name) 순, 동점일 때 이 순서
+        self.docs = docs
+        self.terms = sorted(postings)
+        self.postings = postings
+
+    @classmethod
+    def build(cls):
+        rows = list(Perfume.objects.order_by("brand", "name", "id").values_list("id", "brand", "name", "description"))
+        extra = defaultdict(list)
+        for pid, accord in PerfumeAccord.objects.values_list("perfume_id", "accord"):
+            extra[pid].append(("accord", accord))
+        for pid, note in PerfumeNote.objects.values_list("perfume_id", "note"):
+            extra[pid].append(("note", note))
+
+        acc = defaultdict(dict)  # term → {doc: weight}
+
+        def add(doc, field, text):
+            weight = FIELD_WEIGHTS[field]
+            for tok in tokenize(text):
+                if weight > acc[tok].get(doc, 0.0):
+                    acc[tok][doc] = weight
+                if field in SUFFIX_FIELDS and _is_hangul(tok):
+                    sw = weight * SUFFIX_FACTOR
+                    for i in range(1, len(tok) - 1):
+                        sub = tok[i:]
+                        if sw > acc[sub].get(doc, 0.0):
+                            acc[sub][doc] = sw
+
+        docs = []
+        for doc, (pid, brand, name, description) in enumerate(rows):
+            docs.append((pid, brand, name))
+            add(doc, "name", name)
+            add(doc, "brand", brand)
+            add(doc, "description", description)
+            for field, value in extra.get(pid, ()):
+                add(doc, field, value)
+                add(doc, field, translation(value))
+
+        postings = {
+            term: (array("i", hits.keys()), array("f", hits.values()))
+            for term, hits in acc.items()
+        }
+        return cls(docs, postings)
+
+    def _prefix_terms(self, token):
+        i = bisect_left(self.terms, token)
+        out = []
+        while i < len(self.terms) and len(out) < MAX_PREFIX_TERMS and self.terms[i].startswith(token):
+            if self.terms[i] != token:
+                out.append(self.terms[i])
+            i += 1
+        return out
+
+    def _token_scores(self, token):
+        scores = {}
+        n = len(self.docs)
+        variants = [(token, 1.0)] + [(t, PREFIX_FACTOR) for t in self._prefix_terms(token)]
+        for term, factor in variants:
+            hit = self.postings.get(term)
+            if hit is None:
+                continue
+            docs, weights = hit
+            idf = math.log(1.0 + n / len(docs)) * factor
+            for d, w in zip(docs, weights):
+                s = w * idf
+                if s > scores.get(d, 0.0):
+                    scores[d] = s
+        return scores
+
+    def search(self, query, limit=20, allowed=None):
+        """
+        [(doc, score)] 점수 내림차순 (모든 토큰 매칭)
+        - allowed: perfume id 집합이면 그 안에서만 순위 (목록 필터를 먼저 적용한 결과)
+        - limit=None이면 매칭 전부
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        total = None
+        # 결과가 적은 토큰부터 교집합
+        for scores in sorted((self._token_scores(t) for t in tokens), key=len):
+            if total is None:
+                total = scores if allowed is None else {d: s for d, s in scores.items() if self.docs[d][0] in allowed}
+            else:
+                total = {d: s + scores[d] for d, s in total.items() if d in scores}
+            if not total:
+                return []
+        if limit is None:
+            return sorted(total.items(), key=_rank_key, reverse=True)
+        return heapq.nlargest(limit, total.items(), key=_rank_key)
+
+    def search_ids(self, query, limit=None, allowed=None):
+        return [self.docs[d][0] for d, _ in self.search(query, limit, allowed)]
+
+    def suggest(self, query, limit=8):
+        out = []
+        for d, score in self.search(query, limit):
+            pid, brand, name = self.docs[d]
+            out.append({"id": pid, "brand": brand, "name": name, "score": round(score, 3)})
+        return out
+
+
+_lock = threading.Lock()
+_current = {"index": None, "version": None}
+
+
+def _index_version():
+    version = cache.get(SEARCH_VERSION_KEY)
+    if version is None:
+        # 캐시에서 사라졌으면(재시작/만료) 새 토큰 → 모든 프로세스가 한 번씩 재구성
+        cache.add(SEARCH_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(SEARCH_VERSION_KEY)
+    return version
+
+
+def get_search_index():
+    version = _index_version()
+    index = _current["index"]
+    if index is not None and _current["version"] == version:
+        return index
+    with _lock:
+        if _current["index"] is None or _current["version"] != version:
+            _current["index"] = CatalogSearchIndex.build()
+            _current["version"] = version
+        return _current["index"]
+
+
+def invalidate_search_index():
+    cache.set(SEARCH_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def search_perfume_ids(query, limit=None, allowed=None):
+    """q 검색: 관련도 순 perfume id 목록 (allowed가 있으면 그 id 안에서만, 기본은 상한 없음)"""
+    return get_search_index().search_ids(query, limit, allowed)
+
+
+def typeahead(query, limit=8):
+    """자동완성: [{"id", "brand", "name", "score"}] (DB 조회 없음)"""
+    return get_search_index().suggest(query, limit)
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .accord_pools import invalidate_accord_pools
+from .attributes import sync_perfume_attributes
+from .facets import invalidate_catalog_facets
+from .models import NoteImage, Perfume
+from .note_images import invalidate_note_images
+from .pagination import invalidate_catalog_counts
+from .perfume_detail import invalidate_perfume_details
+from .search import invalidate_search_index
+
+
+@receiver(post_save, sender=Perfume)
+def sync_attributes_on_perfume_save(sender, instance, raw=False, **kwargs):
+    # loaddata(raw)는 정규화 테이블도 픽스처에서 같이 들어오거나, 이후 sync_perfume_attributes로 재구성
+    if not raw:
+        sync_perfume_attributes(instance)
+
+
+@receiver(post_save, sender=Perfume)
+@receiver(post_delete, sender=Perfume)
+def invalidate_catalog_on_perfume_change(sender, instance, **kwargs):
+    # 향수가 추가/수정/삭제되면 목록 페이지 패싯/개수, 검색 색인, 상세 페이지/추천 풀 캐시를 다시 계산
+    invalidate_catalog_facets()
+    invalidate_catalog_counts()
+    invalidate_search_index()
+    invalidate_perfume_details()
+    invalidate_accord_pools()
+
+
+@receiver(post_save, sender=NoteImage)
+@receiver(post_delete, sender=NoteImage)
+def invalidate_note_images_on_change(sender, instance, **kwargs):
+    invalidate_note_images()
+    invalidate_perfume_details()  # 상세 뷰 모델에 노트 이미지 URL이 들어 있음
@@ -1,3 +1,653 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .accord_pools import accord_pool_ids, sample_accord_pool
+from .attributes import parse_accords, parse_notes, parse_sizes, rebuild_perfume_attributes
+from .facets import FACETS_CACHE_KEY, get_catalog_facets
+from .models import (
+    Conversation, Favorite, FeedbackEvent, Message, NoteImage, Perfume, PerfumeAccord, PerfumeNote, PerfumeSize, RecCandidate, RecRun,
+)
+from .note_images import resolve_note_images
+from .pagination import decode_cursor, encode_cursor
+from .perfume_detail import invalidate_perfume_details
+from .search import invalidate_search_index, search_perfume_ids, typeahead
+from .views import fetch_random_by_accords, filter_worldcup_candidates, query_perfumes_by_accords
+from .weather import get_current_weather, grid_cell
+
+
+def make_perfume(**kwargs):
+    fields = {
+        "brand": "Chanel",
+        "name": "No.5",
+        "sizes": [50, 100],
+        "description": "",
+        "concentration": "EDP",
+        "gender": "Female",
+        "main_accords": ["플로랄", "파우더리"],
+    }
+    fields.update(kwargs)
+    return Perfume.objects.create(**fields)
+
+
+class CatalogFacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_perfume()
+        make_perfume(name="Bleu", gender="Male", concentration="EDT", sizes=[100], main_accords=["우디", "시트러스"])
+        make_perfume(brand="Diptyque", name="Tam Dao", gender="Unisex", sizes=[75, 75], main_accords="우디, 스파이시, /")
+        cache.clear()
+
+    def test_values_and_counts(self):
+        facets = get_catalog_facets()
+        self.assertEqual(facets["brands"], [{"value": "Chanel", "count": 2}, {"value": "Diptyque", "count": 1}])
+        self.assertEqual([c["value"] for c in facets["concentrations"]], ["EDP", "EDT"])
+        self.assertEqual([g["value"] for g in facets["genders"]], ["Female", "Male", "Unisex"])
+        self.assertIn({"value": "우디", "count": 2}, facets["accords"])
+        self.assertNotIn("/", [a["value"] for a in facets["accords"]])
+        self.assertEqual(
+            facets["sizes"],
+            [{"value": 50, "count": 1}, {"value": 75, "count": 1}, {"value": 100, "count": 2}],
+        )
+
+    def test_parse_accords_string(self):
+        self.assertEqual(parse_accords("['우디', '머스크', '-']"), ["우디", "머스크"])
+        self.assertEqual(parse_accords(None), [])
+
+    def test_parse_dedupes_like_ci_collation(self):
+        # 유니크 키가 *_ci 콜레이션이라 대소문자/악센트만 다른 값은 같은 행 → 처음 것만
+        self.assertEqual(parse_accords(["Woody", "woody", "WOODY", "Citrus"]), ["Woody", "Citrus"])
+        self.assertEqual(parse_notes("Néroli, neroli, NEROLI, Rose, rosé"), ["Néroli", "Rose"])
+        self.assertEqual(parse_notes(["바닐라", "바닐라", "Vanilla"]), ["바닐라", "Vanilla"])
+
+    def test_parse_sizes(self):
+        self.assertEqual(parse_sizes(["30ml", "50", 50, "7.5"]), [30, 50, 7])
+        self.assertEqual(parse_sizes("30, 100"), [30, 100])
+
+    def test_cached_after_first_call(self):
+        get_catalog_facets()
+        with self.assertNumQueries(0):
+            get_catalog_facets()
+
+    def test_save_and_delete_invalidate(self):
+        get_catalog_facets()
+        p = make_perfume(brand="Byredo", name="Gypsy Water")
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
+        self.assertIn({"value": "Byredo", "count": 1}, get_catalog_facets()["brands"])
+
+        p.delete()
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
+        self.assertNotIn("Byredo", [b["value"] for b in get_catalog_facets()["brands"]])
+
+
+class PerfumeAttributeTablesTests(TestCase):
+    def test_rows_follow_perfume_save(self):
+        p = make_perfume(top_notes=["Bergamot"], middle_notes="Rose, Iris", base_notes=None)
+        self.assertEqual(
+            list(p.accord_rows.order_by("position").values_list("accord", flat=True)), ["플로랄", "파우더리"]
+        )
+        self.assertEqual(
+            sorted(p.note_rows.values_list("layer", "note")),
+            [("middle", "Iris"), ("middle", "Rose"), ("top", "Bergamot")],
+        )
+        self.assertEqual(sorted(p.size_rows.values_list("size_ml", flat=True)), [50, 100])
+
+        p.main_accords = ["Woody", "woody", "우디"]
+        p.top_notes = ["Bergamot", "BERGAMOT", "Bergamöt"]
+        p.save()
+        self.assertEqual(list(p.accord_rows.order_by("position").values_list("accord", flat=True)), ["Woody", "우디"])
+        self.assertEqual(list(p.note_rows.filter(layer="top").values_list("note", flat=True)), ["Bergamot"])
+
+        p.main_accords = ["우디"]
+        p.sizes = [30]
+        p.save()
+        self.assertEqual(list(p.accord_rows.values_list("accord", flat=True)), ["우디"])
+        self.assertEqual(list(p.size_rows.values_list("size_ml", flat=True)), [30])
+
+        p.delete()
+        self.assertFalse(PerfumeAccord.objects.exists())
+        self.assertFalse(PerfumeNote.objects.exists())
+        self.assertFalse(PerfumeSize.objects.exists())
+
+    def test_accord_queries_use_tables(self):
+        floral = make_perfume()
+        make_perfume(name="Bleu", gender="Male", main_accords=["우디"])
+        make_perfume(brand="Diptyque", name="Do Son", gender="Unisex", main_accords=["플로랄"])
+
+        picks = query_perfumes_by_accords(["플로랄", "그린"], limit=8, gender="Female")
+        self.assertEqual({p.name for p in picks}, {"No.5", "Do Son"})
+
+        items = filter_worldcup_candidates("여성", "플로랄", "day")
+        self.assertEqual({i["id"] for i in items}, {floral.id, Perfume.objects.get(name="Do Son").id})
+        self.assertEqual(filter_worldcup_candidates("남성", "플로랄", "night")[0]["name"], "Do Son")
+
+
+class AccordPoolTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ids = {}
+        for name, gender, accords in [
+            ("a", "Female", ["플로랄", "그린"]),
+            ("b", "Male", ["우디"]),
+            ("c", "Unisex", ["그린"]),
+            ("d", "Female", ["시트러스"]),
+            ("e", "Male", ["그린", "우디"]),
+        ]:
+            self.ids[name] = make_perfume(name=name, gender=gender, main_accords=accords).id
+
+    def pick(self, *names):
+        return [self.ids[n] for n in names]
+
+    def test_pool_ids_follow_id_order_and_gender(self):
+        self.assertEqual(accord_pool_ids(["그린", "플로랄"]), self.pick("a", "c", "e"))
+        self.assertEqual(accord_pool_ids(["그린", "우디"], limit=2), self.pick("a", "b"))
+        self.assertEqual(accord_pool_ids(["그린", "시트러스"], gender="Female"), self.pick("a", "c", "d"))
+        self.assertEqual(accord_pool_ids(["그린"], gender="Unisex"), self.pick("c"))
+        self.assertEqual(accord_pool_ids(["없는 어코드"]), [])
+
+    def test_sampling_excludes_and_fetches_once(self):
+        accord_pool_ids(["그린"])  # 색인 적재
+        with self.assertNumQueries(1):
+            picks = fetch_random_by_accords(["그린", "우디"], pool=60, k=3, exclude_ids=set(self.pick("a", "b")))
+        self.assertEqual(sorted(p.id for p in picks), self.pick("c", "e"))
+        self.assertTrue(all(p.image_url.endswith(f"/perfumes/{p.id}.jpg") for p in picks))
+
+        picks = sample_accord_pool(["그린", "우디", "시트러스", "플로랄"], k=2, pool=3)
+        self.assertEqual(len(picks), 2)
+        self.assertTrue(set(p.id for p in picks) <= set(self.pick("a", "b", "c")))
+
+    def test_pool_follows_catalog_changes(self):
+        self.assertEqual(accord_pool_ids(["시트러스"]), self.pick("d"))
+        p = Perfume.objects.get(id=self.ids["b"])
+        p.main_accords = ["시트러스"]
+        p.save()
+        self.assertEqual(accord_pool_ids(["시트러스"]), self.pick("b", "d"))
+        p.delete()
+        self.assertEqual(accord_pool_ids(["시트러스"]), self.pick("d"))
+
+
+class CatalogSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.no5 = make_perfume(top_notes=["Aldehyde"], base_notes=["Vanilla"], description="클래식한 향")
+        self.bleu = make_perfume(name="Bleu", gender="Male", main_accords=["우디", "시트러스"], description="Vanilla 없음")
+        self.vanille = make_perfume(brand="Guerlain", name="Spiritueuse Double Vanille", main_accords=["바닐라"])
+
+    def test_ranked_by_field_weight(self):
+        # 이름 > 노트 > 설명
+        self.assertEqual(search_perfume_ids("vanil"), [self.vanille.id, self.no5.id, self.bleu.id])
+
+    def test_all_tokens_must_match(self):
+        self.assertEqual(search_perfume_ids("chanel 우디"), [self.bleu.id])
+        self.assertEqual(search_perfume_ids("guerlain 우디"), [])
+
+    def test_korean_english_note_synonyms(self):
+        self.assertEqual(search_perfume_ids("알데하이드"), [self.no5.id])
+        self.assertIn(self.vanille.id, search_perfume_ids("바닐라"))
+
+    def test_korean_infix(self):
+        self.assertEqual(search_perfume_ids("로랄"), [self.no5.id])
+
+    def test_index_follows_catalog_changes(self):
+        self.assertEqual(search_perfume_ids("gypsy"), [])
+        p = make_perfume(brand="Byredo", name="Gypsy Water")
+        self.assertEqual(search_perfume_ids("gyp"), [p.id])
+        p.delete()
+        self.assertEqual(search_perfume_ids("gyp"), [])
+
+    def test_typeahead_endpoint(self):
+        self.client.force_login(User.objects.create_user(username="tester", password="pass-1234-word"))
+        res = self.client.get(reverse("scentpick:perfume_typeahead"), {"q": "spirit"})
+        items = res.json()["items"]
+        self.assertEqual([i["id"] for i in items], [self.vanille.id])
+        self.assertEqual(items[0]["url"], reverse("scentpick:product_detail", args=[self.vanille.id]))
+        self.assertEqual(self.client.get(reverse("scentpick:perfume_typeahead")).json()["items"], [])
+        self.assertEqual(typeahead("없는향수"), [])
+
+
+class NoteImageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for name in ["Lemon Verbena", "Lemon", "Black Pepper", "Vanilla", "특제향 블렌드"]:
+            NoteImage.objects.create(note_name=name, image_url=f"https://img/{name}.jpg")
+
+    def test_matching_rules(self):
+        self.assertEqual(
+            resolve_note_images(["레몬", "vanill", "Pink Pepper", "특제향", "Nope", None]),
+            [
+                "https://img/Lemon.jpg",         # 한→영 번역 후 정확히 일치 (먼저 나온 부분 일치보다 우선)
+                "https://img/Vanilla.jpg",       # 부분 일치
+                "https://img/Black Pepper.jpg",  # 단어별 부분 일치
+                "https://img/특제향 블렌드.jpg",   # 원래 이름으로 부분 일치
+                None,
+                None,
+            ],
+        )
+
+    def test_index_refreshes_on_note_image_save(self):
+        self.assertIsNone(resolve_note_images(["Oud"])[0])
+        NoteImage.objects.create(note_name="Oud", image_url="https://img/oud.jpg")
+        self.assertEqual(resolve_note_images(["Oud"]), ["https://img/oud.jpg"])
+
+    def test_product_detail_note_queries_do_not_grow(self):
+        few = make_perfume(name="Few", top_notes=["레몬"], middle_notes=[], base_notes=[])
+        many = make_perfume(
+            name="Many",
+            top_notes=["레몬", "Pink Pepper", "Bergamot", "Lime", "Neroli"],
+            middle_notes=["바닐라", "Rose", "Jasmine", "Iris", "Orris"],
+            base_notes=["Musk", "Amber", "Oud", "Cedar", "특제향"],
+        )
+        self.client.get(reverse("scentpick:product_detail", args=[few.id]))  # 색인 적재
+        # 상세 뷰 모델 캐시는 비우고 (노트 이미지 색인만 유지) 비교
+        invalidate_perfume_details()
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("scentpick:product_detail", args=[few.id]))
+        invalidate_perfume_details()
+        with CaptureQueriesContext(connection) as large:
+            res = self.client.get(reverse("scentpick:product_detail", args=[many.id]))
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertFalse(any("note_images" in q["sql"] for q in large.captured_queries))
+        self.assertEqual(res.context["base_notes"][-1]["image_url"], "https://img/특제향 블렌드.jpg")
+
+
+class ProductDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.first = make_perfume(name="First")
+        self.perfume = make_perfume(name="Middle", top_notes=["레몬"], middle_notes='["바닐라"]', base_notes="머스크 앰버")
+        self.last = make_perfume(name="Last")
+        NoteImage.objects.create(note_name="Lemon", image_url="https://img/lemon.jpg")
+        self.url = reverse("scentpick:product_detail", args=[self.perfume.id])
+
+    def test_view_model(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.context["perfume"], self.perfume)
+        self.assertEqual(res.context["main_accords"], ["플로랄", "파우더리"])
+        self.assertEqual(res.context["top_notes"], [{"name": "레몬", "korean_name": "레몬", "image_url": "https://img/lemon.jpg"}])
+        self.assertEqual([n["name"] for n in res.context["middle_notes"]], ["바닐라"])
+        self.assertEqual([n["name"] for n in res.context["base_notes"]], ["머스크", "앰버"])
+        self.assertEqual((res.context["prev_perfume_id"], res.context["next_perfume_id"]), (self.first.id, self.last.id))
+        self.assertFalse(res.context["is_favorite"])
+        self.assertIsNone(res.context["feedback_status"])
+
+    def test_cached_until_catalog_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        self.perfume.name = "Renamed"
+        self.perfume.save()
+        self.assertEqual(self.client.get(self.url).context["perfume"].name, "Renamed")
+
+        NoteImage.objects.create(note_name="Vanilla", image_url="https://img/vanilla.jpg")
+        res = self.client.get(self.url)
+        self.assertEqual(res.context["middle_notes"][0]["image_url"], "https://img/vanilla.jpg")
+
+    def test_user_state_in_one_query(self):
+        user = User.objects.create_user(username="tester", password="pass-1234-word")
+        Favorite.objects.create(user=user, perfume=self.perfume)
+        FeedbackEvent.objects.create(user=user, perfume=self.perfume, source="detail", action="dislike")
+        self.client.force_login(user)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.url)
+        self.assertTrue(res.context["is_favorite"])
+        self.assertEqual(res.context["feedback_status"], "dislike")
+        state_queries = [q for q in ctx.captured_queries if "favorites" in q["sql"] or "feedback_events" in q["sql"]]
+        self.assertEqual(len(state_queries), 1)
+        self.assertFalse(any('FROM "perfumes"' in q["sql"] and "favorites" not in q["sql"] for q in ctx.captured_queries))
+
+    def test_missing_perfume_is_404(self):
+        self.assertEqual(self.client.get(reverse("scentpick:product_detail", args=[999999])).status_code, 404)
+
+
+class FakeOpenMeteo(BaseHTTPRequestHandler):
+    """로컬 Open-Meteo 대역: /v1/search (지오코딩), /v1/forecast (현재 날씨)"""
+    state = None
+
+    def do_GET(self):
+        state = self.state
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        state["hits"].append((url.path, params))
+        time.sleep(state["delay"])
+        if state["fail"]:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if url.path == "/v1/search":
+            body = {"results": [{"latitude": 35.1796, "longitude": 129.0756}]} if params["name"] == "Busan" else {}
+        else:
+            body = {"current": {"temperature_2m": state["temp"], "relative_humidity_2m": 60,
+                                "weather_code": 61, "wind_speed_10m": 3.2}}
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class WeatherCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenMeteo)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.urls = override_settings(
+            OPEN_METEO_GEOCODE_URL=f"{base}/v1/search", OPEN_METEO_FORECAST_URL=f"{base}/v1/forecast"
+        )
+        cls.urls.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.urls.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.state = FakeOpenMeteo.state = {"hits": [], "delay": 0, "fail": False, "temp": 20.4}
+
+    def paths(self):
+        return [path for path, _ in self.state["hits"]]
+
+    def wait_for(self, predicate, timeout=3):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("timed out")
+            time.sleep(0.01)
+
+    def test_city_is_geocoded_once_and_forecast_cached_per_cell(self):
+        self.assertEqual(get_current_weather(city="Busan")["temperature_2m"], 20.4)
+        self.assertEqual(self.paths(), ["/v1/search", "/v1/forecast"])
+        # 격자 칸 중심 좌표로 조회
+        self.assertEqual(self.state["hits"][1][1]["latitude"], str(grid_cell(35.1796, 129.0756)[0]))
+
+        get_current_weather(city="Busan")
+        get_current_weather(lat=35.2, lon=129.08)  # 같은 칸
+        self.assertEqual(len(self.state["hits"]), 2)
+
+    def test_unknown_city_falls_back_to_seoul(self):
+        get_current_weather(city="Nowhere")
+        self.assertEqual(self.state["hits"][1][1]["latitude"], str(grid_cell(37.5665, 126.9780)[0]))
+
+    @override_settings(WEATHER_FORECAST_TTL=0)
+    def test_stale_value_served_while_refreshing(self):
+        get_current_weather(lat=37.5, lon=127.0)
+        self.state["temp"] = 5.0
+        self.state["delay"] = 0.3
+        t0 = time.monotonic()
+        self.assertEqual(get_current_weather(lat=37.5, lon=127.0)["temperature_2m"], 20.4)
+        self.assertLess(time.monotonic() - t0, 0.2)
+        self.wait_for(lambda: cache.get(f"scentpick:weather:current:{37.5}:{127.0}")["current"]["temperature_2m"] == 5.0)
+
+    @override_settings(WEATHER_FORECAST_TTL=0)
+    def test_refresh_errors_keep_cached_value(self):
+        get_current_weather(lat=37.5, lon=127.0)
+        self.state["fail"] = True
+        self.assertEqual(get_current_weather(lat=37.5, lon=127.0)["temperature_2m"], 20.4)
+        self.wait_for(lambda: len(self.state["hits"]) == 2)
+        time.sleep(0.05)
+        self.assertEqual(get_current_weather(lat=37.5, lon=127.0)["temperature_2m"], 20.4)
+
+    @override_settings(WEATHER_COLD_WAIT=0.1)
+    def test_cold_miss_does_not_wait_for_slow_api(self):
+        self.state["delay"] = 0.5
+        t0 = time.monotonic()
+        self.assertIsNone(get_current_weather(lat=33.5, lon=126.5))
+        self.assertLess(time.monotonic() - t0, 0.4)
+        # 뒤에서 받아온 값은 다음 요청에 사용
+        self.wait_for(lambda: get_current_weather(lat=33.5, lon=126.5) is not None)
+
+    def test_recommend_page_degrades_when_weather_unavailable(self):
+        self.client.force_login(User.objects.create_user(username="tester", password="pass-1234-word"))
+        self.state["fail"] = True
+        res = self.client.get(reverse("scentpick:recommend"), {"lat": "37.5", "lon": "127.0"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.context["weather_line1"], "데이터 없음, -°C")
+
+        self.state["fail"] = False
+        self.wait_for(lambda: cache.get("scentpick:weather:current:37.5:127.0:refreshing") is None)
+        res = self.client.get(reverse("scentpick:recommend"), {"lat": "37.5", "lon": "127.0"})
+        self.assertEqual((res.context["weather_line1"], res.context["weather_line2"]), ("약한 비, 20°C", "습도 60%, 바람 보통"))
+
+
+class ChatHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="pass-1234-word")
+        self.client.force_login(self.user)
+        self.conv = Conversation.objects.create(user=self.user, title="t")
+        self.a = make_perfume(name="A")
+        self.b = make_perfume(name="B")
+        self.c = make_perfume(name="C")
+
+    def turn(self, text, picks=()):
+        req = Message.objects.create(conversation=self.conv, role="user", content=text)
+        if picks:
+            run = RecRun.objects.create(user=self.user, conversation=self.conv, request_msg=req)
+            for rank, p in enumerate(picks, start=1):
+                RecCandidate.objects.create(run_rec=run, perfume=p, rank=rank, score=1.0 / rank)
+        Message.objects.create(conversation=self.conv, role="assistant", content=f"re: {text}")
+
+    def api(self, **params):
+        return self.client.get(reverse("scentpick:conversation_messages_api", args=[self.conv.id]), params).json()
+
+    def test_latest_run_per_assistant_message(self):
+        self.turn("1", picks=[self.b, self.a])
+        self.turn("2")
+        self.turn("3", picks=[self.c])
+        # 요청 메시지가 없는 run은 무시
+        RecRun.objects.create(user=self.user, conversation=self.conv)
+
+        items = self.api()["items"]
+        self.assertEqual([i["role"] for i in items], ["user", "assistant"] * 3)
+        self.assertNotIn("perfume_list", items[0])
+        self.assertEqual(
+            items[1]["perfume_list"],
+            [
+                {"id": self.b.id, "brand": "Chanel", "name": "B", "rank": 1, "score": 1.0},
+                {"id": self.a.id, "brand": "Chanel", "name": "A", "rank": 2, "score": 0.5},
+            ],
+        )
+        self.assertEqual([p["name"] for p in items[3]["perfume_list"]], ["B", "A"])
+        self.assertEqual([p["name"] for p in items[5]["perfume_list"]], ["C"])
+
+        res = self.client.get(reverse("scentpick:chat"), {"conversation_id": self.conv.id})
+        chat_items = json.loads(res.context["chat_messages"])
+        self.assertEqual(chat_items[0]["perfume_list"], [])
+        self.assertEqual([p["name"] for p in chat_items[5]["perfume_list"]], ["C"])
+
+    def test_query_count_does_not_grow_with_history(self):
+        self.turn("1", picks=[self.a])
+        with CaptureQueriesContext(connection) as short:
+            self.api()
+        for i in range(30):
+            self.turn(str(i), picks=[self.a, self.b, self.c])
+        with CaptureQueriesContext(connection) as long:
+            items = self.api(limit=100)["items"]
+        self.assertEqual(len(items), 62)
+        self.assertEqual(len(long.captured_queries), len(short.captured_queries))
+
+    def test_messages_page_backwards_with_before(self):
+        self.turn("1", picks=[self.b, self.a])
+        self.turn("2")
+        self.turn("3", picks=[self.c])
+
+        page = self.api(limit=2)
+        self.assertEqual([i["content"] for i in page["items"]], ["3", "re: 3"])
+        self.assertEqual([p["name"] for p in page["items"][1]["perfume_list"]], ["C"])
+
+        page = self.api(limit=2, before=page["next_before"])
+        self.assertEqual([i["content"] for i in page["items"]], ["2", "re: 2"])
+        # 이전 페이지에서 요청된 run도 그대로 따라옴
+        self.assertEqual([p["name"] for p in page["items"][1]["perfume_list"]], ["B", "A"])
+
+        page = self.api(limit=2, before=page["next_before"])
+        self.assertEqual([i["content"] for i in page["items"]], ["1", "re: 1"])
+        self.assertIsNone(page["next_before"])
+
+    def test_messages_etag_revalidation(self):
+        self.turn("1", picks=[self.a])
+        url = reverse("scentpick:conversation_messages_api", args=[self.conv.id])
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+        # 페이지 파라미터가 다르면 다른 응답
+        self.assertEqual(self.client.get(url, {"limit": 1}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.turn("2")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_other_users_conversation_is_404(self):
+        other = User.objects.create_user(username="other", password="pass-1234-word")
+        conv = Conversation.objects.create(user=other, title="x")
+        res = self.client.get(reverse("scentpick:conversation_messages_api", args=[conv.id]))
+        self.assertEqual(res.status_code, 404)
+
+    def test_conversation_list_pages_and_titles(self):
+        untitled = Conversation.objects.create(user=self.user)
+        Message.objects.create(conversation=untitled, role="user", content="가볍고 상쾌한 여름 향수 추천해줘")
+        empty = Conversation.objects.create(user=self.user)
+        url = reverse("scentpick:conversations_api")
+
+        page = self.client.get(url, {"limit": 2}).json()
+        self.assertEqual([i["id"] for i in page["items"]], [empty.id, untitled.id])
+        self.assertEqual([i["title"] for i in page["items"]], [f"대화 {empty.id}", "가볍고 상쾌한 여름 향수 추"])
+
+        page = self.client.get(url, {"limit": 2, "cursor": page["next_cursor"]}).json()
+        self.assertEqual([i["id"] for i in page["items"]], [self.conv.id])
+        self.assertIsNone(page["next_cursor"])
+
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.conv.title = "renamed"
+        self.conv.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class PerfumesViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(30):
+            make_perfume(name=f"Perfume {i:02d}")
+        user = User.objects.create_user(username="tester", password="pass-1234-word")
+        self.client.force_login(user)
+
+    def test_full_page_lists_facets(self):
+        res = self.client.get(reverse("scentpick:perfumes"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.context["brands"], [{"value": "Chanel", "count": 30}])
+        self.assertContains(res, "Chanel <span")
+
+    def test_facets_not_recomputed_on_cached_page(self):
+        url = reverse("scentpick:perfumes")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            get_catalog_facets()
+        res = self.client.get(url)
+        self.assertEqual(len(res.context["accords"]), 2)
+
+    def test_accord_and_size_filters(self):
+        make_perfume(name="Woody", main_accords=["우디"], sizes=[30])
+        url = reverse("scentpick:perfumes")
+        res = self.client.get(url, {"accord": ["우디", "없는어코드"], "ajax": 1})
+        self.assertEqual([p.name for p in res.context["page_obj"]], ["Woody"])
+        res = self.client.get(url, {"size": ["30", "abc"], "ajax": 1})
+        self.assertEqual([p.name for p in res.context["page_obj"]], ["Woody"])
+
+    def test_q_search_orders_by_relevance(self):
+        make_perfume(brand="Aesop", name="Hwyl", description="이끼와 Chanel 느낌")
+        res = self.client.get(reverse("scentpick:perfumes"), {"q": "chanel", "ajax": 1})
+        names = [p.name for p in res.context["page_obj"]]
+        self.assertEqual(len(res.context["page_obj"].paginator.object_list), 31)
+        self.assertEqual(names[0], "Perfume 00")
+        res = self.client.get(reverse("scentpick:perfumes"), {"q": "chanel", "page": 2, "ajax": 1})
+        self.assertEqual([p.name for p in res.context["page_obj"]][-1], "Hwyl")
+
+    def test_q_ranks_within_filters_without_cap(self):
+        # 동점이면 (brand, name) 순 → Zeta는 순위 맨 뒤. 검색 결과를 필터 전에 자르면 빠짐
+        Perfume.objects.bulk_create(
+            Perfume(brand="Zeta" if i < 50 else "Alpha", name=f"Wood {i:03d}", sizes=[50], description="",
+                    concentration="EDP", gender="Male", main_accords=["우디"])
+            for i in range(600)
+        )
+        rebuild_perfume_attributes()
+        invalidate_search_index()
+        url = reverse("scentpick:perfumes")
+        res = self.client.get(url, {"q": "우디", "brand": "Zeta", "ajax": 1})
+        self.assertEqual(res.context["page_obj"].paginator.count, 50)
+        self.assertEqual({p.brand for p in res.context["page_obj"]}, {"Zeta"})
+        res = self.client.get(url, {"q": "우디", "accord": "우디", "gender": "Male", "ajax": 1})
+        self.assertEqual(res.context["page_obj"].paginator.count, 600)
+        res = self.client.get(url, {"q": "우디", "ajax": 1})
+        self.assertEqual(res.context["page_obj"].paginator.count, 600)
+        self.assertEqual(search_perfume_ids("우디", allowed=set()), [])
+
+    def _cursor_walk(self, params):
+        url = reverse("scentpick:perfumes")
+        names, cursor, pages = [], "", 0
+        while cursor is not None:
+            res = self.client.get(url, {**params, "ajax": 1, "cursor": cursor})
+            self.assertTrue(res.context["cursor_mode"])
+            self.assertIsNone(res.context["page_obj"])
+            names += [p.name for p in res.context["perfume_list"]]
+            cursor = res.context["next_cursor"]
+            pages += 1
+        return names, pages
+
+    def test_cursor_pages_match_numbered_order(self):
+        make_perfume(brand="Aesop", name="Hwyl")
+        numbered = []
+        for page in (1, 2):
+            res = self.client.get(reverse("scentpick:perfumes"), {"page": page, "ajax": 1})
+            numbered += [p.name for p in res.context["page_obj"]]
+        names, pages = self._cursor_walk({})
+        self.assertEqual(names, numbered)
+        self.assertEqual(pages, 2)
+        self.assertEqual(names[0], "Hwyl")
+        self.assertContains(
+            self.client.get(reverse("scentpick:perfumes"), {"ajax": 1, "cursor": ""}), "data-ajax-cursor"
+        )
+
+    def test_cursor_with_search_and_bad_cursor(self):
+        names, pages = self._cursor_walk({"q": "perfume"})
+        self.assertEqual(len(names), 30)
+        self.assertEqual(pages, 2)
+        res = self.client.get(reverse("scentpick:perfumes"), {"ajax": 1, "cursor": "!!not-a-cursor"})
+        self.assertEqual(res.context["perfume_list"][0].name, "Perfume 00")
+        self.assertIsNone(decode_cursor(encode_cursor([1, 2])))
+
+    def test_count_cached_per_filter(self):
+        url = reverse("scentpick:perfumes")
+        self.client.get(url, {"ajax": 1, "gender": "Female"})
+        with self.assertNumQueries(3):  # 세션, 사용자, 현재 페이지
+            res = self.client.get(url, {"ajax": 1, "gender": "Female", "page": 2})
+        self.assertEqual(res.context["page_obj"].paginator.count, 30)
+
+        make_perfume(name="New")
+        res = self.client.get(url, {"ajax": 1, "gender": "Female", "page": 2})
+        self.assertEqual(res.context["page_obj"].paginator.count, 31)
+
+    def test_ajax_page_skips_facets(self):
+        res = self.client.get(reverse("scentpick:perfumes"), {"page": 2, "ajax": 1})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("brands", res.context)
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
@@ -8,6 +8,7 @@ urlpatterns = [
     path('chat/', views.chat, name='chat'),
     path('recommend/', views.recommend, name='recommend'),
     path('perfumes/', views.perfumes, name='perfumes'),
+    path('perfumes/typeahead/', views.perfume_typeahead, name='perfume_typeahead'),
     path('perfume/<int:perfume_id>/', views.product_detail, name='product_detail'),
     path('scentpick/api/toggle-favorite/', views.toggle_favorite, name='toggle_favorite'),
     path('scentpick/api/toggle-like-dislike/', views.toggle_like_dislike, name='toggle_like_dislike'),
@@ -20,29 +20,47 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, Max  # yyh : Count, Max 추가
-from django.http import JsonResponse, StreamingHttpResponse
+from django.db.models import Q, Count, Max, Exists, OuterRef  # yyh : Count, Max 추가
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.utils.decorators import method_decorator
-from django.views.decorators.http import require_POST, require_GET
+from django.views.decorators.http import condition, require_POST, require_GET
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control, never_cache
 
 # --- 프로젝트 내부 (app) ---
 from .models import (
     Perfume,
+    PerfumeAccord,
+    PerfumeSize,
     Favorite,
     FeedbackEvent,
-    NoteImage,
     Conversation,
     Message,
-    RecRun,
     RecCandidate,
 )
+from .accord_pools import accord_pool_ids, fetch_in_order, sample_accord_pool
+from .chat_history import (
+    CONVERSATION_PAGE_SIZE,
+    MESSAGE_PAGE_SIZE,
+    conversation_list_state,
+    conversation_state,
+    load_conversation_history,
+    load_conversation_list,
+    make_etag,
+    page_size,
+)
+from .facets import get_catalog_facets
+from .note_images import resolve_note_images
+from .perfume_detail import get_perfume_detail, user_perfume_state
+from .pagination import PER_PAGE, CachedCountPaginator, filter_signature, keyset_page, offset_page
+from .search import search_perfume_ids, typeahead
+from .weather import get_current_weather
 from uauth.models import UserDetail
 from uauth.utils import process_profile_image, upload_to_s3_and_get_url
 
-from .utils.note_translations import get_korean_note_name, get_english_note_name
+from .utils.note_translations import get_korean_note_name
 
 # S3 클라이언트 전역 설정
 s3_client = boto3.client(
@@ -66,15 +84,14 @@ def chat(request):
     """
     Chat 페이지: conversations DB에서 대화 목록과 메시지들을 읽어서 표시
     """
-    # 전체 대화 목록 (프론트에서 스크롤로 제한)
-    recent_conversations = Conversation.objects.filter(
-        user=request.user
-    ).order_by('-updated_at')
+    # 최근 대화 첫 페이지만 (나머지는 사이드바 스크롤 시 conversations_api?cursor=)
+    recent_conversations, conversations_cursor = load_conversation_list(request.user)
     
     # 현재 선택된 대화 ID (세션 또는 GET 파라미터에서)
     current_conversation_id = request.GET.get('conversation_id') or request.session.get('conversation_id')
     current_conversation = None
     messages = []
+    messages_before = None
     
     if current_conversation_id:
         try:
@@ -82,44 +99,20 @@ def chat(request):
                 id=current_conversation_id, 
                 user=request.user
             )
-            # 해당 대화의 메시지들 가져오기 (추천 데이터 포함)
-            messages_raw = current_conversation.messages.order_by('created_at')
+            # 해당 대화의 최근 메시지들 (추천 데이터 포함, 쿼리 수 고정)
+            # 이전 메시지는 위로 스크롤 시 conversation_messages_api?before=
             messages = []
-            
-            for m in messages_raw:
-                message_data = {
+            history, messages_before = load_conversation_history(
+                current_conversation, limit=MESSAGE_PAGE_SIZE
+            )
+            for m, perfume_list in history:
+                messages.append({
                     'role': m.role,
                     'content': m.content,
                     'created_at': m.created_at,
                     'chat_image': getattr(m, 'chat_image', None),  # 안전한 이미지 URL 접근
-                    'perfume_list': []
-                }
-                
-                # assistant 메시지인 경우 관련된 추천 데이터 찾기
-                if m.role == 'assistant':
-                    rec_runs = RecRun.objects.filter(
-                        conversation=current_conversation,
-                        request_msg__created_at__lte=m.created_at
-                    ).order_by('-created_at')
-                    
-                    if rec_runs.exists():
-                        latest_run = rec_runs.first()
-                        candidates = latest_run.candidates.select_related('perfume').order_by('rank')
-                        
-                        perfume_list = []
-                        for candidate in candidates:
-                            perfume_list.append({
-                                'id': candidate.perfume.id,
-                                'brand': candidate.perfume.brand,
-                                'name': candidate.perfume.name,
-                                'rank': candidate.rank,
-                                'score': candidate.score
-                            })
-                        
-                        if perfume_list:
-                            message_data['perfume_list'] = perfume_list
-                
-                messages.append(message_data)
+                    'perfume_list': perfume_list,
+                })
             
             # 세션에 저장
             request.session['conversation_id'] = current_conversation.id
@@ -129,9 +122,11 @@ def chat(request):
     
     return render(request, "scentpick/chat.html", {
         "recent_conversations": recent_conversations,
+        "conversations_cursor": conversations_cursor,
         "current_conversation": current_conversation,
         "current_conversation_id": current_conversation_id,
         "chat_messages": json.dumps(messages, default=str, ensure_ascii=False),  # JSON으로 직렬화
+        "messages_before": messages_before,
         "SERVICE_TOKEN": SERVICE_TOKEN,
     })
 
@@ -146,30 +141,13 @@ def perfumes(request):
 
     qs = Perfume.objects.all()
 
-    if q:
-        qs = qs.filter(
-            Q(name__icontains=q)
-            | Q(brand__icontains=q)
-            | Q(description__icontains=q)
-            | Q(main_accords__icontains=q)
-            | Q(top_notes__icontains=q)
-            | Q(middle_notes__icontains=q)
-            | Q(base_notes__icontains=q)
-        )
-
     if brand_sel:
         qs = qs.filter(brand__in=brand_sel)
 
     if size_sel:
-        size_q = Q()
-        for s in size_sel:
-            try:
-                s_int = int(s)
-                size_q |= Q(sizes__contains=s_int)
-            except ValueError:
-                pass
-        if size_q:
-            qs = qs.filter(size_q)
+        size_ints = [int(s) for s in size_sel if s.isdigit()]
+        if size_ints:
+            qs = qs.filter(pk__in=perfume_ids_with(PerfumeSize, size_ml__in=size_ints))
 
     if gender_sel:
         gq = Q()
@@ -186,33 +164,57 @@ def perfumes(request):
             qs = qs.filter(cq)
 
     if accord_sel:
-        aq = Q()
-        for a in accord_sel:
-            aq |= Q(main_accords__icontains=a)
-        if aq:
-            qs = qs.filter(aq)
-
-    qs = qs.order_by("brand", "name")
+        qs = qs.filter(pk__in=perfume_ids_with(PerfumeAccord, accord__in=accord_sel))
 
-    paginator = Paginator(qs, 24)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    if q:
+        # 자유 검색: 필터를 먼저 적용하고 통과한 id 안에서만 검색 색인(search.py) 관련도 순으로 전부 정렬
+        # (상한 없음 — 필터 전에 잘라내면 뒤쪽 매칭이 빠짐) → 이 id 리스트로 페이지 나누고 현재 페이지 행만 조회
+        filtered = any((brand_sel, size_sel, gender_sel, conc_sel, accord_sel))
+        allowed = set(qs.values_list("pk", flat=True)) if filtered else None
+        ranked_ids = search_perfume_ids(q, allowed=allowed)
+
+    # 무한 스크롤(ajax=1&cursor=...): COUNT/OFFSET 없이 다음 24개 + 다음 커서
+    cursor_mode = request.GET.get("ajax") == "1" and "cursor" in request.GET
+    page_obj = page_range_custom = next_cursor = None
+    if cursor_mode:
+        cursor = request.GET.get("cursor")
+        if q:
+            page_ids, next_cursor = offset_page(ranked_ids, cursor)
+            by_id = Perfume.objects.in_bulk(page_ids)
+            perfume_list = [by_id[pid] for pid in page_ids if pid in by_id]
+        else:
+            perfume_list, next_cursor = keyset_page(qs, cursor)
+    else:
+        page_number = request.GET.get("page")
+        if q:
+            paginator = Paginator(ranked_ids, PER_PAGE)
+            page_obj = paginator.get_page(page_number)
+            by_id = Perfume.objects.in_bulk(page_obj.object_list)
+            page_obj.object_list = [by_id[pid] for pid in page_obj.object_list if pid in by_id]
+        else:
+            # 필터 조합별 COUNT(*) 캐시
+            signature = filter_signature({
+                "brand": brand_sel, "size": size_sel, "gender": gender_sel, "conc": conc_sel, "accord": accord_sel,
+            })
+            paginator = CachedCountPaginator(qs.order_by("brand", "name", "pk"), PER_PAGE, signature)
+            page_obj = paginator.get_page(page_number)
+        perfume_list = page_obj.object_list
 
-    current = page_obj.number
-    total = paginator.num_pages
-    page_range_custom = []
+        current = page_obj.number
+        total = paginator.num_pages
+        page_range_custom = []
 
-    if total <= 10:
-        page_range_custom = list(range(1, total + 1))
-    else:
-        if current <= 6:
-            page_range_custom = list(range(1, 7)) + ["...", total]
-        elif current >= total - 5:
-            page_range_custom = [1, "..."] + list(range(total - 5, total + 1))
+        if total <= 10:
+            page_range_custom = list(range(1, total + 1))
         else:
-            page_range_custom = [1, "..."] + list(range(current - 2, current + 3)) + ["...", total]
+            if current <= 6:
+                page_range_custom = list(range(1, 7)) + ["...", total]
+            elif current >= total - 5:
+                page_range_custom = [1, "..."] + list(range(total - 5, total + 1))
+            else:
+                page_range_custom = [1, "..."] + list(range(current - 2, current + 3)) + ["...", total]
 
-    for p in page_obj.object_list:
+    for p in perfume_list:
         raw = p.main_accords or ""
         if isinstance(raw, list):
             toks = [str(t).strip() for t in raw]
@@ -226,49 +228,21 @@ def perfumes(request):
         p.accord_list = [t for t in toks if t][:6]
         p.image_url = f"https://scentpick-images.s3.ap-northeast-2.amazonaws.com/perfumes/{p.id}.jpg"
 
-    brands = Perfume.objects.values_list("brand", flat=True).distinct().order_by("brand")
-    concentrations = (
-        Perfume.objects.exclude(concentration="")
-        .values_list("concentration", flat=True)
-        .distinct()
-        .order_by("concentration")
-    )
-    genders = (
-        Perfume.objects.exclude(gender="")
-        .values_list("gender", flat=True)
-        .distinct()
-        .order_by("gender")
-    )
-
-    raw_accords = Perfume.objects.exclude(main_accords="").values_list("main_accords", flat=True)
-    accord_set = set()
-    for raw in raw_accords:
-        if not raw:
-            continue
-        if isinstance(raw, list):
-            parts = [str(p).strip() for p in raw if p]
-        else:
-            cleaned = str(raw).strip("[]").replace("'", "").replace('"', "")
-            parts = [p.strip() for p in cleaned.split(",") if p.strip()]
-        for p in parts:
-            if p and p not in ["/", "-", "_"]:
-                accord_set.add(p)
-    accords = sorted(accord_set)
-
     base_qd = request.GET.copy()
     base_qd.pop("page", True)
+    base_qd.pop("cursor", True)
     base_qs = base_qd.urlencode()
 
     ctx = {
+        "perfume_list": perfume_list,
         "page_obj": page_obj,
         "page_range_custom": page_range_custom,
-        "brands": brands,
-        "concentrations": concentrations,
-        "genders": genders,
-        "accords": accords,
+        "cursor_mode": cursor_mode,
+        "next_cursor": next_cursor,
         "selected": {
             "q": q,
             "brand": brand_sel,
+            "size": size_sel,
             "gender": gender_sel,
             "conc": conc_sel,
             "accord": accord_sel,
@@ -276,11 +250,31 @@ def perfumes(request):
         "base_qs": base_qs,
     }
 
+    # 페이지 넘김(ajax)은 카드 그리드만 다시 그리므로 필터 목록 불필요
     if request.GET.get("ajax") == "1":
         return render(request, "scentpick/perfumes_grid.html", ctx)
-    
+
+    # 필터 목록: {"value", "count"} 리스트 (캐시, Perfume 변경 시 무효화)
+    ctx.update(get_catalog_facets())
     return render(request, "scentpick/perfumes.html", ctx)
 
+@login_required
+@require_GET
+def perfume_typeahead(request):
+    """
+    향수 목록 검색창 자동완성 API (이름/브랜드/어코드/노트, 한↔영 노트명, 접두어 일치)
+    """
+    q = (request.GET.get("q") or "").strip()
+    try:
+        limit = min(max(int(request.GET.get("limit", 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    items = typeahead(q, limit=limit) if q else []
+    for it in items:
+        it["image_url"] = f"{S3_BASE}/perfumes/{it['id']}.jpg"
+        it["url"] = reverse("scentpick:product_detail", args=[it["id"]])
+    return JsonResponse({"q": q, "items": items})
+
 @login_required
 def offlines(request):
     return render(request, "scentpick/offlines.html", {"KAKAO_JS_KEY": settings.KAKAO_JS_KEY})
@@ -425,37 +419,10 @@ def tip_and_accords_by_code(code):
     return ("오늘 기분에 맞는 향을 가볍게 시향해 보세요 :)", ["플로랄", "프루티", "그린", "머스크"])
 
 def fetch_weather_simple(city="Seoul", lat=None, lon=None):
-    # 1) 위경도 직접 받은 경우
-    if lat is not None and lon is not None:
-        pass  # 그대로 사용
-    else:
-        # city 이름 기반 지오코딩
-        g = requests.get(
-            "https://geocoding-api.open-meteo.com/v1/search",
-            params={"name": city, "count": 1, "language": "ko", "format": "json"},
-            timeout=5,
-        )
-        g.raise_for_status()
-        gj = g.json()
-        if gj.get("results"):
-            lat = gj["results"][0]["latitude"]
-            lon = gj["results"][0]["longitude"]
-        else:
-            lat, lon = 37.5665, 126.9780  # 서울 기본
-
-    # 2) 현재 날씨 조회
-    r = requests.get(
-        "https://api.open-meteo.com/v1/forecast",
-        params={
-            "latitude": lat,
-            "longitude": lon,
-            "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m",
-            "timezone": "Asia/Seoul",
-        },
-        timeout=5,
-    )
-    r.raise_for_status()
-    cur = r.json().get("current") or {}
+    """(line1, line2, weather_code) — 캐시된 날씨 (weather.py), 아직 없으면 None"""
+    cur = get_current_weather(city=city, lat=lat, lon=lon)
+    if cur is None:
+        return None
 
     code = cur.get("weather_code")
     desc = WMO_KO.get(code, "알 수 없음")
@@ -473,45 +440,27 @@ def fetch_weather_simple(city="Seoul", lat=None, lon=None):
 # =======================
 # DB 조회 / 이미지 URL 부여
 # =======================
+def perfume_ids_with(model, **lookups):
+    """
+    정규화 테이블(perfume_accords/perfume_sizes/perfume_notes)에서 조건에 맞는 perfume_id 서브쿼리
+    - 목록 페이지처럼 count + 정렬로 결과 전체가 필요한 곳: pk__in=perfume_ids_with(...)
+    """
+    return model.objects.filter(**lookups).values("perfume_id")
+
+def perfume_has(model, **lookups):
+    """
+    같은 조건의 EXISTS (향수별 (perfume, 값) 유니크 인덱스 조회)
+    - 개수 제한 풀 조회처럼 앞에서부터 limit개만 찾으면 되는 곳 (중간에 멈춤)
+    """
+    return Exists(model.objects.filter(perfume=OuterRef("pk"), **lookups))
+
 def query_perfumes_by_accords(accords, limit=8, gender=None):
-    from django.db.models import Q
-    
-    # 어코드 조건 구성
-    accord_q = Q()
-    for a in accords:
-        accord_q |= Q(main_accords__contains=[a])
-    
-    # 성별 조건 추가
-    def apply_gender_filter(base_query):
-        if gender and gender in ['Male', 'Female']:
-            # Male이나 Female이 요청되면 해당 성별 + Unisex 포함
-            return base_query.filter(Q(gender=gender) | Q(gender='Unisex'))
-        elif gender == 'Unisex':
-            # Unisex만 요청되면 Unisex만
-            return base_query.filter(gender='Unisex')
-        else:
-            # gender가 None이면 성별 필터링 없음
-            return base_query
-    
-    try:
-        # JSONField 방식으로 시도
-        base_qs = Perfume.objects.filter(accord_q)
-        qs = apply_gender_filter(base_qs)[:limit]
-        
-        if qs.exists():
-            return list(qs)
-    except Exception:
-        pass  # TextField(JSON 문자열) fallback
-    
-    # TextField fallback
-    accord_q = Q()
-    for a in accords:
-        accord_q |= Q(main_accords__icontains=f'"{a}"')
-    
-    base_qs = Perfume.objects.filter(accord_q)
-    qs = apply_gender_filter(base_qs)[:limit]
-    
-    return list(qs)
+    """
+    어코드 중 하나라도 가진 향수 앞쪽(id 순) limit개
+    gender: Male/Female이면 해당 성별 + Unisex, Unisex면 Unisex만, None이면 전체
+    id는 메모리 어코드 풀(accord_pools.py)에서, 향수 행은 id__in 조회 1번
+    """
+    return fetch_in_order(accord_pool_ids(accords, gender, limit=limit))
 
 def attach_image_urls(perfumes_iter):
     """scentpick-images/perfumes/{id}.jpg 규칙으로 image_url 속성 부여"""
@@ -574,7 +523,7 @@ def filter_worldcup_candidates(gender_ko: str, accord_ko: str, time_pref: str, n
     """
     성별/메인어코드/낮밤 선택으로 Perfume 후보 8개 뽑기
     - 성별: 남성→Male+Unisex, 여성→Female+Unisex, 남녀공용→Unisex
-    - 메인어코드: JSONField or TEXT(JSON문자열) 모두 대응
+    - 메인어코드: perfume_accords 정규화 테이블로 조회
     - 낮/밤: 점수 높은 순으로 정렬 후 상위 need개
     """
     # 성별 매핑
@@ -587,16 +536,7 @@ def filter_worldcup_candidates(gender_ko: str, accord_ko: str, time_pref: str, n
         g_filter = ["Unisex"]
 
     # 메인어코드 조건
-    q = Q(gender__in=g_filter)
-    try:
-        q &= Q(main_accords__contains=[accord_ko])
-        base = Perfume.objects.filter(q)[:200]
-        if not base:
-            raise ValueError
-    except Exception:
-        # TEXT 저장 fallback (JSON 문자열)
-        q &= (Q(main_accords__icontains=f'"{accord_ko}"') | Q(main_accords__icontains=accord_ko))
-        base = Perfume.objects.filter(q)[:200]
+    base = Perfume.objects.filter(perfume_has(PerfumeAccord, accord=accord_ko), gender__in=g_filter)[:200]
 
     # 낮/밤 점수로 정렬
     key = "day" if time_pref == "day" else "night"
@@ -641,12 +581,14 @@ def recommend(request):
     a = request.GET.get("a", "")   # "플로랄" | ...
     t = request.GET.get("t", "")   # "day" | "night"
 
-    try:
-       # ① 날씨 정보
-        if lat and lon:
-            line1, line2, code = fetch_weather_simple(lat=float(lat), lon=float(lon))
-        else:
-            line1, line2, code = fetch_weather_simple(city=city)
+    # ① 날씨 정보 (캐시, Open-Meteo 응답을 기다리지 않음)
+    if lat and lon:
+        weather = fetch_weather_simple(lat=float(lat), lon=float(lon))
+    else:
+        weather = fetch_weather_simple(city=city)
+
+    if weather is not None:
+        line1, line2, code = weather
         tip, target_accords = tip_and_accords_by_code(code)
         emoji = emoji_by_code(code)
 
@@ -680,9 +622,8 @@ def recommend(request):
             # 라디오 옵션
             "accord_options": ACCORD_OPTIONS,
         }
-
-    except requests.RequestException:
-        # 날씨 API 실패 시: 날씨 박스만 기본값, 계절 추천은 랜덤으로 계속
+    else:
+        # 날씨 데이터 없음(첫 조회 지연 / API 실패): 날씨 박스만 기본값, 계절 추천은 랜덤으로 계속
         now = datetime.now(ZoneInfo("Asia/Seoul"))
         season_title, season_tip, season_accords = seasonal_accords_and_tip(now.month)
         seasonal_perfumes = fetch_random_by_accords(season_accords, pool=60, k=3)
@@ -715,28 +656,14 @@ def recommend(request):
     return render(request, "scentpick/recommend.html", context)
 
 
-def _sample_random(seq, k):
-    """seq에서 k개 랜덤 샘플 (부족하면 있는 만큼)"""
-    seq = list(seq) if seq is not None else []
-    if len(seq) <= k:
-        return seq
-    return random.sample(seq, k)
-
 def fetch_random_by_accords(accords, pool=60, k=3, exclude_ids=None, gender=None):
     """
     어코드로 pool개 풀을 긁어온 뒤 k개 랜덤 뽑기.
     exclude_ids에 있는 id는 제외(중복 회피용).
     gender: 'Male', 'Female', 'Unisex' 중 하나.
     """
-    # 풀 데이터 조회 시 성별 필터링 포함
-    pool_list = query_perfumes_by_accords(accords, limit=pool, gender=gender)
-    
-    # 중복 제외 처리
-    if exclude_ids:
-        pool_list = [p for p in pool_list if getattr(p, "id", None) not in exclude_ids]
-    
-    # 랜덤 추출
-    picked = _sample_random(pool_list, k)
+    # 풀 / 중복 제외 / 랜덤 추출은 id 배열에서, 뽑힌 k개만 DB 조회
+    picked = sample_accord_pool(accords, k, pool=pool, exclude_ids=exclude_ids, gender=gender)
     
     # 이미지 URL 붙이기
     attach_image_urls(picked)
@@ -933,6 +860,8 @@ def chat_stream_api(request):
                         if user_message:
                             user_message.chat_image = uploaded_image_url
                             user_message.save()
+                            # 대화 메시지 API ETag가 바뀌도록
+                            conv.save(update_fields=['updated_at'])
                             print(f"✅ Image URL saved to message {user_message.id}: {uploaded_image_url}")
                     except Exception as e:
                         print(f"❌ Failed to save image URL: {e}")
@@ -966,127 +895,32 @@ def chat_stream_api(request):
         return StreamingHttpResponse(error_generator(), content_type='text/event-stream')
 
 def get_note_image_url(note_name):
-    """노트명으로 이미지 URL 가져오기 - 개선된 버전"""
-    try:
-        # 한국어면 영어로 변환
-        english_name = get_english_note_name(note_name)
-        
-        # 1. 정확한 이름으로 검색
-        note_image = NoteImage.objects.filter(note_name__iexact=english_name).first()
-        if note_image:
-            return note_image.image_url
-        
-        # 2. 부분 매칭으로 검색 (대소문자 무시)
-        note_image = NoteImage.objects.filter(note_name__icontains=english_name).first()
-        if note_image:
-            return note_image.image_url
-        
-        # 3. 공백으로 분리해서 각 단어로 검색
-        if ' ' in english_name:
-            for word in english_name.split():
-                if len(word) > 2:  # 2글자 이상인 단어만
-                    note_image = NoteImage.objects.filter(note_name__icontains=word).first()
-                    if note_image:
-                        return note_image.image_url
-        
-        # 4. 역방향 검색 - DB의 노트명이 한국어 노트명을 포함하는지
-        notes_containing = NoteImage.objects.filter(note_name__icontains=note_name).first()
-        if notes_containing:
-            return notes_containing.image_url
-        return None
-        
-    except Exception as e:
-        return None
+    """노트명으로 이미지 URL 가져오기 (여러 개면 resolve_note_images로 한 번에)"""
+    return resolve_note_images([note_name])[0]
 
 
 def product_detail(request, perfume_id):
-    # DB 테스트 (개발용 - 나중에 제거)
-    #test_note_images()
-    
-    perfume = get_object_or_404(Perfume, id=perfume_id)
+    # 향수/노트/이전·다음 id는 캐시된 뷰 모델 (카탈로그 변경 시 무효화)
+    detail = get_perfume_detail(perfume_id)
+    if detail is None:
+        raise Http404("No Perfume matches the given query.")
+    perfume = detail['perfume']
     image_url = f"https://scentpick-images.s3.ap-northeast-2.amazonaws.com/perfumes/{perfume.id}.jpg"
     
-    # 사용자의 즐겨찾기/피드백 상태 확인
-    is_favorite = False
-    feedback_status = None
-    
-    if request.user.is_authenticated:
-        # 즐겨찾기 상태 확인
-        is_favorite = Favorite.objects.filter(
-            user=request.user,
-            perfume=perfume
-        ).exists()
-        
-        # 피드백 상태 확인
-        feedback = FeedbackEvent.objects.filter(
-            user=request.user,
-            perfume=perfume,
-            action__in=['like', 'dislike']
-        ).first()
-        
-        if feedback:
-            feedback_status = feedback.action
-    
-    def safe_process_json_field(field_data):
-        if not field_data:
-            return []
-        
-        try:
-            # Case 1: 이미 Python 리스트인 경우
-            if isinstance(field_data, list):
-                return field_data
-            
-            # Case 2: JSON 문자열인 경우 (예: '["레몬", "자몽"]')
-            if isinstance(field_data, str):
-                import json
-                try:
-                    parsed = json.loads(field_data)
-                    if isinstance(parsed, list):
-                        return parsed
-                except:
-                    # Case 3: JSON 파싱 실패시 공백으로 분리 (예: '레몬 자몽')
-                    return field_data.split()
-            
-            return []
-        except Exception as e:
-            print(f"Error processing field: {field_data}, Error: {e}")
-            return []
-    
-    main_accords = safe_process_json_field(perfume.main_accords)
-    top_notes = safe_process_json_field(perfume.top_notes)
-    middle_notes = safe_process_json_field(perfume.middle_notes)
-    base_notes = safe_process_json_field(perfume.base_notes)
-    
-    # 노트에 이미지 URL과 한국어 이름 추가
-    def enhance_notes(notes_list):
-        enhanced_notes = []
-        for note in notes_list:
-            enhanced_notes.append({
-                'name': note,
-                'korean_name': note,  # 이미 한국어이므로 그대로 사용
-                'image_url': get_note_image_url(note)  # 한국어→영어 변환 후 이미지 검색
-            })
-        return enhanced_notes
-    
-    enhanced_top_notes = enhance_notes(top_notes)
-    enhanced_middle_notes = enhance_notes(middle_notes)
-    enhanced_base_notes = enhance_notes(base_notes)
-    
-    # 이전/다음 향수 가져오기
-    prev_perfume = Perfume.objects.filter(id__lt=perfume_id).order_by('-id').first()
-    next_perfume = Perfume.objects.filter(id__gt=perfume_id).order_by('id').first()
+    # 사용자의 즐겨찾기/피드백 상태 확인 (쿼리 1번)
+    is_favorite, feedback_status = user_perfume_state(request.user, perfume.id)
 
     context = {
         'perfume': perfume,
         'image_url': image_url,
-        'main_accords': main_accords,
-        'top_notes': enhanced_top_notes,
-        'middle_notes': enhanced_middle_notes,
-        'base_notes': enhanced_base_notes,
+        'main_accords': detail['main_accords'],
+        'top_notes': detail['top_notes'],
+        'middle_notes': detail['middle_notes'],
+        'base_notes': detail['base_notes'],
         'sizes': perfume.sizes,
         'gender': perfume.gender,
-        'prev_perfume': prev_perfume,
-        'next_perfume': next_perfume,
+        'prev_perfume_id': detail['prev_id'],
+        'next_perfume_id': detail['next_id'],
         'detail_url': perfume.detail_url,  # bysuco 링크 추가
         'notes_score': perfume.notes_score,  # 노트 점수 추가
         'season_score': perfume.season_score,  # 계절 점수 추가
@@ -1338,45 +1172,6 @@ def mypage(request):
 
     return render(request, "scentpick/mypage.html", context)
 
-@login_required
-@require_GET
-def conversations_api(request):
-    """
-    대화 목록 API - AJAX로 대화 목록 로드
-    """
-    items = []
-    qs = Conversation.objects.filter(user=request.user).order_by('-updated_at')[:100]
-    for c in qs:
-        title = c.title
-        if not title:
-            # Fallback: derive from first user message
-            try:
-                first_user = c.messages.filter(role='user').order_by('created_at').first()
-                if first_user and first_user.content:
-                    title = first_user.content[:15]
-            except Exception:
-                pass
-        if not title:
-            title = f"대화 {c.id}"
-        items.append({
-            'id': c.id,
-            'title': title,
-            'updated_at': c.updated_at.isoformat(),
-        })
-    return JsonResponse({'items': items})
-
-
-@login_required
-@require_POST
-def chat_new_api(request):
-    """
-    새 대화 시작 API - 세션 초기화
-    """
-    # 세션에서 현재 대화 ID 제거
-    request.session['conversation_id'] = None
-    return JsonResponse({'ok': True, 'message': '새 대화가 시작되었습니다.'})
-
-
 @login_required
 @require_POST
 def delete_feedback_api(request):
@@ -1437,80 +1232,77 @@ def update_feedback_api(request):
             'status': 'error',
             'message': f'오류가 발생했습니다: {str(e)}'
         }, status=500)
+def _before_id(request):
+    before = request.GET.get('before', '')
+    return int(before) if before.isdigit() else None
+
+def _conversations_etag(request):
+    # 목록이 그대로면(최근 updated_at, 대화 수) 같은 커서/limit 응답도 그대로 → 304
+    return make_etag(
+        conversation_list_state(request.user),
+        request.GET.get('cursor'),
+        request.GET.get('limit'),
+    )
+
+def _conversation_messages_etag(request, conv_id):
+    state = conversation_state(request.user, conv_id)
+    if state is None:
+        return None  # 없는 대화는 뷰에서 404
+    return make_etag(state, _before_id(request), request.GET.get('limit'))
+
 @login_required
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_conversations_etag)
 def conversations_api(request):
     """
     대화 목록 API - AJAX로 대화 목록 로드
+    ?cursor= 로 다음 페이지 (응답의 next_cursor), ?limit= (기본 CONVERSATION_PAGE_SIZE)
     """
-    items = []
-    qs = Conversation.objects.filter(user=request.user).order_by('-updated_at')[:100]
-    for c in qs:
-        title = c.title
-        if not title:
-            # Fallback: derive from first user message
-            try:
-                first_user = c.messages.filter(role='user').order_by('created_at').first()
-                if first_user and first_user.content:
-                    title = first_user.content[:15]
-            except Exception:
-                pass
-        if not title:
-            title = f"대화 {c.id}"
-        items.append({
-            'id': c.id,
-            'title': title,
-            'updated_at': c.updated_at.isoformat(),
-        })
-    return JsonResponse({'items': items})
+    items, next_cursor = load_conversation_list(
+        request.user,
+        cursor=request.GET.get('cursor'),
+        limit=page_size(request.GET.get('limit'), CONVERSATION_PAGE_SIZE),
+    )
+    for item in items:
+        item['updated_at'] = item['updated_at'].isoformat()
+    return JsonResponse({'items': items, 'next_cursor': next_cursor})
 
 @login_required
 @require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_conversation_messages_etag)
 def conversation_messages_api(request, conv_id: int):
     """
     특정 대화의 메시지 목록 API - AJAX로 메시지 로드 (추천 데이터 포함)
+    최신 메시지부터 limit개(시간순으로 응답), 위로 스크롤하면 ?before=<next_before> 로 이전 페이지
     """
     conv = get_object_or_404(Conversation, id=conv_id, user=request.user)
-    msgs = conv.messages.order_by('created_at')
     data = []
-    
-    for m in msgs:
+
+    # 메시지 + assistant 메시지별 추천 후보 (쿼리 수 고정)
+    history, next_before = load_conversation_history(
+        conv,
+        before=_before_id(request),
+        limit=page_size(request.GET.get('limit'), MESSAGE_PAGE_SIZE),
+    )
+    for m, perfume_list in history:
         message_data = {
             'role': m.role,
             'content': m.content,
             'created_at': m.created_at.isoformat(),
             'chat_image': getattr(m, 'chat_image', None),  # 안전한 이미지 URL 접근
         }
-        
-        # assistant 메시지인 경우 관련된 추천 데이터 찾기
-        if m.role == 'assistant':
-            # 이 메시지와 연관된 RecRun 찾기
-            rec_runs = RecRun.objects.filter(
-                conversation=conv,
-                request_msg__created_at__lte=m.created_at
-            ).order_by('-created_at')
-            
-            if rec_runs.exists():
-                latest_run = rec_runs.first()
-                # 추천 후보들 가져오기
-                candidates = latest_run.candidates.select_related('perfume').order_by('rank')
-                
-                perfume_list = []
-                for candidate in candidates:
-                    perfume_list.append({
-                        'id': candidate.perfume.id,
-                        'brand': candidate.perfume.brand,
-                        'name': candidate.perfume.name,
-                        'rank': candidate.rank,
-                        'score': candidate.score
-                    })
-                
-                if perfume_list:
-                    message_data['perfume_list'] = perfume_list
-        
+        if perfume_list:
+            message_data['perfume_list'] = perfume_list
         data.append(message_data)
     
-    return JsonResponse({'conversation_id': conv.id, 'title': conv.title, 'items': data})
+    return JsonResponse({
+        'conversation_id': conv.id,
+        'title': conv.title,
+        'items': data,
+        'next_before': next_before,
+    })
 
 @login_required
 @require_POST
@@ -0,0 +1,154 @@
+# scentpick/weather.py
+# 추천 페이지 날씨 박스용 Open-Meteo 조회 + 캐시
+# - 지오코딩(city → 위경도): 사실상 영구 캐시
+# - 현재 날씨: 위경도를 GRID_STEP(0.1° ≈ 11km) 격자로 반올림한 칸 단위 캐시
+#   WEATHER_FORECAST_TTL(기본 10분)이 지나면 stale — 일단 stale 값을 돌려주고 백그라운드 스레드에서 갱신
+#   (stale-while-revalidate). 갱신이 실패하면 stale 값을 계속 사용
+# - 캐시가 아예 없을 때만 백그라운드 조회를 WEATHER_COLD_WAIT초까지 기다리고, 그래도 없으면 None
+#   → 페이지 요청이 Open-Meteo 응답(타임아웃 5초 × 2)에 묶이지 않음
+# - 같은 칸 갱신은 프로세스 안에서는 진행 중 future로, 프로세스 간에는 캐시 락 키로 한 번만
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+DEFAULT_LOCATION = (37.5665, 126.9780)  # 서울
+
+GRID_STEP = 0.1
+HTTP_TIMEOUT = 5
+# stale 값도 없는 것보다 나으므로 캐시 자체는 오래 보관
+FORECAST_KEEP = 6 * 60 * 60
+REFRESH_LOCK_TIMEOUT = 2 * HTTP_TIMEOUT + 5
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather")
+_inflight = {}
+# 이미 끝난 future에 add_done_callback하면 콜백이 바로(락을 잡은 채로) 실행되므로 RLock
+_inflight_lock = threading.RLock()
+
+
+def _forecast_ttl():
+    return getattr(settings, "WEATHER_FORECAST_TTL", 10 * 60)
+
+
+def _cold_wait():
+    return getattr(settings, "WEATHER_COLD_WAIT", 1.5)
+
+
+def grid_cell(lat, lon):
+    """위경도 → 격자 칸 중심 (캐시 키이자 실제 조회 좌표)"""
+    return round(round(lat / GRID_STEP) * GRID_STEP, 4), round(round(lon / GRID_STEP) * GRID_STEP, 4)
+
+
+def _geocode_key(city):
+    return f"scentpick:weather:geo:{city.strip().lower()}"
+
+
+def _forecast_key(cell):
+    return f"scentpick:weather:current:{cell[0]}:{cell[1]}"
+
+
+# -----------------------------
+# Open-Meteo 호출 (백그라운드 스레드)
+# -----------------------------
+def _geocode(city):
+    g = requests.get(
+        getattr(settings, "OPEN_METEO_GEOCODE_URL", GEOCODE_URL),
+        params={"name": city, "count": 1, "language": "ko", "format": "json"},
+        timeout=HTTP_TIMEOUT,
+    )
+    g.raise_for_status()
+    results = g.json().get("results")
+    # 결과 없음은 확정 답이므로 기본 위치로 캐시, HTTP 오류는 캐시하지 않음
+    location = (results[0]["latitude"], results[0]["longitude"]) if results else DEFAULT_LOCATION
+    cache.set(_geocode_key(city), location, None)
+    return location
+
+
+def _fetch_current(cell):
+    r = requests.get(
+        getattr(settings, "OPEN_METEO_FORECAST_URL", FORECAST_URL),
+        params={
+            "latitude": cell[0],
+            "longitude": cell[1],
+            "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m",
+            "timezone": "Asia/Seoul",
+        },
+        timeout=HTTP_TIMEOUT,
+    )
+    r.raise_for_status()
+    current = r.json().get("current") or {}
+    cache.set(_forecast_key(cell), {"current": current, "fetched_at": time.time()}, FORECAST_KEEP)
+    return current
+
+
+def _refresh(city, cell, lock_key):
+    try:
+        if cell is None:
+            cell = grid_cell(*_geocode(city))
+        return _fetch_current(cell)
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"❌ Weather refresh failed ({city or cell}): {e}")
+        return None
+    finally:
+        cache.delete(lock_key)
+
+
+def _forget(job_key, future):
+    with _inflight_lock:
+        if _inflight.get(job_key) is future:
+            del _inflight[job_key]
+
+
+def _schedule(job_key, city, cell):
+    """같은 job_key 갱신이 진행 중이면 그 future, 아니면 새로 시작 (다른 프로세스가 갱신 중이면 None)"""
+    with _inflight_lock:
+        future = _inflight.get(job_key)
+        if future is not None and not future.done():
+            return future
+        lock_key = f"{job_key}:refreshing"
+        if not cache.add(lock_key, 1, REFRESH_LOCK_TIMEOUT):
+            return None
+        future = _executor.submit(_refresh, city, cell, lock_key)
+        _inflight[job_key] = future
+        future.add_done_callback(partial(_forget, job_key))
+        return future
+
+
+def _wait(future):
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=_cold_wait())
+    except TimeoutError:
+        return None
+
+
+# -----------------------------
+# 공개 API
+# -----------------------------
+def get_current_weather(city="Seoul", lat=None, lon=None):
+    """
+    Open-Meteo "current" dict (temperature_2m / relative_humidity_2m / weather_code / wind_speed_10m)
+    캐시가 없고 WEATHER_COLD_WAIT 안에 못 받아오면 None
+    """
+    if lat is None or lon is None:
+        location = cache.get(_geocode_key(city))
+        if location is None:
+            # 지오코딩 + 날씨를 한 작업으로
+            return _wait(_schedule(_geocode_key(city), city, None))
+        lat, lon = location
+
+    cell = grid_cell(lat, lon)
+    key = _forecast_key(cell)
+    cached = cache.get(key)
+    if cached is None:
+        return _wait(_schedule(key, None, cell))
+    if time.time() - cached["fetched_at"] >= _forecast_ttl():
+        _schedule(key, None, cell)  # stale 값 먼저 돌려주고 뒤에서 갱신
+    return cached["current"]